@@ -12,10 +12,10 @@ from datetime import datetime
 import plotly.graph_objects as go
 import plotly.express as px
 
-import duckdb
 from pathlib import Path 
 
 from my_agent.utils.config import DUCKDB_PATH, USE_DUCKDB
+from my_agent.utils.duckdb_swap import readonly_cursor
 # ==== THEME ====
 THEME_MAIN  = "#7742e3"
 THEME_DARK  = "#5b2fc7"
@@ -100,16 +100,19 @@ def load_all_data(franchise_csv, biz_area_csv):
     if USE_DUCKDB:
         try:
             db_path = Path(DUCKDB_PATH).expanduser()
-            if not db_path.exists():
+            # 프로세스 공용 읽기 전용 연결의 스레드별 커서 (DB 파일이 교체되면 재연결)
+            con = readonly_cursor(db_path)
+            if con is None:
                 raise FileNotFoundError(f"DuckDB 파일 없음: {db_path}")
             
-            con = duckdb.connect(str(db_path), read_only=True)
-            
             # 전체 데이터 로드 (대시보드는 전체 데이터 필요)
             store = con.execute("SELECT * FROM franchise").fetchdf()
             trade = con.execute("SELECT * FROM biz_area").fetchdf()
             
-            con.close()
+            # ENUM 컬럼(category) → 문자열 (CSV 경로와 같은 dtype으로 전처리)
+            for df_ in (store, trade):
+                for col in df_.select_dtypes("category").columns:
+                    df_[col] = df_[col].astype(object)
             
             print(f"✅ DuckDB 로드 완료: franchise {len(store):,} rows, biz_area {len(trade):,} rows")
             
@@ -0,0 +1,375 @@
+# forecast.py
+# -*- coding: utf-8 -*-
+"""
+다음달 매출 구간 예측 로직 (AutoGluon)
+- 배치: 전 가맹점 최신 행을 모아 predict_proba 1회로 일괄 예측 → DuckDB predictions 테이블
+- 온라인: predictions 테이블의 사전 계산 결과(1행) 조회
+- 피처 조회: 정렬된 Parquet(없으면 CSV)에서 가맹점 1곳의 최신 행만 지연 로드
+- 예측 래퍼: predict_proba 1회로 클래스/확률 산출 + persist/워밍업 + 호출별 지연시간
+- 증류 모델: 앙상블을 LightGBM 단일 모델로 증류한 경량 백엔드 (PREDICTOR_BACKEND="lite")
+"""
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from my_agent.utils.duckdb_swap import readonly_cursor
+from my_agent.utils.log import get_logger
+from my_agent.utils.config import (
+    DUCKDB_PATH, PREPROCESSED_CSV, PREPROCESSED_PARQUET,
+    PREDICTOR_PATH, PREDICTOR_PERSIST, PREDICTOR_WARMUP,
+    PREDICTOR_BACKEND, LITE_MODEL_PATH,
+)
+
+log = get_logger(__name__)
+
+# 매출 구간 라벨 매핑
+LABEL_MAP = {
+    0: "6_90%초과(하위 10% 이하)",
+    1: "5_75-90%",
+    2: "4_50-75%",
+    3: "3_25-50%",
+    4: "2_10-25%",
+    5: "1_10%이하"
+}
+
+# 예측에 불필요한 컬럼
+DROP_COLS = ['매출금액_구간', '매핑용_상권명', '매핑용_업종', '기준년월', 'dt']
+
+# 전처리 데이터의 가맹점 ID 컬럼 후보
+STORE_COL_CANDIDATES = ["가맹점구분번호", "가맹점_구분번호", "MCT_KEY", "store_id"]
+
+PREDICTIONS_TABLE = "predictions"
+
+
+def clean_store_id(store_id: str) -> str:
+    """대시보드 키(가맹점구분번호___가맹점명) → 가맹점구분번호"""
+    return store_id.split('___')[0] if '___' in store_id else store_id
+
+
+def score_rows(predictor, rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    predict_proba 1회로 여러 행을 일괄 예측
+
+    Returns:
+        predicted_class / predicted_label / predicted_probability + proba_{class} 컬럼
+    """
+    features = rows.drop(columns=DROP_COLS, errors='ignore')
+    proba = predictor.predict_proba(features)
+
+    pred_class = proba.idxmax(axis=1).astype(int)
+    out = pd.DataFrame({
+        "predicted_class": pred_class.values,
+        "predicted_label": pred_class.map(lambda c: LABEL_MAP.get(int(c), "알 수 없음")).values,
+        "predicted_probability": proba.max(axis=1).astype(float).values,
+    })
+    for c in proba.columns:
+        out[f"proba_{int(c)}"] = proba[c].astype(float).values
+    return out
+
+
+# 사전 계산 결과 조회 (온라인 경로)
+def _get_db_connection() -> Optional[duckdb.DuckDBPyConnection]:
+    """DuckDB 읽기 전용 커서 (스레드별, 파일 없으면 None, 파일이 교체되면 재연결)"""
+    return readonly_cursor(DUCKDB_PATH)
+
+
+def load_prediction(store_id: str) -> Optional[Dict[str, Any]]:
+    """
+    predictions 테이블에서 사전 계산된 예측 1행 조회
+
+    Returns:
+        {"predicted_class", "predicted_label", "predicted_probability", "기준년월"} 또는 None
+    """
+    con = _get_db_connection()
+    if con is None:
+        return None
+
+    try:
+        row = con.execute(
+            f"""
+            SELECT predicted_class, predicted_label, predicted_probability, 기준년월
+            FROM {PREDICTIONS_TABLE}
+            WHERE 가맹점_구분번호 = ?
+            """,
+            [clean_store_id(str(store_id))],
+        ).fetchone()
+    except duckdb.CatalogException:
+        # predictions 테이블 미구축 (scripts/build_predictions.py 미실행)
+        return None
+
+    if row is None:
+        return None
+
+    return {
+        "predicted_class": int(row[0]),
+        "predicted_label": row[1],
+        "predicted_probability": float(row[2]),
+        "기준년월": row[3],
+    }
+
+
+# 피처 조회 (가맹점 단위 지연 로드)
+_FEATURES_CONNECTION: Optional[duckdb.DuckDBPyConnection] = None
+_FEATURES_STORE_COL: Optional[str] = None
+_FEATURES_LOCK = threading.Lock()
+
+
+def _get_features_connection() -> duckdb.DuckDBPyConnection:
+    """
+    피처 테이블 뷰(features)를 가진 인메모리 DuckDB 연결
+    - Parquet 있으면 Parquet (row group 통계로 가맹점 1곳만 읽음)
+    - 없으면 CSV를 스캔 (pandas 전체 적재 없이 필터링)
+    - 조회는 호출마다 이 연결의 커서를 열고 닫음 (스레드 간 커서 공유 불가)
+    """
+    global _FEATURES_CONNECTION, _FEATURES_STORE_COL
+    if _FEATURES_CONNECTION is None:
+        with _FEATURES_LOCK:
+            if _FEATURES_CONNECTION is None:
+                parquet_path = Path(PREPROCESSED_PARQUET).expanduser()
+                csv_path = Path(PREPROCESSED_CSV).expanduser()
+                if parquet_path.exists():
+                    source = f"read_parquet('{parquet_path}')"
+                elif csv_path.exists():
+                    source = f"read_csv_auto('{csv_path}', header=true)"
+                else:
+                    raise FileNotFoundError(f"피처 데이터가 없습니다: {parquet_path} / {csv_path}")
+
+                con = duckdb.connect()
+                con.execute("SET enable_object_cache = true")  # Parquet 메타데이터 캐시
+                con.execute(f"CREATE VIEW features AS SELECT * FROM {source}")
+                columns = con.execute("DESCRIBE features").fetchdf()["column_name"].tolist()
+                _FEATURES_STORE_COL = next((c for c in STORE_COL_CANDIDATES if c in columns), None)
+                _FEATURES_CONNECTION = con
+    return _FEATURES_CONNECTION
+
+
+def _projection(columns: Optional[List[str]]) -> str:
+    if not columns:
+        return "*"
+    cols = list(dict.fromkeys(list(columns) + ["기준년월"]))
+    return ", ".join(f'"{c}"' for c in cols)
+
+
+def load_latest_features(encoded_store_id: int, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """
+    인코딩된 가맹점 ID의 최신 기준년월 1행 조회
+
+    Args:
+        encoded_store_id: label_encoder로 변환한 가맹점 ID
+        columns: 모델 피처 컬럼 (predictor.features()), None이면 전체
+
+    Returns:
+        1행 DataFrame 또는 None
+    """
+    features = _get_features_connection()
+    if not _FEATURES_STORE_COL:
+        raise KeyError("피처 데이터에서 가맹점 ID 컬럼을 찾을 수 없습니다.")
+
+    with features.cursor() as con:
+        df = con.execute(
+            f"""
+            SELECT {_projection(columns)}
+            FROM features
+            WHERE "{_FEATURES_STORE_COL}" = ?
+            ORDER BY 기준년월 DESC
+            LIMIT 1
+            """,
+            [int(encoded_store_id)],
+        ).fetchdf()
+    return None if df.empty else df
+
+
+def load_all_latest_features(columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """가맹점별 최신 기준년월 1행씩 조회 (배치 예측용)"""
+    features = _get_features_connection()
+    if not _FEATURES_STORE_COL:
+        raise KeyError("피처 데이터에서 가맹점 ID 컬럼을 찾을 수 없습니다.")
+
+    cols = None if not columns else list(dict.fromkeys([_FEATURES_STORE_COL] + list(columns)))
+    with features.cursor() as con:
+        return con.execute(
+            f"""
+            SELECT {_projection(cols)}
+            FROM features
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY "{_FEATURES_STORE_COL}" ORDER BY 기준년월 DESC
+            ) = 1
+            ORDER BY "{_FEATURES_STORE_COL}"
+            """
+        ).fetchdf()
+
+
+def load_all_features(columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """전체 기간 피처 행 조회 (모델 증류/평가용)"""
+    with _get_features_connection().cursor() as con:
+        return con.execute(f"SELECT {_projection(columns)} FROM features ORDER BY 기준년월").fetchdf()
+
+
+def features_store_col() -> Optional[str]:
+    """피처 테이블의 가맹점 ID 컬럼명"""
+    _get_features_connection()
+    return _FEATURES_STORE_COL
+
+
+def load_sample_features(columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """피처 테이블의 임의 1행 (워밍업용)"""
+    with _get_features_connection().cursor() as con:
+        df = con.execute(f"SELECT {_projection(columns)} FROM features LIMIT 1").fetchdf()
+    return None if df.empty else df
+
+
+# 예측 래퍼
+class SalesBandPredictor:
+    """
+    AutoGluon TabularPredictor 래퍼
+    - predict + predict_proba 2회 대신 predict_proba 1회 → argmax로 클래스 산출
+    - persist: 모델을 메모리에 상주시켜 호출마다 디스크 로딩 방지
+    - warmup: 첫 사용자 요청 전에 지연 로딩/초기화 비용을 미리 지불
+    - last_latency_ms / latency_stats(): 호출별 지연시간 노출
+    """
+
+    def __init__(self, predictor, persist: bool = PREDICTOR_PERSIST):
+        self.predictor = predictor
+        self.last_latency_ms: Optional[float] = None
+        self._latencies: List[float] = []
+        if persist:
+            self._persist()
+
+    @classmethod
+    def load(cls, path: str = PREDICTOR_PATH, persist: bool = PREDICTOR_PERSIST) -> "SalesBandPredictor":
+        from autogluon.tabular import TabularPredictor
+        return cls(TabularPredictor.load(path), persist=persist)
+
+    def _persist(self):
+        # AutoGluon 1.x: persist(), 구버전: persist_models()
+        persist_fn = getattr(self.predictor, "persist", None) or getattr(self.predictor, "persist_models", None)
+        if persist_fn is not None:
+            persist_fn()
+
+    def features(self) -> List[str]:
+        return self.predictor.features()
+
+    def predict_proba(self, rows: pd.DataFrame) -> pd.DataFrame:
+        t0 = time.perf_counter()
+        proba = self.predictor.predict_proba(rows)
+        self.last_latency_ms = (time.perf_counter() - t0) * 1000
+        self._latencies.append(self.last_latency_ms)
+        del self._latencies[:-1000]  # 최근 1000건만 유지
+        return proba
+
+    def predict_one(self, row: pd.DataFrame) -> Dict[str, Any]:
+        """1행 예측 → {"predicted_class", "predicted_label", "predicted_probability", "latency_ms"}"""
+        scored = score_rows(self, row).iloc[0]
+        return {
+            "predicted_class": int(scored["predicted_class"]),
+            "predicted_label": scored["predicted_label"],
+            "predicted_probability": float(scored["predicted_probability"]),
+            "latency_ms": round(self.last_latency_ms, 2),
+        }
+
+    def warmup(self) -> Optional[float]:
+        """피처 테이블 1행으로 예측 1회 수행 (지연시간 ms 반환)"""
+        sample = load_sample_features(self.features())
+        if sample is None:
+            return None
+        self.predict_proba(sample.drop(columns=DROP_COLS, errors='ignore'))
+        return self.last_latency_ms
+
+    def latency_stats(self) -> Dict[str, Any]:
+        if not self._latencies:
+            return {"count": 0}
+        s = pd.Series(self._latencies)
+        return {
+            "count": int(s.size),
+            "last_ms": round(self.last_latency_ms, 2),
+            "p50_ms": round(float(s.quantile(0.5)), 2),
+            "p95_ms": round(float(s.quantile(0.95)), 2),
+        }
+
+
+# 증류 모델 (경량 온라인 백엔드)
+class DistilledModel:
+    """
+    scripts/distill_predictor.py 가 저장한 LightGBM 번들
+    - TabularPredictor와 같은 features() / predict_proba() 인터페이스
+    - 범주형 컬럼은 학습 시 카테고리 목록으로 코드화 (미등록 값 → 결측)
+    """
+
+    def __init__(self, bundle: Dict[str, Any]):
+        self.booster = bundle["booster"]
+        self.classes: List[int] = list(bundle["classes"])
+        self.feature_names: List[str] = list(bundle["features"])
+        self.categories: Dict[str, List[Any]] = bundle.get("categories", {})
+
+    @classmethod
+    def load(cls, path: str = LITE_MODEL_PATH) -> "DistilledModel":
+        import joblib
+        return cls(joblib.load(path))
+
+    def features(self) -> List[str]:
+        return self.feature_names
+
+    def encode(self, rows: pd.DataFrame) -> np.ndarray:
+        """DataFrame → LightGBM 입력 float 행렬"""
+        X = np.empty((len(rows), len(self.feature_names)), dtype=np.float64)
+        for j, col in enumerate(self.feature_names):
+            values = rows[col] if col in rows.columns else pd.Series(np.nan, index=rows.index)
+            if col in self.categories:
+                codes = pd.Categorical(values, categories=self.categories[col]).codes
+                X[:, j] = np.where(codes < 0, np.nan, codes)
+            else:
+                X[:, j] = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+        return X
+
+    def predict_proba(self, rows: pd.DataFrame) -> pd.DataFrame:
+        proba = self.booster.predict(self.encode(rows), num_threads=1)
+        return pd.DataFrame(np.atleast_2d(proba), columns=self.classes, index=rows.index)
+
+
+# 프로세스 단위 싱글턴 (+ 백그라운드 워밍업)
+_PREDICTOR: Optional[SalesBandPredictor] = None
+_PREDICTOR_LOCK = threading.Lock()
+
+
+def _load_online_predictor() -> SalesBandPredictor:
+    """PREDICTOR_BACKEND에 따라 증류 모델 또는 앙상블 로드 (증류 모델 없으면 앙상블)"""
+    if PREDICTOR_BACKEND == "lite":
+        if Path(LITE_MODEL_PATH).expanduser().exists():
+            return SalesBandPredictor(DistilledModel.load(), persist=False)
+        log.warning("증류 모델이 없어 앙상블을 사용합니다: %s", LITE_MODEL_PATH)
+    return SalesBandPredictor.load()
+
+
+def get_predictor() -> SalesBandPredictor:
+    """SalesBandPredictor 싱글턴 (최초 호출 시 로드 + persist + warmup)"""
+    global _PREDICTOR
+    if _PREDICTOR is None:
+        with _PREDICTOR_LOCK:
+            if _PREDICTOR is None:
+                predictor = _load_online_predictor()
+                if PREDICTOR_WARMUP:
+                    try:
+                        predictor.warmup()
+                    except Exception as e:
+                        log.warning("예측 모델 워밍업 실패: %s", e)
+                _PREDICTOR = predictor
+    return _PREDICTOR
+
+
+def start_warmup():
+    """프로세스 시작 시 백그라운드로 모델 로드/워밍업 (중복 호출 무시)"""
+    if not PREDICTOR_WARMUP or _PREDICTOR is not None or _PREDICTOR_LOCK.locked():
+        return
+    threading.Thread(target=_safe_get_predictor, name="predictor-warmup", daemon=True).start()
+
+
+def _safe_get_predictor():
+    try:
+        get_predictor()
+    except Exception as e:
+        log.exception("예측 모델 로드 실패: %s", e)
@@ -5,10 +5,14 @@
 MCP 툴 직접 호출 (Python 내부에서 바로 사용 가능)
 """
 from typing import List
+
+from my_agent.utils.tracing import span
+from mcp.telemetry import call_tool
 from mcp.tools import (
     search_merchant,
     load_store_data,
     load_bizarea_data, 
+    load_store_profile,
     find_cooperation_candidates
 )
 from mcp.tools_web import web_search
@@ -22,6 +26,7 @@ def call_mcp_tool(tool_name: str, **kwargs) -> dict:
         "search_merchant": search_merchant,
         "load_store_data": load_store_data,
         "load_bizarea_data": load_bizarea_data,
+        "load_store_profile": load_store_profile,
         "find_cooperation_candidates": find_cooperation_candidates,
         "web_search": web_search, 
         "get_weather_forecast": get_weather_forecast
@@ -30,4 +35,12 @@ def call_mcp_tool(tool_name: str, **kwargs) -> dict:
     if not tool_func:
         raise ValueError(f"Tool '{tool_name}' not found. Available: {list(tools_map.keys())}")
 
-    return tool_func(**kwargs)
\ No newline at end of file
+    with span(tool_name, kind="tool") as s:
+        result = call_tool(tool_name, tool_func, **kwargs)
+        if isinstance(result, dict):
+            s.set(
+                rows=result.get("count"),
+                cache_hit=result.get("cache_hit"),
+                success=result.get("success", result.get("found")),
+            )
+        return result
@@ -0,0 +1,220 @@
+# mcp/http_client.py
+# -*- coding: utf-8 -*-
+"""
+외부 HTTP 호출 공용 클라이언트 (Serper / 기상청)
+
+- 연결 풀 + keep-alive: 프로세스 공용 requests.Session (호스트별 HTTP_POOL_SIZE 연결 재사용)
+- 재시도: 연결 오류 / 타임아웃 / 429 / 5xx만, 최대 HTTP_RETRIES회
+  대기 = U(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE × 2^n)) (full jitter, Retry-After 우선)
+- 호스트별 동시 요청 상한 (HTTP_MAX_PER_HOST)
+- 서킷 브레이커: 연속 실패 HTTP_BREAKER_THRESHOLD회 → HTTP_BREAKER_COOLDOWN초 동안 즉시 실패,
+  이후 요청 1건으로 복구 여부 확인 (half-open)
+
+request()는 (응답, meta)를 반환 — meta: attempts, retry_count, elapsed, host, circuit_open
+실패 시 HttpError(.meta 포함)를 던지므로 호출부는 재시도/폴백 정보를 결과 meta에 그대로 기록
+"""
+import random
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from my_agent.utils.config import (
+    HTTP_POOL_SIZE,
+    HTTP_MAX_PER_HOST,
+    HTTP_RETRIES,
+    HTTP_BACKOFF_BASE,
+    HTTP_BACKOFF_MAX,
+    HTTP_BREAKER_THRESHOLD,
+    HTTP_BREAKER_COOLDOWN,
+)
+from my_agent.utils.log import get_logger
+
+log = get_logger(__name__)
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class HttpError(Exception):
+    """재시도 후에도 실패 (meta에 시도 횟수 등)"""
+
+    def __init__(self, message: str, meta: Dict[str, Any]):
+        super().__init__(message)
+        self.meta = meta
+
+
+class CircuitOpenError(HttpError):
+    """서킷 브레이커가 열려 있어 호출하지 않음"""
+
+
+class _Breaker:
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.cooldown or self.probing:
+                return False
+            self.probing = True  # half-open: 1건만 통과
+            return True
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.threshold:
+                if self.opened_at is None or self.probing:
+                    log.warning("서킷 오픈 (연속 실패 %d회, %.0fs)", self.failures, self.cooldown)
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+
+class _Host:
+    def __init__(self):
+        self.semaphore = threading.BoundedSemaphore(HTTP_MAX_PER_HOST)
+        self.breaker = _Breaker(HTTP_BREAKER_THRESHOLD, HTTP_BREAKER_COOLDOWN)
+        self.inflight = 0
+        self.lock = threading.Lock()
+
+    def enter(self):
+        with self.lock:
+            self.inflight += 1
+
+    def exit(self):
+        with self.lock:
+            self.inflight -= 1
+
+
+class HttpClient:
+    def __init__(self):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._hosts: Dict[str, _Host] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, netloc: str) -> _Host:
+        host = self._hosts.get(netloc)
+        if host is None:
+            with self._lock:
+                host = self._hosts.setdefault(netloc, _Host())
+        return host
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        timeout: float,
+        retries: Optional[int] = None,
+        deadline: Optional[float] = None,
+        **kwargs,
+    ) -> Tuple[requests.Response, Dict[str, Any]]:
+        """
+        Args:
+            timeout: 시도 1회 타임아웃 (초)
+            retries: 재시도 횟수 (None → HTTP_RETRIES)
+            deadline: 전체 시간 예산 (초) — 남은 시간이 백오프보다 짧으면 재시도하지 않음
+        """
+        retries = HTTP_RETRIES if retries is None else retries
+        netloc = urlparse(url).netloc
+        host = self._host(netloc)
+        t0 = time.monotonic()
+        meta: Dict[str, Any] = {"host": netloc, "attempts": 0, "retry_count": 0, "circuit_open": False}
+
+        for attempt in range(retries + 1):
+            if not host.breaker.allow():
+                meta["circuit_open"] = True
+                meta["elapsed"] = round(time.monotonic() - t0, 3)
+                raise CircuitOpenError(f"circuit open: {netloc}", meta)
+
+            remaining = None if deadline is None else deadline - (time.monotonic() - t0)
+            attempt_timeout = timeout if remaining is None else max(0.1, min(timeout, remaining))
+            retry_after = None
+            meta["attempts"] = attempt + 1
+            error: Optional[str] = None
+            with host.semaphore:
+                host.enter()
+                try:
+                    resp = self.session.request(method, url, timeout=attempt_timeout, **kwargs)
+                    if resp.status_code in RETRY_STATUS:
+                        error = f"HTTP {resp.status_code}"
+                        retry_after = _retry_after(resp)
+                        resp.close()  # 연결을 풀로 반환
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = f"{type(e).__name__}: {e}"
+                finally:
+                    host.exit()
+
+            if error is None:
+                # 4xx 등 재시도 대상이 아닌 응답은 호출부 raise_for_status에서 처리
+                host.breaker.success()
+                meta["status"] = resp.status_code
+                meta["elapsed"] = round(time.monotonic() - t0, 3)
+                return resp, meta
+
+            host.breaker.failure()
+            meta["error"] = error
+            elapsed = time.monotonic() - t0
+            wait = random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** attempt)))
+            if retry_after is not None:
+                wait = max(wait, min(retry_after, HTTP_BACKOFF_MAX))
+            if attempt == retries or (deadline is not None and elapsed + wait >= deadline):
+                break
+            log.debug("%s %s 실패 (%s) → %.2fs 후 재시도 %d/%d", method, netloc, error, wait, attempt + 1, retries)
+            time.sleep(wait)
+            meta["retry_count"] = attempt + 1
+
+        meta["elapsed"] = round(time.monotonic() - t0, 3)
+        raise HttpError(meta["error"], meta)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """호스트별 진행 중 요청 수 / 서킷 상태 — 메트릭용"""
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {
+            netloc: {"inflight": h.inflight, "circuit_open": int(h.breaker.is_open), "failures": h.breaker.failures}
+            for netloc, h in hosts.items()
+        }
+
+
+def _retry_after(resp: requests.Response) -> Optional[float]:
+    value = resp.headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+_CLIENT: Optional[HttpClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """프로세스 공용 클라이언트"""
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = HttpClient()
+    return _CLIENT
@@ -0,0 +1,71 @@
+# mcp/kma_grid.py
+# -*- coding: utf-8 -*-
+"""
+위도·경도 → 기상청 단기예보 격자(nx, ny) 변환 (Lambert 정각원추도법, 격자 간격 5km)
+
+- latlon_to_grid: NumPy 벡터 연산 (스칼라 / 배열 모두 가능)
+  → scripts/build_duckdb.py 가 매장 전체에 1회 적용해 franchise_latest.kma_nx / kma_ny 로 저장
+- 좌표가 없거나(NaN) 범위를 벗어나면 격자도 없음 (기본 좌표로 대체하지 않음)
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+# 기상청 격자 상수
+RE = 6371.00877     # 지구 반경 (km)
+GRID = 5.0          # 격자 간격 (km)
+SLAT1 = 30.0        # 표준위도 1
+SLAT2 = 60.0        # 표준위도 2
+OLON = 126.0        # 기준점 경도
+OLAT = 38.0         # 기준점 위도
+XO = 43             # 기준점 X 격자
+YO = 136            # 기준점 Y 격자
+
+# 격자 범위 (동네예보 격자 149 × 253)
+NX_MAX = 149
+NY_MAX = 253
+
+# 좌표와 무관한 투영 상수는 import 시 1회 계산
+_DEGRAD = np.pi / 180.0
+_re = RE / GRID
+_slat1 = SLAT1 * _DEGRAD
+_slat2 = SLAT2 * _DEGRAD
+_olon = OLON * _DEGRAD
+_olat = OLAT * _DEGRAD
+_sn = np.log(np.cos(_slat1) / np.cos(_slat2)) / np.log(
+    np.tan(np.pi / 4.0 + _slat2 / 2.0) / np.tan(np.pi / 4.0 + _slat1 / 2.0)
+)
+_sf = np.tan(np.pi / 4.0 + _slat1 / 2.0) ** _sn * np.cos(_slat1) / _sn
+_ro = _re * _sf / (np.tan(np.pi / 4.0 + _olat / 2.0) ** _sn)
+
+
+def latlon_to_grid(lat, lon) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    위도·경도 배열 → (nx, ny) 배열
+
+    Returns:
+        float 배열 2개 (정수 격자값, 좌표 결측/격자 범위 밖은 NaN)
+    """
+    lat = np.asarray(lat, dtype="float64")
+    lon = np.asarray(lon, dtype="float64")
+
+    ra = _re * _sf / (np.tan(np.pi / 4.0 + lat * _DEGRAD / 2.0) ** _sn)
+    theta = lon * _DEGRAD - _olon
+    theta = np.where(theta > np.pi, theta - 2.0 * np.pi, theta)
+    theta = np.where(theta < -np.pi, theta + 2.0 * np.pi, theta)
+    theta = theta * _sn
+
+    nx = np.floor(ra * np.sin(theta) + XO + 0.5)
+    ny = np.floor(_ro - ra * np.cos(theta) + YO + 0.5)
+    outside = (nx < 1) | (nx > NX_MAX) | (ny < 1) | (ny > NY_MAX)
+    return np.where(outside, np.nan, nx), np.where(outside, np.nan, ny)
+
+
+def to_grid(lat: Optional[float], lon: Optional[float]) -> Optional[Tuple[int, int]]:
+    """단일 좌표 → (nx, ny), 좌표 결측/범위 밖이면 None"""
+    if lat is None or lon is None:
+        return None
+    nx, ny = latlon_to_grid(lat, lon)
+    if np.isnan(nx) or np.isnan(ny):
+        return None
+    return int(nx), int(ny)
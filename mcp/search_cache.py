@@ -0,0 +1,190 @@
+# mcp/search_cache.py
+# -*- coding: utf-8 -*-
+"""
+웹 검색 결과 캐시 (web_search 전용)
+
+- 키: 정규화 쿼리 + top_k + rewrite 여부
+  · NFKC, 소문자, 구두점/OR 제거, 토큰 중복 제거 후 정렬 (어순만 다른 쿼리는 같은 키)
+  · 마스킹 상호 토큰(본죽**** 등)은 제외 — 검색어로 의미가 없어 같은 상권·intent면 결과가 같음
+- 2단계: 프로세스 메모리 LRU (SEARCH_CACHE_MEM_ENTRIES) → SQLite (SEARCH_CACHE_PATH, 프로세스 간 공유)
+- TTL: SEARCH_CACHE_TTL_DAYS (기본 SEARCH_RECENCY_DAYS), SQLite는 SEARCH_CACHE_MAX_ENTRIES 초과 시
+  마지막 사용 시각이 오래된 순으로 정리 (메모리 적중도 last_access에 일괄 반영)
+- 만료 항목은 TTL만큼 더 보관 → Serper 장애 시 get_stale로 폴백
+"""
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from my_agent.utils.config import (
+    SEARCH_CACHE_ENABLED,
+    SEARCH_CACHE_PATH,
+    SEARCH_CACHE_TTL_DAYS,
+    SEARCH_CACHE_MAX_ENTRIES,
+    SEARCH_CACHE_MEM_ENTRIES,
+)
+from my_agent.utils.log import get_logger
+
+log = get_logger(__name__)
+
+_PUNCT = re.compile(r"[^\w\s*]")
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 쿼리 정규화"""
+    text = unicodedata.normalize("NFKC", query or "").lower()
+    tokens = _PUNCT.sub(" ", text).split()
+    return " ".join(sorted({t for t in tokens if t != "or" and "*" not in t}))
+
+
+def cache_key(query: str, top_k: int, rewrite_query: bool) -> str:
+    return f"{normalize_query(query)}|k={int(top_k)}|rw={int(bool(rewrite_query))}"
+
+
+class SearchCache:
+    """메모리 LRU + SQLite 2단계 캐시 (스레드 안전)"""
+
+    # put 몇 번마다 SQLite 크기 점검 (매번 COUNT(*) 하지 않도록)
+    PRUNE_EVERY = 64
+    # 메모리 적중의 last_access 갱신은 모아서 기록 (키 개수 또는 경과 시간 기준)
+    TOUCH_BATCH = 64
+    TOUCH_FLUSH_S = 60.0
+
+    def __init__(self, path: str, ttl_s: float, max_entries: int, mem_entries: int):
+        self.path = Path(path).expanduser()
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.mem_entries = mem_entries
+        self.hits = 0
+        self.misses = 0
+        self._mem: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts = 0
+        self._touched: Dict[str, float] = {}   # 메모리 적중 키 → 마지막 사용 시각 (SQLite 미반영분)
+        self._touch_flushed = time.time()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._con = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        self._con.execute("""
+            CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._con.execute("CREATE INDEX IF NOT EXISTS idx_search_cache_access ON search_cache(last_access)")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None and now - entry[0] < self.ttl_s:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                self._touch(key, now)
+                return entry[1]
+
+            row = self._con.execute(
+                "SELECT payload, created_at FROM search_cache WHERE key = ? AND created_at > ?",
+                (key, now - self.ttl_s),
+            ).fetchone()
+            if row is None:
+                self._mem.pop(key, None)
+                self.misses += 1
+                return None
+            self._con.execute("UPDATE search_cache SET last_access = ? WHERE key = ?", (now, key))
+            payload = json.loads(row[0])
+            self._remember(key, row[1], payload)
+            self.hits += 1
+            return payload
+
+    def get_stale(self, key: str) -> Optional[Dict[str, Any]]:
+        """TTL 무시 조회 (업스트림 장애 폴백용, 적중/미적중 집계 안 함)"""
+        with self._lock:
+            row = self._con.execute("SELECT payload FROM search_cache WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, payload: Dict[str, Any]):
+        now = time.time()
+        with self._lock:
+            self._con.execute(
+                "INSERT OR REPLACE INTO search_cache (key, payload, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(payload, ensure_ascii=False), now, now),
+            )
+            self._remember(key, now, payload)
+            self._puts += 1
+            if self._puts % self.PRUNE_EVERY == 0:
+                self._prune(now)
+
+    def _touch(self, key: str, now: float):
+        """메모리 적중 기록 — 다른 프로세스의 _prune이 자주 쓰는 항목을 지우지 않도록 last_access 갱신"""
+        self._touched[key] = now
+        if len(self._touched) >= self.TOUCH_BATCH or now - self._touch_flushed >= self.TOUCH_FLUSH_S:
+            self._flush_touches(now)
+
+    def _flush_touches(self, now: float):
+        if self._touched:
+            self._con.executemany(
+                "UPDATE search_cache SET last_access = MAX(last_access, ?) WHERE key = ?",
+                [(t, k) for k, t in self._touched.items()],
+            )
+            self._touched.clear()
+        self._touch_flushed = now
+
+    def _remember(self, key: str, created_at: float, payload: Dict[str, Any]):
+        self._mem[key] = (created_at, payload)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.mem_entries:
+            self._mem.popitem(last=False)
+
+    def _prune(self, now: float):
+        """만료 후 TTL만큼 지난 항목 삭제 + 최대 개수 초과분을 오래 안 쓴 순으로 삭제"""
+        self._flush_touches(now)
+        self._con.execute("DELETE FROM search_cache WHERE created_at <= ?", (now - 2 * self.ttl_s,))
+        n = self._con.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        if n > self.max_entries:
+            self._con.execute(
+                "DELETE FROM search_cache WHERE key IN "
+                "(SELECT key FROM search_cache ORDER BY last_access LIMIT ?)",
+                (n - self.max_entries,),
+            )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            n = self._con.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+            return {"memory": len(self._mem), "sqlite": n, "hits": self.hits, "misses": self.misses}
+
+
+_CACHE: Optional[SearchCache] = None
+_CACHE_LOCK = threading.Lock()
+_DISABLED = False   # SQLite 열기 실패 시 True (설정값 SEARCH_CACHE_ENABLED는 그대로 둠)
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """프로세스 싱글턴 (비활성화 또는 SQLite 열기 실패 시 None → 캐시 없이 동작)"""
+    global _CACHE, _DISABLED
+    if not SEARCH_CACHE_ENABLED or _DISABLED:
+        return None
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                try:
+                    _CACHE = SearchCache(
+                        SEARCH_CACHE_PATH,
+                        ttl_s=SEARCH_CACHE_TTL_DAYS * 86400,
+                        max_entries=SEARCH_CACHE_MAX_ENTRIES,
+                        mem_entries=SEARCH_CACHE_MEM_ENTRIES,
+                    )
+                except (sqlite3.Error, OSError) as e:
+                    log.warning("검색 캐시 비활성화 (SQLite 열기 실패): %s", e)
+                    _DISABLED = True
+                    return None
+    return _CACHE
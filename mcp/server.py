@@ -10,10 +10,13 @@ from mcp.tools import (
     search_merchant,
     load_store_data,
     load_bizarea_data, 
+    load_store_profile,
     find_cooperation_candidates
 )
 from mcp.tools_web import web_search 
-from mcp.tools_weather import get_weather_forecast 
+from mcp.tools_weather import get_weather_forecast, start_prefetcher
+from mcp.telemetry import instrument, render, start_http_server
+from my_agent.utils.config import MCP_METRICS_PORT, MCP_METRICS_HOST
 
 mcp = FastMCP(
     "BigContestMCPServer",
@@ -23,18 +26,30 @@ mcp = FastMCP(
     - search_merchant: 가맹점명 검색
     - load_store_data: 가맹점 데이터 조회
     - load_bizarea_data: 상권 데이터 조회
+    - load_store_profile: 지표 빌더용 가맹점 프로필 조회
     - find_cooperation_candidates: 협업 후보 조회
     - web_search: 외부 검색 웹 정보 수집
     """
 )
 
-# 툴 등록
-mcp.tool()(search_merchant)
-mcp.tool()(load_store_data)
-mcp.tool()(load_bizarea_data)
-mcp.tool()(find_cooperation_candidates)
-mcp.tool()(web_search)
-mcp.tool()(get_weather_forecast)
+# 툴 등록 (툴별 호출 수 / 에러 / 지연시간 / 반환 행 수 메트릭)
+mcp.tool()(instrument(search_merchant))
+mcp.tool()(instrument(load_store_data))
+mcp.tool()(instrument(load_bizarea_data))
+mcp.tool()(instrument(load_store_profile))
+mcp.tool()(instrument(find_cooperation_candidates))
+mcp.tool()(instrument(web_search))
+mcp.tool()(instrument(get_weather_forecast))
+
+
+@mcp.resource("metrics://prometheus", mime_type="text/plain")
+def metrics() -> str:
+    """툴 메트릭 (Prometheus 텍스트 포맷)"""
+    return render()
+
 
 if __name__ == "__main__":
+    if MCP_METRICS_PORT:
+        start_http_server(MCP_METRICS_PORT, MCP_METRICS_HOST)
+    start_prefetcher()
     mcp.run()
@@ -0,0 +1,237 @@
+# mcp/telemetry.py
+# -*- coding: utf-8 -*-
+"""
+MCP 툴 운영 메트릭 (Prometheus 텍스트 포맷, 외부 의존성 없음)
+
+툴별:
+- mcp_tool_calls_total{tool}                 : 호출 수
+- mcp_tool_errors_total{tool}                : 예외 또는 결과에 error가 담긴 호출 수
+- mcp_tool_latency_seconds{tool} (histogram) : 지연시간 버킷 / sum / count
+- mcp_tool_rows_total{tool}                  : 반환 행 수 합계 (count / data / candidates)
+
+콜백 메트릭 (수집 시점에 계산, register_gauge / register_counter로 추가):
+- mcp_duckdb_connections / mcp_duckdb_cursors : 읽기 전용 연결 / 스레드별 커서 수
+- mcp_cache_entries{cache}                    : 캐시 항목 수
+- mcp_search_cache_lookups_total{result}      : 웹 검색 캐시 적중/미적중 수 (counter)
+- mcp_http_inflight{host} / mcp_http_circuit_open{host} : 외부 API 진행 중 요청 수 / 서킷 상태
+
+노출:
+- start_http_server(port): GET /metrics (로컬 HTTP, 데몬 스레드)
+- mcp/server.py 의 MCP 리소스 metrics://prometheus
+"""
+import functools
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 지연시간 버킷 (초) — search_merchant / load_store_data SLO(수십 ms ~ 1 s) 구간을 촘촘하게
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_LOCK = threading.Lock()
+_CALLS: Dict[str, int] = {}
+_ERRORS: Dict[str, int] = {}
+_ROWS: Dict[str, int] = {}
+_LATENCY: Dict[str, List[float]] = {}      # tool → [버킷별 누적 개수..., +Inf]
+_LATENCY_SUM: Dict[str, float] = {}
+_GAUGES: List[Tuple[str, str, Callable[[], Any], str]] = []   # (이름, 설명, 콜백, gauge|counter)
+
+
+def _result_rows(result: Any) -> int:
+    if not isinstance(result, dict):
+        return 0
+    if isinstance(result.get("count"), int):
+        return result["count"]
+    for key in ("data", "candidates", "docs", "merchants"):
+        value = result.get(key)
+        if isinstance(value, list):
+            return len(value)
+        if isinstance(value, dict):
+            return 1
+    return 0
+
+
+def _is_error(result: Any) -> bool:
+    return isinstance(result, dict) and bool(result.get("error"))
+
+
+def observe(tool: str, seconds: float, rows: int = 0, error: bool = False):
+    """툴 호출 1건 기록"""
+    with _LOCK:
+        _CALLS[tool] = _CALLS.get(tool, 0) + 1
+        if error:
+            _ERRORS[tool] = _ERRORS.get(tool, 0) + 1
+        _ROWS[tool] = _ROWS.get(tool, 0) + rows
+        counts = _LATENCY.setdefault(tool, [0] * (len(LATENCY_BUCKETS) + 1))
+        for i, le in enumerate(LATENCY_BUCKETS):
+            if seconds <= le:
+                counts[i] += 1
+        counts[-1] += 1
+        _LATENCY_SUM[tool] = _LATENCY_SUM.get(tool, 0.0) + seconds
+
+
+def call_tool(tool: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """fn 호출 + 메트릭 기록 (예외는 에러로 기록 후 그대로 전파)"""
+    t0 = time.perf_counter()
+    try:
+        result = fn(*args, **kwargs)
+    except Exception:
+        observe(tool, time.perf_counter() - t0, error=True)
+        raise
+    observe(tool, time.perf_counter() - t0, rows=_result_rows(result), error=_is_error(result))
+    return result
+
+
+def instrument(fn: Callable[..., Any], name: Optional[str] = None) -> Callable[..., Any]:
+    """툴 함수 래퍼 (functools.wraps로 시그니처/docstring 유지 → FastMCP 스키마 동일)"""
+    tool = name or fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return call_tool(tool, fn, *args, **kwargs)
+    return wrapper
+
+
+def register_gauge(name: str, help_text: str, fn: Callable[[], Any], metric_type: str = "gauge"):
+    """게이지 등록 — fn()은 숫자 또는 [(labels dict, 값), ...] 반환 (수집 시점에 호출, 예외 시 생략)"""
+    with _LOCK:
+        _GAUGES[:] = [g for g in _GAUGES if g[0] != name]
+        _GAUGES.append((name, help_text, fn, metric_type))
+
+
+def register_counter(name: str, help_text: str, fn: Callable[[], Any]):
+    """단조 증가 값(프로세스 누적 합계) 콜백 등록 — 이름은 _total로 끝나야 rate()에 맞음"""
+    register_gauge(name, help_text, fn, metric_type="counter")
+
+
+def _escape(value: Any) -> str:
+    """Prometheus 텍스트 포맷 라벨 값 이스케이프 (역슬래시, 큰따옴표, 줄바꿈)"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(d: Dict[str, Any]) -> str:
+    if not d:
+        return ""
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in d.items())
+    return "{" + body + "}"
+
+
+def render() -> str:
+    """Prometheus 텍스트 exposition"""
+    with _LOCK:
+        calls, errors, rows = dict(_CALLS), dict(_ERRORS), dict(_ROWS)
+        latency = {k: list(v) for k, v in _LATENCY.items()}
+        latency_sum = dict(_LATENCY_SUM)
+        gauges = list(_GAUGES)
+
+    lines = [
+        "# HELP mcp_tool_calls_total MCP 툴 호출 수",
+        "# TYPE mcp_tool_calls_total counter",
+        *(f'mcp_tool_calls_total{{tool="{t}"}} {n}' for t, n in sorted(calls.items())),
+        "# HELP mcp_tool_errors_total MCP 툴 에러 수 (예외 또는 결과 error)",
+        "# TYPE mcp_tool_errors_total counter",
+        *(f'mcp_tool_errors_total{{tool="{t}"}} {errors.get(t, 0)}' for t in sorted(calls)),
+        "# HELP mcp_tool_rows_total MCP 툴 반환 행 수",
+        "# TYPE mcp_tool_rows_total counter",
+        *(f'mcp_tool_rows_total{{tool="{t}"}} {n}' for t, n in sorted(rows.items())),
+        "# HELP mcp_tool_latency_seconds MCP 툴 지연시간",
+        "# TYPE mcp_tool_latency_seconds histogram",
+    ]
+    for t in sorted(latency):
+        counts = latency[t]
+        for le, n in zip(LATENCY_BUCKETS, counts):
+            lines.append(f'mcp_tool_latency_seconds_bucket{{tool="{t}",le="{le}"}} {n}')
+        lines.append(f'mcp_tool_latency_seconds_bucket{{tool="{t}",le="+Inf"}} {counts[-1]}')
+        lines.append(f'mcp_tool_latency_seconds_sum{{tool="{t}"}} {latency_sum[t]:.6f}')
+        lines.append(f'mcp_tool_latency_seconds_count{{tool="{t}"}} {counts[-1]}')
+
+    for name, help_text, fn, metric_type in gauges:
+        try:
+            value = fn()
+        except Exception:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        samples = value if isinstance(value, list) else [({}, value)]
+        for labels, v in samples:
+            lines.append(f"{name}{_labels(labels)} {float(v):g}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    """카운터/히스토그램 초기화 (벤치마크 구간 분리용, 게이지는 유지)"""
+    with _LOCK:
+        for d in (_CALLS, _ERRORS, _ROWS, _LATENCY, _LATENCY_SUM):
+            d.clear()
+
+
+# 기본 게이지
+def _duckdb_pool(key: str):
+    from my_agent.utils.duckdb_swap import pool_stats
+    return pool_stats()[key]
+
+
+def _cache_entries():
+    from mcp import tools
+    store = tools._ARROW_STORE or {}
+    samples = [({"cache": "duckdb_tables"}, len(tools._DB_TABLES))]
+    if store:
+        samples.append(({"cache": "arrow_store_pos"}, len(store["store_pos"])))
+        samples.append(({"cache": "arrow_biz_pos"}, len(store["biz_pos"])))
+    from mcp import tools_weather
+    samples.append(({"cache": "weather_grid"}, tools_weather.grid_cache_stats()["entries"]))
+    search = _search_cache_stats()
+    if search:
+        samples.append(({"cache": "search_memory"}, search["memory"]))
+        samples.append(({"cache": "search_sqlite"}, search["sqlite"]))
+    return samples
+
+
+def _search_cache_stats():
+    from mcp import search_cache
+    return search_cache._CACHE.stats() if search_cache._CACHE is not None else None
+
+
+def _search_cache_lookups():
+    stats = _search_cache_stats() or {"hits": 0, "misses": 0}
+    return [({"result": "hit"}, stats["hits"]), ({"result": "miss"}, stats["misses"])]
+
+
+def _http_hosts(key: str):
+    from mcp import http_client
+    if http_client._CLIENT is None:
+        return []
+    return [({"host": host}, st[key]) for host, st in sorted(http_client._CLIENT.stats().items())]
+
+
+register_gauge("mcp_duckdb_connections", "공용 읽기 전용 DuckDB 연결 수", lambda: _duckdb_pool("connections"))
+register_gauge("mcp_duckdb_cursors", "스레드별 DuckDB 커서 수", lambda: _duckdb_pool("cursors"))
+register_gauge("mcp_cache_entries", "캐시 항목 수", _cache_entries)
+register_counter("mcp_search_cache_lookups_total", "웹 검색 캐시 조회 수 (프로세스 시작 이후)", _search_cache_lookups)
+register_gauge("mcp_http_inflight", "외부 API 진행 중 요청 수", lambda: _http_hosts("inflight"))
+register_gauge("mcp_http_circuit_open", "외부 API 서킷 브레이커 열림 여부 (1=열림)", lambda: _http_hosts("circuit_open"))
+
+
+# HTTP 노출
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_http_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """GET http://host:port/metrics (데몬 스레드, 프로세스 종료 시 함께 종료)"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mcp-metrics", daemon=True).start()
+    return server
@@ -1,7 +1,7 @@
 # mcp/tools.py 
 # -*- coding: utf-8 -*-
 """
-MCP 툴 함수 (DuckDB 기반)
+MCP 툴 함수 (DuckDB 기반, USE_DUCKDB=False → Arrow 메모리 맵 저장소)
 
 공통 매핑 컬럼: 기준년월, 업종, 상권_지리
 
@@ -9,6 +9,7 @@ MCP 툴 함수 (DuckDB 기반)
 - search_merchant(merchant_name): 가맹점명/ID 검색
 - load_store_data(store_id, latest_only): 가맹점 데이터 조회
 - load_bizarea_data(store_row, all_matches): 상권 데이터 조회
+- load_store_profile(store_id): 지표 빌더용 가맹점 프로필 1행 (store_profile 테이블)
 """
 
 from __future__ import annotations
@@ -16,82 +17,165 @@ import re
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Union
 
+import numpy as np
 import pandas as pd
 import duckdb
 
 from my_agent.utils.config import (
-    FRANCHISE_CSV, BIZ_AREA_CSV,
+    ARROW_DIR,
     DUCKDB_PATH, USE_DUCKDB
 )
+from my_agent.utils.duckdb_swap import readonly_connection, readonly_cursor
+from my_agent.utils.tracing import traced_cursor
+from my_agent.utils.log import get_logger, SAMPLED
+from mcp.kma_grid import to_grid
 
-# DuckDB 연결 (싱글턴)
+log = get_logger(__name__)
+
+# DuckDB 연결 (프로세스 공용, 파일이 원자적으로 교체되면 재연결 — 조회는 스레드별 커서)
 _DB_CONNECTION: Optional[duckdb.DuckDBPyConnection] = None
+_DB_TABLES: set = set()
 
 
 def _get_db_connection():
     """DuckDB 연결 획득"""
-    global _DB_CONNECTION
-    if _DB_CONNECTION is None:
-        db_path = Path(DUCKDB_PATH).expanduser()
-        if not db_path.exists():
-            raise FileNotFoundError(
-                f"❌ DuckDB 파일이 없습니다: {db_path}\n"
-                f"💡 data.duckdb를 다운받아 data 폴더에 넣으세요."
-            )
-        _DB_CONNECTION = duckdb.connect(str(db_path), read_only=True)
-    return _DB_CONNECTION
-
-
-# CSV 기반 로딩 (레거시 - USE_DUCKDB=False일 때만)
-_FRANCHISE_DF: Optional[pd.DataFrame] = None
-_BIZAREA_DF: Optional[pd.DataFrame] = None
-
-
-def _file_exists(path: str) -> bool:
-    return Path(path).exists() and Path(path).is_file()
-
-
-def _load_franchise_df() -> pd.DataFrame:
-    """가맹점 CSV 로드 (싱글턴 캐시)"""
-    global _FRANCHISE_DF
-    if _FRANCHISE_DF is None:
-        if not _file_exists(FRANCHISE_CSV):
-            raise FileNotFoundError(f"franchise CSV not found: {FRANCHISE_CSV}")
-        df = pd.read_csv(FRANCHISE_CSV)
-        for col in ["가맹점_구분번호", "가맹점명", "기준년월", "업종", "상권_지리"]:
-            if col in df.columns:
-                df[col] = df[col].astype(str)
-        _FRANCHISE_DF = df
-    return _FRANCHISE_DF
-
-
-def _load_bizarea_df() -> pd.DataFrame:
-    """상권 CSV 로드 (싱글턴 캐시)"""
-    global _BIZAREA_DF
-    if _BIZAREA_DF is None:
-        if not _file_exists(BIZ_AREA_CSV):
-            raise FileNotFoundError(f"biz area CSV not found: {BIZ_AREA_CSV}")
-        df = pd.read_csv(BIZ_AREA_CSV)
-        for col in ["기준년월", "상권_지리", "업종"]:
-            if col in df.columns:
-                df[col] = df[col].astype(str)
-        _BIZAREA_DF = df
-    return _BIZAREA_DF
+    global _DB_CONNECTION, _DB_TABLES
+    con = readonly_connection(DUCKDB_PATH)
+    if con is None:
+        raise FileNotFoundError(
+            f"❌ DuckDB 파일이 없습니다: {Path(DUCKDB_PATH).expanduser()}\n"
+            f"💡 data.duckdb를 다운받아 data 폴더에 넣으세요."
+        )
+    if con is not _DB_CONNECTION:
+        _DB_TABLES = {r[0] for r in con.cursor().execute("SELECT table_name FROM duckdb_tables()").fetchall()}
+        _DB_CONNECTION = con
+    # 동시 세션(스레드)은 같은 DB 인스턴스를 각자의 커서로 조회 (TRACE_ENABLED면 쿼리별 스팬)
+    return traced_cursor(readonly_cursor(DUCKDB_PATH))
+
+
+def _has_table(name: str) -> bool:
+    """현재 DB에 테이블 존재 여부 (다운로드 받은 구버전 DB에는 파생 테이블이 없을 수 있음)"""
+    _get_db_connection()
+    return name in _DB_TABLES
+
+
+def _to_yyyymm(value: Any) -> Optional[int]:
+    """기준년월 → 정수 YYYYMM (202401, '2024-01', '20240101' 모두 허용)"""
+    digits = re.sub(r"[^0-9]", "", str(value))
+    return int(digits[:6]) if len(digits) >= 6 else None
+
+
+# Arrow 메모리 맵 저장소 (USE_DUCKDB=False일 때만)
+# - scripts/build_arrow_store.py 가 만든 비압축 IPC 파일을 memory_map으로 0-copy 로드
+# - 프로세스 간 OS 페이지 캐시 공유, 호출마다 복사 없음 (slice/filter만 사용)
+_ARROW_STORE: Optional[Dict[str, Any]] = None
+
+
+def _open_arrow(name: str):
+    import pyarrow as pa
+    path = Path(ARROW_DIR).expanduser() / f"{name}.arrow"
+    if not path.exists():
+        raise FileNotFoundError(
+            f"❌ Arrow 저장소 파일이 없습니다: {path}\n"
+            f"💡 python scripts/build_arrow_store.py 를 먼저 실행하세요."
+        )
+    return pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+
+
+def _load_arrow_store() -> Dict[str, Any]:
+    """Arrow 저장소 로드 (싱글턴) + 오프셋 맵 dict 구성"""
+    global _ARROW_STORE
+    if _ARROW_STORE is None:
+        latest = _open_arrow("franchise_latest")
+        biz_index = _open_arrow("biz_area_index")
+        _ARROW_STORE = {
+            "franchise": _open_arrow("franchise"),
+            "latest": latest,
+            # 가맹점_구분번호 → (franchise_latest 행 번호, franchise 오프셋, 길이)
+            "store_pos": {
+                sid: (i, off, n)
+                for i, (sid, off, n) in enumerate(zip(
+                    latest.column("가맹점_구분번호").to_pylist(),
+                    latest.column("_offset").to_pylist(),
+                    latest.column("_length").to_pylist(),
+                ))
+            },
+            "biz_area": _open_arrow("biz_area"),
+            # (기준년월, 상권_지리, 업종) → (biz_area 오프셋, 길이)
+            "biz_pos": {
+                (yyyymm, geo, ind): (off, n)
+                for yyyymm, geo, ind, off, n in zip(*(biz_index.column(c).to_pylist() for c in (
+                    "기준년월", "상권_지리", "업종", "_offset", "_length"
+                )))
+            },
+        }
+    return _ARROW_STORE
+
+
+_MERCHANT_COLS = ["가맹점_구분번호", "가맹점명", "가맹점_주소", "업종", "상권_지리"]
+
+# 마스킹 검색용 가맹점명 정규화 (search_merchant / scripts/build_arrow_store.py 공용 — 두 저장소가 같은 결과)
+# 각 REGEXP_REPLACE는 첫 번째 일치만 치환 (기존 DuckDB 검색 결과 유지)
+NORM_NAME_SQL = r"""REGEXP_REPLACE(
+                      REGEXP_REPLACE(
+                        REGEXP_REPLACE(CAST(가맹점명 AS VARCHAR), '\s+', ''),
+                        '[()\{\}\[\]<>·•\-\_\/]', ''
+                      ),
+                      '점$', ''
+                    )"""
+
+
+def _arrow_merchants(table) -> List[Dict[str, Any]]:
+    cols = [c for c in _MERCHANT_COLS if c in table.column_names]
+    return [_to_serializable_row(r) for r in table.select(cols).to_pylist()]
+
+
+def _to_py(v: Any) -> Any:
+    """numpy/pandas 스칼라 → Python 기본형"""
+    if v is None or (not isinstance(v, (list, dict, str)) and pd.isna(v)):
+        return None
+    if isinstance(v, np.floating):
+        return float(v)
+    if isinstance(v, np.integer):
+        return int(v)
+    if isinstance(v, np.bool_):
+        return bool(v)
+    if isinstance(v, pd.Timestamp):
+        return v.isoformat()
+    return v
 
 
 def _to_serializable_row(row: Union[pd.Series, Dict[str, Any]]) -> Dict[str, Any]:
     """pandas Series/Dict → JSON 직렬화"""
-    if isinstance(row, dict):
-        return {k: (None if pd.isna(v) else v) for k, v in row.items()}
-    return {k: (None if pd.isna(v) else v) for k, v in row.to_dict().items()}
+    items = row.items() if isinstance(row, dict) else row.to_dict().items()
+    return {k: _to_py(v) for k, v in items}
+
+
+def _widen_float32(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    FLOAT(float32) 비율 컬럼 → float64 (build_duckdb 스키마)
+    - 그대로 to_dict하면 0.1164 → 0.11640000343322754 처럼 float32 오차가 결과에 노출됨
+    - float32 최단 표현(저장된 값)으로 복원 → CSV 원본 값과 같은 float64
+    """
+    cols = [c for c, t in df.dtypes.items() if t == np.float32]
+    if not cols:
+        return df
+    df = df.copy()
+    for c in cols:
+        df[c] = df[c].to_numpy().astype(str).astype(np.float64)
+    return df
 
 
 def _to_serializable_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
     """DataFrame → List[dict] 직렬화"""
     if df.empty:
         return []
-    df2 = df.where(pd.notna(df), None)
-    return df2.to_dict(orient="records")
+    return [_to_serializable_row(r) for r in _widen_float32(df).to_dict(orient="records")]
+
+
+def _first_record(df: pd.DataFrame) -> Dict[str, Any]:
+    """DataFrame 첫 행 → dict 직렬화 (iloc[0]은 dtype을 잃으므로 records 경로 사용)"""
+    return _to_serializable_records(df.head(1))[0]
 
 
 # 가맹점 검색
@@ -174,17 +258,11 @@ def search_merchant(merchant_name: str) -> Dict[str, Any]:
                 star_count = len(m.group(2))
                 mask_len = len(prefix_raw) + star_count
 
-                sql_base = r"""
+                sql_base = f"""
                 WITH base AS (
                   SELECT
                     가맹점_구분번호, 가맹점명, 가맹점_주소, 업종, 상권_지리, 기준년월,
-                    REGEXP_REPLACE(
-                      REGEXP_REPLACE(
-                        REGEXP_REPLACE(가맹점명, '\s+', ''),
-                        '[()\{\}\[\]<>·•\-\_\/]', ''
-                      ),
-                      '점$', ''
-                    ) AS norm_name
+                    {NORM_NAME_SQL} AS norm_name
                   FROM franchise
                 ),
                 dedup AS (
@@ -242,9 +320,8 @@ def search_merchant(merchant_name: str) -> Dict[str, Any]:
                     .to_dict("records")
                 ]
 
-                print(
-                    f"[DEBUG] {priority}: {len(merchants)}건 / prefix='{prefix_raw}', len={mask_len}"
-                )
+                log.debug("%s: %d건 / prefix=%r, len=%d", priority, len(merchants), prefix_raw, mask_len,
+                          extra=SAMPLED)
                 return {
                     "found": True,
                     "message": f"마스킹 '{q}' {priority} {len(merchants)}개",
@@ -294,13 +371,16 @@ def search_merchant(merchant_name: str) -> Dict[str, Any]:
         }
 
     # ─────────────────────────────────────
-    # 🧾 CSV 경로 (레거시)
+    # 🧾 Arrow 메모리 맵 경로 (가맹점별 최신 1행 테이블만 사용)
     # ─────────────────────────────────────
-    df = _load_franchise_df().copy()
+    import pyarrow.compute as pc
+
+    store = _load_arrow_store()
+    latest = store["latest"]
 
     if re.match(store_id_pattern, q.upper()):
-        hit = df[df["가맹점_구분번호"] == q.upper()].copy()
-        if hit.empty:
+        pos = store["store_pos"].get(q.upper())
+        if pos is None:
             return {
                 "found": False,
                 "message": f"가맹점_구분번호 '{q}'를 찾을 수 없습니다.",
@@ -309,25 +389,15 @@ def search_merchant(merchant_name: str) -> Dict[str, Any]:
                 "search_type": "id",
             }
 
-        hit = (
-            hit.sort_values("기준년월", ascending=False)
-            .drop_duplicates(subset=["가맹점_구분번호"], keep="first")
-        )
-        merchants = [
-            {k: _to_py(v) for k, v in row.items()}
-            for row in hit[
-                ["가맹점_구분번호", "가맹점명", "가맹점_주소", "업종", "상권_지리"]
-            ].to_dict("records")
-        ]
         return {
             "found": True,
             "message": f"가맹점_구분번호 '{q}' 조회 성공",
             "count": 1,
-            "merchants": merchants,
+            "merchants": _arrow_merchants(latest.slice(pos[0], 1)),
             "search_type": "id",
         }
 
-    # 마스킹 (CSV 모드)
+    # 마스킹 (norm_name은 빌드 시 계산됨)
     if "*" in q:
         m = re.match(r"^([^\*]*)(\*+)$", q)
         if m:
@@ -335,48 +405,33 @@ def search_merchant(merchant_name: str) -> Dict[str, Any]:
             star_count = len(m.group(2))
             mask_len = len(prefix_raw) + star_count
 
-            df["norm_name"] = (
-                df["가맹점명"]
-                .astype(str)
-                .str.replace(r"\s+", "", regex=True)
-                .str.replace(r"[()\{\}\[\]<>·•\-\_\/]", "", regex=True)
-                .str.replace(r"점$", "", regex=True)
-            )
-
-            df_exact = df[
-                (df["norm_name"].str.len() == mask_len)
-                & (df["norm_name"].str.startswith(prefix_raw, na=False))
-            ]
-            df_relaxed = df[df["norm_name"].str.startswith(prefix_raw, na=False)]
+            norm = latest.column("norm_name")
+            prefix_hit = pc.fill_null(pc.starts_with(norm, prefix_raw), False)
+            df_exact = latest.filter(pc.and_(prefix_hit, pc.equal(pc.utf8_length(norm), mask_len)))
 
-            if not df_exact.empty:
-                hit = df_exact
+            if df_exact.num_rows:
+                hit = df_exact.sort_by("가맹점명")
                 priority = "정확매칭"
-            elif not df_relaxed.empty:
-                hit = df_relaxed
-                priority = "확장매칭"
             else:
-                return {
-                    "found": False,
-                    "message": f"마스킹 '{q}'로 일치/유사한 가맹점을 찾을 수 없습니다.",
-                    "count": 0,
-                    "merchants": [],
-                    "search_type": "name",
-                }
+                relaxed = latest.filter(prefix_hit)
+                if not relaxed.num_rows:
+                    return {
+                        "found": False,
+                        "message": f"마스킹 '{q}'로 일치/유사한 가맹점을 찾을 수 없습니다.",
+                        "count": 0,
+                        "merchants": [],
+                        "search_type": "name",
+                    }
+                order = pc.sort_indices(
+                    relaxed.append_column("_len", pc.utf8_length(relaxed.column("norm_name"))),
+                    sort_keys=[("_len", "ascending"), ("가맹점명", "ascending")],
+                )
+                hit = relaxed.take(order)
+                priority = "확장매칭"
 
-            hit = (
-                hit.sort_values("기준년월", ascending=False)
-                .drop_duplicates(subset=["가맹점_구분번호"], keep="first")
-            )
-            merchants = [
-                {k: _to_py(v) for k, v in row.items()}
-                for row in hit[
-                    ["가맹점_구분번호", "가맹점명", "가맹점_주소", "업종", "상권_지리"]
-                ].to_dict("records")
-            ]
-            print(
-                f"[DEBUG] (CSV) {priority}: {len(merchants)}건 / prefix='{prefix_raw}', len={mask_len}"
-            )
+            merchants = _arrow_merchants(hit)
+            log.debug("(Arrow) %s: %d건 / prefix=%r, len=%d", priority, len(merchants), prefix_raw, mask_len,
+                      extra=SAMPLED)
             return {
                 "found": True,
                 "message": f"마스킹 '{q}' {priority} {len(merchants)}개",
@@ -385,10 +440,10 @@ def search_merchant(merchant_name: str) -> Dict[str, Any]:
                 "search_type": "name",
             }
 
-    # C) 일반 LIKE
-    mask = df["가맹점명"].str.contains(q, case=False, na=False)
-    hit = df[mask].copy()
-    if hit.empty:
+    # C) 일반 부분검색
+    mask = pc.fill_null(pc.match_substring(latest.column("가맹점명"), q, ignore_case=True), False)
+    hit = latest.filter(mask)
+    if not hit.num_rows:
         return {
             "found": False,
             "message": f"'{q}'와 일치하는 가맹점이 없습니다.",
@@ -397,16 +452,7 @@ def search_merchant(merchant_name: str) -> Dict[str, Any]:
             "search_type": "name",
         }
 
-    hit = (
-        hit.sort_values("기준년월", ascending=False)
-        .drop_duplicates(subset=["가맹점_구분번호"], keep="first")
-    )
-    merchants = [
-        {k: _to_py(v) for k, v in row.items()}
-        for row in hit.head(50)[
-            ["가맹점_구분번호", "가맹점명", "가맹점_주소", "업종", "상권_지리"]
-        ].to_dict("records")
-    ]
+    merchants = _arrow_merchants(hit.sort_by("가맹점명").slice(0, 50))
     return {
         "found": True,
         "message": f"'{q}' 검색 결과 {len(merchants)}개",
@@ -436,12 +482,16 @@ def load_store_data(store_id: str, latest_only: bool = True) -> Dict[str, Any]:
         con = _get_db_connection()
         
         if latest_only:
-            query = """
-            SELECT * FROM franchise
-            WHERE 가맹점_구분번호 = ?
-            ORDER BY 기준년월 DESC
-            LIMIT 1
-            """
+            # 파생 테이블(franchise_latest) 우선 → 없으면 전체 이력에서 최신 1건
+            if _has_table("franchise_latest"):
+                query = "SELECT * FROM franchise_latest WHERE 가맹점_구분번호 = ?"
+            else:
+                query = """
+                SELECT * FROM franchise
+                WHERE 가맹점_구분번호 = ?
+                ORDER BY 기준년월 DESC
+                LIMIT 1
+                """
             result = con.execute(query, [sid]).fetchdf()
             
             if result.empty:
@@ -449,7 +499,7 @@ def load_store_data(store_id: str, latest_only: bool = True) -> Dict[str, Any]:
             
             return {
                 "success": True,
-                "data": result.iloc[0].to_dict(),
+                "data": _first_record(result),
                 "error": None
             }
         else:
@@ -465,34 +515,29 @@ def load_store_data(store_id: str, latest_only: bool = True) -> Dict[str, Any]:
             
             return {
                 "success": True,
-                "data": result.to_dict("records"),
+                "data": _to_serializable_records(result),
                 "error": None
             }
     
-    # CSV 사용 (레거시)
+    # Arrow 메모리 맵 사용 (오프셋 맵으로 가맹점 행 구간만 slice)
     else:
-        df = _load_franchise_df()
-        
-        if "가맹점_구분번호" not in df.columns:
-            return {"success": False, "data": None, "error": "컬럼 '가맹점_구분번호' 없음"}
-        
-        store_df = df[df["가맹점_구분번호"] == sid].copy()
-        if store_df.empty:
+        store = _load_arrow_store()
+        pos = store["store_pos"].get(sid)
+        if pos is None:
             return {"success": False, "data": None, "error": f"store_id {sid} not found"}
-        
-        if "기준년월" in store_df.columns:
-            store_df = store_df.sort_values("기준년월")
-        
+
+        _, offset, length = pos
+        rows = store["franchise"].slice(offset, length)  # 기준년월 오름차순
         if latest_only:
             return {
                 "success": True,
-                "data": _to_serializable_row(store_df.iloc[-1]),
+                "data": _to_serializable_row(rows.slice(length - 1, 1).to_pylist()[0]),
                 "error": None
             }
         else:
             return {
                 "success": True,
-                "data": _to_serializable_records(store_df),
+                "data": [_to_serializable_row(r) for r in rows.to_pylist()],
                 "error": None
             }
 
@@ -501,14 +546,15 @@ def load_store_data(store_id: str, latest_only: bool = True) -> Dict[str, Any]:
 def load_bizarea_data(store_row: Dict[str, Any], all_matches: bool = False) -> Dict[str, Any]:
     """상권 데이터 조회
     - DuckDB: 조건 일치 행 전부(or 1건) 반환. (상권_코드 컬럼 의존 제거)
-    - CSV  : 정확 매칭 실패 확률 0 → 항상 단건 반환 (all_matches 무시)
+    - Arrow: (기준년월, 상권_지리, 업종) 오프셋 맵으로 해당 구간만 slice
     """
     required = ["기준년월", "업종", "상권_지리"]
     missing = [k for k in required if k not in store_row or not store_row.get(k)]
     if missing:
         return {"success": False, "data": None, "error": f"필수 키 누락: {', '.join(missing)}"}
 
-    yyyymm = str(store_row["기준년월"])
+    # 조인 키: 기준년월은 정수 YYYYMM, 업종/상권_지리는 ENUM과 비교
+    yyyymm = _to_yyyymm(store_row["기준년월"])
     area_geo = str(store_row["상권_지리"])
     industry = str(store_row["업종"])
 
@@ -525,7 +571,7 @@ def load_bizarea_data(store_row: Dict[str, Any], all_matches: bool = False) -> D
             df = con.execute(query, params).fetchdf()
             if df.empty:
                 return {"success": False, "data": None, "error": "상권 데이터 없음"}
-            return {"success": True, "data": df.to_dict("records"), "error": None}
+            return {"success": True, "data": _to_serializable_records(df), "error": None}
         else:
             # 단건만 필요 → LIMIT 1 (중복 제거/정렬 불필요)
             query = """
@@ -538,22 +584,101 @@ def load_bizarea_data(store_row: Dict[str, Any], all_matches: bool = False) -> D
             df = con.execute(query, params).fetchdf()
             if df.empty:
                 return {"success": False, "data": None, "error": "상권 데이터 없음"}
-            return {"success": True, "data": df.iloc[0].to_dict(), "error": None}
-
-    # CSV 분기: 정확 매칭 실패 확률 0 → 항상 단건 반환
-    # all_matches 인자는 무시(하위호환 위해 유지)
-    df_biz = _load_bizarea_df()
-    hit = df_biz[
-        (df_biz["기준년월"] == yyyymm) &
-        (df_biz["상권_지리"] == area_geo) &
-        (df_biz["업종"] == industry)
-    ].copy()
-
-    if hit.empty:
+            return {"success": True, "data": _first_record(df), "error": None}
+
+    # Arrow 분기: 조인 키 오프셋 맵으로 조회
+    store = _load_arrow_store()
+    pos = store["biz_pos"].get((yyyymm, area_geo, industry))
+    if pos is None:
         return {"success": False, "data": None, "error": "bizarea not found"}
 
-    # 정렬 불필요, 상권_코드도 없음 → 첫 행만 직 반환
-    return {"success": True, "data": _to_serializable_row(hit.iloc[0]), "error": None}
+    offset, length = pos
+    rows = store["biz_area"].slice(offset, length if all_matches else 1).to_pylist()
+    if all_matches:
+        return {"success": True, "data": [_to_serializable_row(r) for r in rows], "error": None}
+    return {"success": True, "data": _to_serializable_row(rows[0]), "error": None}
+
+
+# 지표 빌더용 가맹점 프로필 (store_profile)
+# my_agent/metrics/* 빌더가 읽는 컬럼만 — 빌더에 컬럼을 추가하면 여기도 함께 추가 후 build_duckdb.py 재실행
+STORE_PROFILE_COLUMNS = [
+    "가맹점_구분번호", "기준년월", "업종", "상권", "상권_지리", "위도", "경도", "kma_nx", "kma_ny",
+    "핵심고객_1순위", "핵심고객_2순위", "핵심고객_3순위",
+    "거주고객_비중", "직장고객_비중", "유동인구고객_비중",
+    "배달매출_비중", "신규손님_비중", "단골손님_비중",
+    "매출금액_구간", "취소율_구간", "이동성_적합도", "연령대_적합도",
+    "동일_업종_매출금액_비율", "동일_업종_매출건수_비율",
+    "동일_업종_내_매출_순위_비율", "동일_상권_내_매출_순위_비율",
+    "동일_업종_내_해지_가맹점_비중", "동일_상권_내_해지_가맹점_비중",
+    "업종매출지수_백분위", "업종건수지수_백분위", "배달비중_백분위",
+    "업종매출_편차", "업종건수_편차",
+    "단골비중_차이_pp", "신규비중_차이_pp", "배달매출비중_차이_pp",
+    "단골비중_YoY_pp", "신규비중_YoY_pp", "배달비중_YoY_pp",
+    "단골비중_3개월_순증감_pp", "단골비중_3개월_추세_pp_per_m", "신규비중_3개월_추세_pp_per_m",
+]
+# 같은 기준년월/상권_지리/업종의 biz_area 컬럼 (테이블에는 STORE_PROFILE_AREA_PREFIX를 붙여 저장)
+STORE_PROFILE_AREA_COLUMNS = [
+    "상권_지리", "평균거래단가", "점포_수", "유사_업종_점포_수", "폐업_률",
+    "총_유동인구_수", "남성_유동인구_수", "여성_유동인구_수", "총_상주인구_수", "총_직장_인구_수",
+    "월_평균_소득_금액", "주중_매출_금액", "주말_매출_금액", "주력_연령대",
+    "피크_요일", "피크_시간대", "상권활력_지수", "접근성_점수", "매출_YoY", "유동인구_YoY",
+    "시간대_건수~06_매출_건수", "시간대_건수~11_매출_건수", "시간대_건수~14_매출_건수",
+    "시간대_건수~17_매출_건수", "시간대_건수~21_매출_건수", "시간대_건수~24_매출_건수",
+]
+STORE_PROFILE_AREA_PREFIX = "상권단위_"
+
+
+def _profile_data(store: Dict[str, Any], area: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    두 경로(store_profile / 폴백) 공통 투영 — 항상 같은 키 집합
+    - store: STORE_PROFILE_COLUMNS (없는 컬럼은 None)
+    - kma_nx/kma_ny가 없으면(구버전 DB / Arrow) 위도·경도로 격자 계산
+    - bizarea: STORE_PROFILE_AREA_COLUMNS (상권 매칭 없으면 None)
+    """
+    profile = {c: store.get(c) for c in STORE_PROFILE_COLUMNS}
+    if profile["kma_nx"] is None or profile["kma_ny"] is None:
+        grid = to_grid(profile["위도"], profile["경도"])
+        if grid is not None:
+            profile["kma_nx"], profile["kma_ny"] = grid
+    return {
+        "store": profile,
+        "bizarea": {c: area.get(c) for c in STORE_PROFILE_AREA_COLUMNS} if area else None,
+    }
+
+
+def _split_profile_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """store_profile 1행 → {"store": 가맹점 컬럼, "bizarea": 상권 컬럼 (매칭 없으면 None)}"""
+    n = len(STORE_PROFILE_AREA_PREFIX)
+    area = {k[n:]: v for k, v in row.items() if k.startswith(STORE_PROFILE_AREA_PREFIX)}
+    return _profile_data(row, area if row.get("has_bizarea") else None)
+
+
+def load_store_profile(store_id: str) -> Dict[str, Any]:
+    """
+    지표 빌더용 가맹점 프로필 1행 조회
+    - store_profile: 가맹점별 최신 1행 중 빌더가 쓰는 컬럼 + 같은 기준년월 상권 컬럼 (빌드 시 사전 조인)
+    - store_profile이 없는 구버전 DB / Arrow 저장소면 load_store_data + load_bizarea_data 결과를 같은 컬럼으로 투영
+      (두 경로 모두 같은 키, 격자가 없으면 좌표로 계산 → SEASON이 호출마다 변환하지 않음)
+
+    Returns:
+        {"success": bool, "data": {"store": dict, "bizarea": dict or None}, "error": str or None}
+    """
+    sid = str(store_id)
+
+    if USE_DUCKDB and _has_table("store_profile"):
+        con = _get_db_connection()
+        df = con.execute("SELECT * FROM store_profile WHERE 가맹점_구분번호 = ?", [sid]).fetchdf()
+        if df.empty:
+            return {"success": False, "data": None, "error": f"가맹점 {sid} 없음"}
+        return {"success": True, "data": _split_profile_row(_first_record(df)), "error": None}
+
+    res_store = load_store_data(sid, latest_only=True)
+    if not res_store.get("success"):
+        return res_store
+    row = res_store["data"]
+    res_biz = load_bizarea_data(row)
+    area = res_biz["data"] if res_biz.get("success") else None
+    return {"success": True, "data": _profile_data(row, area), "error": None}
 
 
 def find_cooperation_candidates(area_geo: str, industry: str, main_customers: List[str], limit: int = 10) -> Dict[str, Any]:
@@ -570,7 +695,8 @@ def find_cooperation_candidates(area_geo: str, industry: str, main_customers: Li
     Returns:
         {"success": bool, "count": int, "candidates": List[dict], "error": str or None}
     """
-    print(f"[DEBUG] find_cooperation_candidates called with area_geo={area_geo}, industry={industry}, main_customers={main_customers}, limit={limit}")
+    log.debug("find_cooperation_candidates(area_geo=%s, industry=%s, main_customers=%s, limit=%s)",
+              area_geo, industry, main_customers, limit, extra=SAMPLED)
     if not area_geo or not industry or not main_customers:
         return {
             "success": False,
@@ -597,14 +723,12 @@ def find_cooperation_candidates(area_geo: str, industry: str, main_customers: Li
         ORDER BY 기준년월 DESC
         LIMIT {limit}
     """
-    print("[DEBUG] SQL Query:")
-    print(query)
     try:
         df = con.execute(query).fetchdf()
         if df.empty:
             return {"success": True, "count": 0, "candidates": [], "error": None}
         
-        return {"success": True, "count": len(df), "candidates": df.to_dict("records"), "error": None}
+        return {"success": True, "count": len(df), "candidates": _to_serializable_records(df), "error": None}
     except Exception as e:
 
         return {"success": False, "count": 0, "candidates": [], "error": str(e)}
\ No newline at end of file
@@ -2,120 +2,350 @@
 # -*- coding: utf-8 -*-
 """
 기상청 단기예보 API MCP 툴 (APIHub 버전)
-- 입력: 위도(lat), 경도(lon)
-- 출력: 향후 n일간의 기온/강수 데이터 (사람이 읽기 좋은 형식)
+- 입력: 기상청 격자(nx, ny — franchise_latest.kma_nx / kma_ny) 또는 위도(lat), 경도(lon)
+- 출력: 향후 n일간의 기온/강수 요약 + 시간별 데이터 (사람이 읽기 좋은 형식)
+- 파싱: item 목록을 1회 순회해 시간별 배열(HourlyForecast)로 보관 (DataFrame/pivot 없음)
+
+격자 캐시:
+- 키 (nx, ny, base_date, base_time) — 같은 5km 격자의 매장은 하루 동안 같은 예보를 받음
+- 만료: 다음 발표 자료 제공 시각(05:10), 이전 발표로 폴백한 결과는 WEATHER_CACHE_RETRY_S 후 재조회
+- 같은 격자 동시 조회는 1건만 API 호출 (나머지는 결과 대기)
+- start_prefetcher(): 매장이 있는 전체 격자(kma_grid_cells)를 백그라운드로 선조회 (발표 시각마다 갱신)
 """
-import requests
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
 import pandas as pd
 from datetime import datetime, timedelta
-from my_agent.utils.config import WEATHER_API_KEY  # APIHub 발급키 사용
+from my_agent.utils.config import (
+    WEATHER_API_KEY,  # APIHub 발급키 사용
+    KMA_URL,
+    WEATHER_PREFETCH,
+    WEATHER_PREFETCH_WORKERS,
+    WEATHER_CACHE_RETRY_S,
+)
+from my_agent.utils.log import get_logger
+from .http_client import get_http_client, HttpError
+from .kma_grid import latlon_to_grid, to_grid
 
-URL = "https://apihub.kma.go.kr/api/typ02/openApi/VilageFcstInfoService_2.0/getVilageFcst"
+log = get_logger(__name__)
+
+URL = KMA_URL
 
 
 # 내부 유틸
-def _convert_latlon_to_grid(lat: float, lon: float):
-    """위도·경도 -> 기상청 격자 좌표 변환"""
-    import math
-    RE = 6371.00877
-    GRID = 5.0
-    SLAT1 = 30.0
-    SLAT2 = 60.0
-    OLON = 126.0
-    OLAT = 38.0
-    XO = 43
-    YO = 136
-
-    DEGRAD = math.pi / 180.0
-    re = RE / GRID
-    slat1 = SLAT1 * DEGRAD
-    slat2 = SLAT2 * DEGRAD
-    olon = OLON * DEGRAD
-    olat = OLAT * DEGRAD
-
-    sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(
-        math.tan(math.pi / 4.0 + slat2 / 2.0) / math.tan(math.pi / 4.0 + slat1 / 2.0)
-    )
-    sf = math.tan(math.pi / 4.0 + slat1 / 2.0) ** sn * math.cos(slat1) / sn
-    ro = re * sf / (math.tan(math.pi / 4.0 + olat / 2.0) ** sn)
+def _base_times(now: datetime):
+    """조회할 발표시각 후보 — 당일 05시 발표(05:10 이후 제공) → 실패 시 전날 23시 발표로 폴백"""
+    yesterday = (now - timedelta(days=1)).strftime("%Y%m%d")
+    if now.hour * 100 + now.minute >= 510:
+        return [(now.strftime("%Y%m%d"), "0500"), (yesterday, "2300")]
+    return [(yesterday, "2300")]
 
-    ra = re * sf / (math.tan(math.pi / 4.0 + lat * DEGRAD / 2.0) ** sn)
-    theta = lon * DEGRAD - olon
-    if theta > math.pi:
-        theta -= 2.0 * math.pi
-    if theta < -math.pi:
-        theta += 2.0 * math.pi
-    theta *= sn
 
-    x = int(ra * math.sin(theta) + XO + 0.5)
-    y = int(ro - ra * math.cos(theta) + YO + 0.5)
-    return x, y
+def _next_publication(now: datetime) -> datetime:
+    """다음 05시 발표 자료 제공 시각 (이 시각부터 _base_times 첫 후보가 바뀜)"""
+    t = now.replace(hour=5, minute=10, second=0, microsecond=0)
+    return t if now < t else t + timedelta(days=1)
 
 
-# 메인 함수
-def get_weather_forecast(lat: float, lon: float, days: int = 3):
-    """기상청 APIHub 단기예보 조회"""
+def _fetch_items(nx: int, ny: int, base_date: str, base_time: str, meta: dict):
+    """단기예보 item 목록 (결과코드 오류 / 빈 응답이면 ValueError, 재시도 횟수는 meta에 누적)"""
+    params = {
+        "authKey": WEATHER_API_KEY,
+        "numOfRows": "300",
+        "pageNo": "1",
+        "dataType": "JSON",
+        "base_date": base_date,
+        "base_time": base_time,
+        "nx": nx,
+        "ny": ny,
+    }
     try:
-        nx, ny = _convert_latlon_to_grid(lat, lon)
-        base_date = datetime.today().strftime("%Y%m%d")
-        base_time = "0500"
-
-        params = {
-            "authKey": WEATHER_API_KEY,
-            "numOfRows": "300",
-            "pageNo": "1",
-            "dataType": "JSON",
-            "base_date": base_date,
-            "base_time": base_time,
-            "nx": nx,
-            "ny": ny,
-        }
+        res, http_meta = get_http_client().request("GET", URL, params=params, timeout=10, deadline=15)
+    except HttpError as e:
+        meta["retry_count"] += e.meta.get("retry_count", 0)
+        raise
+    meta["retry_count"] += http_meta["retry_count"]
+    res.raise_for_status()
+    response = res.json().get("response") or {}
+    code = (response.get("header") or {}).get("resultCode", "00")
+    if code != "00":
+        raise ValueError(f"결과코드 {code} (base={base_date} {base_time})")
+    body = response.get("body") or {}
+    items = (body.get("items") or {}).get("item") or []
+    if not items:
+        raise ValueError(f"예보 없음 (base={base_date} {base_time})")
+    return items
+
+
+def _grid_forecast(nx: int, ny: int, meta: dict) -> "HourlyForecast":
+    """격자 1개의 시간별 예보 (days 필터 전) — 발표시각 후보를 차례로 조회"""
+    items, error = None, None
+    for i, (base_date, base_time) in enumerate(_base_times(datetime.now())):
+        try:
+            items = _fetch_items(nx, ny, base_date, base_time, meta)
+            meta.update(base_date=base_date, base_time=base_time, fallback_used=i > 0)
+            break
+        except HttpError as e:
+            error = e
+            if e.meta.get("circuit_open"):
+                break
+        except ValueError as e:
+            error = e
+    if items is None:
+        raise error
+
+    return _parse_items(items)
+
+
+# 예보 파싱 (item 목록 → 시간별 배열, 1회 순회)
+PTY_TEXT = {
+    "0": "없음",
+    "1": "비",
+    "2": "비/눈",
+    "3": "눈",
+    "5": "빗방울",
+    "6": "빗방울/눈날림",
+    "7": "눈날림",
+}
+_CATEGORIES = ("TMP", "TMN", "TMX", "PTY")
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """예보값 → float (기상청 결측값 ±900 이상은 None)"""
+    try:
+        v = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if abs(v) >= 900 else v
 
-        res = requests.get(URL, params=params, timeout=10)
-        res.raise_for_status()
-
-        items = res.json()["response"]["body"]["items"]["item"]
-        df = pd.DataFrame(items)
-
-        df = df[df["category"].isin(["TMP", "TMN", "TMX", "PTY"])]
-        df["fcstDateTime"] = pd.to_datetime(df["fcstDate"] + df["fcstTime"], format="%Y%m%d%H%M")
-
-        df_pivot = df.pivot_table(index="fcstDateTime", columns="category", values="fcstValue", aggfunc="first")
-        df_pivot.reset_index(inplace=True)
-
-        # 컬럼 변경
-        df_pivot.rename(
-            columns={
-                "TMP": "기온(℃)",
-                "TMN": "최저기온(℃)",
-                "TMX": "최고기온(℃)",
-                "PTY": "강수형태코드",
-            },
-            inplace=True,
-        )
-
-        # 강수형태 코드 -> 텍스트 변환
-        pty_map = {
-            "0": "없음",
-            "1": "비",
-            "2": "비/눈",
-            "3": "눈",
-            "5": "빗방울",
-            "6": "빗방울/눈날림",
-            "7": "눈날림",
+
+class HourlyForecast:
+    """격자 1개의 시간별 예보 (시각 오름차순 배열, 없는 항목은 None)"""
+
+    __slots__ = ("times", "tmp", "tmn", "tmx", "pty")
+
+    def __init__(self, times, tmp, tmn, tmx, pty):
+        self.times: List[datetime] = times
+        self.tmp: List[Optional[float]] = tmp
+        self.tmn: List[Optional[float]] = tmn
+        self.tmx: List[Optional[float]] = tmx
+        self.pty: List[Optional[str]] = pty
+
+    def until(self, end: datetime) -> int:
+        """end 이전 시각 개수 (days 필터)"""
+        return bisect_left(self.times, end)
+
+    def summary(self, n: int) -> Dict[str, Any]:
+        """앞 n시간 요약: 평균/최저/최고 기온, 강수 시간 수, 날씨 추세"""
+        temps = [t for t in self.tmp[:n] if t is not None]
+        lows = [t for t in self.tmn[:n] if t is not None]
+        highs = [t for t in self.tmx[:n] if t is not None]
+        rain_hours = sum(1 for c in self.pty[:n] if c is not None and c != "0")
+        return {
+            "시간수": n,
+            "평균기온": round(sum(temps) / len(temps), 1) if temps else None,
+            "최저기온": min(lows or temps) if (lows or temps) else None,
+            "최고기온": max(highs or temps) if (highs or temps) else None,
+            "강수시간수": rain_hours,
+            "날씨추세": "맑음 유지" if rain_hours == 0 else "간헐적 비" if rain_hours < 4 else "비 많음",
         }
-        df_pivot["강수형태"] = df_pivot["강수형태코드"].map(pty_map).fillna("정보없음")
 
-        df_pivot = df_pivot[df_pivot["fcstDateTime"] < (datetime.now() + timedelta(days=days))]
-        df_pivot.sort_values("fcstDateTime", inplace=True)
+    def records(self, n: int) -> List[Dict[str, Any]]:
+        """기존 pivot 레코드 형식 (fcstDateTime + 기온/최저/최고 + 강수형태코드/강수형태)"""
+        out = []
+        for i in range(n):
+            code = self.pty[i]
+            out.append({
+                "fcstDateTime": pd.Timestamp(self.times[i]),
+                "강수형태코드": code,
+                "최저기온(℃)": self.tmn[i],
+                "기온(℃)": self.tmp[i],
+                "최고기온(℃)": self.tmx[i],
+                "강수형태": PTY_TEXT.get(code, "정보없음"),
+            })
+        return out
+
+
+def _parse_items(items: List[Dict[str, Any]]) -> HourlyForecast:
+    """TMP/TMN/TMX/PTY만 시각별로 모아 배열화 (DataFrame / pivot 없이)"""
+    hours: Dict[str, list] = {}
+    for it in items:
+        category = it.get("category")
+        if category not in _CATEGORIES:
+            continue
+        slot = hours.get(it["fcstDate"] + it["fcstTime"])
+        if slot is None:
+            slot = hours[it["fcstDate"] + it["fcstTime"]] = [None, None, None, None]
+        value = it.get("fcstValue")
+        if category == "PTY":
+            slot[3] = str(value) if value is not None else None
+        else:
+            slot[_CATEGORIES.index(category)] = _to_float(value)
+
+    keys = sorted(hours)
+    return HourlyForecast(
+        times=[datetime.strptime(k, "%Y%m%d%H%M") for k in keys],
+        tmp=[hours[k][0] for k in keys],
+        tmn=[hours[k][1] for k in keys],
+        tmx=[hours[k][2] for k in keys],
+        pty=[hours[k][3] for k in keys],
+    )
+
+
+# 격자 캐시
+GridKey = Tuple[int, int, str, str]
+
+_GRID_CACHE: Dict[GridKey, Tuple[float, HourlyForecast, dict]] = {}   # key → (만료 epoch, 예보, meta)
+_GRID_LOCK = threading.Lock()
+_INFLIGHT: Dict[GridKey, threading.Lock] = {}
+
+
+def _grid_key(nx: int, ny: int, now: datetime) -> GridKey:
+    base_date, base_time = _base_times(now)[0]
+    return nx, ny, base_date, base_time
+
+
+def _cached_grid_forecast(nx: int, ny: int, meta: dict) -> Tuple[HourlyForecast, bool]:
+    """(예보, 캐시 적중 여부) — 미적중 시 같은 격자 요청은 1건만 조회, 발표시각/재시도는 meta에 기록"""
+    now = datetime.now()
+    key = _grid_key(nx, ny, now)
+    entry = _GRID_CACHE.get(key)
+    if entry is not None and entry[0] > time.time():
+        meta.update(entry[2], retry_count=0)
+        return entry[1], True
+
+    with _GRID_LOCK:
+        lock = _INFLIGHT.setdefault(key, threading.Lock())
+    with lock:
+        entry = _GRID_CACHE.get(key)
+        if entry is not None and entry[0] > time.time():
+            meta.update(entry[2], retry_count=0)
+            return entry[1], True
+
+        try:
+            forecast = _grid_forecast(nx, ny, meta)
+            expires = _next_publication(now).timestamp()
+            if meta["fallback_used"]:
+                expires = min(expires, time.time() + WEATHER_CACHE_RETRY_S)
+            with _GRID_LOCK:
+                t = time.time()
+                for k in [k for k, v in _GRID_CACHE.items() if v[0] <= t]:
+                    del _GRID_CACHE[k]
+                _GRID_CACHE[key] = (expires, forecast, dict(meta))
+        finally:
+            with _GRID_LOCK:
+                _INFLIGHT.pop(key, None)
+        return forecast, False
+
+
+def grid_cache_stats() -> Dict[str, int]:
+    """격자 캐시 항목 수 — 메트릭용"""
+    t = time.time()
+    with _GRID_LOCK:
+        live = sum(1 for v in _GRID_CACHE.values() if v[0] > t)
+    return {"entries": live, "inflight": len(_INFLIGHT)}
+
+
+# 메인 함수
+def get_weather_forecast(lat: Optional[float] = None, lon: Optional[float] = None, days: int = 3,
+                         nx: Optional[int] = None, ny: Optional[int] = None, include_records: bool = True):
+    """
+    기상청 APIHub 단기예보 조회 (격자 캐시 경유, 격자가 주어지면 좌표 변환 생략)
+
+    Returns:
+        summary: 평균/최저/최고 기온, 강수시간수, 날씨추세 (향후 days일)
+        data   : 시간별 레코드 (include_records=False면 빈 목록)
+    """
+    meta = {"retry_count": 0, "fallback_used": False}
+    try:
+        if nx is None or ny is None:
+            grid = to_grid(lat, lon)
+            if grid is None:
+                raise ValueError(f"기상청 격자로 변환할 수 없는 좌표: lat={lat}, lon={lon}")
+            nx, ny = grid
+        nx, ny = int(nx), int(ny)
+        forecast, cache_hit = _cached_grid_forecast(nx, ny, meta)
+        n = forecast.until(datetime.now() + timedelta(days=days))
 
         return {
             "success": True,
-            "count": len(df_pivot),
-            "data": df_pivot.to_dict(orient="records"),
-            "message": f"{len(df_pivot)} forecast entries retrieved",
+            "count": n,
+            "summary": forecast.summary(n),
+            "data": forecast.records(n) if include_records else [],
+            "message": f"{n} forecast entries retrieved",
+            "cache_hit": cache_hit,
+            "meta": meta,
         }
 
     except Exception as e:
-        return {"success": False, "count": 0, "data": [], "message": str(e)}
+        return {"success": False, "count": 0, "summary": None, "data": [], "message": str(e), "meta": meta}
+
+
+# 선조회 (전체 매장 격자)
+def _store_grid_cells() -> Set[Tuple[int, int]]:
+    """매장이 있는 격자 목록 (kma_grid_cells 파생 테이블, 구버전 DB면 매장 좌표를 변환)"""
+    from mcp.tools import _get_db_connection, _has_table
+
+    con = _get_db_connection()
+    if _has_table("kma_grid_cells"):
+        return {(int(x), int(y)) for x, y in con.execute("SELECT kma_nx, kma_ny FROM kma_grid_cells").fetchall()}
+
+    coords = con.execute("SELECT DISTINCT 위도, 경도 FROM franchise").fetchdf()
+    nx, ny = latlon_to_grid(coords["위도"].to_numpy(dtype="float64", na_value=float("nan")),
+                            coords["경도"].to_numpy(dtype="float64", na_value=float("nan")))
+    ok = ~(pd.isna(nx) | pd.isna(ny))
+    return set(zip(nx[ok].astype(int).tolist(), ny[ok].astype(int).tolist()))
+
+
+def prefetch_grid_cells(cells: Optional[Set[Tuple[int, int]]] = None,
+                        workers: int = WEATHER_PREFETCH_WORKERS) -> Dict[str, Any]:
+    """격자 예보 일괄 조회 → 캐시 적재 (이미 유효한 항목은 건너뜀)"""
+    cells = _store_grid_cells() if cells is None else cells
+    t0 = time.time()
+    counts = {"cells": len(cells), "fetched": 0, "cached": 0, "failed": 0}
+
+    def _one(cell):
+        try:
+            _, hit = _cached_grid_forecast(*cell, {"retry_count": 0, "fallback_used": False})
+            return "cached" if hit else "fetched"
+        except Exception:
+            return "failed"
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="weather-prefetch") as pool:
+        for outcome in pool.map(_one, sorted(cells)):
+            counts[outcome] += 1
+    counts["elapsed"] = round(time.time() - t0, 2)
+    return counts
+
+
+_PREFETCHER: Optional[threading.Thread] = None
+
+
+def _prefetch_loop():
+    while True:
+        try:
+            counts = prefetch_grid_cells()
+            log.info("날씨 격자 선조회: %s", counts)
+            retry = counts["failed"] > 0
+        except Exception as e:
+            log.warning("날씨 격자 선조회 실패: %s", e)
+            retry = True
+        now = datetime.now()
+        wait = (_next_publication(now) - now).total_seconds()
+        if retry:
+            wait = min(wait, WEATHER_CACHE_RETRY_S)
+        time.sleep(max(wait, 1.0))
+
+
+def start_prefetcher():
+    """프로세스 시작 시 백그라운드 선조회 시작 (비활성화 / API 키 없음 / 중복 호출 시 무시)"""
+    global _PREFETCHER
+    if not WEATHER_PREFETCH or not WEATHER_API_KEY or _PREFETCHER is not None:
+        return
+    _PREFETCHER = threading.Thread(target=_prefetch_loop, name="weather-prefetch", daemon=True)
+    _PREFETCHER.start()
 
@@ -2,24 +2,41 @@
 # -*- coding: utf-8 -*-
 
 import time, json, re
+import logging
+import sqlite3
 import urllib.parse as up
-import requests
 from typing import List, Dict, Any, Optional, Tuple
 
 from .contracts import WebSearchOutput, WebDoc
+from .search_cache import get_search_cache, cache_key
+from .http_client import get_http_client, HttpError
 from my_agent.utils.config import (
     SERPER_API_KEY,
+    SERPER_URL,
     SEARCH_TIMEOUT,
     DEFAULT_TOPK,
     GOOGLE_API_KEY,
     LLM_MODEL,
     LLM_TEMPERATURE,
 )
+from my_agent.utils.tracing import traced_llm
+from my_agent.utils.log import get_logger
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+log = get_logger(__name__)
+
 
 # 공통 유틸
+def _cache_call(op: str, fn, *args) -> Any:
+    """검색 캐시 호출 — SQLite 런타임 오류(database is locked 등)는 기록 후 None (캐시 없이 검색)"""
+    try:
+        return fn(*args)
+    except sqlite3.Error as e:
+        log.warning("검색 캐시 %s 실패 → 캐시 없이 진행: %s", op, e)
+        return None
+
+
 def _norm(text: Optional[str]) -> str:
     return (text or "").strip()
 
@@ -50,11 +67,11 @@ def _rewrite_query_gemini(query: str) -> str:
     출력:
     """.strip()
     try:
-        llm = ChatGoogleGenerativeAI(
+        llm = traced_llm(ChatGoogleGenerativeAI(
             model=LLM_MODEL,
             google_api_key=GOOGLE_API_KEY,
             temperature=LLM_TEMPERATURE,
-        )
+        ), "query_rewrite")
         resp = llm.invoke(prompt)
         return _norm(resp.content)
     except Exception:
@@ -62,18 +79,24 @@ def _rewrite_query_gemini(query: str) -> str:
 
 
 # Serper API 호출
-def _serper_search(q: str, top_k: int = 10) -> Tuple[str, List[WebDoc]]:
-    """Serper.dev (Google Search API) 호출"""
+def _serper_search(q: str, top_k: int = 10) -> Tuple[str, List[WebDoc], Dict[str, Any]]:
+    """Serper.dev (Google Search API) 호출 → (provider, docs, meta: retry_count / error)"""
+    meta: Dict[str, Any] = {"retry_count": 0, "error": None}
     if not SERPER_API_KEY:
-        return "serper", []
+        return "serper", [], meta
     try:
-        url = "https://google.serper.dev/search"
+        url = SERPER_URL
         headers = {
             "X-API-KEY": SERPER_API_KEY,
             "Content-Type": "application/json",
         }
         payload = {"q": q, "num": min(top_k, 20)}
-        r = requests.post(url, headers=headers, data=json.dumps(payload), timeout=SEARCH_TIMEOUT)
+        # 재시도 포함 전체 SEARCH_TIMEOUT 안에서 끝나도록 deadline 지정
+        r, http_meta = get_http_client().request(
+            "POST", url, headers=headers, data=json.dumps(payload),
+            timeout=SEARCH_TIMEOUT, deadline=SEARCH_TIMEOUT,
+        )
+        meta["retry_count"] = http_meta["retry_count"]
         r.raise_for_status()
 
         j = r.json() or {}
@@ -92,10 +115,13 @@ def _serper_search(q: str, top_k: int = 10) -> Tuple[str, List[WebDoc]]:
                 "source": up.urlparse(link).netloc,
                 "published_at": _norm(it.get("date") or ""),
             })
-        return "serper", docs
+        return "serper", docs, meta
+    except HttpError as e:
+        meta.update(retry_count=e.meta.get("retry_count", 0), error=str(e), circuit_open=e.meta.get("circuit_open"))
     except Exception as e:
-        print("[Serper 검색 실패]", e)
-        return "serper", []
+        meta["error"] = str(e)
+    log.warning("Serper 검색 실패: %s (재시도 %d회)", meta["error"], meta["retry_count"])
+    return "serper", [], meta
 
 
 # 결과 정제
@@ -135,19 +161,28 @@ def web_search(query: str,
     if not original_query:
         return _build_output(False, provider, [], original_query, used_query, 0, False, t0)
 
+    # 캐시 조회 (재작성 LLM 호출 + Serper 호출 모두 생략)
+    cache = get_search_cache()
+    key = cache_key(original_query, top_k, rewrite_query)
+    cached = _cache_call("get", cache.get, key) if cache else None
+    if cached is not None:
+        result = _build_output(True, provider, cached["docs"], original_query, cached["query_used"], 0, False, t0)
+        result["cache_hit"] = True
+        log.log(logging.INFO if debug else logging.DEBUG, "cache hit: %r", original_query)
+        return result
+
     # 쿼리 재생성
     t_rewrite_start = time.time()
     if rewrite_query:
         used_query = _rewrite_query_gemini(original_query)
-        if debug:
-            print(f"[rewrite] '{original_query}' → '{used_query}'")
+        log.log(logging.INFO if debug else logging.DEBUG, "rewrite %r → %r", original_query, used_query)
     else:
         used_query = original_query
     t_rewrite = time.time() - t_rewrite_start
 
     # Serper 검색
     t_search_start = time.time()
-    _, docs = _serper_search(used_query, top_k)
+    _, docs, search_meta = _serper_search(used_query, top_k)
     t_search = time.time() - t_search_start
 
     # 결과 정제
@@ -157,14 +192,33 @@ def web_search(query: str,
 
     total_time = time.time() - t0
 
-    if debug:
-        print("\n---- 실행 시간 요약")
-        print(f"- 쿼리 변환: {t_rewrite:.3f}s")
-        print(f"- Serper 검색: {t_search:.3f}s")
-        print(f"- 결과 정제: {t_clean:.3f}s")
-        print(f"- 총 실행 시간: {total_time:.3f}s\n")
-
-    result = _build_output(True, provider, results, original_query, used_query, 0, False, t0)
+    log.log(
+        logging.INFO if debug else logging.DEBUG,
+        "실행 시간: 쿼리 변환 %.3fs / Serper 검색 %.3fs / 결과 정제 %.3fs / 총 %.3fs",
+        t_rewrite, t_search, t_clean, total_time,
+    )
+
+    # 빈 결과(키 없음 / 호출 실패)는 캐시하지 않음
+    fallback_used = False
+    if cache and results:
+        _cache_call("put", cache.put, key, {"docs": results, "query_used": used_query})
+    elif cache and search_meta["error"]:
+        # 업스트림 장애 → 만료된 캐시라도 있으면 사용
+        stale = _cache_call("get_stale", cache.get_stale, key)
+        if stale is not None:
+            results, used_query, fallback_used = stale["docs"], stale["query_used"], True
+            log.info("Serper 실패 → 만료 캐시 사용: %r", original_query)
+
+    failed = bool(search_meta["error"]) and not fallback_used
+    result = _build_output(
+        not failed, provider, results, original_query, used_query,
+        search_meta["retry_count"], fallback_used, t0,
+    )
+    result["cache_hit"] = False
+    if failed:
+        result["error"] = search_meta["error"]
+    if search_meta.get("circuit_open"):
+        result["meta"]["circuit_open"] = True
     result["meta"].update({
         "rewrite_time": round(t_rewrite, 3),
         "search_time": round(t_search, 3),
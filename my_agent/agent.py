@@ -12,27 +12,36 @@ from my_agent.nodes.sns import SNSNode
 from my_agent.nodes.revisit import RevisitNode
 from my_agent.nodes.cooperation import CooperationNode
 from my_agent.nodes.season import SeasonNode
+from my_agent.nodes.regenerate import RegenerateNode
 
 from my_agent.nodes.relevance_check import check_relevance
 from my_agent.utils.chat_history import update_conversation_memory
-from my_agent.utils.config import DEFAULT_TOPK, DEFAULT_RECENCY_DAYS
+from my_agent.utils.config import DEFAULT_TOPK, DEFAULT_RECENCY_DAYS, RELEVANCE_MAX_RETRIES
+from my_agent.utils.tracing import traced_node
+from my_agent.utils.log import get_logger
+
+log = get_logger(__name__)
 
 
 def create_graph():
     workflow = StateGraph(GraphState)
 
-    # ─── 노드 등록 ───
-    workflow.add_node("router", RouterNode())
-    workflow.add_node("web_augment", WebAugmentNode(default_topk=DEFAULT_TOPK))
-    workflow.add_node("general", GeneralNode())
-    workflow.add_node("issue", IssueNode())
-    workflow.add_node("sns", SNSNode())
-    workflow.add_node("revisit", RevisitNode())
-    workflow.add_node("cooperation", CooperationNode())
-    workflow.add_node("season", SeasonNode())
-
-    workflow.add_node("relevance_checker", check_relevance)
-    workflow.add_node("memory_updater", update_conversation_memory)
+    # ─── 노드 등록 (노드별 타이밍 스팬) ───
+    nodes = {
+        "router": RouterNode(),
+        "web_augment": WebAugmentNode(default_topk=DEFAULT_TOPK),
+        "general": GeneralNode(),
+        "issue": IssueNode(),
+        "sns": SNSNode(),
+        "revisit": RevisitNode(),
+        "cooperation": CooperationNode(),
+        "season": SeasonNode(),
+        "relevance_checker": check_relevance,
+        "regenerate": RegenerateNode(),
+        "memory_updater": update_conversation_memory,
+    }
+    for name, fn in nodes.items():
+        workflow.add_node(name, traced_node(name, fn))
 
     # ─── 엔트리 포인트 ───
     workflow.set_entry_point("router")
@@ -40,7 +49,7 @@ def create_graph():
     # ─── Router 이후 clarify 여부 ───
     def _after_router(state):
         if state.get("need_clarify"):
-            print("[GRAPH] need_clarify=True 감지 → 즉시 종료")
+            log.info("need_clarify=True 감지 → 즉시 종료")
             return "clarify"
         return "continue"
 
@@ -75,20 +84,29 @@ def create_graph():
         workflow.add_edge(node, "relevance_checker")
 
     # ─── 릴리번스 결과 분기 ───
+    # 실패 시 웹 검색/지표는 그대로 두고 LLM 답변만 재생성 (최대 RELEVANCE_MAX_RETRIES회, 이후 마지막 답변 사용)
     def _after_relevance(state):
         if state.get("relevance_passed"):
             return "pass"
-        print("[GRAPH] relevance_passed=False → web_augment로 재시도")
-        return "retry"
+        retry_count = int(state.get("retry_count") or 0)
+        if retry_count < RELEVANCE_MAX_RETRIES and state.get("prompt"):
+            log.warning("relevance_passed=False (%s) → 답변 재생성 %d/%d",
+                        state.get("relevance_reason"), retry_count + 1, RELEVANCE_MAX_RETRIES)
+            return "retry"
+        log.warning("relevance_passed=False (%s) → 재시도 %d회 소진, 마지막 답변 사용",
+                    state.get("relevance_reason"), retry_count)
+        return "give_up"
 
     workflow.add_conditional_edges(
         "relevance_checker",
         _after_relevance,
         {
             "pass": "memory_updater",
-            "retry": "web_augment",  # 실패 시 web_augment로 되돌리기
+            "retry": "regenerate",
+            "give_up": "memory_updater",
         },
     )
+    workflow.add_edge("regenerate", "relevance_checker")
 
     # ─── 메모리 업데이트 후 종료 ───
     workflow.add_edge("memory_updater", END)
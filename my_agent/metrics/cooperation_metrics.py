@@ -9,14 +9,14 @@ Cooperation Metrics Builder (길동무 전용)
 import pandas as pd
 import numpy as np
 from typing import Dict, Any
-from my_agent.utils.tools import load_store_and_area_data
+from my_agent.utils.tools import load_store_profile_data
 from my_agent.metrics.main_metrics import _safe, _drop_na_metrics
 
 
 def build_cooperation_metrics(store_num: str) -> Dict[str, Any]:
     """협업 가능성 평가용 메트릭 (고객 유사도 + 상권 안정성)"""
     state = {"store_id": store_num}
-    state = load_store_and_area_data(state, include_region=False, latest_only=True)
+    state = load_store_profile_data(state)
 
     store = state.get("store_data", {})
     bizarea = state.get("bizarea_data", {})
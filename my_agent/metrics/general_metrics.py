@@ -8,7 +8,7 @@ General Metrics Builder
 import numpy as np
 import pandas as pd
 from typing import Dict, Any
-from my_agent.utils.tools import load_store_and_area_data
+from my_agent.utils.tools import load_store_profile_data
 from my_agent.metrics.main_metrics import _safe, _drop_na_metrics
 
 
@@ -48,7 +48,7 @@ def build_general_metrics(store_num: str) -> Dict[str, Any]:
     """
     # 데이터 로드
     state = {"store_id": store_num}
-    state = load_store_and_area_data(state, include_region=False, latest_only=True)
+    state = load_store_profile_data(state)
     
     store = state.get("store_data")
     biz = state.get("bizarea_data")
@@ -2,7 +2,7 @@
 
 # -*- coding: utf-8 -*-
 from typing import Dict, Any
-from my_agent.utils.tools import load_store_and_area_data
+from my_agent.utils.tools import load_store_profile_data
 from my_agent.metrics.main_metrics import _safe, _drop_na_metrics
 
 
@@ -19,10 +19,10 @@ def add_metric_if(abnormal_dict, key, value, condition_fn, message_fn):
 
 def build_issue_metrics(store_num: str) -> Dict[str, Any]:
     state = {"store_id": store_num}
-    state = load_store_and_area_data(state, include_region=False, latest_only=True)
+    state = load_store_profile_data(state)
 
     store = state.get("store_data")
-    area = state.get("area_data")
+    area = state.get("bizarea_data")
     if not store:
         raise ValueError("store_data not found. Check store_num.")
 
@@ -5,7 +5,7 @@
 Revisit Metrics Builder
 입력: store_num (가맹점 구분 번호)
 동작:
-    - utils/tools.py → load_store_and_area_data 사용
+    - utils/tools.py → load_store_profile_data 사용 (store_profile 좁은 1행)
     - 재방문 관련 핵심 지표와 이상치 탐지 결과 생성
 출력:
     {
@@ -18,7 +18,7 @@ from typing import Dict, Any
 import numpy as np
 import pandas as pd
 
-from my_agent.utils.tools import load_store_and_area_data
+from my_agent.utils.tools import load_store_profile_data
 from my_agent.metrics.main_metrics import _safe, _drop_na_metrics
 
 ## 데이터 기반 임계값
@@ -45,7 +45,7 @@ def add_metric_if(abnormal_dict, key, value, condition_fn, message_fn):
 def build_revisit_metrics(store_num: str) -> Dict[str, Any]:
     """revisit 메트릭 생성"""
     state = {"store_id": store_num}
-    state = load_store_and_area_data(state, include_region=False, latest_only=True)
+    state = load_store_profile_data(state)
 
     store = state.get("store_data")
     if not store:
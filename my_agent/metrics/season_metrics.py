@@ -4,17 +4,89 @@
 """
 Season Metrics
 - 날씨 + 계절 + 상권 시간대별 고객 패턴 분석
+- 일괄 모드: scripts/build_season_snapshot.py 가 전 가맹점 지표를 season_snapshot 테이블(일 단위)로 저장
+  → build_season_metrics는 오늘자 스냅샷 1행이 있으면 그대로 사용 (없으면 가맹점 단위로 계산)
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from datetime import date, datetime
+
+import duckdb
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from my_agent.utils.tools import load_store_and_area_data, get_weather_forecast_data
+
+from my_agent.utils.config import DUCKDB_PATH
+from my_agent.utils.duckdb_swap import readonly_cursor
+from my_agent.utils.tools import load_store_profile_data, get_weather_forecast_data
+from my_agent.utils.log import get_logger
+
+log = get_logger(__name__)
+
+SEASON_SNAPSHOT_TABLE = "season_snapshot"
+
+# 상권 시간대별 매출 건수 컬럼
+TIME_KEYS = [
+    "시간대_건수~06_매출_건수",
+    "시간대_건수~11_매출_건수",
+    "시간대_건수~14_매출_건수",
+    "시간대_건수~17_매출_건수",
+    "시간대_건수~21_매출_건수",
+    "시간대_건수~24_매출_건수",
+]
+
+SEASON_COLUMNS = ["계절", "평균기온", "강수시간수", "날씨추세", "업종", "상권명", "상권_주요활성시간대", "메시지"]
+
+
+def season_of(month: int) -> str:
+    """월 → 계절"""
+    if month in [12, 1, 2]:
+        return "겨울"
+    elif month in [3, 4, 5]:
+        return "봄"
+    elif month in [6, 7, 8]:
+        return "여름"
+    return "가을"
+
+
+def _period_label(time_key: str) -> str:
+    return time_key.replace("시간대_건수~", "").replace("_매출_건수", "")
+
+
+def _season_message(season: str, temp_avg: float, weather_trend: str, area_name: str, active_period: str) -> str:
+    return (
+        f"{season} 평균기온 {temp_avg:.1f}℃, 날씨 '{weather_trend}' 예상. "
+        f"상권 '{area_name}'은 {active_period}시간대에 가장 활발"
+    )
+
+
+def load_season_snapshot(store_id: str, snapshot_date: Optional[date] = None) -> Optional[Dict[str, Any]]:
+    """season_snapshot 테이블에서 해당 일자 1행 조회 (테이블 없음 / 행 없음 / 날씨 결측이면 None)"""
+    con = readonly_cursor(DUCKDB_PATH)
+    if con is None:
+        return None
+    try:
+        row = con.execute(
+            f"""
+            SELECT {", ".join(SEASON_COLUMNS)}
+            FROM {SEASON_SNAPSHOT_TABLE}
+            WHERE 가맹점_구분번호 = ? AND snapshot_date = ? AND 평균기온 IS NOT NULL
+            """,
+            [str(store_id), snapshot_date or date.today()],
+        ).fetchone()
+    except duckdb.CatalogException:
+        # season_snapshot 미구축 (scripts/build_season_snapshot.py 미실행)
+        return None
+    if row is None:
+        return None
+    metrics = dict(zip(SEASON_COLUMNS, row))
+    metrics["평균기온"] = float(metrics["평균기온"])
+    metrics["강수시간수"] = int(metrics["강수시간수"])
+    return metrics
 
 
 def build_season_metrics(store_id: str) -> Dict[str, Any]:
     """
-    날씨 및 상권 기반 계절 지표 생성
+    날씨 및 상권 기반 계절 지표 생성 (오늘자 season_snapshot 우선)
 
     Returns
     -------
@@ -26,70 +98,52 @@ def build_season_metrics(store_id: str) -> Dict[str, Any]:
         }
     }
     """
-    print(f"[SEASON_METRICS] Build start for store_id={store_id}")
+    log.debug("Build start for store_id=%s", store_id)
+
+    snapshot = load_season_snapshot(store_id)
+    if snapshot is not None:
+        return {"success": True, "season_metrics": snapshot}
 
     # 매장 + 상권 데이터 로드
     state = {"store_id": store_id}
-    state = load_store_and_area_data(state, include_region=False, latest_only=True)
+    state = load_store_profile_data(state)
     store = state.get("store_data", {})
     area = state.get("bizarea_data", {})
 
     if not store:
         return {"success": False, "error": "store_data not found"}
 
-    lat = store.get("위도", 37.57)
-    lon = store.get("경도", 126.98)
-
-    # 날씨 데이터 불러오기
-    weather = get_weather_forecast_data(lat, lon, days=3)
-    if not weather.get("success"):
+    # 날씨 데이터 불러오기 (빌드 시 계산된 기상청 격자 우선, 구버전 DB면 좌표 변환 — 좌표가 없으면 실패 처리)
+    weather = get_weather_forecast_data(
+        lat=store.get("위도"),
+        lon=store.get("경도"),
+        nx=store.get("kma_nx"),
+        ny=store.get("kma_ny"),
+        days=3,
+        include_records=False,  # 요약만 사용
+    )
+    summary = weather.get("summary") or {}
+    if not weather.get("success") or summary.get("평균기온") is None:
         return {
             "success": False,
             "error": f"날씨 조회 실패: {weather.get('message')}",
             "season_metrics": None
         }
 
-    df = pd.DataFrame(weather["data"])
-    df["기온(℃)"] = pd.to_numeric(df["기온(℃)"], errors="coerce")
-    df["fcstDateTime"] = pd.to_datetime(df["fcstDateTime"])
-    temp_avg = df["기온(℃)"].mean()
-    rain_hours = (df["강수형태"] != "없음").sum()
+    temp_avg = summary["평균기온"]
+    rain_hours = summary["강수시간수"]
+    weather_trend = summary["날씨추세"]
 
     # 계절 판정
-    m = datetime.now().month
-    if m in [12, 1, 2]:
-        season = "겨울"
-    elif m in [3, 4, 5]:
-        season = "봄"
-    elif m in [6, 7, 8]:
-        season = "여름"
-    else:
-        season = "가을"
-
-    weather_trend = (
-        "맑음 유지" if rain_hours == 0 else
-        "간헐적 비" if rain_hours < 4 else
-        "비 많음"
-    )
+    season = season_of(datetime.now().month)
 
     # 상권 시간대별 고객 흐름 분석
-    time_keys = [
-        "시간대_건수~06_매출_건수",
-        "시간대_건수~11_매출_건수",
-        "시간대_건수~14_매출_건수",
-        "시간대_건수~17_매출_건수",
-        "시간대_건수~21_매출_건수",
-        "시간대_건수~24_매출_건수",
-    ]
-
-    time_data = {k: area.get(k) for k in time_keys if area.get(k) is not None}
-    active_period = None
+    time_data = {k: area.get(k) for k in TIME_KEYS if area.get(k) is not None}
     if time_data:
-        active_period = max(time_data, key=time_data.get).replace("시간대_건수~", "").replace("_매출_건수", "")
+        active_period = _period_label(max(time_data, key=time_data.get))
     else:
         active_period = "정보 없음"
 
-
     # 결과 종합
     industry = store.get("업종") or "알 수 없음"
     area_name = store.get("상권") or store.get("상권_지리") or "상권 정보 없음"
@@ -102,15 +156,60 @@ def build_season_metrics(store_id: str) -> Dict[str, Any]:
         "업종": industry,
         "상권명": area_name,
         "상권_주요활성시간대": active_period,
-        "메시지": (
-            f"{season} 평균기온 {temp_avg:.1f}℃, 날씨 '{weather_trend}' 예상. "
-            f"상권 '{area_name}'은 {active_period}시간대에 가장 활발"
-        ),
+        "메시지": _season_message(season, temp_avg, weather_trend, area_name, active_period),
     }
 
     return {"success": True, "season_metrics": season_metrics}
 
 
+def build_season_frame(stores: pd.DataFrame, weather: pd.DataFrame, today: date) -> pd.DataFrame:
+    """
+    전 가맹점 계절 지표 (벡터 연산)
+
+    Args:
+        stores : 가맹점_구분번호, 업종, 상권, 상권_지리, kma_nx, kma_ny + TIME_KEYS 중 있는 컬럼
+        weather: kma_nx, kma_ny, 평균기온, 강수시간수, 날씨추세 (격자별 예보 요약)
+
+    Returns:
+        가맹점_구분번호 + SEASON_COLUMNS (날씨가 없는 격자는 평균기온/강수시간수/날씨추세/메시지가 NULL)
+    """
+    df = stores.merge(weather, on=["kma_nx", "kma_ny"], how="left")
+    season = season_of(today.month)
+
+    # 상권 주요 활성 시간대: 시간대 컬럼 중 최댓값 (전부 결측이면 "정보 없음")
+    time_cols = [k for k in TIME_KEYS if k in df.columns]
+    if time_cols:
+        counts = df[time_cols].apply(pd.to_numeric, errors="coerce")
+        has_any = counts.notna().any(axis=1).to_numpy()
+        top = counts.fillna(-np.inf).to_numpy().argmax(axis=1)
+        labels = np.array([_period_label(k) for k in time_cols], dtype=object)
+        active = np.where(has_any, labels[top], "정보 없음")
+    else:
+        active = np.full(len(df), "정보 없음", dtype=object)
+
+    industry = df["업종"].astype("object").where(df["업종"].notna(), "알 수 없음")
+    area_name = df["상권"].astype("object") if "상권" in df.columns else pd.Series(None, index=df.index)
+    area_name = area_name.where(area_name.notna(), df["상권_지리"].astype("object"))
+    area_name = area_name.where(area_name.notna(), "상권 정보 없음")
+
+    out = pd.DataFrame({
+        "가맹점_구분번호": df["가맹점_구분번호"].astype(str),
+        "계절": season,
+        "평균기온": df["평균기온"].round(1),
+        "강수시간수": df["강수시간수"].astype("Int32"),
+        "날씨추세": df["날씨추세"],
+        "업종": industry.astype(str),
+        "상권명": area_name.astype(str),
+        "상권_주요활성시간대": active,
+    })
+    message = (
+        season + " 평균기온 " + out["평균기온"].map("{:.1f}".format) + "℃, 날씨 '" + out["날씨추세"].astype(str)
+        + "' 예상. 상권 '" + out["상권명"] + "'은 " + out["상권_주요활성시간대"] + "시간대에 가장 활발"
+    )
+    out["메시지"] = message.where(out["평균기온"].notna(), None)
+    return out
+
+
 if __name__ == "__main__":
     import sys, json
 
@@ -121,4 +220,4 @@ if __name__ == "__main__":
 
     store_id = sys.argv[1]
     result = build_season_metrics(store_id)
-    print(json.dumps(result, ensure_ascii=False, indent=2))
\ No newline at end of file
+    print(json.dumps(result, ensure_ascii=False, indent=2))
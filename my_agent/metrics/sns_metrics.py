@@ -24,14 +24,14 @@ SNS Metrics Builder
 """
 
 from typing import Dict, Any
-from my_agent.utils.tools import load_store_and_area_data
+from my_agent.utils.tools import load_store_profile_data
 from my_agent.metrics.main_metrics import _safe, _drop_na_metrics
 
 
 def build_sns_metrics(store_num: str) -> Dict[str, Any]:
     """SNSNode용 핵심 지표 생성"""
     state = {"store_id": store_num}
-    state = load_store_and_area_data(state, include_region=False, latest_only=True)
+    state = load_store_profile_data(state)
 
     store = state.get("store_data", {})
     bizarea = state.get("bizarea_data", {})
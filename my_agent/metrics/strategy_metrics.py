@@ -5,7 +5,7 @@
 Strategy Metrics Builder 
 입력: store_num (가맹점 구분 번호)
 동작:
-    - utils/tools.py → load_store_and_area_data 사용
+    - utils/tools.py → load_store_profile_data 사용 (store_profile 좁은 1행)
     - store 데이터에서 전략 강도 지표 추출
 출력:
     {
@@ -14,7 +14,7 @@ Strategy Metrics Builder
 """
 import numpy as np
 from typing import Dict, Any, List
-from my_agent.utils.tools import load_store_and_area_data
+from my_agent.utils.tools import load_store_profile_data
 
 def _safe(x):
     """결측값 처리 (NaN, None, 빈 문자열 등) → None"""
@@ -35,9 +35,7 @@ def _drop_na_metrics(d: Dict[str, Any]) -> Dict[str, Any]:
 def build_strategy_metrics(store_num: str) -> Dict[str, Any]:
     """strategy 메트릭 생성"""
     state = {"store_id": store_num}
-    state = load_store_and_area_data(state, include_region=False, latest_only=True)  
-    ## latest_only False면 해당 가맹점 모든 행 불러오고 True면 최신만 불러오게 됨
-    ## include_region은 행정동 데이터를 추가 하냐 마냐 (기본 False)
+    state = load_store_profile_data(state)
 
     store = state.get("store_data")
 
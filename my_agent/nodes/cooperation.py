@@ -10,21 +10,59 @@ from typing import Dict, Any, List
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 from my_agent.utils.config import GOOGLE_API_KEY, LLM_MODEL, LLM_TEMPERATURE
-from my_agent.utils.tools import resolve_store, load_store_and_area_data, find_cooperation_candidates_by_store
+from my_agent.utils.tracing import traced_llm
+from my_agent.utils.tools import resolve_store, load_store_profile_data, find_cooperation_candidates_by_store
+from my_agent.utils.scheduler import run_parallel
 from my_agent.utils.postprocess import postprocess_response, format_web_snippets
+from my_agent.utils.prompt_builder import PromptBuilder, register_template, format_table, WEB_PRIORITY
+from my_agent.utils.prompt_cache import invoke_with_template
+from my_agent.metrics.main_metrics import build_main_metrics
+from my_agent.metrics.strategy_metrics import build_strategy_metrics
 from my_agent.metrics.cooperation_metrics import build_cooperation_metrics
 from mcp.adapter_client import call_mcp_tool
 
 
+# 정적 프롬프트 접두부 (system 메시지, 내용을 바꾸면 버전을 올릴 것)
+COOPERATION_TEMPLATE = register_template("cooperation", "v1", """
+# 당신은 소상공인 마케팅 전문가입니다.  
+주어진 데이터와 후보 점포 리스트를 바탕으로 **협업 가능한 매장 조합과 시너지 아이디어**를 제시하세요.
+
+---
+
+## 출력 형식
+### 1. **현재 매장 분석**  
+   - 고객층 및 상권 특성 요약  
+   - 협업이 필요한 이유 (데이터 기반)
+### 2. **추천 협업 파트너**  
+   - 후보 점포 리스트 중 상위 2~3곳을 선택  
+   - 각 점포별 협업 포인트 제시  
+     - 고객층 겹침 (예: 직장인 중심 / 20~30대 여성 등)  
+     - 업종 차이에서 오는 시너지 (예: 카페 ↔ 꽃집, 학원 ↔ 간식가게)
+### 3. **공동 마케팅 아이디어**  
+   - SNS 공동 이벤트 / 쿠폰 교차제공 / 배달 패키지 등  
+   - 각 아이디어에 대한 기대효과를 데이터 기반으로 설명
+### 4. **기대효과 요약**  
+   - 고객 재방문률 상승, 신규 유입률 개선 등
+
+---
+
+## 작성 규칙
+1. metrics와 candidates에 기반한 사실만 언급 (추측 금지)
+2. 업종/상권 데이터를 해석적으로 요약
+3. 불필요한 일반론 금지
+4. 문단별 제목 유지
+""")
+
+
 class CooperationNode:
     """협업 후보 탐색 및 추천 노드"""
 
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
+        self.llm = traced_llm(ChatGoogleGenerativeAI(
             model=LLM_MODEL,
             google_api_key=GOOGLE_API_KEY,
             temperature=LLM_TEMPERATURE
-        )
+        ), "cooperation")
 
     def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
         user_query = state.get("user_query", "").strip()
@@ -34,7 +72,7 @@ class CooperationNode:
         if not state.get("store_id"):
             state = resolve_store(state)
             
-        store_id = state["store_id"]
+        store_id = state.get("store_id")
 
         metrics: Dict[str, Any] = {}
         errors: Dict[str, str] = {}
@@ -42,97 +80,72 @@ class CooperationNode:
         # 2. 가맹점 및 상권 데이터 로드
         if store_id:
             try:
-                state = load_store_and_area_data(state, latest_only=True)
+                state = load_store_profile_data(state)
             except Exception as e:
-                errors["load_store_and_area_data"] = str(e)
+                errors["load_store_profile_data"] = str(e)
+
+            # 메인 / 전략 강도 / 협업 지표 + 협업 후보 조회 병렬 실행 (서로 독립, 빌더별 제한 시간)
+            results, build_errors = run_parallel({
+                "build_main_metrics": lambda: build_main_metrics(store_id),
+                "build_strategy_metrics": lambda: build_strategy_metrics(store_id),
+                "build_cooperation_metrics": lambda: build_cooperation_metrics(store_id),
+                "find_cooperation_candidates": lambda: find_cooperation_candidates_by_store(store_id=store_id, top_k=5),
+            })
 
             ## 메인 지표
-            try:
-                res_main = build_main_metrics(store_id)  # {"main_metrics": {...}, "상권_단위_정보": {...}} 권장
-                if isinstance(res_main, dict):
-                    if res_main.get("main_metrics"):
-                        metrics["main_metrics"] = res_main["main_metrics"]
-                    if res_main.get("상권_단위_정보"):
-                        metrics["상권_단위_정보"] = res_main["상권_단위_정보"]
-            except Exception as e:
-                errors["build_main_metrics"] = str(e)
+            res_main = results.get("build_main_metrics")  # {"main_metrics": {...}, "상권_단위_정보": {...}} 권장
+            if isinstance(res_main, dict):
+                if res_main.get("main_metrics"):
+                    metrics["main_metrics"] = res_main["main_metrics"]
+                if res_main.get("상권_단위_정보"):
+                    metrics["상권_단위_정보"] = res_main["상권_단위_정보"]
+            if "build_main_metrics" in build_errors:
+                errors["build_main_metrics"] = build_errors["build_main_metrics"]
 
             ## 전략 강도 지표
-            try:
-                res_strategy = build_strategy_metrics(store_id)  # 보통 {"strategy_metrics": {...}}
+            if "build_strategy_metrics" in results:
+                res_strategy = results["build_strategy_metrics"]  # 보통 {"strategy_metrics": {...}}
                 if isinstance(res_strategy, dict) and res_strategy.get("strategy_metrics"):
                     metrics["strategy_metrics"] = res_strategy["strategy_metrics"]
                 else:
                     metrics["strategy_metrics"] = res_strategy
-            except Exception as e:
-                errors["build_strategy_metrics"] = str(e)
+            else:
+                errors["build_strategy_metrics"] = build_errors["build_strategy_metrics"]
 
             ## 협업 메트릭 계산
-            try:
-                metrics['협업_metrics'] = build_cooperation_metrics(store_id)
-            except Exception as e:
-                state["error"] = f"협업 메트릭 계산 실패: {e}"
+            if "build_cooperation_metrics" in results:
+                metrics['협업_metrics'] = results["build_cooperation_metrics"]
+            else:
+                state["error"] = f"협업 메트릭 계산 실패: {build_errors['build_cooperation_metrics']}"
 
             # 협업 후보 조회
-            try:
-                result = find_cooperation_candidates_by_store(store_id=store_id, top_k=5)
-            except Exception as e:
-                state["error"] = f"MCP 호출 실패: {e}"
+            if "find_cooperation_candidates" in results:
+                result = results["find_cooperation_candidates"]
+            else:
+                state["error"] = f"MCP 호출 실패: {build_errors['find_cooperation_candidates']}"
                 result = {"success": False, "candidates": []}
+        else:
+            result = {"success": False, "candidates": []}
 
         candidates: List[Dict[str, Any]] = result.get("candidates", [])
         state["metrics"] = metrics if metrics else None
 
-        # 3. LLM 프롬프트 구성
-        prompt = f"""
-# 당신은 소상공인 마케팅 전문가입니다.  
-주어진 데이터와 후보 점포 리스트를 바탕으로 **협업 가능한 매장 조합과 시너지 아이디어**를 제시하세요.
-
----
-
-## 사용자 질문
-{user_query}
-
-## 가게 정보
-{state.get("user_info")}
-
-## 데이터 지표
-{state.get("metrics")}
-
-## 협업 후보 점포 (상위 {len(candidates)}개)
-{candidates}
-
-## 웹 참고 정보
-{format_web_snippets(web_snippets)}
-
----
-
-## 출력 형식
-### 1. **현재 매장 분석**  
-   - 고객층 및 상권 특성 요약  
-   - 협업이 필요한 이유 (데이터 기반)
-### 2. **추천 협업 파트너**  
-   - 후보 점포 리스트 중 상위 2~3곳을 선택  
-   - 각 점포별 협업 포인트 제시  
-     - 고객층 겹침 (예: 직장인 중심 / 20~30대 여성 등)  
-     - 업종 차이에서 오는 시너지 (예: 카페 ↔ 꽃집, 학원 ↔ 간식가게)
-### 3. **공동 마케팅 아이디어**  
-   - SNS 공동 이벤트 / 쿠폰 교차제공 / 배달 패키지 등  
-   - 각 아이디어에 대한 기대효과를 데이터 기반으로 설명
-### 4. **기대효과 요약**  
-   - 고객 재방문률 상승, 신규 유입률 개선 등
-
----
+        # 3. LLM 프롬프트 구성 (정적 부분은 COOPERATION_TEMPLATE)
+        prompt = (
+            PromptBuilder("cooperation", COOPERATION_TEMPLATE)
+            .section("사용자 질문", user_query)
+            .section("가게 정보", state.get("user_info"))
+            .metrics(state.get("metrics"), "데이터 지표")
+            .lines(f"협업 후보 점포 (상위 {len(candidates)}개)", format_table(candidates), priority=2, keep_first=4)
+            .section("웹 참고 정보", format_web_snippets(web_snippets), priority=WEB_PRIORITY)
+            .build()
+        )
 
-## 작성 규칙
-1. metrics와 candidates에 기반한 사실만 언급 (추측 금지)
-2. 업종/상권 데이터를 해석적으로 요약
-3. 불필요한 일반론 금지
-4. 문단별 제목 유지
-"""
+        # 관련성 검사 실패 시 재생성 노드가 같은 프롬프트를 재사용
+        state["prompt"], state["prompt_template"] = prompt, COOPERATION_TEMPLATE.key
 
         # 4. LLM 호출 및 후처리
-        raw_response = self.llm.invoke(prompt).content
+        raw_response = invoke_with_template(self.llm, COOPERATION_TEMPLATE, prompt).content
         final_response = postprocess_response(
             raw_response=raw_response,
             web_snippets=web_snippets
@@ -7,24 +7,101 @@ GeneralNode - 일반 마케팅 분석/조언 노드
 - general_metrics (선택): 보완 정보
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from langchain_google_genai import ChatGoogleGenerativeAI
 import json
 
 from my_agent.utils.config import GOOGLE_API_KEY, LLM_MODEL, LLM_TEMPERATURE
-from my_agent.utils.tools import resolve_store, load_store_and_area_data
+from my_agent.utils.tracing import traced_llm
+from my_agent.utils.tools import resolve_store, load_store_profile_data
+from my_agent.utils.scheduler import run_parallel
 from my_agent.metrics.main_metrics import build_main_metrics
+from my_agent.metrics.strategy_metrics import build_strategy_metrics
 from my_agent.metrics.general_metrics import build_general_metrics
 from my_agent.utils.postprocess import postprocess_response, format_web_snippets
+from my_agent.utils.prompt_builder import PromptBuilder, PromptTemplate, register_template, WEB_PRIORITY
+from my_agent.utils.prompt_cache import invoke_with_template
+from my_agent.utils.log import get_logger
+
+log = get_logger(__name__)
+
+
+# 정적 프롬프트 접두부 (system 메시지, 내용을 바꾸면 버전을 올릴 것)
+_GENERAL_ROLE = """
+당신은 소상공인을 위한 **데이터 기반 마케팅 전략가**입니다.
+주어진 정보를 해석하여 매장의 **현재 상태 분석 및 실행 가능한 마케팅 전략**을 제시하세요.
+"""
+
+# 가게 지표가 있을 때
+GENERAL_TEMPLATE = register_template("general", "v1", _GENERAL_ROLE + """
+---
+
+## 출력 형식
+
+### 1. 현재 상황 요약
+- 데이터를 바탕으로 매장의 현황과 주요 특징을 2~3문장으로 정리
+
+### 2. 핵심 데이터 분석
+- 핵심 지표 2~3개를 근거로 분석 (수치 포함)
+
+### 3. 전략 제안
+- 실행 가능한 마케팅 전략 2~3개 제시
+- 전략별 예상 효과 및 적용 방법 명시
+
+### 4. 기대 효과
+- 전략 실행 시 기대할 수 있는 지표 개선이나 매출 효과 설명
+
+---
+
+## 작성 규칙
+1. **근거 기반** — 제공된 데이터나 웹 정보를 반드시 활용
+2. **실행 가능성** — 추상적 조언 금지, 구체적 액션 제시
+3. **맞춤형 전략** — 상황에 맞는 솔루션 제시
+4. **투명성** — 모든 주장에 근거 명시
+5. "100% 성공", "확실한 효과" 등 과장 표현 금지
+6. 데이터 없는 추측 금지
+7. 복사/붙여넣기식 일반론 금지
+""")
+
+# 가게 지표가 없을 때 (웹 정보/일반 지식 기반)
+GENERAL_WEB_TEMPLATE = register_template("general_web", "v1", _GENERAL_ROLE + """
+---
+
+## 출력 형식
+
+### 1. 현재 상황 요약
+- 질문의 맥락을 파악하여 2~3문장으로 요약
+
+### 2. 핵심 데이터 분석
+- 웹 정보나 일반적 마케팅 지식을 바탕으로 2~3개 근거 제시
+
+### 3. 전략 제안
+- 실행 가능한 마케팅 전략 2~3개 제시
+- 전략별 예상 효과 및 적용 방법 명시
+
+### 4. 기대 효과
+- 전략 실행 시 기대할 수 있는 효과 설명
+
+---
+
+## 작성 규칙
+1. **근거 기반** — 웹 정보를 반드시 활용
+2. **실행 가능성** — 추상적 조언 금지, 구체적 액션 제시
+3. **맞춤형 전략** — 상황에 맞는 솔루션 제시
+4. **투명성** — 모든 주장에 근거 명시
+5. "100% 성공", "확실한 효과" 등 과장 표현 금지
+6. 데이터 없는 추측 금지
+7. 복사/붙여넣기식 일반론 금지
+""")
 
 
 class GeneralNode:
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
+        self.llm = traced_llm(ChatGoogleGenerativeAI(
             model=LLM_MODEL,
             google_api_key=GOOGLE_API_KEY,
             temperature=LLM_TEMPERATURE
-        )
+        ), "general")
     
     def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """General 노드 실행"""
@@ -44,61 +121,47 @@ class GeneralNode:
         if store_id:
             try:
                 # Store + Bizarea 데이터 로드
-                state = load_store_and_area_data(
-                    state, 
-                    include_region=False, 
-                    latest_only=True
-                )
+                state = load_store_profile_data(state)
+                
+                # Main / Strategy / General Metrics 병렬 로드 (서로 독립, 빌더별 제한 시간)
+                results, build_errors = run_parallel({
+                    "build_main_metrics": lambda: build_main_metrics(store_id),          # 필수
+                    "build_strategy_metrics": lambda: build_strategy_metrics(store_id),  # 선택
+                    "build_general_metrics": lambda: build_general_metrics(store_id),    # 선택
+                })
+                
+                res_main = results.get("build_main_metrics")
+                if isinstance(res_main, dict):
+                    if res_main.get("main_metrics"):
+                        metrics["main_metrics"] = res_main["main_metrics"]
+                    if res_main.get("상권_단위_정보"):
+                        metrics["상권_단위_정보"] = res_main["상권_단위_정보"]
                 
-                # Main Metrics 로드 (필수)
-                try:
-                    res_main = build_main_metrics(store_id)
-                    if isinstance(res_main, dict):
-                        if res_main.get("main_metrics"):
-                            metrics["main_metrics"] = res_main["main_metrics"]
-                        if res_main.get("상권_단위_정보"):
-                            metrics["상권_단위_정보"] = res_main["상권_단위_정보"]
-                    print("[INFO] Main Metrics 로드 성공")
-                except Exception as e:
-                    errors["build_main_metrics"] = str(e)
-                    print(f"[ERROR] Main Metrics 로드 실패: {e}")
+                res_strategy = results.get("build_strategy_metrics")
+                if isinstance(res_strategy, dict) and res_strategy.get("strategy_metrics"):
+                    metrics["strategy_metrics"] = res_strategy["strategy_metrics"]
                 
-                # Strategy Metrics 로드 (선택)
-                try:
-                    from my_agent.metrics.strategy_metrics import build_strategy_metrics
-                    res_strategy = build_strategy_metrics(store_id)
-                    if isinstance(res_strategy, dict) and res_strategy.get("strategy_metrics"):
-                        metrics["strategy_metrics"] = res_strategy["strategy_metrics"]
-                    print("[INFO] Strategy Metrics 로드 성공")
-                except Exception as e:
-                    errors["build_strategy_metrics"] = str(e)
-                    print(f"[WARN] Strategy Metrics 로드 실패 (옵션): {e}")
+                res_general = results.get("build_general_metrics")
+                if isinstance(res_general, dict) and res_general.get("general_metrics"):
+                    metrics["general_metrics"] = res_general["general_metrics"]
                 
-                # General Metrics 로드 (선택)
-                try:
-                    res_general = build_general_metrics(store_id)
-                    if isinstance(res_general, dict) and res_general.get("general_metrics"):
-                        metrics["general_metrics"] = res_general["general_metrics"]
-                    print("[INFO] General Metrics 로드 성공")
-                except Exception as e:
-                    errors["build_general_metrics"] = str(e)
-                    print(f"[WARN] General Metrics 로드 실패 (옵션): {e}")
+                errors.update(build_errors)
+                log.debug("Metrics 로드: 성공=%s, 실패=%s", list(results), list(build_errors))
                 
             except Exception as e:
-                errors["load_store_and_area_data"] = str(e)
-                print(f"[ERROR] 데이터 로드 실패: {e}")
-                import traceback
-                traceback.print_exc()
+                errors["load_store_profile_data"] = str(e)
+                log.exception("데이터 로드 실패: %s", e)
         
         state["metrics"] = metrics if metrics else None
         state["errors"] = errors if errors else None
         
-        # 3. 프롬프트 생성
-        prompt = self._build_prompt(state)
+        # 3. 프롬프트 생성 (정적 템플릿 + 동적 본문)
+        template, prompt = self._build_prompt(state)
+        state["prompt"], state["prompt_template"] = prompt, template.key  # 재생성 노드가 재사용
         
         # 4. LLM 호출
         try:
-            raw_response = self.llm.invoke(prompt).content
+            raw_response = invoke_with_template(self.llm, template, prompt).content
 
             final_response = postprocess_response(
                 raw_response=raw_response,
@@ -116,12 +179,8 @@ class GeneralNode:
         
         return state
     
-    def _build_prompt(self, state: Dict[str, Any]) -> str:
-        """변수 추출 후 간결하게 사용"""
-        
-        system = """당신은 소상공인을 위한 **데이터 기반 마케팅 전략가**입니다.
-주어진 정보를 해석하여 매장의 **현재 상태 분석 및 실행 가능한 마케팅 전략**을 제시하세요.
-"""
+    def _build_prompt(self, state: Dict[str, Any]) -> Tuple[PromptTemplate, str]:
+        """(정적 템플릿, 동적 본문) — 지표 유무에 따라 템플릿 선택"""
         
         # 변수 추출
         user_query = state.get("user_query")
@@ -131,89 +190,23 @@ class GeneralNode:
         
         # Metrics가 있는 경우
         if metrics:
-            return f"""{system}
----
-
-## 질문
-{user_query}
-
-## 가게 정보
-{user_info}
-
-## 데이터 지표
-{metrics}
-
-## 웹 참고 정보
-{format_web_snippets(web_snippets)}
-
----
-
-## 출력 형식
-
-### 1. 현재 상황 요약
-- 데이터를 바탕으로 매장의 현황과 주요 특징을 2~3문장으로 정리
-
-### 2. 핵심 데이터 분석
-- 핵심 지표 2~3개를 근거로 분석 (수치 포함)
-
-### 3. 전략 제안
-- 실행 가능한 마케팅 전략 2~3개 제시
-- 전략별 예상 효과 및 적용 방법 명시
-
-### 4. 기대 효과
-- 전략 실행 시 기대할 수 있는 지표 개선이나 매출 효과 설명
-
----
-
-## 작성 규칙
-1. **근거 기반** — 제공된 데이터나 웹 정보를 반드시 활용
-2. **실행 가능성** — 추상적 조언 금지, 구체적 액션 제시
-3. **맞춤형 전략** — 상황에 맞는 솔루션 제시
-4. **투명성** — 모든 주장에 근거 명시
-5. "100% 성공", "확실한 효과" 등 과장 표현 금지
-6. 데이터 없는 추측 금지
-7. 복사/붙여넣기식 일반론 금지
-"""
+            return GENERAL_TEMPLATE, (
+                PromptBuilder("general", GENERAL_TEMPLATE)
+                .section("질문", user_query)
+                .section("가게 정보", user_info)
+                .metrics(metrics, "데이터 지표")
+                .section("웹 참고 정보", format_web_snippets(web_snippets), priority=WEB_PRIORITY)
+                .build()
+            )
         
         # Metrics가 없는 경우
         else:
-            return f"""{system}
----
-
-## 질문
-{user_query}
-
-## 웹 참고 정보
-{format_web_snippets(web_snippets)}
-
----
-
-## 출력 형식
-
-### 1. 현재 상황 요약
-- 질문의 맥락을 파악하여 2~3문장으로 요약
-
-### 2. 핵심 데이터 분석
-- 웹 정보나 일반적 마케팅 지식을 바탕으로 2~3개 근거 제시
-
-### 3. 전략 제안
-- 실행 가능한 마케팅 전략 2~3개 제시
-- 전략별 예상 효과 및 적용 방법 명시
-
-### 4. 기대 효과
-- 전략 실행 시 기대할 수 있는 효과 설명
-
----
-
-## 작성 규칙
-1. **근거 기반** — 웹 정보를 반드시 활용
-2. **실행 가능성** — 추상적 조언 금지, 구체적 액션 제시
-3. **맞춤형 전략** — 상황에 맞는 솔루션 제시
-4. **투명성** — 모든 주장에 근거 명시
-5. "100% 성공", "확실한 효과" 등 과장 표현 금지
-6. 데이터 없는 추측 금지
-7. 복사/붙여넣기식 일반론 금지
-"""
+            return GENERAL_WEB_TEMPLATE, (
+                PromptBuilder("general", GENERAL_WEB_TEMPLATE)
+                .section("질문", user_query)
+                .section("웹 참고 정보", format_web_snippets(web_snippets), priority=WEB_PRIORITY)
+                .build()
+            )
 
 
 # CLI Test
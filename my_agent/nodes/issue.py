@@ -12,22 +12,66 @@ from typing import Dict, Any
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 from my_agent.utils.config import GOOGLE_API_KEY, LLM_MODEL, LLM_TEMPERATURE
-from my_agent.utils.tools import resolve_store, load_store_and_area_data
+from my_agent.utils.tracing import traced_llm
+from my_agent.utils.tools import resolve_store, load_store_profile_data
+from my_agent.utils.scheduler import run_parallel
 
 from my_agent.metrics.main_metrics import build_main_metrics
 from my_agent.metrics.strategy_metrics import build_strategy_metrics
 from my_agent.metrics.issue_metrics import build_issue_metrics
 
 from my_agent.utils.postprocess import postprocess_response, format_web_snippets
+from my_agent.utils.prompt_builder import PromptBuilder, register_template, WEB_PRIORITY
+from my_agent.utils.prompt_cache import invoke_with_template
+
+
+# 정적 프롬프트 접두부 (system 메시지, 내용을 바꾸면 버전을 올릴 것)
+ISSUE_TEMPLATE = register_template("issue", "v1", """
+# 당신은 데이터 기반 문제 진단 전문가입니다  
+주어진 정보를 해석하여 매장의 **핵심 문제와 원인**을 도출하세요.
+
+---
+
+## 출력 형식
+### 1. 현재 상황 분석
+- 데이터를 바탕으로 현재 매장의 상황을 요약 (2~3문장)
+
+### 2. 핵심 문제 요약
+- 매장이 겪고 있는 가장 핵심적인 비즈니스 문제를 한 문장으로 요약
+
+### 3. 이상 지표 분석
+- abnormal_metrics를 활용하여 감지된 이상 지표를 구체적으로 나열
+
+### 4. 문제 원인
+- 데이터를 근거로 한 주요 원인 2~4가지 제시
+
+### 5. 개선 방향
+- 문제 해결을 위한 마케팅 아이디어 제안  
+- 각 아이디어의 **데이터적 근거** 명시  
+- 웹 참고 데이터 활용 가능
+
+### 6. 기대 효과
+- 전략 실행 후 기대할 수 있는 변화와 지표 개선 전망
+
+---
+
+## 작성 규칙
+1. 오직 제공된 데이터 지표(metrics)에 기반하여 분석  
+2. 임의의 수치 생성 금지  
+3. 데이터 근거를 포함한 문장 작성  
+4. 추상적 설명 및 일반론 금지  
+5. 근거와 아이디어를 구체적으로 명시  
+6. 참고 출처 명시 가능
+""")
 
 
 class IssueNode:
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
+        self.llm = traced_llm(ChatGoogleGenerativeAI(
             model=LLM_MODEL,
             google_api_key=GOOGLE_API_KEY,
             temperature=LLM_TEMPERATURE
-        )
+        ), "issue")
     def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
         user_query = state.get("user_query", "").strip()
         web_snippets = state.get("web_snippets", [])
@@ -40,101 +84,70 @@ class IssueNode:
 
         # 2. store 있는 경우에만 metrics 생성
         metrics: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
         if store_id:
             # 가게/상권 데이터 적재 (최신행만)
             try:
-                state = load_store_and_area_data(state, include_region=False, latest_only=True)
+                state = load_store_profile_data(state)
             except Exception as e:
-                errors["load_store_and_area_data"] = str(e)
+                errors["load_store_profile_data"] = str(e)
+
+            # 메인 / 전략 강도 / 이슈 지표 병렬 생성 (서로 독립, 빌더별 제한 시간)
+            results, build_errors = run_parallel({
+                "build_main_metrics": lambda: build_main_metrics(store_id),
+                "build_strategy_metrics": lambda: build_strategy_metrics(store_id),
+                "build_issue_metrics": lambda: build_issue_metrics(store_id),
+            })
 
             # 2-1) 메인 지표
-            try:
-                res_main = build_main_metrics(store_id)  # {"main_metrics": {...}, "상권_단위_정보": {...}} 권장
-                if isinstance(res_main, dict):
-                    if res_main.get("main_metrics"):
-                        metrics["main_metrics"] = res_main["main_metrics"]
-                    if res_main.get("상권_단위_정보"):
-                        metrics["상권_단위_정보"] = res_main["상권_단위_정보"]
-            except Exception as e:
-                errors["build_main_metrics"] = str(e)
+            res_main = results.get("build_main_metrics")  # {"main_metrics": {...}, "상권_단위_정보": {...}} 권장
+            if isinstance(res_main, dict):
+                if res_main.get("main_metrics"):
+                    metrics["main_metrics"] = res_main["main_metrics"]
+                if res_main.get("상권_단위_정보"):
+                    metrics["상권_단위_정보"] = res_main["상권_단위_정보"]
+            if "build_main_metrics" in build_errors:
+                errors["build_main_metrics"] = build_errors["build_main_metrics"]
 
             # 2-2) 전략 강도 지표
-            try:
-                res_strategy = build_strategy_metrics(store_id)  # 보통 {"strategy_metrics": {...}}
+            if "build_strategy_metrics" in results:
+                res_strategy = results["build_strategy_metrics"]  # 보통 {"strategy_metrics": {...}}
                 if isinstance(res_strategy, dict) and res_strategy.get("strategy_metrics"):
                     metrics["strategy_metrics"] = res_strategy["strategy_metrics"]
                 else:
                     # 함수가 바로 dict를 반환하는 구현일 수도 있음
                     metrics["strategy_metrics"] = res_strategy
-            except Exception as e:
-                errors["build_strategy_metrics"] = str(e)
+            else:
+                errors["build_strategy_metrics"] = build_errors["build_strategy_metrics"]
 
-            try:
-                m_issue = build_issue_metrics(store_id)
+            # 2-3) 이슈 / 이상 지표
+            if "build_issue_metrics" in results:
+                m_issue = results["build_issue_metrics"]
                 metrics["issue_metrics"] = m_issue.get("issue_metrics", {})
                 metrics["abnormal_metrics"] = m_issue.get("abnormal_metrics", {})
-            except Exception:
-                errors["issue_metrics"] = str(e)
-                errors["abnormal_metrics"] = str(e)
+            else:
+                errors["issue_metrics"] = build_errors["build_issue_metrics"]
+                errors["abnormal_metrics"] = build_errors["build_issue_metrics"]
 
 
         state["metrics"] = metrics if metrics else None
+        state["errors"] = errors if errors else None
+
+        # 3. Prompt 구성 (출력 형식/규칙은 ISSUE_TEMPLATE, 지표는 key=value 한 줄씩 — 토큰 예산 초과 시 우선순위 낮은 항목부터 제외)
+        prompt = (
+            PromptBuilder("issue", ISSUE_TEMPLATE)
+            .section("질문", user_query)
+            .section("가게 정보", state.get("user_info"))
+            .metrics(state.get("metrics"), "데이터 지표")
+            .section("웹 참고 정보", format_web_snippets(web_snippets), priority=WEB_PRIORITY)
+            .build()
+        )
 
-        # 3. Prompt 구성(JSON 구조 그대로 사용)
-        prompt = f"""
-# 당신은 데이터 기반 문제 진단 전문가입니다  
-주어진 정보를 해석하여 매장의 **핵심 문제와 원인**을 도출하세요.
-
----
-
-## 질문
-{user_query}
-
-## 가게 정보
-{state.get("user_info")}
-
-## 데이터 지표
-{state.get("metrics")}
-
-## 웹 참고 정보
-{format_web_snippets(web_snippets)}
-
----
-
-## 출력 형식
-### 1. 현재 상황 분석
-- 데이터를 바탕으로 현재 매장의 상황을 요약 (2~3문장)
-
-### 2. 핵심 문제 요약
-- 매장이 겪고 있는 가장 핵심적인 비즈니스 문제를 한 문장으로 요약
-
-### 3. 이상 지표 분석
-- abnormal_metrics를 활용하여 감지된 이상 지표를 구체적으로 나열
-
-### 4. 문제 원인
-- 데이터를 근거로 한 주요 원인 2~4가지 제시
-
-### 5. 개선 방향
-- 문제 해결을 위한 마케팅 아이디어 제안  
-- 각 아이디어의 **데이터적 근거** 명시  
-- 웹 참고 데이터 활용 가능
-
-### 6. 기대 효과
-- 전략 실행 후 기대할 수 있는 변화와 지표 개선 전망
-
----
-
-## 작성 규칙
-1. 오직 위 JSON 데이터(metrics)에 기반하여 분석  
-2. 임의의 수치 생성 금지  
-3. 데이터 근거를 포함한 문장 작성  
-4. 추상적 설명 및 일반론 금지  
-5. 근거와 아이디어를 구체적으로 명시  
-6. 참고 출처 명시 가능
-"""
+        # 관련성 검사 실패 시 재생성 노드가 같은 프롬프트를 재사용
+        state["prompt"], state["prompt_template"] = prompt, ISSUE_TEMPLATE.key
 
         # 4. LLM 호출
-        raw_response = self.llm.invoke(prompt).content
+        raw_response = invoke_with_template(self.llm, ISSUE_TEMPLATE, prompt).content
 
         final_response = postprocess_response(
             raw_response=raw_response,
@@ -0,0 +1,82 @@
+# my_agent/nodes/regenerate.py
+# -*- coding: utf-8 -*-
+"""
+RegenerateNode - 관련성 검사 실패 시 LLM 답변만 다시 생성하는 노드
+- 의도 노드가 남긴 프롬프트(state["prompt"], state["prompt_template"])를 그대로 재사용
+  → 웹 검색 / 가맹점 조회 / 지표 빌더는 다시 실행하지 않음 (metrics, web_snippets 유지)
+- 실패 사유(relevance_reason)를 담은 보정 지시를 동적 본문 끝에 덧붙여 1회 호출 (정적 접두부 캐시 유지)
+- retry_count 증가 → agent._after_relevance가 RELEVANCE_MAX_RETRIES에서 재시도 중단
+"""
+import time
+from typing import Dict, Any
+
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from my_agent.utils.config import GOOGLE_API_KEY, LLM_MODEL, LLM_TEMPERATURE
+from my_agent.utils.tracing import traced_llm, current_span
+from my_agent.utils.prompt_builder import TEMPLATES
+from my_agent.utils.prompt_cache import invoke_with_template
+from my_agent.utils.postprocess import postprocess_response
+from my_agent.nodes.relevance_check import INTENT_KEYWORDS
+from my_agent.utils.log import get_logger
+
+log = get_logger(__name__)
+
+
+def build_retry_hint(state: Dict[str, Any]) -> str:
+    """관련성 검사 실패 사유 기반 보정 지시"""
+    intent = (state.get("intent") or "GENERAL").upper()
+    user_query = (state.get("user_query") or "").strip()
+    store_name = (state.get("user_info") or {}).get("store_name")
+    reason = state.get("relevance_reason") or "관련성 낮음"
+
+    lines = [
+        "## 재작성 지시",
+        f"이전 답변이 관련성 검사를 통과하지 못했습니다 ({reason}). 아래를 지켜 처음부터 다시 작성하세요.",
+        f"- 질문 \"{user_query}\"에 직접 답할 것",
+    ]
+    if store_name:
+        lines.append(f"- 가게명 '{store_name}'을(를) 언급하고, 데이터 지표의 실제 수치를 인용할 것")
+    keywords = INTENT_KEYWORDS.get(intent)
+    if keywords:
+        lines.append(f"- {', '.join(keywords[:4])} 등 질문 의도와 관련된 용어로 설명할 것")
+    lines.append("- 출력 형식의 모든 항목을 빠짐없이 채울 것")
+    return "\n".join(lines)
+
+
+class RegenerateNode:
+    def __init__(self):
+        self.llm = traced_llm(ChatGoogleGenerativeAI(
+            model=LLM_MODEL,
+            google_api_key=GOOGLE_API_KEY,
+            temperature=LLM_TEMPERATURE
+        ), "regenerate")
+
+    def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        retry = int(state.get("retry_count") or 0) + 1
+        state["retry_count"] = retry
+        template = TEMPLATES.get(state.get("prompt_template") or "")
+        prompt = state.get("prompt")
+        current_span().set(retry=retry, reason=state.get("relevance_reason"))
+
+        if template is None or not prompt:
+            log.warning("재생성 불가 (프롬프트 없음) → 기존 답변 유지")
+            return state
+
+        t0 = time.perf_counter()
+        try:
+            raw_response = invoke_with_template(
+                self.llm, template, f"{prompt.rstrip()}\n\n{build_retry_hint(state)}\n"
+            ).content
+        except Exception as e:
+            log.warning("재생성 %d회차 LLM 호출 실패: %s → 기존 답변 유지", retry, e)
+            return state
+
+        state["final_response"] = postprocess_response(
+            raw_response=raw_response,
+            web_snippets=state.get("web_snippets", [])
+        )
+        state["error"] = None
+        log.info("재생성 %d회차 완료 — 사유=%s | %.3fs 소요",
+                 retry, state.get("relevance_reason"), time.perf_counter() - t0)
+        return state
@@ -13,21 +13,58 @@ from typing import Dict, Any
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 from my_agent.utils.config import GOOGLE_API_KEY, LLM_MODEL, LLM_TEMPERATURE
-from my_agent.utils.tools import resolve_store, load_store_and_area_data
+from my_agent.utils.tracing import traced_llm
+from my_agent.utils.tools import resolve_store, load_store_profile_data
+from my_agent.utils.scheduler import run_parallel
 
 from my_agent.metrics.main_metrics import build_main_metrics
 from my_agent.metrics.strategy_metrics import build_strategy_metrics
 from my_agent.metrics.revisit_metrics import build_revisit_metrics
 from my_agent.utils.postprocess import postprocess_response, format_web_snippets
+from my_agent.utils.prompt_builder import PromptBuilder, register_template, WEB_PRIORITY
+from my_agent.utils.prompt_cache import invoke_with_template
+
+
+# 정적 프롬프트 접두부 (system 메시지, 내용을 바꾸면 버전을 올릴 것)
+REVISIT_TEMPLATE = register_template("revisit", "v1", """
+# 당신은 데이터 기반 재방문 전략 설계 전문가입니다  
+주어진 정보를 바탕으로 매장의 **재방문율과 단골 고객 비중을 높이는 실행 전략**을 제시하세요.
+
+---
+
+## 출력 형식
+### 1. 현재 상황 요약
+- 매장 현황과 고객 및 상권 패턴을 간단히 요약  
+
+### 2. 핵심 데이터 분석  
+- 재방문 관련 주요 수치 및 추세 분석 (근거 중심)
+
+### 3. 재방문 유도 전략  
+- 구체적이고 실행 가능한 전략 제안  
+- 캠페인, 혜택, 고객세분화 등 포함
+
+### 4. 기대 효과
+- 전략 실행 후 기대할 수 있는 변화와 지표 개선 전망
+
+---
+
+## 작성 규칙
+1. **분석 → 근거 → 전략 → 기대효과** 순으로 구성  
+2. 데이터(metrics)에서 **실제 수치를 직접 인용**  
+3. 일반론 금지 — 매장 상황에 맞는 구체적 전략 제시  
+4. 필요 시 **표나 리스트** 활용 가능  
+5. 데이터 부족 시 웹 참고 정보 기반으로 현실적 리텐션 전략 보완  
+6. 임의 수치 생성 금지
+""")
 
 
 class RevisitNode:
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
+        self.llm = traced_llm(ChatGoogleGenerativeAI(
             model=LLM_MODEL,
             google_api_key=GOOGLE_API_KEY,
             temperature=LLM_TEMPERATURE
-        )
+        ), "revisit")
 
     def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
         user_query = (state.get("user_query") or "").strip()
@@ -46,95 +83,61 @@ class RevisitNode:
         if store_id:
             # 가게/상권 데이터 적재 (최신행만)
             try:
-                state = load_store_and_area_data(state, include_region=False, latest_only=True)
+                state = load_store_profile_data(state)
             except Exception as e:
-                errors["load_store_and_area_data"] = str(e)
+                errors["load_store_profile_data"] = str(e)
+
+            # 메인 / 전략 강도 / 재방문 지표 병렬 생성 (서로 독립, 빌더별 제한 시간)
+            results, build_errors = run_parallel({
+                "build_main_metrics": lambda: build_main_metrics(store_id),
+                "build_strategy_metrics": lambda: build_strategy_metrics(store_id),
+                "build_revisit_metrics": lambda: build_revisit_metrics(store_id),
+            })
+            errors.update(build_errors)
 
             # 2-1) 메인 지표
-            try:
-                res_main = build_main_metrics(store_id)  # {"main_metrics": {...}, "상권_단위_정보": {...}} 권장
-                if isinstance(res_main, dict):
-                    if res_main.get("main_metrics"):
-                        metrics["main_metrics"] = res_main["main_metrics"]
-                    if res_main.get("상권_단위_정보"):
-                        metrics["상권_단위_정보"] = res_main["상권_단위_정보"]
-            except Exception as e:
-                errors["build_main_metrics"] = str(e)
+            res_main = results.get("build_main_metrics")  # {"main_metrics": {...}, "상권_단위_정보": {...}} 권장
+            if isinstance(res_main, dict):
+                if res_main.get("main_metrics"):
+                    metrics["main_metrics"] = res_main["main_metrics"]
+                if res_main.get("상권_단위_정보"):
+                    metrics["상권_단위_정보"] = res_main["상권_단위_정보"]
 
             # 2-2) 전략 강도 지표
-            try:
-                res_strategy = build_strategy_metrics(store_id)  # 보통 {"strategy_metrics": {...}}
+            if "build_strategy_metrics" in results:
+                res_strategy = results["build_strategy_metrics"]  # 보통 {"strategy_metrics": {...}}
                 if isinstance(res_strategy, dict) and res_strategy.get("strategy_metrics"):
                     metrics["strategy_metrics"] = res_strategy["strategy_metrics"]
                 else:
                     # 함수가 바로 dict를 반환하는 구현일 수도 있음
                     metrics["strategy_metrics"] = res_strategy
-            except Exception as e:
-                errors["build_strategy_metrics"] = str(e)
 
             # 2-3) 재방문 지표 + 이상치
-            try:
-                res_revisit = build_revisit_metrics(store_id)  # {"revisit_metrics": {...}, "abnormal_metrics": {...}}
-                if isinstance(res_revisit, dict):
-                    if res_revisit.get("revisit_metrics"):
-                        metrics["revisit_metrics"] = res_revisit["revisit_metrics"]
-                    if res_revisit.get("abnormal_metrics"):
-                        metrics["revisit_abnormal"] = res_revisit["abnormal_metrics"]
-                        
-            except Exception as e:
-                errors["build_revisit_metrics"] = str(e)
+            res_revisit = results.get("build_revisit_metrics")  # {"revisit_metrics": {...}, "abnormal_metrics": {...}}
+            if isinstance(res_revisit, dict):
+                if res_revisit.get("revisit_metrics"):
+                    metrics["revisit_metrics"] = res_revisit["revisit_metrics"]
+                if res_revisit.get("abnormal_metrics"):
+                    metrics["revisit_abnormal"] = res_revisit["abnormal_metrics"]
 
         state["metrics"] = metrics if metrics else None
         state["errors"] = errors if errors else None  # 디버깅 편의
 
-        # 3) 프롬프트
-        prompt = f"""
-# 당신은 데이터 기반 재방문 전략 설계 전문가입니다  
-주어진 정보를 바탕으로 매장의 **재방문율과 단골 고객 비중을 높이는 실행 전략**을 제시하세요.
-
----
-
-## 질문
-{user_query}
-
-## 가게 정보
-{state.get("user_info")}
-
-## 데이터 지표
-{state.get("metrics")}
-
-## 웹 참고 정보
-{format_web_snippets(web_snippets)}
-
----
-
-## 출력 형식
-### 1. 현재 상황 요약
-- 매장 현황과 고객 및 상권 패턴을 간단히 요약  
-
-### 2. 핵심 데이터 분석  
-- 재방문 관련 주요 수치 및 추세 분석 (근거 중심)
-
-### 3. 재방문 유도 전략  
-- 구체적이고 실행 가능한 전략 제안  
-- 캠페인, 혜택, 고객세분화 등 포함
-
-### 4. 기대 효과
-- 전략 실행 후 기대할 수 있는 변화와 지표 개선 전망
-
----
+        # 3) 프롬프트 (정적 부분은 REVISIT_TEMPLATE)
+        prompt = (
+            PromptBuilder("revisit", REVISIT_TEMPLATE)
+            .section("질문", user_query)
+            .section("가게 정보", state.get("user_info"))
+            .metrics(state.get("metrics"), "데이터 지표")
+            .section("웹 참고 정보", format_web_snippets(web_snippets), priority=WEB_PRIORITY)
+            .build()
+        )
 
-## 작성 규칙
-1. **분석 → 근거 → 전략 → 기대효과** 순으로 구성  
-2. 데이터(metrics)에서 **실제 수치를 직접 인용**  
-3. 일반론 금지 — 매장 상황에 맞는 구체적 전략 제시  
-4. 필요 시 **표나 리스트** 활용 가능  
-5. 데이터 부족 시 웹 참고 정보 기반으로 현실적 리텐션 전략 보완  
-6. 임의 수치 생성 금지
-        """
+        # 관련성 검사 실패 시 재생성 노드가 같은 프롬프트를 재사용
+        state["prompt"], state["prompt_template"] = prompt, REVISIT_TEMPLATE.key
 
         # 4) LLM 호출
-        raw_response = self.llm.invoke(prompt).content
+        raw_response = invoke_with_template(self.llm, REVISIT_TEMPLATE, prompt).content
 
         # 5) 후처리 적용: 텍스트 정제 + 웹 출처 토글(있을 때만)
         final_output = postprocess_response(
@@ -7,8 +7,12 @@ Intent 라우팅: LLM 우선 분류 → 규칙 기반 보정(백업) → 가맹
 from typing import Optional
 from langchain_google_genai import ChatGoogleGenerativeAI
 from my_agent.utils.config import GOOGLE_API_KEY, LLM_MODEL, LLM_TEMPERATURE
+from my_agent.utils.tracing import traced_llm
 from my_agent.utils.state import GraphState
 from my_agent.utils.tools import resolve_store  
+from my_agent.utils.log import get_logger
+
+log = get_logger(__name__)
 
 INTENTS = ("SNS", "REVISIT", "ISSUE", "COOPERATION", "SEASON", "GENERAL")
 
@@ -25,11 +29,11 @@ class RouterNode:
     def __init__(self):
         self.llm: Optional[ChatGoogleGenerativeAI] = None
         if GOOGLE_API_KEY:
-            self.llm = ChatGoogleGenerativeAI(
+            self.llm = traced_llm(ChatGoogleGenerativeAI(
                 model=LLM_MODEL,
                 google_api_key=GOOGLE_API_KEY,
                 temperature=LLM_TEMPERATURE
-            )
+            ), "router")
 
     def _rules_fallback(self, user_query: str) -> str:
         q = (user_query or "").lower()
@@ -125,26 +129,25 @@ class RouterNode:
             intent = self._rules_fallback(user_query)
 
         state["intent"] = intent
-        print(f"[ROUTER] Intent 분류 완료: {intent}")
+        log.info("Intent 분류 완료: %s", intent)
 
         # 2) 가맹점 검색 (store_id 없을 때만)
         if not state.get("store_id"):
-            print("[ROUTER] resolve_store 실행 중...")
+            log.debug("resolve_store 실행")
             state = resolve_store(state)
             
             # need_clarify가 True면 바로 리턴 (후보 선택 필요)
             if state.get("need_clarify"):
-                print("[ROUTER] ⚠️ 가맹점 후보 여러 개 → 사용자 선택 필요")
-                print(f"[ROUTER] 후보 수: {len(state.get('store_candidates', []))}")
+                log.info("가맹점 후보 %d개 → 사용자 선택 필요", len(state.get("store_candidates", [])))
                 return state
             
             # 가맹점 확정됨
             if state.get("store_id"):
                 user_info = state.get("user_info", {})
-                print(f"[ROUTER] 가맹점 확정: {user_info.get('store_name')} (id={state.get('store_id')})")
+                log.info("가맹점 확정: %s (id=%s)", user_info.get("store_name"), state.get("store_id"))
             else:
-                print("[ROUTER] 가맹점명 없음 → GENERAL fallback 모드")
+                log.info("가맹점명 없음 → GENERAL fallback 모드")
         else:
-            print(f"[ROUTER] store_id 이미 존재: {state.get('store_id')}")
+            log.debug("store_id 이미 존재: %s", state.get("store_id"))
 
         return state
\ No newline at end of file
@@ -9,20 +9,61 @@ SeasonNode - 계절·날씨 기반 마케팅 전략 노드
 from typing import Dict, Any
 from langchain_google_genai import ChatGoogleGenerativeAI
 from my_agent.utils.config import GOOGLE_API_KEY, LLM_MODEL, LLM_TEMPERATURE
-from my_agent.utils.tools import resolve_store, load_store_and_area_data
+from my_agent.utils.tracing import traced_llm
+from my_agent.utils.tools import resolve_store, load_store_profile_data
+from my_agent.utils.scheduler import run_parallel
 from my_agent.metrics.main_metrics import build_main_metrics
 from my_agent.metrics.strategy_metrics import build_strategy_metrics
 from my_agent.metrics.season_metrics import build_season_metrics
 from my_agent.utils.postprocess import postprocess_response, format_web_snippets
+from my_agent.utils.prompt_builder import PromptBuilder, register_template, WEB_PRIORITY
+from my_agent.utils.prompt_cache import invoke_with_template
+
+
+# 정적 프롬프트 접두부 (system 메시지, 내용을 바꾸면 버전을 올릴 것)
+SEASON_TEMPLATE = register_template("season", "v1", """
+# 당신은 계절·날씨 기반 마케팅 전략 전문가입니다.  
+주어진 데이터를 바탕으로 매장의 **계절적 특징, 날씨 영향, 상권 고객 흐름 패턴**을 해석하세요.
+
+---
+
+## 출력 형식
+### 1. 현재 계절 및 날씨 요약
+- 평균기온, 강수 상태, 전반적인 기상 특징을 간단히 요약
+
+### 2. 상권 고객 활동 패턴
+- 상권 내 주요 활성 시간대와 그 의미를 설명  
+- 예: "오후 17~21시는 직장인 퇴근 유입 중심의 시간대"
+
+### 3. 고객 패턴 분석
+- 핵심 고객군을 분석하여 고객 패턴을 파악
+- 예: "여성 20대가 핵심 고객군이기 때문에 SNS 프로모션 효과가 높을 가능성"
+
+### 4. 계절형 마케팅 전략 제안
+- 현재 계절과 날씨, 고객유형에 맞는 구체적 마케팅 전략 제시  
+- 예: “가을철 저녁 유입 증가 → 야외 테이크아웃 세트 할인”  
+- 각 전략은 **데이터 근거**를 함께 제시
+
+### 5. 실행 시 기대효과
+- 매출, 유입, 체류시간 등의 개선 가능성 예측
+
+---
+
+## 작성 규칙
+1. 모든 분석은 season_metrics 데이터에 근거  
+2. 계절·날씨·시간대 패턴을 함께 고려  
+3. 구체적이고 실질적인 마케팅 아이디어 제시  
+4. 근거 수치나 요약 문장을 반드시 포함
+""")
 
 
 class SeasonNode:
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
+        self.llm = traced_llm(ChatGoogleGenerativeAI(
             model=LLM_MODEL,
             google_api_key=GOOGLE_API_KEY,
             temperature=LLM_TEMPERATURE
-        )
+        ), "season")
 
     def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
         user_query = state.get("user_query", "").strip()
@@ -39,94 +80,59 @@ class SeasonNode:
 
         if store_id:
             try:
-                state = load_store_and_area_data(state, include_region=False, latest_only=True)
+                state = load_store_profile_data(state)
             except Exception as e:
-                errors["load_store_and_area_data"] = str(e)
+                errors["load_store_profile_data"] = str(e)
+
+            # 메인 / 전략 강도 / 계절 지표 병렬 생성 (서로 독립, 빌더별 제한 시간)
+            results, build_errors = run_parallel({
+                "build_main_metrics": lambda: build_main_metrics(store_id),
+                "build_strategy_metrics": lambda: build_strategy_metrics(store_id),
+                "build_season_metrics": lambda: build_season_metrics(store_id),
+            })
+            errors.update(build_errors)
 
             # 메인 지표
-            try:
-                res_main = build_main_metrics(store_id)  # {"main_metrics": {...}, "상권_단위_정보": {...}} 권장
-                if isinstance(res_main, dict):
-                    if res_main.get("main_metrics"):
-                        metrics["main_metrics"] = res_main["main_metrics"]
-                    if res_main.get("상권_단위_정보"):
-                        metrics["상권_단위_정보"] = res_main["상권_단위_정보"]
-            except Exception as e:
-                errors["build_main_metrics"] = str(e)
+            res_main = results.get("build_main_metrics")  # {"main_metrics": {...}, "상권_단위_정보": {...}} 권장
+            if isinstance(res_main, dict):
+                if res_main.get("main_metrics"):
+                    metrics["main_metrics"] = res_main["main_metrics"]
+                if res_main.get("상권_단위_정보"):
+                    metrics["상권_단위_정보"] = res_main["상권_단위_정보"]
 
             # 전략 강도 지표
-            try:
-                res_strategy = build_strategy_metrics(store_id)  # 보통 {"strategy_metrics": {...}}
+            if "build_strategy_metrics" in results:
+                res_strategy = results["build_strategy_metrics"]  # 보통 {"strategy_metrics": {...}}
                 if isinstance(res_strategy, dict) and res_strategy.get("strategy_metrics"):
                     metrics["strategy_metrics"] = res_strategy["strategy_metrics"]
                 else:
                     # 함수가 바로 dict를 반환하는 구현일 수도 있음
                     metrics["strategy_metrics"] = res_strategy
-            except Exception as e:
-                errors["build_strategy_metrics"] = str(e)
-            
-            # season metrics 생성
-            try:
-                m_season = build_season_metrics(store_id)
-                metrics = {"season_metrics": m_season.get("season_metrics", {})}
-            except Exception as e:
-                metrics = {}
-                state["error"] = f"season_metrics 생성 실패: {e}"
 
-        state["metrics"] = metrics if metrics else None
-
-        # LLM 프롬프트 구성
-        prompt = f"""
-# 당신은 계절·날씨 기반 마케팅 전략 전문가입니다.  
-주어진 데이터를 바탕으로 매장의 **계절적 특징, 날씨 영향, 상권 고객 흐름 패턴**을 해석하세요.
-
----
+            # season metrics (메인/전략 지표에 추가)
+            if "build_season_metrics" in results:
+                metrics["season_metrics"] = results["build_season_metrics"].get("season_metrics", {})
+            else:
+                state["error"] = f"season_metrics 생성 실패: {build_errors['build_season_metrics']}"
 
-## 사용자 질문
-{user_query}
-
-## 가게 기본 정보
-{state.get("user_info")}
-
-## 계절 및 날씨 데이터
-{state.get("metrics")}
-
-## 참고 웹 정보
-{format_web_snippets(web_snippets)}
-
----
-
-## 출력 형식
-### 1. 현재 계절 및 날씨 요약
-- 평균기온, 강수 상태, 전반적인 기상 특징을 간단히 요약
-
-### 2. 상권 고객 활동 패턴
-- 상권 내 주요 활성 시간대와 그 의미를 설명  
-- 예: "오후 17~21시는 직장인 퇴근 유입 중심의 시간대"
-
-### 3. 고객 패턴 분석
-- 핵심 고객군을 분석하여 고객 패턴을 파악
-- 예: "여성 20대가 핵심 고객군이기 때문에 SNS 프로모션 효과가 높을 가능성"
-
-### 4. 계절형 마케팅 전략 제안
-- 현재 계절과 날씨, 고객유형에 맞는 구체적 마케팅 전략 제시  
-- 예: “가을철 저녁 유입 증가 → 야외 테이크아웃 세트 할인”  
-- 각 전략은 **데이터 근거**를 함께 제시
-
-### 5. 실행 시 기대효과
-- 매출, 유입, 체류시간 등의 개선 가능성 예측
-
----
+        state["metrics"] = metrics if metrics else None
+        state["errors"] = errors if errors else None
+
+        # LLM 프롬프트 구성 (정적 부분은 SEASON_TEMPLATE)
+        prompt = (
+            PromptBuilder("season", SEASON_TEMPLATE)
+            .section("사용자 질문", user_query)
+            .section("가게 기본 정보", state.get("user_info"))
+            .metrics(state.get("metrics"), "계절 및 날씨 데이터")
+            .section("참고 웹 정보", format_web_snippets(web_snippets), priority=WEB_PRIORITY)
+            .build()
+        )
 
-## 작성 규칙
-1. 모든 분석은 season_metrics 데이터에 근거  
-2. 계절·날씨·시간대 패턴을 함께 고려  
-3. 구체적이고 실질적인 마케팅 아이디어 제시  
-4. 근거 수치나 요약 문장을 반드시 포함
-"""
+        # 관련성 검사 실패 시 재생성 노드가 같은 프롬프트를 재사용
+        state["prompt"], state["prompt_template"] = prompt, SEASON_TEMPLATE.key
 
         # LLM 호출
-        raw_response = self.llm.invoke(prompt).content
+        raw_response = invoke_with_template(self.llm, SEASON_TEMPLATE, prompt).content
         final_response = postprocess_response(raw_response, web_snippets = web_snippets)
 
         state["final_response"] = final_response
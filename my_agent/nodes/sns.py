@@ -12,8 +12,11 @@ from typing import Dict, Any
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 from my_agent.utils.config import GOOGLE_API_KEY, LLM_MODEL, LLM_TEMPERATURE
-from my_agent.utils.tools import resolve_store, load_store_and_area_data
+from my_agent.utils.tracing import traced_llm
+from my_agent.utils.tools import resolve_store, load_store_profile_data
 from my_agent.utils.postprocess import postprocess_response, format_web_snippets
+from my_agent.utils.prompt_builder import PromptBuilder, register_template, format_table, WEB_PRIORITY
+from my_agent.utils.prompt_cache import invoke_with_template
 
 from my_agent.metrics.main_metrics import build_main_metrics
 from my_agent.metrics.strategy_metrics import build_strategy_metrics
@@ -89,12 +92,56 @@ SNS_CHANNEL_GUIDE = {
     },
 }
 
+# 프롬프트용 표 (헤더 + 채널별 1행, 모듈 로드 시 1회 생성)
+SNS_CHANNEL_GUIDE_TABLE = "\n".join(format_table([{"채널": name, **guide} for name, guide in SNS_CHANNEL_GUIDE.items()]))
+
+
+# 정적 프롬프트 접두부 (system 메시지, 채널 가이드 포함 — 내용을 바꾸면 버전을 올릴 것)
+SNS_TEMPLATE = register_template("sns", "v1", f"""
+# 당신은 SNS 마케팅 전문가입니다  
+주어진 정보를 바탕으로 **데이터 기반 SNS 채널 추천과 실행 가능한 홍보 전략**을 제시하세요.
+
+---
+
+## SNS 채널별 특성 (참고용)
+{SNS_CHANNEL_GUIDE_TABLE}
+
+---
+
+## 출력 형식 
+### 1. 현재 상황 요약  
+- 데이터를 바탕으로 매장의 현황과 주요 특징을 2~3문장으로 정리  
+
+### 2. 핵심 데이터 분석  
+- 핵심 지표 2~3개를 근거로 분석 (수치 포함)
+
+### 3. 전략 제안  
+- 가게 데이터와 가장 잘 맞는 채널을 우선 순위별로 2~3개 추천   
+- 각 채널별 구체적인 운영 전략 제시 
+
+### 4. 기대 효과 
+- 전략 실행 시 기대할 수 있는 지표 개선이나 매출 효과 설명
+
+---
+
+## 작성 규칙
+1. 제공된 데이터를 기반으로 **고객 특성(연령대, 방문 패턴, 객단가 등)** 분석  
+2. 위의 SNS 채널 특성을 참고하여 **가게 데이터와 가장 적합한 채널을 우선순위별로 3~4개 추천**
+   - 각 채널별 **추천 근거** 명시  
+   - 각 채널별 **운영 전략** 제시 (업로드 주기, 콘텐츠 유형, 해시태그 전략 등)  
+   - 각 채널별 **기대 효과** 명시  
+3. **실제 사용 가능한 홍보 문구**를 2~3개 제안 (해시태그 포함)  
+4. 일반론 금지 — 매장 데이터 기반으로만 전략 제시  
+5. 가게 데이터가 부족할 경우 웹 참고 정보를 바탕으로 일반적인 조언 제시
+""")
+
+
 class SNSNode:
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
+        self.llm = traced_llm(ChatGoogleGenerativeAI(
             model=LLM_MODEL,
             google_api_key=GOOGLE_API_KEY,
-            temperature=LLM_TEMPERATURE)
+            temperature=LLM_TEMPERATURE), "sns")
 
     def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
         user_query = state.get("user_query", "").strip()
@@ -110,7 +157,7 @@ class SNSNode:
         metrics: Dict[str, Any] = {}
         if state.get("store_id"):
             # 가게/상권 데이터 적재
-            state = load_store_and_area_data(state, include_region=False, latest_only=True)
+            state = load_store_profile_data(state)
 
             store_id = state["store_id"]
             # 각 지표 빌드 (실패해도 나머지 진행)
@@ -125,81 +172,37 @@ class SNSNode:
                 pass
 
             try:
-                m_strategy = build_strategy_metrics(store_id), "strategy_metrics"
+                m_strategy = build_strategy_metrics(store_id).get("strategy_metrics")
                 if m_strategy:
                     metrics["strategy_metrics"] = m_strategy
             except Exception:
                 pass
 
             try:
-                m_sns = build_sns_metrics(store_id), "sns_metrics"
+                m_sns = build_sns_metrics(store_id).get("sns_node_metrics")
                 if m_sns:
                     metrics["sns_metrics"] = m_sns
             except Exception:
                 pass
 
         state["metrics"] = metrics if metrics else None
-        # 웹 참고 정보 포맷 적용
-        web_section = ""
-        if web_snippets:
-            web_section = f"\n### 웹 참고 정보\n{format_web_snippets(web_snippets)}\n"
-
-
-        # 3. Prompt 구성(JSON 구조로 그대로 포함)
-        prompt = f"""
-# 당신은 SNS 마케팅 전문가입니다  
-주어진 정보를 바탕으로 **데이터 기반 SNS 채널 추천과 실행 가능한 홍보 전략**을 제시하세요.
-
----
-
-## 질문
-{user_query}
-
-## 가게 정보
-{state.get("user_info")}
-
-## 데이터 지표
-{state.get("metrics")}
-
-## SNS 채널별 특성 (참고용)
-{SNS_CHANNEL_GUIDE}
-
-## 웹 참고 정보
-{format_web_snippets(web_snippets)}
-
----
-
-## 출력 형식 
-### 1. 현재 상황 요약  
-- 데이터를 바탕으로 매장의 현황과 주요 특징을 2~3문장으로 정리  
-
-### 2. 핵심 데이터 분석  
-- 핵심 지표 2~3개를 근거로 분석 (수치 포함)
-
-### 3. 전략 제안  
-- 가게 데이터와 가장 잘 맞는 채널을 우선 순위별로 2~3개 추천   
-- 각 채널별 구체적인 운영 전략 제시 
-
-### 4. 기대 효과 
-- 전략 실행 시 기대할 수 있는 지표 개선이나 매출 효과 설명
-
----
-
-## 작성 규칙
-1. 제공된 데이터를 기반으로 **고객 특성(연령대, 방문 패턴, 객단가 등)** 분석  
-2. 위의 SNS 채널 특성을 참고하여 **가게 데이터와 가장 적합한 채널을 우선순위별로 3~4개 추천**
-   - 각 채널별 **추천 근거** 명시  
-   - 각 채널별 **운영 전략** 제시 (업로드 주기, 콘텐츠 유형, 해시태그 전략 등)  
-   - 각 채널별 **기대 효과** 명시  
-3. **실제 사용 가능한 홍보 문구**를 2~3개 제안 (해시태그 포함)  
-4. 일반론 금지 — 매장 데이터 기반으로만 전략 제시  
-5. 가게 데이터가 부족할 경우 웹 참고 정보를 바탕으로 일반적인 조언 제시
 
-        """
+        # 3. Prompt 구성 (지표는 key=value 한 줄씩, 채널 가이드/출력 형식은 SNS_TEMPLATE — 토큰 예산 초과 시 웹 정보부터 제외)
+        prompt = (
+            PromptBuilder("sns", SNS_TEMPLATE)
+            .section("질문", user_query)
+            .section("가게 정보", state.get("user_info"))
+            .metrics(state.get("metrics"), "데이터 지표")
+            .section("웹 참고 정보", format_web_snippets(web_snippets), priority=WEB_PRIORITY)
+            .build()
+        )
         
     
+        # 관련성 검사 실패 시 재생성 노드가 같은 프롬프트를 재사용
+        state["prompt"], state["prompt_template"] = prompt, SNS_TEMPLATE.key
+
         # LLM 호출
-        raw_response = self.llm.invoke(prompt).content
+        raw_response = invoke_with_template(self.llm, SNS_TEMPLATE, prompt).content
 
         # 후처리 적용
         final_output = postprocess_response(
@@ -4,6 +4,9 @@
 
 from typing import Dict, Any, List
 from mcp.adapter_client import call_mcp_tool
+from my_agent.utils.log import get_logger
+
+log = get_logger(__name__)
 
 # Intent별 키워드 가중 검색
 _INTENT_KEYWORDS = {
@@ -51,11 +54,11 @@ class WebAugmentNode:
 
         # 실행 조건: 지정된 intent or fallback 요청
         if not (intent in self.intents or state.get("need_web_fallback", False)):
-            print(f"[WebAugmentNode] Skipping - intent={intent} not in {self.intents}")
+            log.debug("Skipping - intent=%s not in %s", intent, self.intents)
             return state
 
         query = _build_query(state)
-        print(f"[WebAugmentNode] Searching with query: {query}")
+        log.debug("Searching with query: %s", query)
         
         resp = call_mcp_tool(
             "web_search",
@@ -67,7 +70,7 @@ class WebAugmentNode:
 
         # 실패 시 무시하고 진행
         if not resp or not resp.get("success"):
-            print(f"[WebAugmentNode] Web search failed: {resp.get('error') if resp else 'No response'}")
+            log.warning("Web search failed: %s", resp.get("error") if resp else "No response")
             return state
 
         # 불필요한 필드 제거한 깨끗한 스니펫 구성 (title, url, snippet 만 사용)
@@ -90,5 +93,5 @@ class WebAugmentNode:
             "query": query
         }
         
-        print(f"[WebAugmentNode] Found {len(clean_snippets)} web snippets")
+        log.debug("Found %d web snippets", len(clean_snippets))
         return state
@@ -3,8 +3,13 @@
 from my_agent.agent import create_graph
 from my_agent.utils.state import GraphState
 from my_agent.utils.chat_history import save_chat_history, load_chat_history
+from my_agent.utils.tracing import trace_turn
+from my_agent.utils.scheduler import request_scope
+from my_agent.utils.log import get_logger
 from typing import Dict, Any
 
+log = get_logger(__name__)
+
 def run_one_turn(user_query: str, thread_id: str = "default") -> Dict[str, Any]:
     graph = create_graph()
 
@@ -25,11 +30,8 @@ def run_one_turn(user_query: str, thread_id: str = "default") -> Dict[str, Any]:
     }
 
     try:
-        final_state = graph.invoke(initial_state)
-
-        # 디버깅 로그 추가
-        print(f"[ADAPTER] need_clarify: {final_state.get('need_clarify')}")
-        print(f"[ADAPTER] store_candidates 수: {len(final_state.get('store_candidates', []))}")
+        with trace_turn(thread_id, user_query) as turn, request_scope():
+            final_state = graph.invoke(initial_state)
 
         # 히스토리 저장 (user_info도 함께 저장)
         metadata = {
@@ -43,11 +45,11 @@ def run_one_turn(user_query: str, thread_id: str = "default") -> Dict[str, Any]:
             metadata=metadata
         )
 
-        # 디버깅 로그
-        print(f"[ADAPTER] 그래프 실행 완료")
-        print(f"[ADAPTER] need_clarify: {final_state.get('need_clarify')}")
-        print(f"[ADAPTER] store_id: {final_state.get('store_id')}")
-        print(f"[ADAPTER] error: {final_state.get('error')}")
+        log.debug(
+            "그래프 실행 완료: need_clarify=%s, store_id=%s, 후보 %d개, error=%s",
+            final_state.get("need_clarify"), final_state.get("store_id"),
+            len(final_state.get("store_candidates", [])), final_state.get("error"),
+        )
 
         # 결과 패키징
         result = {
@@ -70,8 +72,10 @@ def run_one_turn(user_query: str, thread_id: str = "default") -> Dict[str, Any]:
             result["actions"] = final_state["actions"]
         if final_state.get("web_snippets"):
             result["web_snippets"] = final_state["web_snippets"]
-
-        print(f"[ADAPTER] result['store_candidates'] 수: {len(result.get('store_candidates', []))}")
+        if final_state.get("retry_count"):
+            result["retry_count"] = final_state["retry_count"]
+        if turn is not None:
+            result["trace"] = turn.summary
         
         return result
 
@@ -101,7 +105,8 @@ def run_one_turn_with_store(user_query: str, store_id: str, thread_id: str = "de
     }
 
     try:
-        final_state = graph.invoke(initial_state)
+        with trace_turn(thread_id, user_query) as turn, request_scope():
+            final_state = graph.invoke(initial_state)
 
         # user_info 채우기 (store_id로부터)
         if not final_state.get("user_info") and store_id:
@@ -146,6 +151,10 @@ def run_one_turn_with_store(user_query: str, store_id: str, thread_id: str = "de
             result["actions"] = final_state["actions"]
         if final_state.get("web_snippets"):
             result["web_snippets"] = final_state["web_snippets"]
+        if final_state.get("retry_count"):
+            result["retry_count"] = final_state["retry_count"]
+        if turn is not None:
+            result["trace"] = turn.summary
 
         return result
 
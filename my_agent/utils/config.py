@@ -68,17 +68,120 @@ DUCKDB_PATH = _get_config(
     (DATA_DIR / "data.duckdb").as_posix()
 )
 
-# DuckDB 사용 여부 토글 (True: DuckDB, False: CSV)
-USE_DUCKDB = get_bool("USE_DUCKDB", True) 
+# 기준년월 hive 파티션 Parquet (scripts/build_duckdb.py --parquet) — 프로세스 간 읽기 전용 공유
+PARQUET_DIR = _get_config(
+    "PARQUET_DIR",
+    (DATA_DIR / "parquet").as_posix()
+)
+
+# Arrow IPC 메모리 맵 저장소 (USE_DUCKDB=False 폴백) — scripts/build_arrow_store.py 로 생성
+ARROW_DIR = _get_config(
+    "ARROW_DIR",
+    (DATA_DIR / "arrow").as_posix()
+)
+
+# DuckDB 사용 여부 토글 (True: DuckDB, False: Arrow 메모리 맵)
+USE_DUCKDB = get_bool("USE_DUCKDB", True)
+
+# 시계열(다음달 매출 구간) 예측 모델/데이터
+PREDICTOR_PATH = _get_config(
+    "PREDICTOR_PATH",
+    (PROJECT_ROOT / "AutogluonModels" / "ag-20251018_185635").as_posix()
+)
+LABEL_ENCODER_PATH = _get_config(
+    "LABEL_ENCODER_PATH",
+    (DATA_DIR / "label_encoder_store.pkl").as_posix()
+)
+PREPROCESSED_CSV = _get_config(
+    "PREPROCESSED_CSV",
+    (DATA_DIR / "preprocessed_df.csv").as_posix()
+)
+# (가맹점 ID, 기준년월) 정렬 Parquet — scripts/build_features.py 로 생성, 없으면 CSV 사용
+PREPROCESSED_PARQUET = _get_config(
+    "PREPROCESSED_PARQUET",
+    (DATA_DIR / "preprocessed_df.parquet").as_posix()
+)
+# AutoGluon 모델 메모리 상주(persist) / 프로세스 시작 시 워밍업
+PREDICTOR_PERSIST = get_bool("PREDICTOR_PERSIST", True)
+PREDICTOR_WARMUP = get_bool("PREDICTOR_WARMUP", True)
+# 온라인 예측 백엔드 ("ensemble": AutoGluon 앙상블, "lite": 증류 LightGBM 단일 모델)
+PREDICTOR_BACKEND = str(_get_config("PREDICTOR_BACKEND", "ensemble")).strip().lower()
+# 증류 모델 — scripts/distill_predictor.py 로 생성 (패리티 리포트는 같은 이름의 .json)
+LITE_MODEL_PATH = _get_config(
+    "LITE_MODEL_PATH",
+    (DATA_DIR / "sales_band_lite.joblib").as_posix()
+)
 
 # 검색 파라미터 (타임아웃/TopK/신선도)
 SEARCH_TIMEOUT        = float(_get_config("SEARCH_TIMEOUT", "12"))
 DEFAULT_TOPK          = int(_get_config("SEARCH_TOPK", "5"))
 DEFAULT_RECENCY_DAYS  = int(_get_config("SEARCH_RECENCY_DAYS", "90"))
 
+# 웹 검색 결과 캐시 (mcp/search_cache.py) — 메모리 LRU + SQLite, TTL 기본값은 검색 신선도 기간
+SEARCH_CACHE_ENABLED     = get_bool("SEARCH_CACHE_ENABLED", True)
+SEARCH_CACHE_PATH        = _get_config("SEARCH_CACHE_PATH", (DATA_DIR / "search_cache.sqlite").as_posix())
+SEARCH_CACHE_TTL_DAYS    = float(_get_config("SEARCH_CACHE_TTL_DAYS", str(DEFAULT_RECENCY_DAYS)))
+SEARCH_CACHE_MAX_ENTRIES = int(_get_config("SEARCH_CACHE_MAX_ENTRIES", "20000"))
+SEARCH_CACHE_MEM_ENTRIES = int(_get_config("SEARCH_CACHE_MEM_ENTRIES", "512"))
+
+# 외부 HTTP 호출 (mcp/http_client.py) — 연결 풀 / 재시도 / 호스트별 동시성 / 서킷 브레이커
+HTTP_POOL_SIZE          = int(_get_config("HTTP_POOL_SIZE", "16"))
+HTTP_MAX_PER_HOST       = int(_get_config("HTTP_MAX_PER_HOST", "8"))
+HTTP_RETRIES            = int(_get_config("HTTP_RETRIES", "2"))
+HTTP_BACKOFF_BASE       = float(_get_config("HTTP_BACKOFF_BASE", "0.25"))
+HTTP_BACKOFF_MAX        = float(_get_config("HTTP_BACKOFF_MAX", "2.0"))
+HTTP_BREAKER_THRESHOLD  = int(_get_config("HTTP_BREAKER_THRESHOLD", "5"))
+HTTP_BREAKER_COOLDOWN   = float(_get_config("HTTP_BREAKER_COOLDOWN", "30"))
+
+# 기상청 단기예보 격자 캐시 (mcp/tools_weather.py) — 같은 5km 격자의 매장은 예보를 공유
+WEATHER_PREFETCH         = get_bool("WEATHER_PREFETCH", True)        # 전체 매장 격자 백그라운드 선조회
+WEATHER_PREFETCH_WORKERS = int(_get_config("WEATHER_PREFETCH_WORKERS", "4"))
+WEATHER_CACHE_RETRY_S    = float(_get_config("WEATHER_CACHE_RETRY_S", "600"))  # 이전 발표 폴백 결과 재조회 간격
+
+# 외부 API 엔드포인트 (부하 테스트 시 scripts/loadtest_agent.py의 로컬 스텁으로 교체)
+SERPER_URL = _get_config("SERPER_URL", "https://google.serper.dev/search")
+KMA_URL = _get_config(
+    "KMA_URL",
+    "https://apihub.kma.go.kr/api/typ02/openApi/VilageFcstInfoService_2.0/getVilageFcst"
+)
+
+# 로깅 (my_agent/utils/log.py) — 운영: INFO 이상만, 디버그 덤프는 LOG_LEVEL=DEBUG에서만 포맷됨
+LOG_LEVEL = str(_get_config("LOG_LEVEL", "INFO")).strip().upper()
+LOG_FORMAT = str(_get_config("LOG_FORMAT", "text")).strip().lower()   # text | json
+LOG_ASYNC = get_bool("LOG_ASYNC", True)                                # 큐 핸들러 (출력은 별도 스레드)
+LOG_SAMPLE_RATE = float(_get_config("LOG_SAMPLE_RATE", "0.1"))        # 고빈도 이벤트(sampled) 기록 비율
+
+# 타이밍 스팬 기록 (my_agent/utils/tracing.py) — TRACE_DIR에 spans/turns JSONL
+TRACE_ENABLED = get_bool("TRACE_ENABLED", False)
+TRACE_DIR = _get_config("TRACE_DIR", (PROJECT_ROOT / "traces").as_posix())
+
+# 의도 노드 지표 빌더 병렬 실행 (my_agent/utils/scheduler.py)
+METRIC_WORKERS = int(_get_config("METRIC_WORKERS", "8"))          # 프로세스 공용 스레드 풀 크기
+METRIC_TIMEOUT = float(_get_config("METRIC_TIMEOUT", "10"))       # 빌더별 제한 시간 (초, 실행 시작부터)
+METRIC_QUEUE_TIMEOUT = float(_get_config("METRIC_QUEUE_TIMEOUT", str(METRIC_TIMEOUT)))   # 풀 시작 대기 제한 (초)
+METRIC_MAX_PER_REQUEST = int(_get_config("METRIC_MAX_PER_REQUEST", "4"))                # 요청(호출)별 동시 실행 빌더 수
+
+# 의도별 프롬프트 토큰 예산 (my_agent/utils/prompt_builder.py) — 초과 시 우선순위 낮은 항목부터 제외, 0 = 제한 없음
+PROMPT_TOKEN_BUDGETS = {
+    intent: int(_get_config(f"PROMPT_TOKEN_BUDGET_{intent.upper()}", default))
+    for intent, default in {
+        "general": "2000", "issue": "2200", "revisit": "2000",
+        "season": "2000", "cooperation": "2200", "sns": "2400",
+    }.items()
+}
+
+# 정적 프롬프트 접두부 캐시 (my_agent/utils/prompt_cache.py) — Gemini 명시적 컨텍스트 캐시(google-genai 설치 시)
+PROMPT_CACHE_ENABLED    = get_bool("PROMPT_CACHE_ENABLED", True)
+PROMPT_CACHE_TTL        = int(_get_config("PROMPT_CACHE_TTL", "3600"))           # 캐시 보관 시간 (초)
+PROMPT_CACHE_MIN_TOKENS = int(_get_config("PROMPT_CACHE_MIN_TOKENS", "1024"))    # 모델 최소 캐시 크기 미만이면 암묵적 접두부 캐시만 사용
+PROMPT_CACHE_RETRY_S    = float(_get_config("PROMPT_CACHE_RETRY_S", "600"))      # 캐시 생성 실패 후 재시도 간격
+
 # MCP 설정
 MCP_ENABLED = str(_get_config("MCP_ENABLED", "1")) == "1"
 MCP_SERVER_PATH = (MCP_DIR / "server.py").as_posix()
+# MCP 서버 메트릭 (Prometheus 텍스트) HTTP 포트 — 0이면 MCP 리소스(metrics://prometheus)로만 제공
+MCP_METRICS_PORT = int(_get_config("MCP_METRICS_PORT", "0"))
+MCP_METRICS_HOST = _get_config("MCP_METRICS_HOST", "127.0.0.1")
 
 # LLM 설정
 LLM_MODEL = _get_config("LLM_MODEL", "gemini-2.5-flash")
@@ -88,6 +191,7 @@ LLM_MAX_RETRIES = int(_get_config("LLM_MAX_RETRIES", "2"))
 # 정책 토글
 CONFIRM_ON_MULTI = str(_get_config("CONFIRM_ON_MULTI", "0")) == "1"
 ENABLE_RELEVANCE_CHECK = str(_get_config("ENABLE_RELEVANCE_CHECK", "1")) == "1"
+RELEVANCE_MAX_RETRIES = int(_get_config("RELEVANCE_MAX_RETRIES", "1"))   # 관련성 검사 실패 시 LLM 답변만 재생성하는 최대 횟수
 ENABLE_MEMORY = str(_get_config("ENABLE_MEMORY", "1")) == "1"
 
 IntentType = Literal["SNS", "REVISIT", "ISSUE", "GENERAL"]
@@ -0,0 +1,163 @@
+# my_agent/utils/duckdb_swap.py
+# -*- coding: utf-8 -*-
+"""
+DuckDB 파일 무중단 교체 유틸
+
+- shadow_database: 섀도 파일(data.duckdb.shadow)에 쓰고 성공 시 os.replace로 원자적 교체
+  (읽기 전용 연결은 기존 파일을 계속 읽으므로 갱신 중에도 막히지 않음)
+- readonly_connection: 프로세스 공용 읽기 전용 연결, 파일 (inode, mtime)이 바뀌면 재연결
+  · 세대별로 새 메모리 인스턴스에 파일을 READ_ONLY로 ATTACH (DuckDB는 같은 경로의 DB 인스턴스를
+    프로세스 내에서 공유하므로, 구 연결이 살아 있는 동안 같은 경로로 connect하면 교체 전 파일이 보임)
+  · 구 연결은 닫지 않음 — 다른 스레드에서 실행 중인 쿼리가 끝나고 커서가 모두 사라지면 GC로 정리
+- readonly_cursor: 공용 연결의 스레드별 커서 (연결 객체 하나를 여러 스레드가 동시에 쓰면
+  쿼리가 직렬화되고 안전하지 않으므로, 동시 세션은 같은 DB 인스턴스를 커서로 나눠 씀)
+  · 재연결 시 모든 스레드의 구 세대 커서 참조를 버림 (진행 중인 쿼리는 호출자 참조로 끝까지 실행)
+- pool_stats: 열린 연결/커서 수 (mcp/telemetry.py 게이지)
+"""
+import os
+import shutil
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+import duckdb
+
+
+def file_signature(path) -> Optional[Tuple[int, int]]:
+    """(inode, mtime_ns) — 파일 없으면 None"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns)
+
+
+_READONLY: Dict[str, Tuple[Tuple[int, int], duckdb.DuckDBPyConnection]] = {}
+_READONLY_LOCK = threading.Lock()
+_RESERVED_CATALOGS = {"memory", "system", "temp"}
+
+
+class _CursorMap(dict):
+    """스레드별 {경로: (연결, 커서)} (WeakSet에 넣도록 dict 상속 + 객체 동일성 비교)"""
+
+    __hash__ = object.__hash__
+    __eq__ = object.__eq__
+
+
+_THREAD_CURSORS = threading.local()
+_CURSOR_MAPS: "weakref.WeakSet[_CursorMap]" = weakref.WeakSet()
+_OPEN_CURSORS: "weakref.WeakSet[duckdb.DuckDBPyConnection]" = weakref.WeakSet()
+
+
+def _catalog_name(path: str) -> str:
+    # 직접 connect할 때와 같은 카탈로그 이름(파일명 stem)을 유지
+    stem = Path(path).stem
+    return f"{stem}_ro" if stem in _RESERVED_CATALOGS else stem
+
+
+def _use_catalog(con: duckdb.DuckDBPyConnection, path: str) -> duckdb.DuckDBPyConnection:
+    """ATTACH한 파일 카탈로그를 기본값으로 (USE는 커서마다 따로 적용됨)"""
+    con.execute(f'USE "{_catalog_name(path)}"')
+    return con
+
+
+def _open_readonly(path: str) -> duckdb.DuckDBPyConnection:
+    """새 메모리 인스턴스 + 파일 READ_ONLY ATTACH (세대마다 별도 인스턴스)"""
+    con = duckdb.connect()
+    quoted = path.replace("'", "''")
+    con.execute(f"ATTACH '{quoted}' AS \"{_catalog_name(path)}\" (READ_ONLY)")
+    return _use_catalog(con, path)
+
+
+def _drop_stale_cursors(key: str, old: duckdb.DuckDBPyConnection):
+    """모든 스레드의 구 세대 커서 참조 제거 (닫지 않음 — 실행 중인 쿼리는 그대로 완료)"""
+    for cursors in list(_CURSOR_MAPS):
+        cached = cursors.get(key)
+        if cached is not None and cached[0] is old:
+            cursors.pop(key, None)
+
+
+def readonly_connection(db_path) -> Optional[duckdb.DuckDBPyConnection]:
+    """경로별 공용 읽기 전용 연결 (파일 없으면 None, 교체되면 재연결)"""
+    key = str(Path(db_path).expanduser())
+    signature = file_signature(key)
+    if signature is None:
+        return None
+
+    cached = _READONLY.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with _READONLY_LOCK:
+        cached = _READONLY.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        con = _open_readonly(key)
+        _READONLY[key] = (signature, con)
+        if cached is not None:
+            # 구 연결은 참조만 버림 — 다른 스레드의 진행 중 쿼리가 끝나면 GC
+            _drop_stale_cursors(key, cached[1])
+        return con
+
+
+def readonly_cursor(db_path) -> Optional[duckdb.DuckDBPyConnection]:
+    """공용 읽기 전용 연결의 현재 스레드 전용 커서 (파일 없으면 None, 재연결되면 새 커서)"""
+    con = readonly_connection(db_path)
+    if con is None:
+        return None
+    cursors = getattr(_THREAD_CURSORS, "by_path", None)
+    if cursors is None:
+        cursors = _THREAD_CURSORS.by_path = _CursorMap()
+        _CURSOR_MAPS.add(cursors)
+    key = str(Path(db_path).expanduser())
+    cached = cursors.get(key)
+    if cached is not None and cached[0] is con:
+        return cached[1]
+    # 처음이거나 연결이 교체됨 → 구 세대 커서는 버리고 새 연결에서 생성
+    cursor = _use_catalog(con.cursor(), key)
+    cursors[key] = (con, cursor)
+    _OPEN_CURSORS.add(cursor)
+    return cursor
+
+
+def pool_stats() -> Dict[str, int]:
+    """공용 연결 / 스레드별 커서 수 (종료된 스레드의 커서는 GC되면 빠짐) — 메트릭용"""
+    return {"connections": len(_READONLY), "cursors": len(_OPEN_CURSORS)}
+
+
+def shadow_path(db_path) -> Path:
+    db_path = Path(db_path)
+    return db_path.with_name(db_path.name + ".shadow")
+
+
+@contextmanager
+def shadow_database(db_path, copy_existing: bool = True) -> Iterator[duckdb.DuckDBPyConnection]:
+    """
+    섀도 DB에 대한 쓰기 연결을 제공하고, 블록이 정상 종료되면 원본과 원자적으로 교체
+
+    Args:
+        db_path: 교체 대상 DuckDB 파일
+        copy_existing: True → 기존 DB를 복사해서 시작 (증분), False → 빈 DB에서 시작 (전체 재구축)
+    """
+    db_path = Path(db_path).expanduser()
+    shadow = shadow_path(db_path)
+    for p in (shadow, Path(str(shadow) + ".wal")):
+        if p.exists():
+            p.unlink()
+
+    if copy_existing and db_path.exists():
+        shutil.copyfile(db_path, shadow)
+
+    con = duckdb.connect(str(shadow))
+    try:
+        yield con
+        con.execute("CHECKPOINT")  # WAL을 본 파일에 반영한 뒤 교체
+        con.close()
+        os.replace(shadow, db_path)
+    except BaseException:
+        con.close()
+        if shadow.exists():
+            shadow.unlink()
+        raise
@@ -0,0 +1,111 @@
+# my_agent/utils/log.py
+# -*- coding: utf-8 -*-
+"""
+레벨 기반 로거 (my_agent.*, mcp.* 공용)
+
+- get_logger(__name__): 표준 logging 로거 — 메시지는 %-인자로 넘겨 레벨이 꺼져 있으면 포맷하지 않음
+  예) log.debug("user_info=%s", user_info)
+- LOG_ASYNC=true: QueueHandler → 별도 스레드(QueueListener)가 stdout에 기록
+  (요청 스레드는 큐에 넣기만 하므로 stdout 잠금 경합이 없음)
+- 고빈도 이벤트는 extra=SAMPLED 로 남기면 LOG_SAMPLE_RATE 비율만 기록 (WARNING 이상은 항상 기록)
+- LOG_FORMAT=json: 한 줄 JSON (ts, level, logger, msg, + extra 필드)
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+from datetime import datetime
+
+from my_agent.utils.config import LOG_LEVEL, LOG_FORMAT, LOG_ASYNC, LOG_SAMPLE_RATE
+
+# 이 로거들 아래(__name__)는 모두 같은 핸들러를 씀
+ROOT_LOGGERS = ("my_agent", "mcp", "forecast")
+
+# 고빈도 이벤트 표시 (log.debug(..., extra=SAMPLED))
+SAMPLED = {"sampled": True}
+
+_STD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "sampled"}
+_CONFIGURED = False
+_CONFIG_LOCK = threading.Lock()
+_LISTENER = None
+
+
+class _SamplingFilter(logging.Filter):
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sampled", False) or record.levelno >= logging.WARNING:
+            return True
+        return random.random() < self.rate
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        payload.update({k: v for k, v in vars(record).items() if k not in _STD_ATTRS})
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """기록 시점의 sys.stdout에 출력 (Streamlit / 테스트의 stdout 교체를 따라감)"""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def _configure():
+    global _CONFIGURED, _LISTENER
+    with _CONFIG_LOCK:
+        if _CONFIGURED:
+            return
+        out = _StdoutHandler()
+        if LOG_FORMAT == "json":
+            out.setFormatter(_JsonFormatter())
+        else:
+            out.setFormatter(logging.Formatter("%(asctime)s %(levelname)-5s [%(name)s] %(message)s", "%H:%M:%S"))
+
+        if LOG_ASYNC:
+            q: queue.SimpleQueue = queue.SimpleQueue()
+            handler: logging.Handler = logging.handlers.QueueHandler(q)
+            _LISTENER = logging.handlers.QueueListener(q, out, respect_handler_level=True)
+            _LISTENER.start()
+            atexit.register(_LISTENER.stop)
+        else:
+            handler = out
+        # 샘플링은 큐에 넣기 전에 (버려질 레코드는 포맷하지 않음)
+        handler.addFilter(_SamplingFilter(LOG_SAMPLE_RATE))
+
+        level = logging.getLevelName(LOG_LEVEL)
+        if not isinstance(level, int):
+            level = logging.INFO
+        for name in ROOT_LOGGERS:
+            root = logging.getLogger(name)
+            root.setLevel(level)
+            root.addHandler(handler)
+            root.propagate = False
+        _CONFIGURED = True
+
+
+def get_logger(name: str) -> logging.Logger:
+    """모듈 로거 (최초 호출 시 핸들러 구성)"""
+    _configure()
+    return logging.getLogger(name)
@@ -0,0 +1,231 @@
+# my_agent/utils/prompt_builder.py
+# -*- coding: utf-8 -*-
+"""
+의도 노드 프롬프트 조립 (간결 직렬화 + 토큰 예산)
+
+- format_kv / format_metrics / format_table: dict repr 대신 key=value·표 형태, 숫자는 반올림
+- estimate_tokens: 로컬 토큰 수 추정 (API 호출 없음)
+- PromptTemplate / register_template: 정적 접두부(역할·출력 형식·작성 규칙·참고 자료)를 이름+버전으로 등록
+  · system 메시지로 맨 앞에 보내 접두부 캐시(my_agent/utils/prompt_cache.py)가 적중하도록 함
+  · 내용이 바뀌면 digest가 바뀌어 캐시 키도 바뀜 (버전을 올리지 않은 변경은 경고)
+- PromptBuilder: 동적 섹션(질문/가게 정보/지표/웹)을 순서대로 쌓고, 의도별 예산(PROMPT_TOKEN_BUDGETS)을 넘으면
+  우선순위 숫자가 큰 항목부터 제외 (0 = 항상 포함, 예산에는 템플릿 토큰도 포함)
+"""
+import hashlib
+import math
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from my_agent.utils.config import PROMPT_TOKEN_BUDGETS
+from my_agent.utils.tracing import current_span
+from my_agent.utils.log import get_logger
+
+log = get_logger(__name__)
+
+# 지표 그룹별 우선순위 (숫자가 클수록 예산 초과 시 먼저 제외, 목록에 없으면 2)
+METRIC_PRIORITY = {
+    "main_metrics": 1,
+    "issue_metrics": 1,
+    "abnormal_metrics": 1,
+    "revisit_metrics": 1,
+    "revisit_abnormal": 1,
+    "season_metrics": 1,
+    "협업_metrics": 1,
+    "sns_metrics": 1,
+    "strategy_metrics": 2,
+    "general_metrics": 2,
+    "상권_단위_정보": 3,
+}
+WEB_PRIORITY = 3   # 웹 참고 정보 (답변 하단 출처 토글은 후처리에서 별도로 붙음)
+
+# 한글/한자/가나는 글자당 약 1토큰, 그 외(영문·숫자·기호·공백)는 약 4글자당 1토큰
+_WIDE_CHARS = re.compile(r"[\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u4e00-\u9fff\uac00-\ud7a3]")
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 추정 (Gemini 토크나이저 근사, 실제 값은 LLM 스팬의 tokens_in)"""
+    if not text:
+        return 0
+    wide = len(_WIDE_CHARS.findall(text))
+    return wide + math.ceil((len(text) - wide) / 4)
+
+
+def format_value(v: Any) -> str:
+    """값 1개 → 짧은 문자열 (실수는 크기에 따라 반올림)"""
+    if v is None:
+        return "-"
+    if isinstance(v, bool):
+        return "Y" if v else "N"
+    if isinstance(v, float):
+        if math.isnan(v):
+            return "-"
+        if abs(v) >= 100:
+            return str(int(round(v)))
+        return f"{round(v, 1 if abs(v) >= 1 else 3):g}"
+    if isinstance(v, (list, tuple)):
+        return "/".join(format_value(x) for x in v)
+    return " ".join(str(v).split())
+
+
+def _flatten(d: Dict[str, Any], prefix: str = "") -> Iterable:
+    for k, v in d.items():
+        key = f"{prefix}{k}"
+        if isinstance(v, dict):
+            yield from _flatten(v, f"{key}.")
+        elif v is not None:
+            yield key, v
+
+
+def format_kv(d: Optional[Dict[str, Any]], sep: str = ", ") -> str:
+    """dict → 'k=v, k=v' (결측 제외, 중첩 dict는 a.b=v)"""
+    if not d:
+        return "(없음)"
+    return sep.join(f"{k}={format_value(v)}" for k, v in _flatten(d))
+
+
+def _unwrap(v: Any) -> Any:
+    """{'coop_metrics': {...}} 처럼 키 1개짜리 래퍼는 벗겨서 표기"""
+    while isinstance(v, dict) and len(v) == 1 and isinstance(next(iter(v.values())), dict):
+        v = next(iter(v.values()))
+    return v
+
+
+def format_metrics(metrics: Optional[Dict[str, Any]]) -> List[str]:
+    """지표 그룹별 1줄: '[그룹] k=v, k=v'"""
+    lines = []
+    for group, values in (metrics or {}).items():
+        values = _unwrap(values)
+        if isinstance(values, dict):
+            if values:
+                lines.append(f"[{group}] {format_kv(values)}")
+        elif values is not None:
+            lines.append(f"[{group}] {format_value(values)}")
+    return lines
+
+
+def format_table(rows: Sequence[Dict[str, Any]], columns: Optional[Sequence[str]] = None) -> List[str]:
+    """레코드 목록 → 'a | b | c' 헤더 + 행 (열은 columns 또는 첫 행의 키)"""
+    if not rows:
+        return []
+    columns = list(columns or rows[0].keys())
+    lines = [" | ".join(columns)]
+    lines += [" | ".join(format_value(r.get(c)) for c in columns) for r in rows]
+    return lines
+
+
+class PromptTemplate:
+    """정적 프롬프트 접두부 (요청마다 바뀌지 않는 부분)"""
+
+    def __init__(self, name: str, version: str, text: str):
+        self.name = name
+        self.version = version
+        self.text = text.strip("\n") + "\n"
+        self.digest = hashlib.sha1(self.text.encode("utf-8")).hexdigest()[:8]
+        self.key = f"{name}@{version}"
+        self.cache_key = f"{self.key}-{self.digest}"   # 제공자 캐시 display_name
+        self.tokens = estimate_tokens(self.text)
+
+    def __repr__(self) -> str:
+        return f"PromptTemplate({self.cache_key}, ~{self.tokens} tokens)"
+
+
+# 등록된 템플릿 {이름@버전: PromptTemplate}
+TEMPLATES: Dict[str, PromptTemplate] = {}
+
+
+def register_template(name: str, version: str, text: str) -> PromptTemplate:
+    """정적 접두부 등록 (같은 이름@버전이 이미 있고 내용이 다르면 경고 후 교체)"""
+    template = PromptTemplate(name, version, text)
+    prev = TEMPLATES.get(template.key)
+    if prev is not None and prev.digest != template.digest:
+        log.warning("프롬프트 템플릿 %s 내용이 바뀌었지만 버전이 그대로입니다 (%s → %s)",
+                    template.key, prev.digest, template.digest)
+    TEMPLATES[template.key] = template
+    return template
+
+
+class PromptBuilder:
+    """
+    섹션 단위 프롬프트 조립기
+
+    예)
+        prompt = (PromptBuilder("issue", ISSUE_TEMPLATE)
+                  .section("질문", user_query)
+                  .metrics(state.get("metrics"))
+                  .section("웹 참고 정보", format_web_snippets(web_snippets), priority=WEB_PRIORITY)
+                  .build())
+        raw_response = invoke_with_template(self.llm, ISSUE_TEMPLATE, prompt).content
+    """
+
+    def __init__(self, intent: str, template: Optional[PromptTemplate] = None,
+                 budget: Optional[int] = None):
+        self.intent = intent
+        self.template = template
+        self.budget = PROMPT_TOKEN_BUDGETS.get(intent, 0) if budget is None else budget
+        # [제목 or None, [[본문, 우선순위], ...]]
+        self._sections: List[list] = []
+
+    def text(self, body: str) -> "PromptBuilder":
+        """고정 텍스트 (제목 없음, 항상 포함)"""
+        self._sections.append([None, [[body.strip("\n"), 0]]])
+        return self
+
+    def section(self, title: str, body: Any, priority: int = 0) -> "PromptBuilder":
+        """'## 제목' 섹션 (dict는 key=value로 직렬화)"""
+        if isinstance(body, dict) or body is None:
+            body = format_kv(body)
+        self._sections.append([title, [[str(body).strip("\n"), priority]]])
+        return self
+
+    def lines(self, title: str, lines: Sequence[str], priority: int = 0,
+              keep_first: int = 0) -> "PromptBuilder":
+        """줄 단위로 제외 가능한 섹션 (같은 우선순위면 뒤 줄부터 제외, keep_first줄은 항상 포함)"""
+        parts = [[line, 0 if i < keep_first else priority] for i, line in enumerate(lines)]
+        self._sections.append([title, parts or [["(없음)", 0]]])
+        return self
+
+    def metrics(self, metrics: Optional[Dict[str, Any]], title: str = "데이터 지표") -> "PromptBuilder":
+        """지표 그룹별 1줄, 그룹 우선순위(METRIC_PRIORITY)에 따라 제외"""
+        parts = [[line, METRIC_PRIORITY.get(group, 2)]
+                 for group, values in (metrics or {}).items()
+                 for line in format_metrics({group: values})]
+        self._sections.append([title, parts or [["(없음)", 0]]])
+        return self
+
+    def _render(self) -> str:
+        blocks = []
+        for title, parts in self._sections:
+            kept = [body for body, _ in parts if body is not None]
+            if not kept:
+                continue
+            body = "\n".join(kept)
+            blocks.append(f"## {title}\n{body}" if title else body)
+        return "\n\n".join(blocks) + "\n"
+
+    def build(self) -> str:
+        """동적 본문 생성 — 템플릿 포함 예산 안에 들어올 때까지 우선순위 숫자가 큰(같으면 뒤쪽) 항목부터 제외"""
+        base = self.template.tokens if self.template else 0
+        prompt = self._render()
+        tokens = base + estimate_tokens(prompt)
+        dropped = 0
+        if self.budget > 0 and tokens > self.budget:
+            candidates = sorted(
+                ((prio, si, pi) for si, (_, parts) in enumerate(self._sections)
+                 for pi, (_, prio) in enumerate(parts) if prio > 0),
+                reverse=True,
+            )
+            for _, si, pi in candidates:
+                self._sections[si][1][pi][0] = None
+                dropped += 1
+                prompt = self._render()
+                tokens = base + estimate_tokens(prompt)
+                if tokens <= self.budget:
+                    break
+            if tokens > self.budget:
+                log.warning("%s 프롬프트가 예산을 넘습니다 (추정 %d > %d 토큰, 필수 항목만 남음)",
+                            self.intent, tokens, self.budget)
+        log.debug("%s 프롬프트: 추정 %d 토큰 (정적 %d, 예산 %d, 제외 %d개)",
+                  self.intent, tokens, base, self.budget, dropped)
+        current_span().set(prompt_tokens_est=tokens, prompt_static_tokens=base or None,
+                           prompt_dropped=dropped or None)
+        return prompt
@@ -0,0 +1,161 @@
+# my_agent/utils/prompt_cache.py
+# -*- coding: utf-8 -*-
+"""
+정적 프롬프트 접두부 캐시
+
+의도 노드 프롬프트 = 정적 템플릿(PromptTemplate, system 메시지) + 동적 본문(질문/가게 정보/지표/웹, human 메시지)
+
+- 제공자 캐시 (Gemini 명시적 컨텍스트 캐시, google-genai 설치 + PROMPT_CACHE_ENABLED)
+  · 템플릿이 PROMPT_CACHE_MIN_TOKENS 이상이면 (모델, 템플릿 cache_key)별로 캐시를 1번 만들어 재사용
+  · 같은 display_name의 유효한 캐시가 이미 있으면(다른 프로세스가 생성) 그대로 사용
+  · 호출은 cached_content=캐시 이름 + human 메시지만 전송 (system_instruction은 캐시에 포함)
+  · 생성(원격 호출)은 잠금 밖에서 키별 single-flight — 다른 템플릿의 LLM 호출은 기다리지 않음
+  · 생성 실패 시 PROMPT_CACHE_RETRY_S 동안 재시도하지 않음, 호출 실패 시 캐시 항목을 버리고 일반 호출
+- 로컬 템플릿 캐시 (그 외)
+  · 템플릿별 SystemMessage를 1번만 만들어 재사용 → 요청마다 같은 바이트열이 맨 앞에 오므로
+    Gemini 2.5 암묵적 접두부 캐시가 적중 (캐시 읽기 토큰은 LLM 스팬의 tokens_cached)
+"""
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Tuple
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from my_agent.utils.config import (
+    GOOGLE_API_KEY, LLM_MODEL,
+    PROMPT_CACHE_ENABLED, PROMPT_CACHE_TTL, PROMPT_CACHE_MIN_TOKENS, PROMPT_CACHE_RETRY_S,
+)
+from my_agent.utils.prompt_builder import PromptTemplate
+from my_agent.utils.tracing import current_span
+from my_agent.utils.log import get_logger
+
+log = get_logger(__name__)
+
+_EXPIRY_MARGIN_S = 60   # 만료 직전 캐시는 쓰지 않음 (호출 도중 만료 방지)
+
+
+def _model_id(model: str) -> str:
+    return str(model).split("/")[-1]
+
+
+class _ContextCache:
+    """(모델, 템플릿) → Gemini cachedContents 이름 (None = 제공자 캐시 사용 안 함)"""
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], Tuple[Optional[str], float]] = {}
+        self._pending: Dict[Tuple[str, str], Future] = {}   # 생성 중인 키 (single-flight)
+        self._lock = threading.Lock()
+        self._client_lock = threading.Lock()
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from google import genai   # 선택 의존성 (없으면 ImportError → 로컬 템플릿 캐시만 사용)
+                    self._client = genai.Client(api_key=GOOGLE_API_KEY)
+        return self._client
+
+    def _create(self, template: PromptTemplate, model: str) -> Tuple[str, float]:
+        from google.genai import types
+
+        client = self._get_client()
+        now = time.time()
+        for cache in client.caches.list():
+            expires = cache.expire_time.timestamp() if cache.expire_time else 0.0
+            if (cache.display_name == template.cache_key and _model_id(cache.model) == model
+                    and expires - now > _EXPIRY_MARGIN_S):
+                log.info("프롬프트 캐시 재사용: %s (%s)", template.cache_key, cache.name)
+                return cache.name, expires - _EXPIRY_MARGIN_S
+
+        cache = client.caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                display_name=template.cache_key,
+                system_instruction=template.text,
+                ttl=f"{PROMPT_CACHE_TTL}s",
+            ),
+        )
+        expires = cache.expire_time.timestamp() if cache.expire_time else now + PROMPT_CACHE_TTL
+        log.info("프롬프트 캐시 생성: %s (%s, ~%d 토큰, TTL %ds)",
+                 template.cache_key, cache.name, template.tokens, PROMPT_CACHE_TTL)
+        return cache.name, expires - _EXPIRY_MARGIN_S
+
+    def lookup(self, template: PromptTemplate, model: str) -> Optional[str]:
+        """
+        유효한 캐시 이름 (필요하면 생성, 사용할 수 없으면 None)
+
+        잠금은 dict 확인/갱신에만 사용하고, 생성(원격 호출)은 잠금 밖에서 키별 1회만 실행
+        → 같은 템플릿 호출만 생성 완료를 기다리고, 다른 템플릿 호출은 막히지 않음
+        """
+        if not (PROMPT_CACHE_ENABLED and GOOGLE_API_KEY) or template.tokens < PROMPT_CACHE_MIN_TOKENS:
+            return None
+        key = (model, template.cache_key)
+        with self._lock:
+            name, valid_until = self._entries.get(key, (None, 0.0))
+            if valid_until > time.time():
+                return name
+            future = self._pending.get(key)
+            owner = future is None
+            if owner:
+                future = self._pending[key] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            name, valid_until = self._create(template, model)
+        except Exception as e:
+            log.warning("프롬프트 캐시 생성 실패 (%s): %s → %ds 동안 일반 호출",
+                        template.cache_key, e, PROMPT_CACHE_RETRY_S)
+            name, valid_until = None, time.time() + PROMPT_CACHE_RETRY_S
+        with self._lock:
+            self._entries[key] = (name, valid_until)
+            self._pending.pop(key, None)
+        future.set_result(name)
+        return name
+
+    def invalidate(self, template: PromptTemplate, model: str):
+        with self._lock:
+            self._entries.pop((model, template.cache_key), None)
+
+
+_CONTEXT_CACHE = _ContextCache()
+
+# 로컬 템플릿 캐시 {cache_key: SystemMessage}
+_SYSTEM_MESSAGES: Dict[str, SystemMessage] = {}
+
+
+def system_message(template: PromptTemplate) -> SystemMessage:
+    """템플릿별 SystemMessage (1번만 생성)"""
+    message = _SYSTEM_MESSAGES.get(template.cache_key)
+    if message is None:
+        message = _SYSTEM_MESSAGES[template.cache_key] = SystemMessage(content=template.text)
+    return message
+
+
+def invoke_with_template(llm: Any, template: PromptTemplate, prompt: str) -> Any:
+    """
+    정적 템플릿 + 동적 본문으로 LLM 호출 (정적 접두부가 항상 맨 앞)
+
+    Args:
+        llm: chat model (traced_llm 래퍼 포함)
+        template: 정적 접두부
+        prompt: PromptBuilder.build() 결과 (동적 본문)
+    """
+    model = _model_id(getattr(llm, "model", None) or LLM_MODEL)
+    s = current_span()
+    s.set(prompt_template=template.cache_key)
+
+    cached_content = _CONTEXT_CACHE.lookup(template, model)
+    if cached_content:
+        try:
+            resp = llm.invoke([HumanMessage(content=prompt)], cached_content=cached_content)
+            s.set(prompt_cache="context")
+            return resp
+        except Exception as e:
+            log.warning("프롬프트 캐시 호출 실패 (%s): %s → 일반 호출", template.cache_key, e)
+            _CONTEXT_CACHE.invalidate(template, model)
+
+    s.set(prompt_cache="prefix")
+    return llm.invoke([system_message(template), HumanMessage(content=prompt)])
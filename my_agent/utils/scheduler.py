@@ -0,0 +1,213 @@
+# my_agent/utils/scheduler.py
+# -*- coding: utf-8 -*-
+"""
+의도 노드의 지표 빌더 병렬 실행 + 요청 단위 메모이제이션
+
+- run_parallel: 서로 독립인 빌더를 프로세스 공용 스레드 풀(METRIC_WORKERS)에서 동시에 실행
+  · 결과/에러를 노드가 쓰던 {이름: 결과} / {이름: 에러 문자열} 형태로 반환
+  · 빌더별 제한 시간(METRIC_TIMEOUT)은 풀에서 실행을 시작한 시점부터 — 초과 시 에러로 기록하고 기다리지 않음
+    (스레드는 끝까지 실행됨 → 호출별 동시 실행 수 METRIC_MAX_PER_REQUEST로 멈춘 작업의 풀 점유를 제한)
+  · contextvars를 작업마다 복사 → 트레이싱 스팬과 요청 메모가 호출 노드의 턴에 그대로 연결
+- request_scope / memoize: 한 턴 안에서 같은 조회(가맹점/상권 데이터 등)는 1번만 실행
+  · 동시에 같은 키를 요청하면 먼저 시작한 호출의 결과를 기다려 공유
+  · 빌더마다 load_store_profile_data를 부르므로, 병렬 실행 시 DB 조회가 빌더 수만큼 늘지 않게 함
+
+DuckDB 커서는 스레드 간 공유할 수 없으므로 각 작업 스레드는 공용 읽기 전용 연결에서
+스레드별 커서를 사용합니다 (duckdb_swap.readonly_cursor).
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Hashable, Iterator, Optional, Tuple
+
+from my_agent.utils.config import (
+    METRIC_WORKERS, METRIC_TIMEOUT, METRIC_QUEUE_TIMEOUT, METRIC_MAX_PER_REQUEST,
+)
+from my_agent.utils.tracing import span
+from my_agent.utils.log import get_logger
+
+log = get_logger(__name__)
+
+
+# 요청 단위 메모
+class _Memo:
+    def __init__(self):
+        self._futures: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = self._futures[key] = Future()
+        if not owner:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            # 실패는 기억하지 않음 (다음 호출이 다시 시도)
+            with self._lock:
+                self._futures.pop(key, None)
+            future.set_exception(e)
+            raise
+        future.set_result(result)
+        return result
+
+
+_REQUEST_MEMO: contextvars.ContextVar = contextvars.ContextVar("request_memo", default=None)
+
+
+@contextmanager
+def request_scope() -> Iterator[None]:
+    """요청(턴) 단위 메모 범위 (이미 범위 안이면 바깥 범위를 그대로 사용)"""
+    if _REQUEST_MEMO.get() is not None:
+        yield
+        return
+    token = _REQUEST_MEMO.set(_Memo())
+    try:
+        yield
+    finally:
+        _REQUEST_MEMO.reset(token)
+
+
+def memoize(key: Hashable, fn: Callable[[], Any]) -> Any:
+    """요청 범위 안이면 key별 1회만 실행, 범위 밖이면 그냥 실행"""
+    memo = _REQUEST_MEMO.get()
+    if memo is None:
+        return fn()
+    return memo.get_or_compute(key, fn)
+
+
+# 병렬 실행
+_POOL: Optional[ThreadPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+# 시간 초과 후에도 아직 실행 중인 작업 수 (풀 스레드를 점유 중)
+_STUCK = 0
+_STUCK_LOCK = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = ThreadPoolExecutor(max_workers=max(1, METRIC_WORKERS), thread_name_prefix="metric")
+    return _POOL
+
+
+class _Task:
+    """run_parallel 작업 1개 — 제한 시간은 풀에서 실행을 시작한 시점(started_at)부터 계산"""
+    __slots__ = ("name", "fn", "context", "future", "started", "started_at", "abandoned")
+
+    def __init__(self, name: str, fn: Callable[[], Any]):
+        self.name = name
+        self.fn = fn
+        self.context = contextvars.copy_context()
+        self.future: Future = Future()
+        self.started = threading.Event()
+        self.started_at = 0.0
+        self.abandoned = False   # 시간 초과로 호출자가 결과를 포기함 (_STUCK_LOCK 보호)
+
+
+class _Batch:
+    """한 번의 run_parallel 호출 — 동시에 풀에 올리는 작업 수를 max_concurrency로 제한"""
+
+    def __init__(self, tasks: Deque[_Task]):
+        self._queue = tasks
+        self._lock = threading.Lock()
+
+    def submit_next(self):
+        with self._lock:
+            if not self._queue:
+                return
+            task = self._queue.popleft()
+        _get_pool().submit(task.context.run, self._run_task, task)
+
+    def _run_task(self, task: _Task):
+        global _STUCK
+        try:
+            if not task.future.set_running_or_notify_cancel():
+                return   # 시작 대기 중 취소됨
+            task.started_at = time.monotonic()
+            task.started.set()
+            try:
+                with span(task.name, kind="metric"):
+                    result = task.fn()
+            except BaseException as e:
+                task.future.set_exception(e)
+            else:
+                task.future.set_result(result)
+            with _STUCK_LOCK:
+                if task.abandoned:
+                    _STUCK -= 1
+        finally:
+            # 끝난 작업의 자리만 다음 작업에 넘김 → 멈춘 작업은 이 요청의 자리를 계속 차지
+            self.submit_next()
+
+
+def run_parallel(
+    tasks: Dict[str, Callable[[], Any]],
+    timeout: Optional[float] = None,
+    timeouts: Optional[Dict[str, float]] = None,
+    max_concurrency: Optional[int] = None,
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    독립 작업 동시 실행
+
+    - 제한 시간은 작업이 풀에서 실행을 시작한 시점부터 계산 (큐 대기 시간은 포함하지 않음)
+    - 시작 대기는 호출 시점부터 METRIC_QUEUE_TIMEOUT까지만 — 그때까지 시작하지 못한 작업은 취소
+    - 시간 초과된 작업의 스레드는 끝까지 실행되며 풀 스레드 1개를 계속 점유함
+      → 한 호출이 동시에 올리는 작업 수를 max_concurrency(METRIC_MAX_PER_REQUEST)로 제한해
+        멈춘 빌더가 있어도 한 요청이 점유하는 스레드는 그 수를 넘지 않음
+        (METRIC_WORKERS는 METRIC_MAX_PER_REQUEST보다 크게 두어야 다른 요청이 계속 진행됨)
+
+    Args:
+        tasks: {이름: 인자 없는 함수}
+        timeout: 작업별 기본 제한 시간 (초, None → METRIC_TIMEOUT)
+        timeouts: 작업별 제한 시간 덮어쓰기
+        max_concurrency: 이 호출의 동시 실행 작업 수 (None → METRIC_MAX_PER_REQUEST)
+
+    Returns:
+        (results, errors) — 성공한 작업은 results[이름], 예외/시간 초과는 errors[이름]
+    """
+    global _STUCK
+    timeout = METRIC_TIMEOUT if timeout is None else timeout
+    timeouts = timeouts or {}
+    max_concurrency = METRIC_MAX_PER_REQUEST if max_concurrency is None else max_concurrency
+
+    t0 = time.monotonic()
+    queued = [_Task(name, fn) for name, fn in tasks.items()]
+    batch = _Batch(deque(queued))
+    for _ in range(min(len(queued), max(1, max_concurrency))):
+        batch.submit_next()
+
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    for task in queued:
+        name, limit = task.name, timeouts.get(task.name, timeout)
+        if not task.started.wait(max(0.0, METRIC_QUEUE_TIMEOUT - (time.monotonic() - t0))):
+            if task.future.cancel():
+                errors[name] = f"queue timeout ({METRIC_QUEUE_TIMEOUT:g}s)"
+                log.warning("%s 시작 대기 시간 초과 (%.1fs) → 취소 (멈춘 작업 %d개)",
+                            name, METRIC_QUEUE_TIMEOUT, _STUCK)
+                continue
+            task.started.wait()   # 취소 직전에 시작됨
+        remaining = max(0.0, limit - (time.monotonic() - task.started_at))
+        try:
+            results[name] = task.future.result(timeout=remaining)
+        except FutureTimeoutError:
+            with _STUCK_LOCK:
+                if not task.future.done():
+                    task.abandoned = True
+                    _STUCK += 1
+            errors[name] = f"timeout ({limit:g}s)"
+            log.warning("%s 시간 초과 (%.1fs) → 결과 없이 진행 (멈춘 작업 %d개)", name, limit, _STUCK)
+        except Exception as e:
+            errors[name] = str(e)
+            log.warning("%s 실패: %s", name, e)
+    return results, errors
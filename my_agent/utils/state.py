@@ -38,6 +38,8 @@ class GraphState(TypedDict):
     metrics: Optional[Dict[str, Any]]       # 각 노드 목적에 맞는 메트릭 묶음
     raw_response: Optional[str]             # LLM 원문(선택)
     final_response: Optional[str]           # 사용자에게 보여줄 응답
+    prompt: Optional[str]                   # 의도 노드가 만든 동적 프롬프트 본문 (재생성 시 재사용)
+    prompt_template: Optional[str]          # 정적 프롬프트 템플릿 키 (이름@버전)
     
     # 액션(선택)
     actions: Optional[List[Dict[str, Any]]] # 후처리/노드가 필요 시 채움
@@ -48,7 +50,8 @@ class GraphState(TypedDict):
     
     # 제어
     relevance_passed: bool
-    retry_count: int
+    relevance_reason: Optional[str]  # 관련성 검사 실패 사유 (재생성 보정 지시에 사용)
+    retry_count: int                 # 재생성 횟수 (RELEVANCE_MAX_RETRIES까지)
     error: Optional[str]
 
     # 내부 데이터 부족 시 웹 보강 트리거 
@@ -18,6 +18,11 @@ from mcp.adapter_client import call_mcp_tool
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 from my_agent.utils.config import GOOGLE_API_KEY, LLM_MODEL, LLM_TEMPERATURE
+from my_agent.utils.tracing import traced_llm
+from my_agent.utils.scheduler import memoize
+from my_agent.utils.log import get_logger
+
+log = get_logger(__name__)
 
 # Helpers
 def normalize_store_name(name: str) -> str:
@@ -55,11 +60,11 @@ class StoreResolver:
     """LLM 기반 가맹점 정보 추출"""
     
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
+        self.llm = traced_llm(ChatGoogleGenerativeAI(
             model=cfg.LLM_MODEL,
             google_api_key=cfg.GOOGLE_API_KEY,
             temperature=0.0  # 추출 작업은 온도 낮게
-        )
+        ), "store_resolver")
     
     def extract_store_info(self, user_query: str) -> Optional[str]:
         """
@@ -107,14 +112,14 @@ class StoreResolver:
             
             # "NONE" 또는 빈 값 체크
             if extracted.upper() in ["NONE", "없음", "N/A", ""]:
-                print("[RESOLVER] LLM 추출 결과: 가맹점 정보 없음")
+                log.debug("LLM 추출 결과: 가맹점 정보 없음")
                 return None
             
-            print(f"[RESOLVER] LLM 추출 결과: '{extracted}'")
+            log.debug("LLM 추출 결과: %r", extracted)
             return extracted
             
         except Exception as e:
-            print(f"[RESOLVER] LLM 추출 실패: {e}")
+            log.warning("LLM 추출 실패: %s", e)
             return None
 
 # 싱글톤 인스턴스
@@ -139,7 +144,7 @@ def resolve_store(state: GraphState) -> GraphState:
     
     # 이미 store_id가 있으면 스킵
     if state.get("store_id"):
-        print(f"[RESOLVER] store_id 이미 존재: {state['store_id']}")
+        log.debug("store_id 이미 존재: %s", state["store_id"])
         state["need_clarify"] = False
         return state
     
@@ -149,10 +154,7 @@ def resolve_store(state: GraphState) -> GraphState:
         state["need_clarify"] = True
         return state
     
-    print("\n" + "="*60)
-    print("[RESOLVER] 가맹점 검색 시작")
-    print(f"[RESOLVER] 사용자 질문: '{user_query}'")
-    print("="*60)
+    log.debug("가맹점 검색 시작: %r", user_query)
     
     # 1. LLM으로 가맹점 관련 텍스트 추출
     resolver = get_resolver()
@@ -160,7 +162,7 @@ def resolve_store(state: GraphState) -> GraphState:
     
     if not search_query:
         # 가맹점 정보 없음 → GENERAL 모드
-        print("[RESOLVER] 가맹점 정보 없음 → GENERAL 모드")
+        log.info("가맹점 정보 없음 → GENERAL 모드")
         state["store_id"] = None
         state["user_info"] = None
         state["need_clarify"] = False
@@ -169,7 +171,7 @@ def resolve_store(state: GraphState) -> GraphState:
     
     # 2. MCP search_merchant 호출
     #    (이름/번호 자동 구분 + DB 조회는 MCP가 담당)
-    print(f"[RESOLVER] 검색 쿼리: '{search_query}'")
+    log.debug("검색 쿼리: %r", search_query)
     
     try:
         result = call_mcp_tool("search_merchant", merchant_name=search_query)
@@ -179,7 +181,7 @@ def resolve_store(state: GraphState) -> GraphState:
         return state
     
     search_type = result.get("search_type", "unknown")
-    print(f"[RESOLVER] 검색 유형: {search_type}")
+    log.debug("검색 유형: %s", search_type)
     
     # 3. 결과 처리
     if not result.get("found"):
@@ -190,7 +192,7 @@ def resolve_store(state: GraphState) -> GraphState:
     candidates = result.get("merchants", [])
     state["store_candidates"] = candidates
     
-    print(f"[RESOLVER] 검색 결과: {len(candidates)}개 후보")
+    log.info("검색 결과: %d개 후보 (%s)", len(candidates), search_type)
     
     # 3-1) 구분번호 직접 조회
     if search_type == "id":
@@ -200,31 +202,34 @@ def resolve_store(state: GraphState) -> GraphState:
             store_id = str(best.get("가맹점_구분번호", ""))
             state["store_id"] = store_id
             
-            print(f"[RESOLVER] 구분번호 조회 성공, load_store_data 호출 시작...")
+            log.debug("구분번호 조회 성공, load_store_data 호출")
             
             # 완전한 데이터 로드 (load_store_data)
             try:
-                result = call_mcp_tool("load_store_data", store_id=store_id, latest_only=True)
-                print(f"[RESOLVER] load_store_data 결과: success={result.get('success')}")
+                result = memoize(
+                    ("load_store_data", store_id, True),
+                    lambda: call_mcp_tool("load_store_data", store_id=store_id, latest_only=True),
+                )
+                log.debug("load_store_data 결과: success=%s", result.get("success"))
                 
                 if result.get("success") and result.get("data"):
-                    print(f"[RESOLVER] store_data 키: {list(result['data'].keys())}")
+                    log.debug("store_data 키: %s", list(result["data"].keys()))
                     state["user_info"] = _build_user_info_from_store_data(result["data"])
                 else:
                     # 로드 실패 시 기본 정보만 사용
-                    print("[RESOLVER] ⚠️ load_store_data 실패, 기본 정보만 사용")
+                    log.warning("load_store_data 실패, 기본 정보만 사용")
                     state["user_info"] = _build_user_info(best)
             except Exception as e:
-                print(f"[RESOLVER] ⚠️ load_store_data 예외 발생: {e}, 기본 정보 사용")
+                log.warning("load_store_data 예외 발생: %s, 기본 정보 사용", e)
                 state["user_info"] = _build_user_info(best)
             
             state["need_clarify"] = False
             state["status"] = "ok"
-            print(f"[RESOLVER] 구분번호 조회 완료: {state['user_info'].get('store_name')}")
+            log.info("구분번호 조회 완료: %s", state["user_info"].get("store_name"))
             return state
         else:
             # 조회 실패 → GENERAL 모드로 폴백
-            print(f"[RESOLVER] ⚠️ 구분번호 '{search_query}' 조회 실패 → GENERAL 모드")
+            log.warning("구분번호 %r 조회 실패 → GENERAL 모드", search_query)
             state["store_id"] = None
             state["user_info"] = None
             state["need_clarify"] = False
@@ -239,32 +244,35 @@ def resolve_store(state: GraphState) -> GraphState:
         store_id = str(best.get("가맹점_구분번호", ""))
         state["store_id"] = store_id
         
-        print(f"[RESOLVER] 가맹점명 1개 매칭, load_store_data 호출 시작...")
+        log.debug("가맹점명 1개 매칭, load_store_data 호출")
         
         # 완전한 데이터 로드 (load_store_data)
         try:
-            result = call_mcp_tool("load_store_data", store_id=store_id, latest_only=True)
-            print(f"[RESOLVER] load_store_data 결과: success={result.get('success')}")
+            result = memoize(
+                ("load_store_data", store_id, True),
+                lambda: call_mcp_tool("load_store_data", store_id=store_id, latest_only=True),
+            )
+            log.debug("load_store_data 결과: success=%s", result.get("success"))
             
             if result.get("success") and result.get("data"):
-                print(f"[RESOLVER] store_data 키: {list(result['data'].keys())}")
+                log.debug("store_data 키: %s", list(result["data"].keys()))
                 state["user_info"] = _build_user_info_from_store_data(result["data"])
             else:
-                print("[RESOLVER] ⚠️ load_store_data 실패, 기본 정보만 사용")
+                log.warning("load_store_data 실패, 기본 정보만 사용")
                 state["user_info"] = _build_user_info(best)
         except Exception as e:
-            print(f"[RESOLVER] ⚠️ load_store_data 예외 발생: {e}, 기본 정보 사용")
+            log.warning("load_store_data 예외 발생: %s, 기본 정보 사용", e)
             state["user_info"] = _build_user_info(best)
         
         state["need_clarify"] = False
         state["status"] = "ok"
-        print(f"[RESOLVER] 가맹점 자동 확정: {state['user_info'].get('store_name')}")
+        log.info("가맹점 자동 확정: %s", state["user_info"].get("store_name"))
         return state
     
     # 3-3) 후보 여러 개 → 사용자 선택 필요
     state["need_clarify"] = True
     state["final_response"] = f"'{search_query}' 후보가 {len(candidates)}개 있습니다. 지점을 선택해주세요."
-    print(f"[RESOLVER] ⚠️ 후보 여러 개 → 사용자 선택 필요")
+    log.info("후보 %d개 → 사용자 선택 필요", len(candidates))
     return state
 
 
@@ -286,15 +294,8 @@ def _build_user_info(merchant: Dict[str, Any]) -> Dict[str, Any]:
         "is_individual": None,
     }
     
-    print("\n" + "="*60)
-    print("[DEBUG] _build_user_info 호출 (기본 정보만)")
-    print("="*60)
-    print(f"입력 merchant: {merchant}")
-    print(f"생성된 user_info:")
-    for key, value in user_info.items():
-        print(f"  - {key}: {value}")
-    print("="*60 + "\n")
-    
+    log.debug("user_info (기본 정보만): %s / merchant=%s", user_info, merchant)
+
     return user_info
 
 
@@ -304,14 +305,8 @@ def _build_user_info_from_store_data(store_data: Dict[str, Any]) -> Dict[str, An
     
     Note: store_data는 모든 필드를 포함
     """
-    print("\n" + "="*60)
-    print("[DEBUG] _build_user_info_from_store_data 호출 (완전한 정보)")
-    print("="*60)
-    
     # 개인사업자 여부 판단 및 텍스트 변환
     biz_flag = store_data.get("개인사업자여부")
-    print(f"[DEBUG] 개인사업자여부 원본 값: {biz_flag} (타입: {type(biz_flag)})")
-    
     if biz_flag == 1:
         business_type = "개인사업자"
     elif biz_flag == 0:
@@ -319,7 +314,6 @@ def _build_user_info_from_store_data(store_data: Dict[str, Any]) -> Dict[str, An
     else:
         business_type = None
     
-    print(f"[DEBUG] 변환된 business_type: {business_type}")
     marketing_area = store_data.get("상권") or store_data.get("상권_지리")
     
     user_info = {
@@ -333,11 +327,8 @@ def _build_user_info_from_store_data(store_data: Dict[str, Any]) -> Dict[str, An
         "is_individual": business_type,
     }
     
-    print(f"\n생성된 user_info (완전한 정보):")
-    for key, value in user_info.items():
-        print(f"  - {key}: {value}")
-    print("="*60 + "\n")
-    
+    log.debug("user_info (완전한 정보): %s / 개인사업자여부 원본=%r", user_info, biz_flag)
+
     return user_info
 
 # Data Loader (store + bizarea)  ← region 제거 버전
@@ -351,8 +342,11 @@ def load_store_and_area_data(state: GraphState, include_region: bool = False, la
         state["error"] = "store_id가 없습니다. 먼저 가맹점을 선택하세요."
         return state
 
-    # 1) store_data (최신 1건)
-    res_store = call_mcp_tool("load_store_data", store_id=store_id, latest_only=latest_only)
+    # 1) store_data (최신 1건) — 같은 턴의 빌더들이 반복 호출하므로 요청 단위 메모
+    res_store = memoize(
+        ("load_store_data", str(store_id), latest_only),
+        lambda: call_mcp_tool("load_store_data", store_id=store_id, latest_only=latest_only),
+    )
     if not res_store.get("success"):
         state["error"] = res_store.get("error", "가맹점 데이터 조회 실패")
         return state
@@ -360,7 +354,11 @@ def load_store_and_area_data(state: GraphState, include_region: bool = False, la
 
     # 2) bizarea_data (상권)
     try:
-        res_biz = call_mcp_tool("load_bizarea_data", store_row=state["store_data"])
+        row = state["store_data"]
+        res_biz = memoize(
+            ("load_bizarea_data", str(row.get("기준년월")), str(row.get("상권_지리")), str(row.get("업종"))),
+            lambda: call_mcp_tool("load_bizarea_data", store_row=row),
+        )
         state["bizarea_data"] = res_biz["data"] if res_biz.get("success") else None
     except Exception:
         state["bizarea_data"] = None
@@ -372,16 +370,43 @@ def load_store_and_area_data(state: GraphState, include_region: bool = False, la
     return state
 
 
+# Data Loader (지표 빌더용 좁은 1행)
+def load_store_profile_data(state: GraphState) -> GraphState:
+    """
+    store_id 기준으로 지표 빌더가 쓰는 컬럼만 조회 (store_profile 테이블, 최신월 상권 컬럼 사전 조인)
+    - store_data / bizarea_data 키는 load_store_and_area_data와 동일 (컬럼만 좁음)
+    """
+    store_id = state.get("store_id")
+    if not store_id:
+        state["error"] = "store_id가 없습니다. 먼저 가맹점을 선택하세요."
+        return state
+
+    # 같은 턴의 빌더들이 반복 호출하므로 요청 단위 메모
+    res = memoize(
+        ("load_store_profile", str(store_id)),
+        lambda: call_mcp_tool("load_store_profile", store_id=store_id),
+    )
+    if not res.get("success"):
+        state["error"] = res.get("error", "가맹점 데이터 조회 실패")
+        return state
+    state["store_data"] = res["data"]["store"]
+    state["bizarea_data"] = res["data"]["bizarea"]
+    return state
+
+
 def find_cooperation_candidates_by_store(store_id: str, top_k: int = 5):
     """
     MCP 래퍼: store_id만 받아서 내부적으로 협업 후보 조회
     - 내부에서 load_store_data, load_bizarea_data 호출
     - 실제 DuckDB 쿼리는 mcp/tools.py의 find_cooperation_candidates 실행
     """
-    print(f"[DEBUG] find_cooperation_candidates_by_store called (store_id={store_id}, top_k={top_k})")
+    log.debug("find_cooperation_candidates_by_store(store_id=%s, top_k=%s)", store_id, top_k)
 
     # 1. 가맹점 기본 데이터 조회
-    store_res = call_mcp_tool("load_store_data", store_id=store_id, latest_only=True)
+    store_res = memoize(
+        ("load_store_data", str(store_id), True),
+        lambda: call_mcp_tool("load_store_data", store_id=store_id, latest_only=True),
+    )
     if not store_res.get("success"):
         return {"success": False, "count": 0, "candidates": [], "error": f"store not found ({store_id})"}
 
@@ -412,24 +437,28 @@ def find_cooperation_candidates_by_store(store_id: str, top_k: int = 5):
         main_customers=main_customers,
         limit=top_k,
     )
-    print(f"[DEBUG] MCP result from find_cooperation_candidates: {result}")
+    log.debug("find_cooperation_candidates: count=%s", result.get("count"))
     return result
 
 
 
-def get_weather_forecast_data(lat: float, lon: float, days: int = 3) -> Dict[str, Any]:
+def get_weather_forecast_data(lat: Optional[float] = None, lon: Optional[float] = None, days: int = 3,
+                              nx: Optional[int] = None, ny: Optional[int] = None,
+                              include_records: bool = True) -> Dict[str, Any]:
     """
     MCP weather_forecast 툴 호출 래퍼
-    - 입력: 위도(lat), 경도(lon), 조회 일수(days)
-    - 출력: 기상청 단기예보 (기온/강수 형태 포함)
+    - 입력: 기상청 격자(nx, ny) 또는 위도(lat), 경도(lon), 조회 일수(days)
+    - 출력: 기상청 단기예보 요약(summary) + 시간별 레코드(include_records=True일 때)
     """
-    print(f"[DEBUG] get_weather_forecast_data 호출 (lat={lat}, lon={lon}, days={days})")
+    log.debug("get_weather_forecast_data(lat=%s, lon=%s, nx=%s, ny=%s, days=%s)", lat, lon, nx, ny, days)
 
     try:
-        result = call_mcp_tool("get_weather_forecast", lat=lat, lon=lon, days=days)
+        result = call_mcp_tool(
+            "get_weather_forecast", lat=lat, lon=lon, days=days, nx=nx, ny=ny, include_records=include_records,
+        )
 
         if not result.get("success"):
-            print(f"[ERROR] 날씨 데이터 조회 실패: {result.get('message')}")
+            log.warning("날씨 데이터 조회 실패: %s", result.get("message"))
             return {
                 "success": False,
                 "data": [],
@@ -439,5 +468,5 @@ def get_weather_forecast_data(lat: float, lon: float, days: int = 3) -> Dict[str
         return result
 
     except Exception as e:
-        print(f"[EXCEPTION] get_weather_forecast_data 오류: {e}")
+        log.exception("get_weather_forecast_data 오류: %s", e)
         return {"success": False, "data": [], "message": str(e)}
\ No newline at end of file
@@ -0,0 +1,382 @@
+# my_agent/utils/tracing.py
+# -*- coding: utf-8 -*-
+"""
+턴 단위 타이밍 스팬 (TRACE_ENABLED=true 일 때만 기록)
+
+- trace_turn: 채팅 1턴 = trace 1개, 종료 시 스팬과 턴 요약을 JSONL로 기록
+- span: 임의 구간 스팬 (중첩 시 parent_span_id 연결, contextvars 기반이라 스레드별로 독립)
+- traced_node / traced_llm / traced_cursor: 그래프 노드 / LLM 호출 / DuckDB 쿼리 래퍼
+
+기록 파일 (TRACE_DIR):
+- spans-YYYYMMDD.jsonl : 스팬 1개 = 1줄 (OTLP span 필드명: trace_id, span_id, parent_span_id,
+                         name, kind, start_time_unix_nano, end_time_unix_nano, attributes, status)
+- turns-YYYYMMDD.jsonl : 턴 요약 (전체 시간, 종류별/노드별 시간, LLM 토큰(캐시 읽기 포함), 캐시 적중, DB 행 수)
+"""
+import contextvars
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from my_agent.utils.config import TRACE_ENABLED, TRACE_DIR
+from my_agent.utils.log import get_logger
+
+log = get_logger(__name__)
+
+_CURRENT_TURN: contextvars.ContextVar = contextvars.ContextVar("trace_turn", default=None)
+_CURRENT_SPAN: contextvars.ContextVar = contextvars.ContextVar("trace_span", default=None)
+_WRITE_LOCK = threading.Lock()
+
+
+def _new_id(n_bytes: int) -> str:
+    return os.urandom(n_bytes).hex()
+
+
+class Span:
+    """구간 1개 (attributes에 tokens_in/out, cache_hit, rows 등 누적)"""
+
+    __slots__ = ("trace_id", "span_id", "parent_span_id", "name", "kind",
+                 "start_ns", "end_ns", "attributes", "status")
+
+    def __init__(self, name: str, kind: str, trace_id: str, parent_span_id: Optional[str]):
+        self.trace_id = trace_id
+        self.span_id = _new_id(8)
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = {}
+        self.status = "OK"
+
+    def set(self, **attrs):
+        self.attributes.update({k: v for k, v in attrs.items() if v is not None})
+
+    def add(self, key: str, n: float = 1):
+        self.attributes[key] = self.attributes.get(key, 0) + n
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "status": self.status,
+        }
+
+
+class _NoopSpan:
+    """트레이싱 비활성화 시 사용 (호출부 분기 없이 set/add 가능)"""
+
+    attributes: Dict[str, Any] = {}
+    duration_ms = 0.0
+
+    def set(self, **attrs):
+        pass
+
+    def add(self, key: str, n: float = 1):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _Turn:
+    def __init__(self, thread_id: str, user_query: str):
+        self.trace_id = _new_id(16)
+        self.thread_id = thread_id
+        self.user_query = user_query
+        self.spans: List[Span] = []
+        self._open: List[Span] = []   # 아직 끝나지 않은 db 스팬 (fetch 대기)
+        self._lock = threading.Lock()
+        self.summary: Dict[str, Any] = {}
+
+    def append(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def track(self, span: Span):
+        with self._lock:
+            self._open.append(span)
+
+    def finish(self, span: Span) -> bool:
+        """열린 스팬 종료 (이미 턴 종료 시 닫혔으면 False)"""
+        with self._lock:
+            if span not in self._open:
+                return False
+            self._open.remove(span)
+            span.end_ns = time.time_ns()
+            self.spans.append(span)
+            return True
+
+    def close_open(self):
+        """턴 종료 시 fetch되지 않은 스팬을 닫음 (rows 없음, unfetched=True)"""
+        with self._lock:
+            now = time.time_ns()
+            for s in self._open:
+                s.end_ns = now
+                s.set(unfetched=True)
+                self.spans.append(s)
+            self._open.clear()
+
+
+def _append_jsonl(prefix: str, records: List[Dict[str, Any]]):
+    if not records:
+        return
+    out_dir = Path(TRACE_DIR).expanduser()
+    path = out_dir / f"{prefix}-{datetime.now():%Y%m%d}.jsonl"
+    try:
+        with _WRITE_LOCK:
+            out_dir.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                for r in records:
+                    f.write(json.dumps(r, ensure_ascii=False, default=str) + "\n")
+    except OSError as e:
+        log.warning("기록 실패: %s", e)
+
+
+def _new_span(name: str, kind: str, turn: Optional[_Turn], **attrs) -> Span:
+    parent = _CURRENT_SPAN.get()
+    s = Span(
+        name, kind,
+        trace_id=turn.trace_id if turn else _new_id(16),
+        parent_span_id=parent.span_id if parent else None,
+    )
+    s.set(**attrs)
+    return s
+
+
+def _end_span(s: Span, turn: Optional[_Turn]):
+    s.end_ns = time.time_ns()
+    if turn is not None:
+        turn.append(s)
+    else:
+        _append_jsonl("spans", [s.to_dict()])
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attrs) -> Iterator[Any]:
+    """
+    구간 스팬 — 진행 중인 턴이 있으면 그 trace에, 없으면 단독 trace로 기록
+    예외는 status=ERROR로 기록 후 그대로 전파
+    """
+    if not TRACE_ENABLED:
+        yield _NOOP
+        return
+
+    turn = _CURRENT_TURN.get()
+    s = _new_span(name, kind, turn, **attrs)
+    token = _CURRENT_SPAN.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.status = "ERROR"
+        s.set(error=f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _CURRENT_SPAN.reset(token)
+        _end_span(s, turn)
+
+
+def current_span() -> Any:
+    """진행 중인 스팬 (없거나 비활성화면 set/add가 무시되는 빈 스팬)"""
+    return _CURRENT_SPAN.get() or _NOOP
+
+
+def summarize_spans(spans: List[Span]) -> Dict[str, Any]:
+    """턴 요약: 종류별 합계(중첩 구간은 종류마다 따로 합산), 노드별 시간, LLM 토큰, 재생성 횟수, 캐시, DB 행 수"""
+    by_kind: Dict[str, float] = {}
+    nodes: Dict[str, float] = {}
+    tools: Dict[str, float] = {}
+    totals = {"llm_calls": 0, "tokens_in": 0, "tokens_out": 0, "tokens_cached": 0, "retries": 0,
+              "cache_hits": 0, "cache_misses": 0, "db_queries": 0, "db_rows": 0}
+    for s in spans:
+        ms = s.duration_ms
+        by_kind[s.kind] = by_kind.get(s.kind, 0.0) + ms
+        a = s.attributes
+        if s.kind == "node":
+            nodes[s.name] = nodes.get(s.name, 0.0) + ms
+            if "retry" in a:
+                totals["retries"] += 1
+        elif s.kind == "tool":
+            tools[s.name] = tools.get(s.name, 0.0) + ms
+        elif s.kind == "llm":
+            totals["llm_calls"] += 1
+        elif s.kind == "db":
+            totals["db_queries"] += 1
+            totals["db_rows"] += int(a.get("rows", 0))
+        totals["tokens_in"] += int(a.get("tokens_in", 0))
+        totals["tokens_out"] += int(a.get("tokens_out", 0))
+        totals["tokens_cached"] += int(a.get("tokens_cached", 0))
+        if "cache_hit" in a:
+            totals["cache_hits" if a["cache_hit"] else "cache_misses"] += 1
+
+    def _round(d: Dict[str, float]) -> Dict[str, float]:
+        return {k: round(v, 1) for k, v in sorted(d.items(), key=lambda kv: -kv[1])}
+
+    return {"ms_by_kind": _round(by_kind), "ms_by_node": _round(nodes), "ms_by_tool": _round(tools), **totals}
+
+
+@contextmanager
+def trace_turn(thread_id: str, user_query: str) -> Iterator[Optional[_Turn]]:
+    """채팅 1턴 trace (비활성화 시 None) — 종료 시 스팬/요약 기록, turn.summary에 요약 보관"""
+    if not TRACE_ENABLED:
+        yield None
+        return
+
+    turn = _Turn(thread_id, user_query)
+    token = _CURRENT_TURN.set(turn)
+    t0 = time.time_ns()
+    try:
+        with span("turn", kind="turn", thread_id=thread_id) as root:
+            yield turn
+    finally:
+        _CURRENT_TURN.reset(token)
+        turn.close_open()
+        spans = sorted(turn.spans, key=lambda s: s.start_ns)
+        turn.summary = {
+            "trace_id": turn.trace_id,
+            "thread_id": thread_id,
+            "timestamp": datetime.fromtimestamp(t0 / 1e9).isoformat(timespec="seconds"),
+            "user_query": user_query,
+            "total_ms": round(root.duration_ms, 1),
+            "n_spans": len(spans),
+            **summarize_spans([s for s in spans if s.kind != "turn"]),
+        }
+        _append_jsonl("spans", [s.to_dict() for s in spans])
+        _append_jsonl("turns", [turn.summary])
+
+
+def traced_node(name: str, fn):
+    """그래프 노드 래퍼 (LangGraph는 state 1개 인자 함수로 인식)"""
+    def node(state):
+        with span(name, kind="node") as s:
+            out = fn(state)
+            if isinstance(out, dict):
+                s.set(intent=out.get("intent"), error=out.get("error") or None)
+            return out
+    node.__name__ = name
+    return node
+
+
+def _usage_tokens(resp: Any) -> Dict[str, Optional[int]]:
+    """LangChain AIMessage.usage_metadata (없으면 None, tokens_cached = 컨텍스트 캐시에서 읽은 입력 토큰)"""
+    usage = getattr(resp, "usage_metadata", None) or {}
+    details = usage.get("input_token_details") or {}
+    return {"tokens_in": usage.get("input_tokens"), "tokens_out": usage.get("output_tokens"),
+            "tokens_cached": details.get("cache_read") or None}
+
+
+class _TracedLLM:
+    """chat model 프록시 — invoke마다 llm 스팬 (그 외 속성은 원본으로 위임)"""
+
+    def __init__(self, llm: Any, name: str):
+        self._llm = llm
+        self._name = name
+
+    def invoke(self, input: Any, *args, **kwargs):
+        with span(f"llm.{self._name}", kind="llm", model=getattr(self._llm, "model", None)) as s:
+            resp = self._llm.invoke(input, *args, **kwargs)
+            s.set(**_usage_tokens(resp))
+            return resp
+
+    def __getattr__(self, item):
+        return getattr(self._llm, item)
+
+
+def traced_llm(llm: Any, name: str) -> Any:
+    """LLM 호출 스팬 래퍼 (비활성화 시 원본 그대로)"""
+    if not TRACE_ENABLED or llm is None:
+        return llm
+    return _TracedLLM(llm, name)
+
+
+# 결과 집합을 돌려주는 문장 (fetch까지 스팬 유지) — 그 외(USE/SET/DDL/DML)는 execute 직후 종료
+_RESULT_SQL = re.compile(r"^[\s(]*(select|with|from|values|table|show|describe|summarize|pragma|explain)\b", re.I)
+
+
+class _TracedCursor:
+    """
+    DuckDB 커서 프록시 — SELECT류는 execute부터 fetch*까지를 db 스팬 1개로 기록 (rows = 결과 행 수)
+    (DuckDB 결과는 fetch 시점에 구체화되므로 execute만 재면 실제 비용이 빠짐)
+    - 결과가 없는 문장은 execute 직후 스팬 종료
+    - fetch되지 않은 스팬은 다음 execute 또는 trace_turn 종료 시 닫힘
+    - 열린 스팬은 현재 스팬(contextvar)으로 설정하지 않음 → 이후 스팬의 부모가 되지 않음
+    """
+
+    def __init__(self, cursor: Any):
+        self._cursor = cursor
+        self._pending = None
+
+    def execute(self, query: str, parameters: Any = None):
+        self._finish(None)
+        turn = _CURRENT_TURN.get()
+        s = _new_span("duckdb.query", "db", turn, sql=" ".join(query.split())[:200])
+        try:
+            if parameters is None:
+                self._cursor.execute(query)
+            else:
+                self._cursor.execute(query, parameters)
+        except BaseException as e:
+            s.status = "ERROR"
+            s.set(error=f"{type(e).__name__}: {e}")
+            _end_span(s, turn)
+            raise
+        if not _RESULT_SQL.match(query):
+            _end_span(s, turn)
+            return self
+        if turn is not None:
+            turn.track(s)
+        self._pending = (s, turn)
+        return self
+
+    def _finish(self, rows: Optional[int]):
+        if self._pending is None:
+            return
+        s, turn = self._pending
+        self._pending = None
+        s.set(rows=rows)
+        if turn is None:
+            _end_span(s, None)
+        else:
+            turn.finish(s)
+
+    def fetchdf(self, *args, **kwargs):
+        df = self._cursor.fetchdf(*args, **kwargs)
+        self._finish(len(df))
+        return df
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._finish(len(rows))
+        return rows
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        self._finish(0 if row is None else 1)
+        return row
+
+    def __getattr__(self, item):
+        return getattr(self._cursor, item)
+
+
+def traced_cursor(cursor: Any) -> Any:
+    """DuckDB 쿼리 스팬 래퍼 (비활성화 시 원본 그대로)"""
+    if not TRACE_ENABLED:
+        return cursor
+    return _TracedCursor(cursor)
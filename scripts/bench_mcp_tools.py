@@ -0,0 +1,237 @@
+# scripts/bench_mcp_tools.py
+"""
+MCP 데이터 툴 벤치마크 (합성 데이터)
+
+합성 가맹점/상권 데이터(scripts/gen_synthetic_data.py) → DuckDB(또는 Arrow 저장소) 구축 → 툴별 지연시간 측정
+- 대상: search_merchant(id / masked / text), load_store_data, load_bizarea_data,
+        find_cooperation_candidates
+- 지표: p50 / p95 / p99 / mean (ms), 처리량 (ops/s)
+- 결과 JSON을 커밋 간 비교 (--compare)
+
+실행 방법 (CLI):
+    python scripts/bench_mcp_tools.py --stores 10000 100000 1000000 [--months 3]
+        [--iterations 200] [--backend duckdb|arrow] [--out bench.json] [--compare prev.json]
+
+실행 방법 (pytest-benchmark):
+    BENCH_STORES=100000 pytest scripts/bench_mcp_tools.py --benchmark-json bench.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def prepare_backend(n_stores: int, months: int, work_dir: Path, backend: str = "duckdb"):
+    """합성 데이터 생성 + 저장소 구축 후 환경변수로 툴 경로 지정 (mcp.tools import 전에 호출)"""
+    os.environ["FRANCHISE_CSV"] = str(work_dir / "csv" / "franchise.csv")
+    os.environ["BIZ_AREA_CSV"] = str(work_dir / "csv" / "biz_area.csv")
+    os.environ["DUCKDB_PATH"] = str(work_dir / "bench.duckdb")
+    os.environ["ARROW_DIR"] = str(work_dir / "arrow")
+    os.environ["USE_DUCKDB"] = "true" if backend == "duckdb" else "false"
+    # 설정 모듈이 import 시점에 환경변수를 읽으므로 환경변수 지정 후 import
+    from scripts.gen_synthetic_data import write_synthetic
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        if backend == "duckdb":
+            write_synthetic("duckdb", Path(os.environ["DUCKDB_PATH"]), n_stores, months)
+        else:
+            write_synthetic("csv", work_dir / "csv", n_stores, months)
+            from scripts.build_arrow_store import build_arrow_store
+            build_arrow_store()
+
+
+# 벤치마크 케이스
+def build_cases(n_stores: int, seed: int = 7) -> Dict[str, Callable[[], Any]]:
+    """툴별 호출 클로저 (입력은 매 호출마다 무작위 선택)"""
+    from mcp import tools
+    from scripts.gen_synthetic_data import BRANDS, store_ids
+
+    rng = random.Random(seed)
+    ids = store_ids(n_stores)
+    sample_ids = [ids[i] for i in rng.sample(range(n_stores), min(n_stores, 1000))]
+    store_rows = [tools.load_store_data(sid)["data"] for sid in sample_ids[:100]]
+    masked_names = [row["가맹점명"] for row in store_rows]
+
+    cases = {
+        "search_merchant.id": lambda: tools.search_merchant(rng.choice(sample_ids)),
+        "search_merchant.masked": lambda: tools.search_merchant(rng.choice(masked_names)),
+        "search_merchant.text": lambda: tools.search_merchant(rng.choice(BRANDS)[:2]),
+        "load_store_data.latest": lambda: tools.load_store_data(rng.choice(sample_ids)),
+        "load_store_data.history": lambda: tools.load_store_data(rng.choice(sample_ids), latest_only=False),
+        "load_bizarea_data": lambda: tools.load_bizarea_data(rng.choice(store_rows)),
+    }
+    # find_cooperation_candidates는 DuckDB 전용
+    if tools.USE_DUCKDB:
+        cases["find_cooperation_candidates"] = lambda: (
+            lambda row: tools.find_cooperation_candidates(
+                row["상권_지리"], row["업종"], [row["핵심고객_1순위"]]
+            )
+        )(rng.choice(store_rows))
+    return cases
+
+
+def _summarize(samples_ms: List[float], wall_s: float) -> Dict[str, float]:
+    arr = np.asarray(samples_ms)
+    return {
+        "n": int(arr.size),
+        "p50_ms": round(float(np.percentile(arr, 50)), 3),
+        "p95_ms": round(float(np.percentile(arr, 95)), 3),
+        "p99_ms": round(float(np.percentile(arr, 99)), 3),
+        "mean_ms": round(float(arr.mean()), 3),
+        "ops_per_s": round(arr.size / wall_s, 1) if wall_s > 0 else None,
+    }
+
+
+def run_cases(cases: Dict[str, Callable[[], Any]], iterations: int, warmup: int = 10) -> Dict[str, Dict]:
+    """케이스별 지연시간 측정 (툴 내부 디버그 출력은 버림)"""
+    results = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for name, fn in cases.items():
+            for _ in range(warmup):
+                fn()
+            samples = []
+            t_wall = time.perf_counter()
+            for _ in range(iterations):
+                t0 = time.perf_counter()
+                fn()
+                samples.append((time.perf_counter() - t0) * 1000)
+            results[name] = _summarize(samples, time.perf_counter() - t_wall)
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def _bench_one_size(n_stores: int, months: int, iterations: int, backend: str) -> Dict[str, Any]:
+    """
+    크기 1개 측정 — 툴 모듈이 import 시점의 설정을 읽으므로 크기마다 별도 프로세스에서 실행
+    """
+    with tempfile.TemporaryDirectory(prefix="bench_mcp_") as tmp:
+        cmd = [
+            sys.executable, __file__, "--worker",
+            "--stores", str(n_stores), "--months", str(months),
+            "--iterations", str(iterations), "--backend", backend,
+            "--out", str(Path(tmp) / "result.json"),
+        ]
+        subprocess.run(cmd, check=True)
+        return json.loads((Path(tmp) / "result.json").read_text(encoding="utf-8"))
+
+
+def _worker(n_stores: int, months: int, iterations: int, backend: str, out: Path):
+    with tempfile.TemporaryDirectory(prefix="bench_data_") as tmp:
+        t0 = time.perf_counter()
+        prepare_backend(n_stores, months, Path(tmp), backend)
+        build_s = time.perf_counter() - t0
+        results = run_cases(build_cases(n_stores), iterations)
+    out.write_text(json.dumps({"build_s": round(build_s, 1), "results": results}, ensure_ascii=False), encoding="utf-8")
+
+
+def print_report(report: Dict[str, Any], baseline: Dict[str, Any] = None):
+    """결과 표 출력 (baseline 있으면 p50/p95 변화율 표시)"""
+    for size, entry in report["sizes"].items():
+        print("\n" + "=" * 78)
+        print(f"stores={int(size):,}  months={report['months']}  backend={report['backend']}  "
+              f"(build {entry['build_s']}s)")
+        print("=" * 78)
+        print(f"{'case':32s} {'p50':>9s} {'p95':>9s} {'p99':>9s} {'ops/s':>10s}")
+        base = (baseline or {}).get("sizes", {}).get(size, {}).get("results", {})
+        for name, r in entry["results"].items():
+            line = f"{name:32s} {r['p50_ms']:8.2f}ms {r['p95_ms']:8.2f}ms {r['p99_ms']:8.2f}ms {r['ops_per_s']:10.1f}"
+            if name in base:
+                d50 = (r["p50_ms"] / base[name]["p50_ms"] - 1) * 100 if base[name]["p50_ms"] else 0
+                d95 = (r["p95_ms"] / base[name]["p95_ms"] - 1) * 100 if base[name]["p95_ms"] else 0
+                line += f"   Δp50 {d50:+.1f}%  Δp95 {d95:+.1f}%"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP 데이터 툴 벤치마크")
+    parser.add_argument("--stores", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--months", type=int, default=3, help="가맹점당 기준년월 수")
+    parser.add_argument("--iterations", type=int, default=200, help="케이스당 측정 횟수")
+    parser.add_argument("--backend", choices=["duckdb", "arrow"], default="duckdb")
+    parser.add_argument("--out", type=str, default=None, help="결과 JSON 경로")
+    parser.add_argument("--compare", type=str, default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.stores[0], args.months, args.iterations, args.backend, Path(args.out))
+        return
+
+    import duckdb
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "backend": args.backend,
+        "months": args.months,
+        "iterations": args.iterations,
+        "python": platform.python_version(),
+        "duckdb": duckdb.__version__,
+        "sizes": {},
+    }
+    for n in args.stores:
+        print(f"▶ stores={n:,} 측정 중...")
+        report["sizes"][str(n)] = _bench_one_size(n, args.months, args.iterations, args.backend)
+
+    baseline = json.loads(Path(args.compare).read_text(encoding="utf-8")) if args.compare else None
+    print_report(report, baseline)
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n💾 저장: {args.out}")
+
+
+# pytest-benchmark 진입점 (pytest scripts/bench_mcp_tools.py)
+try:
+    import pytest
+except ImportError:  # CLI 전용 환경
+    pytest = None
+
+if pytest is not None:
+    @pytest.fixture(scope="module")
+    def bench_cases(tmp_path_factory):
+        n_stores = int(os.environ.get("BENCH_STORES", "10000"))
+        prepare_backend(
+            n_stores,
+            int(os.environ.get("BENCH_MONTHS", "3")),
+            tmp_path_factory.mktemp("bench"),
+            os.environ.get("BENCH_BACKEND", "duckdb"),
+        )
+        return build_cases(n_stores)
+
+    @pytest.mark.parametrize("case", [
+        "search_merchant.id", "search_merchant.masked", "search_merchant.text",
+        "load_store_data.latest", "load_store_data.history",
+        "load_bizarea_data", "find_cooperation_candidates",
+    ])
+    def test_mcp_tool_latency(benchmark, bench_cases, case):
+        if case not in bench_cases:
+            pytest.skip(f"{case}: 현재 백엔드에서 지원하지 않음")
+        benchmark.group = case.split(".")[0]
+        benchmark(bench_cases[case])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# scripts/build_arrow_store.py
+"""
+CSV → Arrow IPC(Feather v2, 비압축) 저장소 구축 스크립트 (USE_DUCKDB=False 폴백용)
+
+비압축 IPC 파일은 pyarrow.memory_map으로 0-copy 로드되므로 콜드 스타트가 거의 없고,
+여러 프로세스가 OS 페이지 캐시를 공유합니다.
+
+생성 파일 (ARROW_DIR):
+- franchise.arrow         : (가맹점_구분번호, 기준년월) 정렬 → 가맹점별 행이 연속
+- franchise_latest.arrow  : 가맹점별 최신 1행 + norm_name + _offset/_length (franchise 오프셋 맵)
+- biz_area.arrow          : (기준년월, 상권_지리, 업종) 정렬
+- biz_area_index.arrow    : (기준년월, 상권_지리, 업종) → _offset/_length
+
+실행 방법:
+    python scripts/build_arrow_store.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import duckdb
+import pyarrow as pa
+
+# 프로젝트 루트 경로 추가
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from my_agent.utils.config import FRANCHISE_CSV, BIZ_AREA_CSV, ARROW_DIR
+from scripts.build_duckdb import YYYYMM_SQL, ENUM_COLUMNS, ENUM_PREFIXES
+from mcp.tools import NORM_NAME_SQL   # search_merchant(DuckDB)와 동일한 가맹점명 정규화
+
+
+# 정렬 순서 (오프셋 맵은 이 순서 기준 — 같은 키의 행은 항상 연속)
+FRANCHISE_ORDER = "가맹점_구분번호, 기준년월"
+BIZ_AREA_ORDER = "기준년월, 상권_지리, 업종"
+
+
+def _fetch(con, query: str) -> pa.Table:
+    result = con.execute(query)
+    # duckdb 1.4+: to_arrow_reader, 구버전: fetch_record_batch
+    reader = getattr(result, "to_arrow_reader", None) or result.fetch_record_batch
+    return reader().read_all()
+
+
+def _dictionary_encode(table: pa.Table) -> pa.Table:
+    """범주 문자열 컬럼 → Arrow dictionary (DuckDB ENUM과 같은 규칙)"""
+    for i, field in enumerate(table.schema):
+        if pa.types.is_string(field.type) and (
+            field.name in ENUM_COLUMNS or field.name.startswith(ENUM_PREFIXES)
+        ):
+            table = table.set_column(i, field.name, table.column(i).dictionary_encode())
+    return table
+
+
+def _write(table: pa.Table, path: Path):
+    """비압축 IPC 파일 (임시 파일 → rename)"""
+    tmp = path.with_suffix(".arrow.tmp")
+    with pa.OSFile(str(tmp), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    tmp.replace(path)
+    print(f"✓ {path.name}: {table.num_rows:,} rows, {path.stat().st_size / 1024 / 1024:.1f} MB")
+
+
+def build_arrow_store():
+    """Arrow 저장소 생성"""
+
+    print("=" * 60)
+    print("Arrow 메모리 맵 저장소 구축")
+    print("=" * 60)
+
+    franchise_path = Path(FRANCHISE_CSV).expanduser()
+    biz_area_path = Path(BIZ_AREA_CSV).expanduser()
+    for p in (franchise_path, biz_area_path):
+        if not p.exists():
+            print(f"❌ CSV 파일을 찾을 수 없습니다: {p}")
+            sys.exit(1)
+
+    out_dir = Path(ARROW_DIR).expanduser()
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    t0 = time.time()
+    con = duckdb.connect()
+    try:
+        con.execute(f"""
+            CREATE TABLE franchise AS
+            SELECT * REPLACE ({YYYYMM_SQL} AS 기준년월, CAST(가맹점_구분번호 AS VARCHAR) AS 가맹점_구분번호)
+            FROM read_csv_auto('{franchise_path}', header=true)
+        """)
+        con.execute(f"""
+            CREATE TABLE biz_area AS
+            SELECT * REPLACE ({YYYYMM_SQL} AS 기준년월)
+            FROM read_csv_auto('{biz_area_path}', header=true)
+        """)
+
+        # 1. franchise + 가맹점별 오프셋 맵 (최신 행 + norm_name)
+        _write(_dictionary_encode(_fetch(con, f"SELECT * FROM franchise ORDER BY {FRANCHISE_ORDER}")),
+               out_dir / "franchise.arrow")
+        _write(_dictionary_encode(_fetch(con, f"""
+            WITH numbered AS (
+                SELECT *, ROW_NUMBER() OVER (ORDER BY {FRANCHISE_ORDER}) - 1 AS _row FROM franchise
+            )
+            SELECT * EXCLUDE (_row),
+                   {NORM_NAME_SQL} AS norm_name,
+                   MIN(_row) OVER w AS _offset,
+                   COUNT(*) OVER w AS _length
+            FROM numbered
+            WINDOW w AS (PARTITION BY 가맹점_구분번호)
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY 가맹점_구분번호 ORDER BY 기준년월 DESC) = 1
+            ORDER BY 가맹점_구분번호
+        """)), out_dir / "franchise_latest.arrow")
+
+        # 2. biz_area + 조인 키 오프셋 맵
+        _write(_dictionary_encode(_fetch(con, f"SELECT * FROM biz_area ORDER BY {BIZ_AREA_ORDER}")),
+               out_dir / "biz_area.arrow")
+        _write(_fetch(con, f"""
+            WITH numbered AS (
+                SELECT 기준년월, 상권_지리, 업종, ROW_NUMBER() OVER (ORDER BY {BIZ_AREA_ORDER}) - 1 AS _row
+                FROM biz_area
+            )
+            SELECT 기준년월, CAST(상권_지리 AS VARCHAR) AS 상권_지리, CAST(업종 AS VARCHAR) AS 업종,
+                   MIN(_row) AS _offset, COUNT(*) AS _length
+            FROM numbered
+            GROUP BY ALL
+            ORDER BY _offset
+        """), out_dir / "biz_area_index.arrow")
+    finally:
+        con.close()
+
+    print("\n" + "=" * 60)
+    print(f"✅ Arrow 저장소 구축 완료: {out_dir} ({time.time() - t0:.1f}s)")
+    print("=" * 60)
+    print("사용: USE_DUCKDB=false")
+
+
+if __name__ == "__main__":
+    build_arrow_store()
@@ -4,27 +4,160 @@ CSV 파일들을 DuckDB로 변환하는 스크립트
 
 공통 매핑 컬럼: 기준년월, 업종, 상권_지리
 
+명시적 스키마:
+- 기준년월: INTEGER (YYYYMM) — '2024-01', 202401, DATE 모두 정규화
+- 업종, 상권_지리, 핵심고객_*, 피크_* (문자열): 두 테이블이 공유하는 ENUM
+- 비중/비율/률 컬럼: FLOAT
+
+물리 정렬 (min/max zone map으로 코호트·월 필터 시 row group 스킵):
+- franchise: (상권_지리, 업종, 기준년월)
+- biz_area : (기준년월, 상권_지리, 업종)
+--parquet: 기준년월 hive 파티션 Parquet(data/parquet/<table>/yyyymm=YYYYMM/*.parquet)도 함께 생성
+  (파티션 디렉터리명은 URL 인코딩을 피하려고 ASCII 별칭 yyyymm 사용, 파일 안에는 기준년월 유지)
+
+섀도 파일(data.duckdb.shadow)에 구축한 뒤 원자적으로 교체하므로
+서비스 중인 읽기 연결은 갱신 중에도 막히지 않습니다.
+- 기본: 전체 재구축 (기존 DB의 predictions 등 파생 외 테이블은 보존)
+- --incremental: CSV에서 DB에 없는 기준년월 행만 추가 + 파생 테이블 갱신 (단일 트랜잭션)
+
 실행 방법:
-    python scripts/build_duckdb.py
+    python scripts/build_duckdb.py [--incremental] [--parquet] [--franchise-csv PATH] [--biz-area-csv PATH]
 
 생성 결과:
     data/data.duckdb
 """
+import argparse
 import duckdb
+import numpy as np
+import pandas as pd
+import re
+import shutil
 import sys
 from pathlib import Path
+from typing import Dict
 
 # 프로젝트 루트 경로 추가
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from my_agent.utils.config import FRANCHISE_CSV, BIZ_AREA_CSV, DATA_DIR
+from my_agent.utils.config import FRANCHISE_CSV, BIZ_AREA_CSV, DUCKDB_PATH, PARQUET_DIR
+from my_agent.utils.duckdb_swap import shadow_database
+from mcp.kma_grid import latlon_to_grid
+from mcp.tools import STORE_PROFILE_COLUMNS, STORE_PROFILE_AREA_COLUMNS, STORE_PROFILE_AREA_PREFIX
+
+# CSV에서 적재하는 원본 테이블
+SOURCE_TABLES = ["franchise", "biz_area"]
+
+# 물리 정렬 키 (코호트 = 상권_지리 + 업종, biz_area는 조인 키)
+SORT_KEYS = {
+    "franchise": ("상권_지리", "업종", "기준년월"),
+    "biz_area": ("기준년월", "상권_지리", "업종"),
+}
+PARQUET_ROW_GROUP_SIZE = 16384
+
+
+def _order_by(table: str) -> str:
+    return ", ".join(f'"{c}"' for c in SORT_KEYS[table])
+
+
+def _read_csv_sql(path: Path) -> str:
+    return f"""
+        read_csv_auto(
+            '{path}',
+            header=true,
+            delim=',',
+            all_varchar=false,
+            ignore_errors=false
+        )
+    """
+
+
+# 명시적 스키마 규칙
+YYYYMM_SQL = "CAST(LEFT(regexp_replace(CAST(기준년월 AS VARCHAR), '[^0-9]', '', 'g'), 6) AS INTEGER)"
+ENUM_COLUMNS = ("업종", "상권_지리")
+ENUM_PREFIXES = ("핵심고객_", "피크_")
+RATIO_PATTERN = re.compile(r"(비중|비율|률)$")
+FLOAT_SOURCE_TYPES = ("DOUBLE", "FLOAT", "DECIMAL")
+
+
+def _is_enum_column(name: str, sniffed_type: str) -> bool:
+    return sniffed_type == "VARCHAR" and (name in ENUM_COLUMNS or name.startswith(ENUM_PREFIXES))
+
+
+def _is_ratio_column(name: str, sniffed_type: str) -> bool:
+    return sniffed_type.startswith(FLOAT_SOURCE_TYPES) and bool(RATIO_PATTERN.search(name))
+
+
+def _enum_type(column: str) -> str:
+    return f'"enum_{column}"'
+
+
+def _column_types(con, relation: str) -> Dict[str, str]:
+    df = con.execute(f"DESCRIBE SELECT * FROM {relation}").fetchdf()
+    return dict(zip(df["column_name"], df["column_type"]))
+
+
+def create_enum_types(con, raw_tables: Dict[str, str]) -> Dict[str, str]:
+    """
+    문자열 범주 컬럼별 ENUM 타입 생성 (같은 컬럼명은 두 테이블이 같은 타입 공유 → 조인 키 정수 비교)
+
+    Returns:
+        {컬럼명: ENUM 타입명}
+    """
+    sources: Dict[str, list] = {}
+    for raw in raw_tables.values():
+        for col, typ in _column_types(con, raw).items():
+            if _is_enum_column(col, typ):
+                sources.setdefault(col, []).append(raw)
+
+    enum_types = {}
+    for col, raws in sources.items():
+        union = " UNION ".join(f'SELECT "{col}" AS v FROM {raw}' for raw in raws)
+        con.execute(f"""
+            CREATE TYPE {_enum_type(col)} AS ENUM (
+                SELECT DISTINCT v FROM ({union}) WHERE v IS NOT NULL ORDER BY v
+            )
+        """)
+        n = con.execute(f"SELECT COUNT(*) FROM (SELECT DISTINCT v FROM ({union}) WHERE v IS NOT NULL)").fetchone()[0]
+        print(f"✓ ENUM {col}: {n:,} values")
+        enum_types[col] = _enum_type(col)
+    return enum_types
+
+
+def _typed_select(con, relation: str, enum_types: Dict[str, str]) -> str:
+    """원본(CSV 추론 타입) → 명시적 스키마 SELECT"""
+    replaces = []
+    for col, typ in _column_types(con, relation).items():
+        if col == "기준년월":
+            replaces.append(f"{YYYYMM_SQL} AS 기준년월")
+        elif col in enum_types and typ == "VARCHAR":
+            replaces.append(f'CAST("{col}" AS {enum_types[col]}) AS "{col}"')
+        elif _is_ratio_column(col, typ):
+            replaces.append(f'CAST("{col}" AS FLOAT) AS "{col}"')
+    replace_sql = f" REPLACE ({', '.join(replaces)})" if replaces else ""
+    return f"SELECT *{replace_sql} FROM {relation}"
+
 
+def apply_schema(con, raw_tables: Dict[str, str]):
+    """
+    원본 임시 테이블 → 명시적 스키마 + 물리 정렬 테이블 (원본 임시 테이블은 삭제)
 
-def validate_csv_files():
+    Args:
+        raw_tables: {생성할 테이블명: 원본 임시 테이블명}
+    """
+    enum_types = create_enum_types(con, raw_tables)
+    for table, raw in raw_tables.items():
+        con.execute(f"CREATE TABLE {table} AS {_typed_select(con, raw, enum_types)} ORDER BY {_order_by(table)}")
+        con.execute(f"DROP TABLE {raw}")
+    print(f"✓ {' / '.join(raw_tables)} 타입 적용 + 정렬 완료")
+    for table in raw_tables:
+        print(f"   {table}: ORDER BY {_order_by(table)}")
+
+
+def validate_csv_files(franchise_csv: str = FRANCHISE_CSV, biz_area_csv: str = BIZ_AREA_CSV):
     """CSV 파일 존재 여부 확인"""
-    franchise_path = Path(FRANCHISE_CSV).expanduser()
-    biz_area_path = Path(BIZ_AREA_CSV).expanduser()
+    franchise_path = Path(franchise_csv).expanduser()
+    biz_area_path = Path(biz_area_csv).expanduser()
     
     print("CSV 파일 확인 중...")
     
@@ -41,330 +174,499 @@ def validate_csv_files():
     return True, franchise_path, biz_area_path
 
 
-def build_database():
-    """DuckDB 구축"""
+def create_indexes(con):
+    """원본 테이블 인덱스 생성"""
+    print("\n" + "─"*60)
+    print("인덱스 생성 중...")
+    print("─"*60)
     
-    print("="*60)
-    print("DuckDB 구축 시작")
-    print("="*60)
-    
-    # 1. CSV 파일 확인
-    validation_result = validate_csv_files()
-    if not validation_result:
-        sys.exit(1)
+    # 가맹점 테이블 인덱스
+    franchise_indexes = [
+        ("idx_franchise_id", "가맹점_구분번호"),
+        ("idx_franchise_date", "기준년월"),
+        ("idx_franchise_name", "가맹점명"),
+    ]
     
-    _, franchise_path, biz_area_path = validation_result
-    
-    # 2. DB 파일 경로 설정
-    db_path = Path(DATA_DIR) / "data.duckdb"
+    for idx_name, column in franchise_indexes:
+        try:
+            con.execute(f"CREATE INDEX {idx_name} ON franchise({column})")
+            print(f"✓ {idx_name}: franchise({column})")
+        except Exception as e:
+            print(f"⚠️  {idx_name} 생성 실패: {e}")
     
-    # 기존 DB 파일 삭제 (재생성)
-    if db_path.exists():
-        print(f"\n⚠️  기존 DB 파일 삭제: {db_path}")
-        db_path.unlink()
+    # 복합 인덱스 (조회용)
+    try:
+        con.execute("CREATE INDEX idx_franchise_composite ON franchise(가맹점_구분번호, 기준년월)")
+        print(f"✓ idx_franchise_composite: franchise(가맹점_구분번호, 기준년월)")
+    except Exception as e:
+        print(f"⚠️  복합 인덱스 생성 실패: {e}")
     
-    # 3. DuckDB 연결
-    print(f"\n🔧 DuckDB 생성 중: {db_path}")
-    con = duckdb.connect(str(db_path))
+    # 조인용 복합 인덱스 (공통 컬럼)
+    try:
+        con.execute("CREATE INDEX idx_franchise_join ON franchise(기준년월, 상권_지리, 업종)")
+        print(f"✓ idx_franchise_join: franchise(기준년월, 상권_지리, 업종)")
+    except Exception as e:
+        print(f"⚠️  조인 인덱스 생성 실패: {e}")
     
+    # 상권 테이블 인덱스 (공통 컬럼 기반)
     try:
-        # 4. 가맹점 데이터 로드
-        print("\n" + "─"*60)
-        print("[1/2] franchise_data_addmetrics.csv 로딩...")
-        print("─"*60)
-        
-        con.execute(f"""
-            CREATE TABLE franchise AS 
-            SELECT * FROM read_csv_auto(
-                '{franchise_path}', 
-                header=true, 
-                delim=',',
-                all_varchar=false,
-                ignore_errors=false
-            )
+        con.execute("CREATE INDEX idx_biz_area_join ON biz_area(기준년월, 상권_지리, 업종)")
+        print(f"✓ idx_biz_area_join: biz_area(기준년월, 상권_지리, 업종)")
+    except Exception as e:
+        print(f"⚠️  상권 조인 인덱스 생성 실패: {e}")
+
+
+def _kma_grid_frame(con):
+    """매장 최신 좌표의 고유 (위도, 경도) → 기상청 격자 (NumPy 벡터 변환, 결측/범위 밖은 NULL)"""
+    coords = con.execute("""
+        SELECT DISTINCT 위도, 경도 FROM franchise
+        QUALIFY ROW_NUMBER() OVER (
+            PARTITION BY 가맹점_구분번호 ORDER BY 기준년월 DESC
+        ) = 1
+    """).fetchdf()
+    nx, ny = latlon_to_grid(coords["위도"].to_numpy(dtype="float64", na_value=np.nan),
+                            coords["경도"].to_numpy(dtype="float64", na_value=np.nan))
+    coords["kma_nx"] = pd.array(nx, dtype="Float64").astype("Int16")
+    coords["kma_ny"] = pd.array(ny, dtype="Float64").astype("Int16")
+    return coords
+
+
+def build_derived_tables(con):
+    """
+    파생 테이블 (재)생성 — 원본 테이블 갱신과 같은 트랜잭션에서 호출
+    - franchise_latest: 가맹점별 최신 기준년월 1행 + 기상청 격자(kma_nx, kma_ny)
+    - kma_grid_cells  : 매장이 있는 고유 격자 (날씨 일괄 선조회 대상)
+    - store_profile   : 가맹점별 최신 1행 중 지표 빌더가 쓰는 컬럼 + 같은 기준년월 상권 컬럼 (좁은 1행 조회용)
+    """
+    con.register("_kma_grid", _kma_grid_frame(con))
+    try:
+        con.execute("""
+            CREATE OR REPLACE TABLE franchise_latest AS
+            SELECT f.*, g.kma_nx, g.kma_ny
+            FROM (
+                SELECT * FROM franchise
+                QUALIFY ROW_NUMBER() OVER (
+                    PARTITION BY 가맹점_구분번호 ORDER BY 기준년월 DESC
+                ) = 1
+            ) f
+            LEFT JOIN _kma_grid g
+                ON f.위도 IS NOT DISTINCT FROM g.위도 AND f.경도 IS NOT DISTINCT FROM g.경도
         """)
-        
-        franchise_count = con.execute("SELECT COUNT(*) FROM franchise").fetchone()[0]
-        print(f"✅ {franchise_count:,} rows 로드 완료")
-        
-        # 컬럼 확인
-        columns = con.execute("DESCRIBE franchise").fetchdf()
-        print(f"   컬럼 수: {len(columns)}")
-        print(f"   주요 컬럼: {', '.join(columns['column_name'].head(10).tolist())}...")
-        
-        # 5. 상권 데이터 로드
-        print("\n" + "─"*60)
-        print("[2/2] biz_area_addmetrics.csv 로딩...")
-        print("─"*60)
-        
+    finally:
+        con.unregister("_kma_grid")
+    con.execute("CREATE INDEX idx_franchise_latest_id ON franchise_latest(가맹점_구분번호)")
+    n = con.execute("SELECT COUNT(*) FROM franchise_latest").fetchone()[0]
+    print(f"✓ franchise_latest: {n:,} rows")
+
+    con.execute("""
+        CREATE OR REPLACE TABLE kma_grid_cells AS
+        SELECT kma_nx, kma_ny, COUNT(*) AS n_stores
+        FROM franchise_latest
+        WHERE kma_nx IS NOT NULL
+        GROUP BY kma_nx, kma_ny
+        ORDER BY kma_nx, kma_ny
+    """)
+    n_cells, n_missing = con.execute("""
+        SELECT (SELECT COUNT(*) FROM kma_grid_cells),
+               (SELECT COUNT(*) FROM franchise_latest WHERE kma_nx IS NULL)
+    """).fetchone()
+    print(f"✓ kma_grid_cells: {n_cells:,} cells (격자 없는 가맹점 {n_missing:,})")
+
+    # 원본 CSV에 없는 컬럼은 건너뜀 (빌더는 없는 컬럼을 결측으로 처리)
+    latest_cols = {r[0] for r in con.execute("DESCRIBE franchise_latest").fetchall()}
+    biz_cols = {r[0] for r in con.execute("DESCRIBE biz_area").fetchall()}
+    store_sql = ", ".join(f'f."{c}"' for c in STORE_PROFILE_COLUMNS if c in latest_cols)
+    area_sql = "".join(
+        f', b."{c}" AS "{STORE_PROFILE_AREA_PREFIX}{c}"' for c in STORE_PROFILE_AREA_COLUMNS if c in biz_cols
+    )
+    con.execute(f"""
+        CREATE OR REPLACE TABLE store_profile AS
+        SELECT {store_sql}, b.기준년월 IS NOT NULL AS has_bizarea{area_sql}
+        FROM franchise_latest f
+        LEFT JOIN (
+            SELECT * FROM biz_area
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY 기준년월, 상권_지리, 업종) = 1
+        ) b
+            ON f.기준년월 = b.기준년월 AND f.상권_지리 = b.상권_지리 AND f.업종 = b.업종
+    """)
+    con.execute("CREATE INDEX idx_store_profile_id ON store_profile(가맹점_구분번호)")
+    n, n_cols, n_missing = con.execute("""
+        SELECT COUNT(*),
+               (SELECT COUNT(*) FROM duckdb_columns() WHERE table_name = 'store_profile'),
+               COUNT(*) FILTER (WHERE NOT has_bizarea)
+        FROM store_profile
+    """).fetchone()
+    print(f"✓ store_profile: {n:,} rows × {n_cols} columns (상권 매칭 없는 가맹점 {n_missing:,})")
+
+
+DERIVED_TABLES = ["franchise_latest", "kma_grid_cells", "store_profile"]
+
+
+def _carry_over_tables(con, old_db_path: Path):
+    """전체 재구축 시 기존 DB의 부가 테이블(predictions 등)을 섀도 DB로 복사"""
+    if not old_db_path.exists():
+        return
+    con.execute(f"ATTACH '{old_db_path}' AS old_db (READ_ONLY)")
+    try:
+        tables = con.execute("""
+            SELECT table_name FROM duckdb_tables() WHERE database_name = 'old_db'
+        """).fetchdf()["table_name"].tolist()
+        for table in tables:
+            if table in SOURCE_TABLES or table in DERIVED_TABLES:
+                continue
+            con.execute(f"CREATE TABLE {table} AS SELECT * FROM old_db.{table}")
+            print(f"✓ 기존 테이블 보존: {table}")
+    finally:
+        con.execute("DETACH old_db")
+
+
+def export_parquet(con, parquet_dir: Path, months: Dict[str, list] = None):
+    """
+    기준년월 hive 파티션 Parquet 내보내기 (정렬 순서 유지 → row group min/max 통계 유효)
+
+    Args:
+        months: {table: [기준년월]} — 지정 시 해당 월 파티션만 추가 (증분), None이면 전체 재생성
+    """
+    print("\n" + "─"*60)
+    print(f"Parquet 내보내기: {parquet_dir}")
+    print("─"*60)
+    parquet_dir.mkdir(parents=True, exist_ok=True)
+    
+    for table in SOURCE_TABLES:
+        if months is not None and not months.get(table):
+            continue
+        target = parquet_dir / table
+        # 전체 재생성은 임시 디렉터리에 쓰고 교체
+        out_dir = target if months is not None else parquet_dir / f".{table}.tmp"
+        if months is None and out_dir.exists():
+            shutil.rmtree(out_dir)
+        
+        where = ""
+        if months is not None:
+            where = f"WHERE 기준년월 IN ({', '.join(str(int(m)) for m in months[table])})"
         con.execute(f"""
-            CREATE TABLE biz_area AS 
-            SELECT * FROM read_csv_auto(
-                '{biz_area_path}',
-                header=true,
-                delim=',',
-                all_varchar=false,
-                ignore_errors=false
+            COPY (
+                SELECT *, 기준년월 AS yyyymm FROM {table} {where}
+                ORDER BY {_order_by(table)}
+            ) TO '{out_dir}' (
+                FORMAT PARQUET,
+                PARTITION_BY (yyyymm),
+                COMPRESSION ZSTD,
+                ROW_GROUP_SIZE {PARQUET_ROW_GROUP_SIZE},
+                OVERWRITE_OR_IGNORE
             )
         """)
         
-        biz_count = con.execute("SELECT COUNT(*) FROM biz_area").fetchone()[0]
-        print(f"✅ {biz_count:,} rows 로드 완료")
-        
-        # 컬럼 확인
-        columns = con.execute("DESCRIBE biz_area").fetchdf()
-        print(f"   컬럼 수: {len(columns)}")
-        print(f"   주요 컬럼: {', '.join(columns['column_name'].head(10).tolist())}...")
-        
-        # 6. 공통 매핑 컬럼 확인
-        print("\n" + "─"*60)
-        print("공통 매핑 컬럼 확인")
-        print("─"*60)
-        
-        common_cols = ['기준년월', '업종', '상권_지리']
-        
-        franchise_cols = con.execute("DESCRIBE franchise").fetchdf()['column_name'].tolist()
-        biz_cols = con.execute("DESCRIBE biz_area").fetchdf()['column_name'].tolist()
-        
-        print("\n[franchise 테이블]")
-        for col in common_cols:
-            exists = col in franchise_cols
-            print(f"  {'✓' if exists else '✗'} {col}")
-            if not exists:
-                print(f"       필수 컬럼 누락!")
+        if months is None:
+            old_dir = parquet_dir / f".{table}.old"
+            if target.exists():
+                target.rename(old_dir)
+            out_dir.rename(target)
+            if old_dir.exists():
+                shutil.rmtree(old_dir)
         
-        print("\n[biz_area 테이블]")
-        for col in common_cols:
-            exists = col in biz_cols
-            print(f"  {'✓' if exists else '✗'} {col}")
-            if not exists:
-                print(f"       필수 컬럼 누락!")
-        
-        # 7. 인덱스 생성
-        print("\n" + "─"*60)
-        print("인덱스 생성 중...")
-        print("─"*60)
-        
-        # 가맹점 테이블 인덱스
-        franchise_indexes = [
-            ("idx_franchise_id", "가맹점_구분번호"),
-            ("idx_franchise_date", "기준년월"),
-            ("idx_franchise_name", "가맹점명"),
-        ]
-        
-        for idx_name, column in franchise_indexes:
+        n_parts = len(list(target.glob("yyyymm=*")))
+        print(f"✓ {table}: {n_parts} partitions → {target}")
+
+
+def _new_months(con, table: str, csv_path: Path) -> list:
+    """CSV에는 있지만 테이블에는 없는 기준년월 목록"""
+    return [r[0] for r in con.execute(f"""
+        SELECT DISTINCT {YYYYMM_SQL} FROM {_read_csv_sql(csv_path)}
+        EXCEPT
+        SELECT DISTINCT 기준년월 FROM {table}
+        ORDER BY 1
+    """).fetchall()]
+
+
+def build_incremental(franchise_path: Path, biz_area_path: Path, db_path: Path, parquet_dir: Path = None):
+    """신규 기준년월만 추가 (섀도 DB 복사본에 단일 트랜잭션으로 반영 후 교체)"""
+    
+    print("="*60)
+    print("DuckDB 증분 적재 시작")
+    print("="*60)
+    
+    if not db_path.exists():
+        print(f"⚠️  기존 DB가 없어 전체 구축으로 전환합니다: {db_path}")
+        return build_database(franchise_path, biz_area_path, db_path, parquet_dir)
+    
+    sources = {"franchise": franchise_path, "biz_area": biz_area_path}
+    
+    # 신규 월 확인 (서비스 중인 DB는 읽기 전용으로만 접근)
+    with duckdb.connect(str(db_path), read_only=True) as con:
+        new_months = {t: _new_months(con, t, p) for t, p in sources.items()}
+    for table, months in new_months.items():
+        print(f"✓ {table} 신규 기준년월: {months if months else '없음'}")
+    
+    if not any(new_months.values()):
+        print("\n✅ 최신 상태 — 추가할 기준년월이 없습니다.")
+        return
+    
+    with shadow_database(db_path, copy_existing=True) as con:
+        con.execute("BEGIN TRANSACTION")
+        for table, months in new_months.items():
+            if not months:
+                continue
+            con.execute("CREATE OR REPLACE TEMP TABLE _new_months (기준년월 BIGINT)")
+            con.executemany("INSERT INTO _new_months VALUES (?)", [[m] for m in months])
+            before = con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            # 인덱스는 INSERT와 함께 갱신됨 / ENUM·FLOAT 컬럼은 테이블 타입으로 암묵 변환
+            # (ENUM에 없는 새 범주 값이 있으면 변환 오류 → 섀도 DB 폐기, 전체 재구축 필요)
             try:
-                con.execute(f"CREATE INDEX {idx_name} ON franchise({column})")
-                print(f"✓ {idx_name}: franchise({column})")
-            except Exception as e:
-                print(f"⚠️  {idx_name} 생성 실패: {e}")
-        
-        # 복합 인덱스 (조회용)
-        try:
-            con.execute("CREATE INDEX idx_franchise_composite ON franchise(가맹점_구분번호, 기준년월)")
-            print(f"✓ idx_franchise_composite: franchise(가맹점_구분번호, 기준년월)")
-        except Exception as e:
-            print(f"⚠️  복합 인덱스 생성 실패: {e}")
-        
-        # 조인용 복합 인덱스 (공통 컬럼)
+                con.execute(f"""
+                    INSERT INTO {table} BY NAME
+                    SELECT * REPLACE ({YYYYMM_SQL} AS 기준년월)
+                    FROM {_read_csv_sql(sources[table])}
+                    WHERE {YYYYMM_SQL} IN (SELECT 기준년월 FROM _new_months)
+                    ORDER BY {_order_by(table)}
+                """)
+            except duckdb.ConversionException as e:
+                print(f"❌ {table}: 기존 ENUM에 없는 범주 값이 있습니다 → 전체 재구축이 필요합니다.\n   {e}")
+                raise SystemExit(1)
+            after = con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            print(f"✅ {table}: +{after - before:,} rows (총 {after:,})")
+        
+        print("\n파생 테이블 갱신 중...")
+        build_derived_tables(con)
+        con.execute("COMMIT")
+        
+        if parquet_dir is not None:
+            export_parquet(con, parquet_dir, new_months)
+    
+    print("\n" + "="*60)
+    print("✅ 증분 적재 완료 (원자적 교체)")
+    print("="*60)
+    print(f"저장 위치: {db_path.absolute()}")
+    print(f"파일 크기: {db_path.stat().st_size / 1024 / 1024:.1f} MB")
+    print("\n💡 predictions 갱신: python scripts/build_predictions.py")
+
+
+def build_database(franchise_path: Path, biz_area_path: Path, db_path: Path, parquet_dir: Path = None):
+    """DuckDB 전체 구축 (섀도 DB에 구축 후 원자적 교체)"""
+    
+    print("="*60)
+    print("DuckDB 구축 시작")
+    print("="*60)
+    
+    # 섀도 DB에 구축 → 성공 시 교체 (기존 DB는 그동안 계속 조회 가능)
+    print(f"\n🔧 DuckDB 생성 중: {db_path} (섀도 빌드)")
+    
+    try:
+        with shadow_database(db_path, copy_existing=False) as con:
+            _build_tables(con, franchise_path, biz_area_path)
+            _carry_over_tables(con, db_path)
+            if parquet_dir is not None:
+                export_parquet(con, parquet_dir)
+    except Exception as e:
+        print(f"\n❌ 오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    
+    print("\n" + "="*60)
+    print("✅ DuckDB 구축 완료!")
+    print("="*60)
+    print(f"저장 위치: {db_path.absolute()}")
+    print(f"파일 크기: {db_path.stat().st_size / 1024 / 1024:.1f} MB")
+    print("\n다음 단계:")
+    print("  1. config.py에서 USE_DUCKDB = True로 변경")
+    print("  2. 월별 데이터 추가 시: python scripts/build_duckdb.py --incremental")
+    print("  3. 쿼리 성능 측정: python scripts/bench_mcp_tools.py --stores 10000")
+    print("="*60)
+
+
+def _build_tables(con, franchise_path: Path, biz_area_path: Path):
+    """원본 테이블 적재 + 인덱스 + 파생 테이블 + 검증"""
+    # 4. 가맹점 데이터 로드
+    print("\n" + "─"*60)
+    print("[1/2] franchise_data_addmetrics.csv 로딩...")
+    print("─"*60)
+
+    con.execute(f"CREATE TEMP TABLE _raw_franchise AS SELECT * FROM {_read_csv_sql(franchise_path)}")
+
+    franchise_count = con.execute("SELECT COUNT(*) FROM _raw_franchise").fetchone()[0]
+    print(f"✅ {franchise_count:,} rows 로드 완료")
+
+    # 컬럼 확인
+    columns = con.execute("DESCRIBE _raw_franchise").fetchdf()
+    print(f"   컬럼 수: {len(columns)}")
+    print(f"   주요 컬럼: {', '.join(columns['column_name'].head(10).tolist())}...")
+
+    # 5. 상권 데이터 로드
+    print("\n" + "─"*60)
+    print("[2/2] biz_area_addmetrics.csv 로딩...")
+    print("─"*60)
+
+    con.execute(f"CREATE TEMP TABLE _raw_biz_area AS SELECT * FROM {_read_csv_sql(biz_area_path)}")
+
+    biz_count = con.execute("SELECT COUNT(*) FROM _raw_biz_area").fetchone()[0]
+    print(f"✅ {biz_count:,} rows 로드 완료")
+
+    # 컬럼 확인
+    columns = con.execute("DESCRIBE _raw_biz_area").fetchdf()
+    print(f"   컬럼 수: {len(columns)}")
+    print(f"   주요 컬럼: {', '.join(columns['column_name'].head(10).tolist())}...")
+
+    # 명시적 스키마 적용 (ENUM / INTEGER 기준년월 / FLOAT 비율)
+    print("\n" + "─"*60)
+    print("스키마 적용 중...")
+    print("─"*60)
+    apply_schema(con, {"franchise": "_raw_franchise", "biz_area": "_raw_biz_area"})
+
+    # 6. 공통 매핑 컬럼 확인
+    print("\n" + "─"*60)
+    print("공통 매핑 컬럼 확인")
+    print("─"*60)
+
+    common_cols = ['기준년월', '업종', '상권_지리']
+
+    franchise_cols = con.execute("DESCRIBE franchise").fetchdf()['column_name'].tolist()
+    biz_cols = con.execute("DESCRIBE biz_area").fetchdf()['column_name'].tolist()
+
+    print("\n[franchise 테이블]")
+    for col in common_cols:
+        exists = col in franchise_cols
+        print(f"  {'✓' if exists else '✗'} {col}")
+        if not exists:
+            print(f"       필수 컬럼 누락!")
+
+    print("\n[biz_area 테이블]")
+    for col in common_cols:
+        exists = col in biz_cols
+        print(f"  {'✓' if exists else '✗'} {col}")
+        if not exists:
+            print(f"       필수 컬럼 누락!")
+
+    # 7. 인덱스 생성
+    create_indexes(con)
+    
+    # 파생 테이블
+    print("\n" + "─"*60)
+    print("파생 테이블 생성 중...")
+    print("─"*60)
+    build_derived_tables(con)
+    
+    # 8. 데이터 검증
+    print("\n" + "="*60)
+    print("데이터 검증")
+    print("="*60)
+
+    # 가맹점 테이블 검증
+    print("\n[franchise 테이블]")
+    print(f"  총 레코드 수: {franchise_count:,}")
+
+    unique_stores = con.execute(
+        "SELECT COUNT(DISTINCT 가맹점_구분번호) FROM franchise"
+    ).fetchone()[0]
+    print(f"  고유 가맹점 수: {unique_stores:,}")
+
+    date_range = con.execute("""
+        SELECT MIN(기준년월) as min_date, MAX(기준년월) as max_date 
+        FROM franchise
+    """).fetchone()
+    print(f"  기준년월 범위: {date_range[0]} ~ {date_range[1]}")
+
+    # 공통 컬럼 결측치 확인
+    for col in common_cols:
         try:
-            con.execute("CREATE INDEX idx_franchise_join ON franchise(기준년월, 상권_지리, 업종)")
-            print(f"✓ idx_franchise_join: franchise(기준년월, 상권_지리, 업종)")
-        except Exception as e:
-            print(f"⚠️  조인 인덱스 생성 실패: {e}")
-        
-        # 상권 테이블 인덱스 (공통 컬럼 기반)
+            null_count = con.execute(f"""
+                SELECT COUNT(*) FROM franchise WHERE {col} IS NULL
+            """).fetchone()[0]
+            print(f"  {col} 결측치: {null_count:,} ({null_count/franchise_count*100:.1f}%)")
+        except:
+            pass
+
+    # 샘플 데이터 확인
+    sample = con.execute("""
+        SELECT 가맹점_구분번호, 가맹점명, 기준년월, 업종, 상권_지리
+        FROM franchise 
+        LIMIT 3
+    """).fetchdf()
+    print(f"\n  샘플 데이터 (3행):")
+    print(sample.to_string(index=False))
+
+    # 상권 테이블 검증
+    print("\n[biz_area 테이블]")
+    print(f"  총 레코드 수: {biz_count:,}")
+
+    # 공통 컬럼 결측치 확인
+    for col in common_cols:
         try:
-            con.execute("CREATE INDEX idx_biz_area_join ON biz_area(기준년월, 상권_지리, 업종)")
-            print(f"✓ idx_biz_area_join: biz_area(기준년월, 상권_지리, 업종)")
-        except Exception as e:
-            print(f"⚠️  상권 조인 인덱스 생성 실패: {e}")
-        
-        # 8. 데이터 검증
-        print("\n" + "="*60)
-        print("데이터 검증")
-        print("="*60)
-        
-        # 가맹점 테이블 검증
-        print("\n[franchise 테이블]")
-        print(f"  총 레코드 수: {franchise_count:,}")
-        
-        unique_stores = con.execute(
-            "SELECT COUNT(DISTINCT 가맹점_구분번호) FROM franchise"
-        ).fetchone()[0]
-        print(f"  고유 가맹점 수: {unique_stores:,}")
-        
-        date_range = con.execute("""
-            SELECT MIN(기준년월) as min_date, MAX(기준년월) as max_date 
-            FROM franchise
-        """).fetchone()
-        print(f"  기준년월 범위: {date_range[0]} ~ {date_range[1]}")
-        
-        # 공통 컬럼 결측치 확인
-        for col in common_cols:
-            try:
-                null_count = con.execute(f"""
-                    SELECT COUNT(*) FROM franchise WHERE {col} IS NULL
-                """).fetchone()[0]
-                print(f"  {col} 결측치: {null_count:,} ({null_count/franchise_count*100:.1f}%)")
-            except:
-                pass
-        
-        # 샘플 데이터 확인
-        sample = con.execute("""
-            SELECT 가맹점_구분번호, 가맹점명, 기준년월, 업종, 상권_지리
-            FROM franchise 
-            LIMIT 3
-        """).fetchdf()
-        print(f"\n  샘플 데이터 (3행):")
-        print(sample.to_string(index=False))
-        
-        # 상권 테이블 검증
-        print("\n[biz_area 테이블]")
-        print(f"  총 레코드 수: {biz_count:,}")
-        
-        # 공통 컬럼 결측치 확인
-        for col in common_cols:
-            try:
-                null_count = con.execute(f"""
-                    SELECT COUNT(*) FROM biz_area WHERE {col} IS NULL
-                """).fetchone()[0]
-                print(f"  {col} 결측치: {null_count:,} ({null_count/biz_count*100:.1f}%)")
-            except:
-                pass
-        
-        # 9. 조인 테스트 (공통 컬럼 확인)
-        print("\n" + "="*60)
-        print("조인 테스트 (공통 컬럼)")
-        print("="*60)
-        
-        # 조인 가능한 레코드 수 확인
-        join_test = con.execute("""
-            SELECT COUNT(*) as join_count
-            FROM franchise f
-            INNER JOIN biz_area b 
-                ON f.기준년월 = b.기준년월 
-                AND f.상권_지리 = b.상권_지리 
-                AND f.업종 = b.업종
-        """).fetchone()[0]
-        
-        print(f"\n✓ 조인 가능한 franchise 레코드: {join_test:,} / {franchise_count:,}")
-        print(f"  조인 성공률: {join_test/franchise_count*100:.1f}%")
-        
-        # 조인 안되는 케이스 분석
-        unmatch = con.execute("""
-            SELECT COUNT(*) as unmatch_count
+            null_count = con.execute(f"""
+                SELECT COUNT(*) FROM biz_area WHERE {col} IS NULL
+            """).fetchone()[0]
+            print(f"  {col} 결측치: {null_count:,} ({null_count/biz_count*100:.1f}%)")
+        except:
+            pass
+
+    # 9. 조인 테스트 (공통 컬럼 확인)
+    print("\n" + "="*60)
+    print("조인 테스트 (공통 컬럼)")
+    print("="*60)
+
+    # 조인 가능한 레코드 수 확인
+    join_test = con.execute("""
+        SELECT COUNT(*) as join_count
+        FROM franchise f
+        INNER JOIN biz_area b 
+            ON f.기준년월 = b.기준년월 
+            AND f.상권_지리 = b.상권_지리 
+            AND f.업종 = b.업종
+    """).fetchone()[0]
+
+    print(f"\n✓ 조인 가능한 franchise 레코드: {join_test:,} / {franchise_count:,}")
+    print(f"  조인 성공률: {join_test/franchise_count*100:.1f}%")
+
+    # 조인 안되는 케이스 분석
+    unmatch = con.execute("""
+        SELECT COUNT(*) as unmatch_count
+        FROM franchise f
+        LEFT JOIN biz_area b 
+            ON f.기준년월 = b.기준년월 
+            AND f.상권_지리 = b.상권_지리 
+            AND f.업종 = b.업종
+        WHERE b.기준년월 IS NULL
+    """).fetchone()[0]
+
+    if unmatch > 0:
+        print(f"\n⚠️  조인 안되는 레코드: {unmatch:,}")
+        print(f"  원인 분석 중...")
+
+        # 원인 분석
+        sample_unmatch = con.execute("""
+            SELECT f.기준년월, f.업종, f.상권_지리, f.가맹점명
             FROM franchise f
             LEFT JOIN biz_area b 
                 ON f.기준년월 = b.기준년월 
                 AND f.상권_지리 = b.상권_지리 
                 AND f.업종 = b.업종
             WHERE b.기준년월 IS NULL
-        """).fetchone()[0]
-        
-        if unmatch > 0:
-            print(f"\n⚠️  조인 안되는 레코드: {unmatch:,}")
-            print(f"  원인 분석 중...")
-            
-            # 원인 분석
-            sample_unmatch = con.execute("""
-                SELECT f.기준년월, f.업종, f.상권_지리, f.가맹점명
-                FROM franchise f
-                LEFT JOIN biz_area b 
-                    ON f.기준년월 = b.기준년월 
-                    AND f.상권_지리 = b.상권_지리 
-                    AND f.업종 = b.업종
-                WHERE b.기준년월 IS NULL
-                LIMIT 5
-            """).fetchdf()
-            
-            print("\n  조인 실패 샘플 (5건):")
-            print(sample_unmatch.to_string(index=False))
-        
-        # 10. 성능 테스트
-        print("\n" + "="*60)
-        print("쿼리 성능 테스트")
-        print("="*60)
-        
-        import time
-        
-        # 테스트 1: 가맹점 ID 검색
-        print("\n[테스트 1] 가맹점 ID로 검색")
-        test_id = con.execute(
-            "SELECT 가맹점_구분번호 FROM franchise LIMIT 1"
-        ).fetchone()[0]
-        
-        start = time.time()
-        result = con.execute("""
-            SELECT * FROM franchise 
-            WHERE 가맹점_구분번호 = ?
-        """, [test_id]).fetchdf()
-        elapsed = time.time() - start
-        
-        print(f"  검색 가맹점: {test_id}")
-        print(f"  결과: {len(result)} rows")
-        print(f"  소요 시간: {elapsed*1000:.2f}ms")
-        
-        # 테스트 2: 가맹점명 검색
-        print("\n[테스트 2] 가맹점명으로 검색 (LIKE)")
-        start = time.time()
-        result = con.execute("""
-            SELECT * FROM franchise 
-            WHERE 가맹점명 LIKE '%본죽%'
-            LIMIT 10
+            LIMIT 5
         """).fetchdf()
-        elapsed = time.time() - start
-        
-        print(f"  검색어: '본죽'")
-        print(f"  결과: {len(result)} rows")
-        print(f"  소요 시간: {elapsed*1000:.2f}ms")
-        
-        # 테스트 3: 조인 쿼리 (공통 컬럼)
-        print("\n[테스트 3] 가맹점-상권 조인 (공통 컬럼)")
-        start = time.time()
-        result = con.execute("""
-            SELECT 
-                f.가맹점명, 
-                f.업종, 
-                f.상권_지리,
-                b.당월_매출_금액,
-                b.점포_수
-            FROM franchise f
-            LEFT JOIN biz_area b 
-                ON f.기준년월 = b.기준년월 
-                AND f.상권_지리 = b.상권_지리 
-                AND f.업종 = b.업종
-            LIMIT 100
-        """).fetchdf()
-        elapsed = time.time() - start
-        
-        print(f"  결과: {len(result)} rows")
-        print(f"  조인 성공: {result['당월_매출_금액'].notna().sum()} rows")
-        print(f"  소요 시간: {elapsed*1000:.2f}ms")
-        
-        # 11. 완료
-        con.close()
-        
-        print("\n" + "="*60)
-        print("✅ DuckDB 구축 완료!")
-        print("="*60)
-        print(f"저장 위치: {db_path.absolute()}")
-        print(f"파일 크기: {db_path.stat().st_size / 1024 / 1024:.1f} MB")
-        print("\n매핑 정보:")
-        print("  공통 컬럼: 기준년월, 업종, 상권_지리")
-        print(f"  조인 성공률: {join_test/franchise_count*100:.1f}%")
-        print("\n다음 단계:")
-        print("  1. config.py에서 USE_DUCKDB = True로 변경")
-        print("  2. mcp/tools.py 코드 수정")
-        print("="*60)
-        
-    except Exception as e:
-        print(f"\n❌ 오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
-        con.close()
-        sys.exit(1)
+
+        print("\n  조인 실패 샘플 (5건):")
+        print(sample_unmatch.to_string(index=False))
+
+    # 10. 성능 측정은 scripts/bench_mcp_tools.py 로 (p50/p95/p99, JSON 비교)
 
 
 if __name__ == "__main__":
-    build_database()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="CSV → DuckDB 구축")
+    parser.add_argument("--incremental", action="store_true", help="신규 기준년월만 추가")
+    parser.add_argument("--parquet", action="store_true", help=f"기준년월 파티션 Parquet도 생성 ({PARQUET_DIR})")
+    parser.add_argument("--franchise-csv", default=FRANCHISE_CSV, help="가맹점 CSV 경로")
+    parser.add_argument("--biz-area-csv", default=BIZ_AREA_CSV, help="상권 CSV 경로")
+    args = parser.parse_args()
+    
+    # 1. CSV 파일 확인
+    validation_result = validate_csv_files(args.franchise_csv, args.biz_area_csv)
+    if not validation_result:
+        sys.exit(1)
+    _, franchise_path, biz_area_path = validation_result
+    
+    db_path = Path(DUCKDB_PATH).expanduser()
+    parquet_dir = Path(PARQUET_DIR).expanduser() if args.parquet else None
+    if args.incremental:
+        build_incremental(franchise_path, biz_area_path, db_path, parquet_dir)
+    else:
+        build_database(franchise_path, biz_area_path, db_path, parquet_dir)
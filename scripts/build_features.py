@@ -0,0 +1,97 @@
+# scripts/build_features.py
+"""
+preprocessed_df.csv → Parquet 변환 스크립트
+
+(가맹점 ID, 기준년월) 순으로 정렬하고 작은 row group으로 저장하여
+가맹점 1곳 조회 시 row group min/max 통계로 나머지를 건너뛸 수 있게 합니다.
+
+실행 방법:
+    python scripts/build_features.py [--row-group-size 8192]
+
+생성 결과:
+    data/preprocessed_df.parquet
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import duckdb
+
+# 프로젝트 루트 경로 추가
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from my_agent.utils.config import PREPROCESSED_CSV, PREPROCESSED_PARQUET
+from forecast import STORE_COL_CANDIDATES
+
+
+def build_features(row_group_size: int = 8192):
+    """Parquet 피처 테이블 생성"""
+
+    print("=" * 60)
+    print("피처 테이블(Parquet) 구축")
+    print("=" * 60)
+
+    csv_path = Path(PREPROCESSED_CSV).expanduser()
+    parquet_path = Path(PREPROCESSED_PARQUET).expanduser()
+
+    if not csv_path.exists():
+        print(f"❌ 전처리 CSV 파일을 찾을 수 없습니다: {csv_path}")
+        sys.exit(1)
+    print(f"✓ 전처리 CSV: {csv_path}")
+
+    con = duckdb.connect()
+    try:
+        con.execute(f"""
+            CREATE VIEW src AS
+            SELECT * FROM read_csv_auto('{csv_path}', header=true)
+        """)
+        columns = con.execute("DESCRIBE src").fetchdf()["column_name"].tolist()
+        store_col = next((c for c in STORE_COL_CANDIDATES if c in columns), None)
+        if not store_col:
+            print("❌ 가맹점 ID 컬럼을 찾을 수 없습니다.")
+            sys.exit(1)
+
+        # 원자적 교체: 임시 파일에 쓰고 rename
+        tmp_path = parquet_path.with_suffix(".parquet.tmp")
+        t0 = time.time()
+        con.execute(f"""
+            COPY (
+                SELECT * FROM src
+                ORDER BY "{store_col}", 기준년월
+            ) TO '{tmp_path}' (
+                FORMAT PARQUET,
+                COMPRESSION ZSTD,
+                ROW_GROUP_SIZE {row_group_size}
+            )
+        """)
+        tmp_path.replace(parquet_path)
+        elapsed = time.time() - t0
+
+        stats = con.execute(f"""
+            SELECT COUNT(*) AS n_rows, COUNT(DISTINCT "{store_col}") AS n_stores
+            FROM read_parquet('{parquet_path}')
+        """).fetchone()
+        n_groups = con.execute(f"""
+            SELECT COUNT(DISTINCT row_group_id) FROM parquet_metadata('{parquet_path}')
+        """).fetchone()[0]
+    finally:
+        con.close()
+
+    print("\n" + "=" * 60)
+    print("✅ 피처 테이블 구축 완료!")
+    print("=" * 60)
+    print(f"저장 위치: {parquet_path.absolute()}")
+    print(f"정렬 키: ({store_col}, 기준년월)")
+    print(f"행 수: {stats[0]:,} / 가맹점 수: {stats[1]:,} / row group 수: {n_groups:,}")
+    print(f"CSV 크기: {csv_path.stat().st_size / 1024 / 1024:.1f} MB → "
+          f"Parquet 크기: {parquet_path.stat().st_size / 1024 / 1024:.1f} MB")
+    print(f"소요 시간: {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="preprocessed_df.csv → Parquet 변환")
+    parser.add_argument("--row-group-size", type=int, default=8192, help="Parquet row group 크기")
+    args = parser.parse_args()
+    build_features(row_group_size=args.row_group_size)
@@ -0,0 +1,166 @@
+# scripts/build_predictions.py
+"""
+다음달 매출 구간 배치 예측 스크립트
+
+전 가맹점의 최신 기준년월 행을 모아 predict_proba 1회로 일괄 예측하고
+결과를 DuckDB predictions 테이블에 저장합니다.
+- 기본: 신규 가맹점 / 최신 기준년월이 바뀐 가맹점 / 모델이 바뀐 가맹점만 재예측
+- --full: 전체 재예측
+
+실행 방법:
+    python scripts/build_predictions.py [--full]
+
+생성 결과:
+    data/data.duckdb → predictions 테이블 (섀도 DB에 기록 후 원자적 교체)
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import duckdb
+import joblib
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from my_agent.utils.config import DUCKDB_PATH, PREDICTOR_PATH, LABEL_ENCODER_PATH
+from my_agent.utils.duckdb_swap import shadow_database
+from forecast import (
+    PREDICTIONS_TABLE, SalesBandPredictor, features_store_col, load_all_latest_features, score_rows
+)
+
+
+CREATE_PREDICTIONS_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {PREDICTIONS_TABLE} (
+        가맹점_구분번호 VARCHAR PRIMARY KEY,
+        encoded_id BIGINT,
+        기준년월 VARCHAR,
+        predicted_class INTEGER,
+        predicted_label VARCHAR,
+        predicted_probability DOUBLE,
+        proba_0 DOUBLE, proba_1 DOUBLE, proba_2 DOUBLE,
+        proba_3 DOUBLE, proba_4 DOUBLE, proba_5 DOUBLE,
+        model_path VARCHAR,
+        scored_at TIMESTAMP
+    )
+"""
+
+
+def _select_stale(db_path: Path, keys: pd.DataFrame, model_path: str, full: bool) -> pd.DataFrame:
+    """
+    재예측이 필요한 가맹점만 선택 (keys의 index 유지)
+    - 현재 DB를 읽기 전용으로 조회 → 대상이 없으면 섀도 DB를 만들지 않음 (복사/교체 생략)
+    """
+    if full or not db_path.exists():
+        return keys
+
+    con = duckdb.connect(str(db_path), read_only=True)
+    try:
+        existing = con.execute(
+            f"SELECT 가맹점_구분번호, 기준년월 AS prev_month, model_path AS prev_model FROM {PREDICTIONS_TABLE}"
+        ).fetchdf()
+    except duckdb.CatalogException:
+        return keys
+    finally:
+        con.close()
+    if existing.empty:
+        return keys
+
+    merged = keys.merge(existing, on="가맹점_구분번호", how="left")
+    stale = (
+        merged["prev_month"].isna()
+        | (merged["prev_month"] != merged["기준년월"])
+        | (merged["prev_model"] != model_path)
+    )
+    return keys[stale.values]
+
+
+def build_predictions(full: bool = False):
+    """predictions 테이블 구축/갱신"""
+
+    print("=" * 60)
+    print("다음달 매출 구간 배치 예측")
+    print("=" * 60)
+
+    # 1. 모델/인코더 로드 (일괄 1회 예측이므로 persist 생략)
+    t0 = time.time()
+    predictor = SalesBandPredictor.load(PREDICTOR_PATH, persist=False)
+    label_encoder = joblib.load(LABEL_ENCODER_PATH)
+    print(f"✓ 모델 로드: {time.time() - t0:.1f}s")
+
+    store_col = features_store_col()
+    if not store_col:
+        print("❌ 가맹점 ID 컬럼을 찾을 수 없습니다.")
+        sys.exit(1)
+
+    # 2. 가맹점별 최신 행 (모델 피처 컬럼만) + 원본 ID 복원
+    t0 = time.time()
+    latest = load_all_latest_features(predictor.features())
+    print(f"✓ 최신 피처 로드: {time.time() - t0:.1f}s")
+    keys = pd.DataFrame({
+        "가맹점_구분번호": label_encoder.inverse_transform(latest[store_col].astype(int)),
+        "encoded_id": latest[store_col].astype(int).values,
+        "기준년월": latest["기준년월"].astype(str).values,
+    })
+    print(f"✓ 가맹점 수: {len(latest):,}")
+
+    # 3. 재예측 대상 선택 (현재 DB 읽기 전용)
+    db_path = Path(DUCKDB_PATH).expanduser()
+    stale_keys = _select_stale(db_path, keys, PREDICTOR_PATH, full)
+    print(f"✓ 재예측 대상: {len(stale_keys):,} / {len(keys):,}")
+
+    if stale_keys.empty:
+        print("\n✅ 최신 상태 — 재예측할 가맹점이 없습니다.")
+        return
+
+    # 섀도 DB(현재 DB 복사본)에 기록 — 완료 후 원자적 교체
+    with shadow_database(db_path, copy_existing=True) as con:
+        con.execute(CREATE_PREDICTIONS_SQL)
+
+        # 4. 일괄 예측 (predict_proba 1회)
+        t0 = time.time()
+        scored = score_rows(predictor, latest.loc[stale_keys.index])
+        elapsed = time.time() - t0
+        print(f"✓ 예측 완료: {elapsed:.1f}s ({elapsed / len(stale_keys) * 1000:.2f}ms/store)")
+
+        out = pd.concat(
+            [stale_keys.reset_index(drop=True), scored],
+            axis=1,
+        )
+        for c in range(6):
+            if f"proba_{c}" not in out.columns:
+                out[f"proba_{c}"] = None
+        out["model_path"] = PREDICTOR_PATH
+        out["scored_at"] = pd.Timestamp.now()
+
+        # 5. 저장 (대상 가맹점만 교체)
+        con.register("scored_df", out)
+        con.execute("BEGIN TRANSACTION")
+        con.execute(f"""
+            DELETE FROM {PREDICTIONS_TABLE}
+            WHERE 가맹점_구분번호 IN (SELECT 가맹점_구분번호 FROM scored_df)
+        """)
+        con.execute(f"""
+            INSERT INTO {PREDICTIONS_TABLE}
+            SELECT 가맹점_구분번호, encoded_id, 기준년월,
+                   predicted_class, predicted_label, predicted_probability,
+                   proba_0, proba_1, proba_2, proba_3, proba_4, proba_5,
+                   model_path, scored_at
+            FROM scored_df
+        """)
+        con.execute("COMMIT")
+
+        total = con.execute(f"SELECT COUNT(*) FROM {PREDICTIONS_TABLE}").fetchone()[0]
+        print("\n" + "=" * 60)
+        print(f"✅ predictions 갱신 완료: {len(out):,} rows 재예측 / 총 {total:,} rows")
+        print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="다음달 매출 구간 배치 예측")
+    parser.add_argument("--full", action="store_true", help="전체 가맹점 재예측")
+    args = parser.parse_args()
+    build_predictions(full=args.full)
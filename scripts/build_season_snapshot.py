@@ -0,0 +1,153 @@
+# scripts/build_season_snapshot.py
+"""
+전 가맹점 계절 지표 일괄 계산 스크립트 (SEASON 답변용 일 단위 스냅샷)
+
+- franchise_latest(가맹점별 최신 행 + 기상청 격자) ⋈ biz_area(같은 기준년월/상권_지리/업종) 시간대 컬럼
+- 날씨: 매장이 있는 격자만 1회씩 조회 (mcp/tools_weather.py 격자 캐시 → 격자별 요약)
+- 계절 / 평균기온 / 날씨추세 / 상권_주요활성시간대 / 메시지를 벡터 연산으로 계산
+- 결과를 season_snapshot 테이블에 snapshot_date(오늘)와 함께 저장 (이전 일자 행은 교체)
+
+기상청 05시 발표 자료 제공(05:10) 이후 하루 1회 실행을 권장합니다.
+
+실행 방법:
+    python scripts/build_season_snapshot.py [--days 3]
+
+생성 결과:
+    data/data.duckdb → season_snapshot 테이블 (섀도 DB에 기록 후 원자적 교체)
+"""
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from my_agent.utils.config import DUCKDB_PATH
+from my_agent.utils.duckdb_swap import shadow_database
+from my_agent.metrics.season_metrics import SEASON_SNAPSHOT_TABLE, TIME_KEYS, build_season_frame
+from mcp import tools_weather
+from mcp.kma_grid import latlon_to_grid
+
+
+def load_stores(db_path: Path) -> pd.DataFrame:
+    """가맹점별 최신 행 + 격자 + 상권 시간대 컬럼 (구버전 DB면 격자를 좌표로 계산)"""
+    with duckdb.connect(str(db_path), read_only=True) as con:
+        tables = {r[0] for r in con.execute("SELECT table_name FROM duckdb_tables()").fetchall()}
+        if "franchise_latest" not in tables:
+            print("❌ franchise_latest 테이블이 없습니다 → python scripts/build_duckdb.py 먼저 실행")
+            sys.exit(1)
+
+        latest_cols = {r[0] for r in con.execute("DESCRIBE franchise_latest").fetchall()}
+        biz_cols = {r[0] for r in con.execute("DESCRIBE biz_area").fetchall()}
+        time_cols = [k for k in TIME_KEYS if k in biz_cols]
+        if not time_cols:
+            print("⚠️  biz_area에 시간대 건수 컬럼이 없습니다 → 상권_주요활성시간대는 '정보 없음'")
+
+        grid_sql = "f.kma_nx, f.kma_ny" if "kma_nx" in latest_cols else "NULL AS kma_nx, NULL AS kma_ny"
+        area_sql = "f.상권" if "상권" in latest_cols else "NULL AS 상권"
+        slot_sql = "".join(f', b."{k}"' for k in time_cols)
+        stores = con.execute(f"""
+            SELECT f.가맹점_구분번호, CAST(f.업종 AS VARCHAR) AS 업종, {area_sql},
+                   CAST(f.상권_지리 AS VARCHAR) AS 상권_지리, f.위도, f.경도, {grid_sql}{slot_sql}
+            FROM franchise_latest f
+            LEFT JOIN (
+                SELECT * FROM biz_area
+                QUALIFY ROW_NUMBER() OVER (PARTITION BY 기준년월, 상권_지리, 업종) = 1
+            ) b
+                ON f.기준년월 = b.기준년월 AND f.상권_지리 = b.상권_지리 AND f.업종 = b.업종
+        """).fetchdf()
+
+    if "kma_nx" not in latest_cols:
+        print("⚠️  franchise_latest에 kma_nx/kma_ny가 없습니다 (구버전 DB) → 좌표로 격자 계산")
+        nx, ny = latlon_to_grid(stores["위도"].to_numpy(dtype="float64", na_value=float("nan")),
+                                stores["경도"].to_numpy(dtype="float64", na_value=float("nan")))
+        stores["kma_nx"], stores["kma_ny"] = nx, ny
+    stores["kma_nx"] = pd.to_numeric(stores["kma_nx"]).astype("Int64")
+    stores["kma_ny"] = pd.to_numeric(stores["kma_ny"]).astype("Int64")
+    return stores.drop(columns=["위도", "경도"])
+
+
+def load_weather(cells, days: int) -> pd.DataFrame:
+    """격자별 예보 요약 (격자 캐시 일괄 적재 후 캐시에서 요약)"""
+    counts = tools_weather.prefetch_grid_cells(set(cells))
+    print(f"✓ 날씨 조회: {counts}")
+    rows = []
+    for nx, ny in cells:
+        result = tools_weather.get_weather_forecast(nx=nx, ny=ny, days=days, include_records=False)
+        summary = result.get("summary") or {}
+        rows.append({
+            "kma_nx": nx,
+            "kma_ny": ny,
+            "평균기온": summary.get("평균기온"),
+            "강수시간수": summary.get("강수시간수"),
+            "날씨추세": summary.get("날씨추세"),
+        })
+    weather = pd.DataFrame(rows, columns=["kma_nx", "kma_ny", "평균기온", "강수시간수", "날씨추세"])
+    weather["kma_nx"] = weather["kma_nx"].astype("Int64")
+    weather["kma_ny"] = weather["kma_ny"].astype("Int64")
+    weather["평균기온"] = pd.to_numeric(weather["평균기온"])
+    return weather
+
+
+def build_season_snapshot(days: int = 3):
+    """season_snapshot 테이블 구축 (오늘 일자)"""
+
+    print("=" * 60)
+    print("계절 지표 스냅샷 (전 가맹점)")
+    print("=" * 60)
+
+    db_path = Path(DUCKDB_PATH).expanduser()
+    if not db_path.exists():
+        print(f"❌ DuckDB 파일이 없습니다: {db_path}")
+        sys.exit(1)
+    today = date.today()
+
+    # 1. 가맹점 + 상권 시간대
+    t0 = time.time()
+    stores = load_stores(db_path)
+    print(f"✓ 가맹점 로드: {len(stores):,} stores ({time.time() - t0:.1f}s)")
+
+    # 2. 격자별 날씨 요약
+    t0 = time.time()
+    cells = sorted({(int(x), int(y)) for x, y in stores[["kma_nx", "kma_ny"]].dropna().itertuples(index=False)})
+    weather = load_weather(cells, days)
+    n_ok = int(weather["평균기온"].notna().sum())
+    print(f"✓ 격자 {len(cells):,}개 중 {n_ok:,}개 예보 확보 ({time.time() - t0:.1f}s)")
+
+    # 3. 벡터 계산
+    t0 = time.time()
+    snapshot = build_season_frame(stores, weather, today)
+    snapshot.insert(1, "snapshot_date", pd.Timestamp(today))
+    snapshot["kma_nx"] = stores["kma_nx"].astype("Int16").values
+    snapshot["kma_ny"] = stores["kma_ny"].astype("Int16").values
+    snapshot["built_at"] = pd.Timestamp.now()
+    n_missing = int(snapshot["평균기온"].isna().sum())
+    print(f"✓ 지표 계산: {time.time() - t0:.2f}s (날씨 없는 가맹점 {n_missing:,})")
+
+    # 4. 저장 (섀도 DB 복사본에서 교체 → 원자적 교체)
+    with shadow_database(db_path, copy_existing=True) as con:
+        con.register("snapshot_df", snapshot)
+        con.execute("BEGIN TRANSACTION")
+        con.execute(f"CREATE OR REPLACE TABLE {SEASON_SNAPSHOT_TABLE} AS "
+                    "SELECT * REPLACE (CAST(snapshot_date AS DATE) AS snapshot_date) FROM snapshot_df")
+        con.execute(f"CREATE INDEX idx_{SEASON_SNAPSHOT_TABLE}_id ON {SEASON_SNAPSHOT_TABLE}(가맹점_구분번호)")
+        con.execute("COMMIT")
+        con.unregister("snapshot_df")
+        total = con.execute(f"SELECT COUNT(*) FROM {SEASON_SNAPSHOT_TABLE}").fetchone()[0]
+
+    print("\n" + "=" * 60)
+    print(f"✅ {SEASON_SNAPSHOT_TABLE} 갱신 완료: {total:,} rows ({today})")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="전 가맹점 계절 지표 스냅샷")
+    parser.add_argument("--days", type=int, default=3, help="예보 요약 기간 (일)")
+    args = parser.parse_args()
+    build_season_snapshot(days=args.days)
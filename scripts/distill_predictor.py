@@ -0,0 +1,180 @@
+# scripts/distill_predictor.py
+"""
+AutoGluon 앙상블 → LightGBM 단일 모델 증류 스크립트
+
+앙상블의 predict_proba 결과(argmax)를 교사 라벨로 삼아 LightGBM 하나를 학습하고,
+최근 N개월(held-out)에서 앙상블과의 일치율/지연시간을 비교한 패리티 리포트를 함께 저장합니다.
+온라인 경로는 PREDICTOR_BACKEND=lite 로 증류 모델을 사용하고, 앙상블은 배치 예측에 그대로 사용합니다.
+
+실행 방법:
+    python scripts/distill_predictor.py [--holdout-months 2] [--num-rounds 300]
+
+생성 결과:
+    data/sales_band_lite.joblib        (LITE_MODEL_PATH)
+    data/sales_band_lite.json          (패리티 리포트)
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from my_agent.utils.config import PREDICTOR_PATH, LITE_MODEL_PATH
+from forecast import DROP_COLS, DistilledModel, SalesBandPredictor, load_all_features
+
+TARGET_COL = "매출금액_구간"
+
+
+def _latency_ms(model, rows: pd.DataFrame, n: int) -> dict:
+    """1행 단위 predict_proba 지연시간 (p50/p99)"""
+    samples = []
+    for i in range(min(n, len(rows))):
+        row = rows.iloc[[i]]
+        t0 = time.perf_counter()
+        model.predict_proba(row)
+        samples.append((time.perf_counter() - t0) * 1000)
+    s = pd.Series(samples)
+    return {"p50_ms": round(float(s.quantile(0.5)), 3), "p99_ms": round(float(s.quantile(0.99)), 3)}
+
+
+def distill(holdout_months: int = 2, num_rounds: int = 300, num_leaves: int = 63):
+    """증류 모델 학습 + 패리티 리포트 저장"""
+    import lightgbm as lgb
+
+    print("=" * 60)
+    print("매출 구간 예측 모델 증류 (AutoGluon → LightGBM)")
+    print("=" * 60)
+
+    # 1. 교사 모델 + 전체 피처
+    t0 = time.time()
+    teacher = SalesBandPredictor.load(PREDICTOR_PATH, persist=True)
+    features = teacher.features()
+    print(f"✓ 앙상블 로드: {time.time() - t0:.1f}s (피처 {len(features)}개)")
+
+    df = load_all_features()
+    X = df[features]
+    print(f"✓ 피처 로드: {len(df):,} rows")
+
+    # 2. 교사 라벨 (predict_proba 1회)
+    t0 = time.time()
+    teacher_proba = teacher.predict_proba(X)
+    classes = [int(c) for c in teacher_proba.columns]
+    teacher_idx = teacher_proba.to_numpy().argmax(axis=1)
+    print(f"✓ 교사 라벨 생성: {time.time() - t0:.1f}s")
+
+    # 3. 학습/held-out 분할 (최근 N개월)
+    months = sorted(df["기준년월"].astype(str).unique())
+    if len(months) <= holdout_months:
+        print(f"❌ 기준년월이 {len(months)}개뿐이라 held-out {holdout_months}개월을 분리할 수 없습니다.")
+        sys.exit(1)
+    holdout_set = set(months[-holdout_months:])
+    is_holdout = df["기준년월"].astype(str).isin(holdout_set).to_numpy()
+    print(f"✓ 학습: {(~is_holdout).sum():,} rows / held-out({', '.join(sorted(holdout_set))}): {is_holdout.sum():,} rows")
+
+    # 4. 범주형 카테고리 고정 (학습 구간 기준)
+    categories = {
+        c: sorted(X.loc[~is_holdout, c].dropna().unique().tolist(), key=str)
+        for c in features
+        if not pd.api.types.is_numeric_dtype(X[c])
+    }
+    student = DistilledModel({"booster": None, "classes": classes, "features": features, "categories": categories})
+    X_enc = student.encode(X)
+    cat_idx = [features.index(c) for c in categories]
+
+    # 5. LightGBM 학습
+    t0 = time.time()
+    train_set = lgb.Dataset(
+        X_enc[~is_holdout], label=teacher_idx[~is_holdout],
+        feature_name=[f"f{i}" for i in range(len(features))],
+        categorical_feature=cat_idx or "auto",
+    )
+    student.booster = lgb.train(
+        {
+            "objective": "multiclass",
+            "num_class": len(classes),
+            "num_leaves": num_leaves,
+            "learning_rate": 0.05,
+            "min_data_in_leaf": 20,
+            "verbosity": -1,
+        },
+        train_set,
+        num_boost_round=num_rounds,
+    )
+    print(f"✓ 증류 모델 학습: {time.time() - t0:.1f}s ({num_rounds} rounds)")
+
+    # 6. 패리티 리포트 (held-out)
+    hold_X = X[is_holdout]
+    student_proba = student.predict_proba(hold_X).to_numpy()
+    student_idx = student_proba.argmax(axis=1)
+    hold_teacher_idx = teacher_idx[is_holdout]
+
+    report = {
+        "teacher_path": PREDICTOR_PATH,
+        "holdout_months": sorted(holdout_set),
+        "n_train": int((~is_holdout).sum()),
+        "n_holdout": int(is_holdout.sum()),
+        "agreement": round(float((student_idx == hold_teacher_idx).mean()), 4),
+        "proba_mae": round(float(np.abs(student_proba - teacher_proba.to_numpy()[is_holdout]).mean()), 4),
+        "per_class_agreement": {
+            str(classes[k]): round(float((student_idx[hold_teacher_idx == k] == k).mean()), 4)
+            for k in range(len(classes)) if (hold_teacher_idx == k).any()
+        },
+    }
+
+    # 실제 라벨이 있으면 정확도도 비교
+    if TARGET_COL in df.columns:
+        truth = pd.to_numeric(df.loc[is_holdout, TARGET_COL], errors='coerce').to_numpy()
+        valid = ~np.isnan(truth)
+        if valid.any():
+            class_arr = np.asarray(classes)
+            report["teacher_accuracy"] = round(float((class_arr[hold_teacher_idx][valid] == truth[valid]).mean()), 4)
+            report["student_accuracy"] = round(float((class_arr[student_idx][valid] == truth[valid]).mean()), 4)
+
+    sample = hold_X.drop(columns=DROP_COLS, errors='ignore')
+    report["latency"] = {
+        "teacher": _latency_ms(teacher, sample, 20),
+        "student": _latency_ms(student, sample, 200),
+    }
+
+    # 7. 저장 (임시 파일 → rename)
+    model_path = Path(LITE_MODEL_PATH).expanduser()
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = model_path.with_suffix(".joblib.tmp")
+    joblib.dump(
+        {"booster": student.booster, "classes": classes, "features": features, "categories": categories},
+        tmp_path,
+    )
+    tmp_path.replace(model_path)
+    report["model_bytes"] = model_path.stat().st_size
+
+    report_path = model_path.with_suffix(".json")
+    report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print("\n" + "=" * 60)
+    print("✅ 증류 완료!")
+    print("=" * 60)
+    print(f"모델: {model_path} ({report['model_bytes'] / 1024:.0f} KB)")
+    print(f"리포트: {report_path}")
+    print(f"앙상블 일치율: {report['agreement'] * 100:.2f}% / 확률 MAE: {report['proba_mae']:.4f}")
+    if "student_accuracy" in report:
+        print(f"정확도: 앙상블 {report['teacher_accuracy'] * 100:.2f}% / 증류 {report['student_accuracy'] * 100:.2f}%")
+    print(f"1행 지연시간 p50: 앙상블 {report['latency']['teacher']['p50_ms']}ms → "
+          f"증류 {report['latency']['student']['p50_ms']}ms")
+    print("\n사용: PREDICTOR_BACKEND=lite")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AutoGluon 앙상블 → LightGBM 증류")
+    parser.add_argument("--holdout-months", type=int, default=2, help="패리티 평가용 최근 개월 수")
+    parser.add_argument("--num-rounds", type=int, default=300, help="부스팅 라운드 수")
+    parser.add_argument("--num-leaves", type=int, default=63, help="트리당 리프 수")
+    args = parser.parse_args()
+    distill(holdout_months=args.holdout_months, num_rounds=args.num_rounds, num_leaves=args.num_leaves)
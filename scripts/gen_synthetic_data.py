@@ -0,0 +1,446 @@
+# scripts/gen_synthetic_data.py
+"""
+합성 franchise / biz_area 데이터 생성기 (오프라인 벤치마크·부하 테스트용)
+
+실제 data/ (Google Drive)가 없어도 데이터 경로 전체를 돌려볼 수 있도록
+mcp/tools.py, my_agent/metrics/*, dashboard.py가 참조하는 컬럼을 같은 이름·단위로 생성합니다.
+
+분포:
+- 업종: 가중치 고정 목록 (한식·카페 비중 큼), 상권 규모: 로그정규
+- 매출: 가맹점 규모(로그정규) × 업종 계절성 × 월별 잡음 → 구간/백분위/순위/편차는 (기준년월, 업종) 안에서 계산
+- 성별·연령 고객 비중: 가맹점별 디리클레 → 핵심고객_1~3순위와 일치
+- 단골/신규/배달 비중: 베타 분포 + 가맹점별 추세 → 차이_pp / YoY_pp / 3개월 추세는 실제 이력에서 계산
+- 가맹점명: 실제 데이터처럼 앞 2글자만 남기고 마스킹 (예: '본죽*****')
+- 모든 가맹점이 모든 기준년월에 존재 (개·폐업 없음)
+
+출력 (build_duckdb.py와 같은 명시적 스키마·정렬):
+- duckdb : franchise / biz_area / franchise_latest / kma_grid_cells + 인덱스
+- parquet: 기준년월 hive 파티션 (<out>/<table>/yyyymm=YYYYMM/)
+- csv    : <out>/franchise.csv, <out>/biz_area.csv (build_duckdb.py / build_arrow_store.py 입력)
+
+실행 방법:
+    python scripts/gen_synthetic_data.py --stores 100000 [--months 24] [--areas N]
+        [--format duckdb|parquet|csv] [--out PATH] [--seed 42] [--start 202301]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import duckdb
+import numpy as np
+import pyarrow as pa
+
+# 프로젝트 루트 경로 추가
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from my_agent.utils.duckdb_swap import shadow_database
+from scripts.build_duckdb import SOURCE_TABLES, apply_schema, build_derived_tables, create_indexes, export_parquet
+
+DEFAULT_OUT = PROJECT_ROOT / "data" / "synthetic"
+
+# 업종: (가중치, 평균 배달비중, 객단가, 계절 진폭, 성수기 월)
+INDUSTRIES = {
+    "한식": (0.22, 0.15, 13000, 0.05, 12),
+    "카페": (0.16, 0.10, 6500, 0.10, 7),
+    "치킨": (0.10, 0.55, 22000, 0.12, 7),
+    "분식": (0.09, 0.35, 8000, 0.05, 3),
+    "베이커리": (0.07, 0.08, 9000, 0.06, 12),
+    "중식": (0.07, 0.45, 15000, 0.06, 1),
+    "호프/맥주": (0.06, 0.05, 28000, 0.15, 8),
+    "일식": (0.05, 0.20, 20000, 0.05, 12),
+    "피자": (0.05, 0.60, 24000, 0.08, 12),
+    "햄버거": (0.05, 0.40, 9500, 0.06, 8),
+    "양식": (0.04, 0.12, 23000, 0.07, 12),
+    "디저트": (0.04, 0.15, 7000, 0.12, 7),
+}
+AREAS = [
+    "성수1가1동", "성수1가2동", "성수2가1동", "성수2가3동", "왕십리도선동", "왕십리2동",
+    "행당1동", "행당2동", "응봉동", "금호1가동", "금호2.3가동", "금호4가동",
+    "옥수동", "마장동", "사근동", "송정동", "용답동",
+]
+BRANDS = [
+    "본죽", "본도시락", "원조국밥", "유유커피", "동대문엽기", "희망분식", "혁이네", "케키케키",
+    "바른치킨", "성수족발", "청년다방", "한솥도시락", "메가커피", "빽다방", "교촌치킨", "파리바게뜨",
+    "뚜레쥬르", "홍콩반점", "역전우동", "버거킹", "맘스터치", "도미노피자", "설빙", "하남돼지집",
+]
+GENDERS = ("남성", "여성")
+AGES = ("20대이하", "30대", "40대", "50대", "60대이상")
+SEGMENTS = [(g, a) for g in GENDERS for a in AGES]
+WEEKDAYS = ("월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일")
+TIME_SLOTS = ("00_06", "06_11", "11_14", "14_17", "17_21", "21_24")
+CANCEL_BAND_P = (0.30, 0.25, 0.20, 0.12, 0.08, 0.05)   # 취소율_구간 1~6
+SALES_BAND_EDGES = (0.10, 0.25, 0.50, 0.75, 0.90)      # 매출금액_구간 1(상위 10%)~6
+
+
+def store_ids(n_stores: int) -> List[str]:
+    """가맹점_구분번호 (10자리 16진수, 인덱스 → 고유 ID 전단사)"""
+    idx = np.arange(n_stores, dtype=np.uint64)
+    codes = (idx * np.uint64(0x9E3779B1) + np.uint64(0x1F3D5B79)) & np.uint64((1 << 40) - 1)
+    return [f"{int(c):010X}" for c in codes]
+
+
+def area_names(n_areas: int) -> List[str]:
+    return [AREAS[i] if i < len(AREAS) else f"{AREAS[i % len(AREAS)]}_{i // len(AREAS)}" for i in range(n_areas)]
+
+
+def month_list(start: int, months: int) -> List[int]:
+    y, m = divmod(int(start), 100)
+    out = []
+    for k in range(months):
+        yy, mm = divmod(m - 1 + k, 12)
+        out.append((y + yy) * 100 + mm + 1)
+    return out
+
+
+def _dirichlet_rows(rng, alpha: np.ndarray) -> np.ndarray:
+    """행별 alpha가 다른 디리클레 표본 (감마 정규화)"""
+    g = rng.gamma(alpha)
+    return g / g.sum(axis=1, keepdims=True)
+
+
+def _beta_mean(rng, mean: np.ndarray, k: float) -> np.ndarray:
+    mean = np.clip(mean, 0.01, 0.99)
+    return rng.beta(mean * k, (1 - mean) * k)
+
+
+def _group_mean(values: np.ndarray, groups: np.ndarray, n_groups: int) -> np.ndarray:
+    """행별 소속 그룹 평균"""
+    total = np.bincount(groups, weights=values, minlength=n_groups)
+    count = np.bincount(groups, minlength=n_groups)
+    return (total / np.maximum(count, 1))[groups]
+
+
+def _group_pct_rank(values: np.ndarray, groups: np.ndarray, n_groups: int) -> np.ndarray:
+    """그룹 내 PERCENT_RANK (오름차순, 0~1)"""
+    order = np.lexsort((values, groups))
+    count = np.bincount(groups, minlength=n_groups)
+    start = np.concatenate([[0], np.cumsum(count)[:-1]])
+    rank = np.empty(len(values), dtype=np.float64)
+    rank[order] = np.arange(len(values)) - start[groups[order]]
+    return rank / np.maximum(count[groups] - 1, 1)
+
+
+def _group_zscore(values: np.ndarray, groups: np.ndarray, n_groups: int) -> np.ndarray:
+    mean = _group_mean(values, groups, n_groups)
+    std = np.sqrt(_group_mean((values - mean) ** 2, groups, n_groups))
+    return np.where(std > 0, (values - mean) / np.where(std > 0, std, 1), 0.0)
+
+
+class SyntheticWorld:
+    """가맹점·상권의 고정 속성 (기준년월마다 month()로 한 달치 행 생성)"""
+
+    def __init__(self, n_stores: int, n_areas: int = None, seed: int = 42):
+        self.rng = rng = np.random.default_rng(seed)
+        self.n_stores = n_stores
+        self.n_areas = n_areas or max(len(AREAS), n_stores // 300)
+        self.areas = area_names(self.n_areas)
+        self.industries = list(INDUSTRIES)
+        n_ind = len(self.industries)
+        ind_table = np.array([INDUSTRIES[k] for k in self.industries], dtype=float)
+        self.ind_delivery, self.ind_ticket = ind_table[:, 1], ind_table[:, 2]
+        self.ind_amp, self.ind_peak = ind_table[:, 3], ind_table[:, 4]
+
+        # 상권 (규모 로그정규, 인구 구성, 연령 분포, 요일·시간대 유동 패턴)
+        self.area_size = rng.lognormal(0.0, 0.7, self.n_areas)
+        self.area_pop = (self.area_size * 120_000).astype(np.int64)
+        self.area_growth = rng.normal(0.0, 0.004, self.n_areas)
+        self.area_mix = _dirichlet_rows(rng, np.tile([4.0, 3.0, 3.0], (self.n_areas, 1)))
+        self.area_age = _dirichlet_rows(rng, np.tile([3.0, 3.0, 2.5, 2.0, 1.5], (self.n_areas, 1)))
+        self.area_male = rng.uniform(0.46, 0.54, self.n_areas)
+        self.area_income = rng.lognormal(np.log(3_200_000), 0.25, self.n_areas).astype(np.int64)
+        self.area_access = rng.uniform(30, 95, self.n_areas).round(1)
+        self.area_week = _dirichlet_rows(rng, np.tile([10, 10, 10, 10, 12, 14, 11], (self.n_areas, 1)).astype(float))
+        self.area_time = _dirichlet_rows(rng, np.tile([2, 8, 14, 10, 16, 6], (self.n_areas, 1)).astype(float))
+        self.ind_week = _dirichlet_rows(rng, np.tile([10, 10, 10, 10, 13, 16, 12], (n_ind, 1)).astype(float))
+        self.ind_time = _dirichlet_rows(rng, np.tile([1, 5, 16, 8, 18, 6], (n_ind, 1)).astype(float))
+
+        # 가맹점 고정 속성
+        weights = ind_table[:, 0] / ind_table[:, 0].sum()
+        self.ind = rng.choice(n_ind, n_stores, p=weights)
+        self.area = rng.choice(self.n_areas, n_stores, p=self.area_size / self.area_size.sum())
+        self.ids = store_ids(n_stores)
+        brand = rng.integers(0, len(BRANDS), n_stores)
+        full_names = [f"{BRANDS[b]}{self.areas[a].split('_')[0][:2]}점" for b, a in zip(brand, self.area)]
+        self.names = pa.array([n[:2] + "*" * (len(n) - 2) for n in full_names])
+        road = rng.integers(1, 40, n_stores)
+        num = rng.integers(1, 120, n_stores)
+        self.addresses = pa.array([
+            f"서울 성동구 {self.areas[a].split('_')[0]} {r}길 {k}" for a, r, k in zip(self.area, road, num)
+        ])
+        self.ids_arr = pa.array(self.ids)
+        self.area_arr = pa.array(self.areas).take(pa.array(self.area))
+        self.ind_arr = pa.array(self.industries).take(pa.array(self.ind))
+        area_lat = rng.uniform(37.535, 37.570, self.n_areas)
+        area_lon = rng.uniform(127.015, 127.065, self.n_areas)
+        self.lat = (area_lat[self.area] + rng.normal(0, 0.002, n_stores)).round(6)
+        self.lon = (area_lon[self.area] + rng.normal(0, 0.002, n_stores)).round(6)
+
+        self.scale = rng.lognormal(0.0, 0.8, n_stores)
+        self.segment_alpha = rng.dirichlet(np.full(len(SEGMENTS), 0.9), n_stores) * 200 + 0.05
+        self.mix_alpha = (self.area_mix[self.area] * 0.6 + rng.dirichlet([2, 2, 2], n_stores) * 0.4) * 80
+        self.loyal = _beta_mean(rng, np.full(n_stores, 0.25), 10)
+        self.new = _beta_mean(rng, np.full(n_stores, 0.12), 14)
+        has_delivery = rng.random(n_stores) > 0.3
+        self.delivery = np.where(has_delivery, _beta_mean(rng, self.ind_delivery[self.ind], 6), 0.0)
+        self.loyal_drift = rng.normal(0, 0.004, n_stores)
+        self.new_drift = rng.normal(0, 0.004, n_stores)
+        self.delivery_drift = np.where(has_delivery, rng.normal(0, 0.006, n_stores), 0.0)
+        self.cancel_band = rng.choice(6, n_stores, p=CANCEL_BAND_P) + 1
+
+    def month(self, t: int, yyyymm: int):
+        """t번째 기준년월의 (franchise, biz_area) Arrow 테이블 (피어 비교 컬럼은 같은 달 안에서 계산)"""
+        rng, n = self.rng, self.n_stores
+        mm = yyyymm % 100
+
+        # 매출 (규모 × 계절성 × 상권 성장 × 잡음)
+        season = 1 + self.ind_amp * np.cos(2 * np.pi * (mm - self.ind_peak) / 12)
+        growth = (1 + self.area_growth) ** t
+        sales = (
+            self.ind_ticket[self.ind] * 1_500 * self.scale * season[self.ind]
+            * growth[self.area] * rng.lognormal(0, 0.12, n)
+        )
+        counts = sales / (self.ind_ticket[self.ind] * rng.lognormal(0, 0.15, n))
+
+        # 고객 구성
+        seg = _dirichlet_rows(rng, self.segment_alpha)
+        top = np.argsort(-seg, axis=1)[:, :3]
+        mix = _dirichlet_rows(rng, self.mix_alpha)
+        loyal = np.clip(self.loyal + self.loyal_drift * t + rng.normal(0, 0.01, n), 0.0, 1.0)
+        new = np.clip(self.new + self.new_drift * t + rng.normal(0, 0.015, n), 0.0, 1.0)
+        delivery = np.clip(
+            self.delivery + self.delivery_drift * t + rng.normal(0, 0.01, n) * (self.delivery > 0), 0.0, 1.0
+        )
+        changed = rng.random(n) < 0.1
+        self.cancel_band = np.where(changed, rng.choice(6, n, p=CANCEL_BAND_P) + 1, self.cancel_band)
+
+        # 적합도: 가맹점 고객 구성 vs 상권 구성 (L1 거리 → 0~100)
+        store_age = seg[:, :5] + seg[:, 5:]
+        age_fit = 100 * (1 - 0.5 * np.abs(store_age - self.area_age[self.area]).sum(axis=1))
+        mobility_fit = 100 * (1 - 0.5 * np.abs(mix - self.area_mix[self.area]).sum(axis=1))
+
+        # 피어 비교 (같은 기준년월의 동일 업종 / 동일 상권)
+        n_ind = len(self.industries)
+        peer = self.ind
+        sales_rank = _group_pct_rank(sales, peer, n_ind)
+        count_rank = _group_pct_rank(counts, peer, n_ind)
+        area_rank = _group_pct_rank(sales, self.area, self.n_areas)
+        overall_top = 1 - _group_pct_rank(sales, np.zeros(n, dtype=np.int64), 1)
+        sales_band = np.searchsorted(np.array(SALES_BAND_EDGES), overall_top, side="left") + 1
+
+        franchise = {
+            "가맹점_구분번호": self.ids_arr,
+            "가맹점명": self.names,
+            "가맹점_주소": self.addresses,
+            "기준년월": np.full(n, yyyymm, dtype=np.int32),
+            "업종": self.ind_arr,
+            "상권_지리": self.area_arr,
+            "상권": self.area_arr,
+            "위도": self.lat,
+            "경도": self.lon,
+        }
+        labels = pa.array([f"{g} {a}" for g, a in SEGMENTS])
+        for k in range(3):
+            franchise[f"핵심고객_{k + 1}순위"] = labels.take(pa.array(top[:, k]))
+            franchise[f"핵심고객_{k + 1}순위_비중"] = np.take_along_axis(seg, top[:, [k]], axis=1)[:, 0].round(4)
+        for j, (g, a) in enumerate(SEGMENTS):
+            franchise[f"{g}_{a}_고객_비중"] = seg[:, j].round(4)
+        franchise.update({
+            "거주고객_비중": mix[:, 0].round(4),
+            "직장고객_비중": mix[:, 1].round(4),
+            "유동인구고객_비중": mix[:, 2].round(4),
+            "단골손님_비중": loyal.round(4),
+            "신규손님_비중": new.round(4),
+            "배달매출_비중": delivery.round(4),
+            "취소율_구간": self.cancel_band.astype(np.int32),
+            "매출금액_구간": sales_band.astype(np.int32),
+            "동일_업종_매출금액_비율": (sales / _group_mean(sales, peer, n_ind) * 100).round(2),
+            "동일_업종_매출건수_비율": (counts / _group_mean(counts, peer, n_ind) * 100).round(2),
+            "동일_업종_내_매출_순위_비율": ((1 - sales_rank) * 100).round(2),
+            "동일_상권_내_매출_순위_비율": ((1 - area_rank) * 100).round(2),
+            "업종매출지수_백분위": (sales_rank * 100).round(2),
+            "업종건수지수_백분위": (count_rank * 100).round(2),
+            "배달비중_백분위": (_group_pct_rank(delivery, peer, n_ind) * 100).round(2),
+            "업종매출_편차": (_group_zscore(np.log(sales), peer, n_ind) * 10).round(2),
+            "업종건수_편차": (_group_zscore(np.log(counts), peer, n_ind) * 10).round(2),
+            "단골비중_차이_pp": ((loyal - _group_mean(loyal, peer, n_ind)) * 100).round(2),
+            "신규비중_차이_pp": ((new - _group_mean(new, peer, n_ind)) * 100).round(2),
+            "배달매출비중_차이_pp": ((delivery - _group_mean(delivery, peer, n_ind)) * 100).round(2),
+            "동일_업종_내_해지_가맹점_비중": rng.gamma(2.0, 5.0, n_ind)[self.ind].round(2),
+            "동일_상권_내_해지_가맹점_비중": rng.gamma(2.0, 2.5, self.n_areas)[self.area].round(2),
+            "연령대_적합도": age_fit.round(1),
+            "이동성_적합도": mobility_fit.round(1),
+        })
+
+        # 상권 × 업종 (유동인구는 상권 단위, 매출·점포 수는 업종 단위)
+        a_idx = np.repeat(np.arange(self.n_areas), n_ind)
+        i_idx = np.tile(np.arange(n_ind), self.n_areas)
+        cell = self.area * n_ind + self.ind
+        n_cells = self.n_areas * n_ind
+        cell_stores = np.bincount(cell, minlength=n_cells)
+        cell_sales = np.bincount(cell, weights=sales, minlength=n_cells)
+        similar = cell_stores + rng.poisson(self.area_size[a_idx] * 8 * (1 + self.ind_delivery[i_idx]))
+        base_sales = similar * self.ind_ticket[i_idx] * 1_200 * season[i_idx] * growth[a_idx]
+        cell_sales = (cell_sales + base_sales) * rng.lognormal(0, 0.05, n_cells)
+        area_stores = np.bincount(a_idx, weights=similar, minlength=self.n_areas).astype(np.int64)
+
+        flow = (self.area_pop * growth * rng.lognormal(0, 0.03, self.n_areas))[a_idx]
+        week_sales = cell_sales[:, None] * _dirichlet_rows(rng, self.ind_week[i_idx] * 300)
+        time_sales = cell_sales[:, None] * _dirichlet_rows(rng, self.ind_time[i_idx] * 300)
+        week_flow = flow[:, None] * self.area_week[a_idx]
+        time_flow = flow[:, None] * self.area_time[a_idx]
+        n_tx = cell_sales / (self.ind_ticket[i_idx] * rng.lognormal(0, 0.08, n_cells))
+
+        biz = {
+            "기준년월": np.full(n_cells, yyyymm, dtype=np.int32),
+            "상권_지리": pa.array(self.areas).take(pa.array(a_idx)),
+            "업종": pa.array(self.industries).take(pa.array(i_idx)),
+            "당월_매출_금액": cell_sales.astype(np.int64),
+            "주중_매출_금액": week_sales[:, :5].sum(axis=1).astype(np.int64),
+            "주말_매출_금액": week_sales[:, 5:].sum(axis=1).astype(np.int64),
+            "평균거래단가": (cell_sales / np.maximum(n_tx, 1)).round(0).astype(np.int64),
+            "점포_수": area_stores[a_idx],
+            "유사_업종_점포_수": similar.astype(np.int64),
+            "폐업_률": rng.beta(2, 40, n_cells).round(4),
+            "총_유동인구_수": flow.astype(np.int64),
+            "남성_유동인구_수": (flow * self.area_male[a_idx]).astype(np.int64),
+            "여성_유동인구_수": (flow * (1 - self.area_male[a_idx])).astype(np.int64),
+            "총_상주인구_수": (self.area_pop * self.area_mix[:, 0] * 0.5).astype(np.int64)[a_idx],
+            "총_직장_인구_수": (self.area_pop * self.area_mix[:, 1] * 0.5).astype(np.int64)[a_idx],
+            "월_평균_소득_금액": self.area_income[a_idx],
+            "주력_연령대": pa.array(AGES).take(pa.array(self.area_age.argmax(axis=1)[a_idx])),
+            "피크_요일": pa.array([d[0] for d in WEEKDAYS]).take(pa.array(week_sales.argmax(axis=1))),
+            "피크_시간대": pa.array(TIME_SLOTS).take(pa.array(time_sales.argmax(axis=1))),
+            "상권활력_지수": np.clip(50 + self.area_growth * 5_000 + rng.normal(0, 5, self.n_areas), 0, 100)
+                .round(1)[a_idx],
+            "접근성_점수": self.area_access[a_idx],
+        }
+        for j, day in enumerate(WEEKDAYS):
+            biz[f"{day}_매출_금액"] = week_sales[:, j].astype(np.int64)
+            biz[f"{day}_유동인구_수"] = week_flow[:, j].astype(np.int64)
+        for j, slot in enumerate(TIME_SLOTS):
+            biz[f"시간대_{slot}_매출_금액"] = time_sales[:, j].astype(np.int64)
+            biz[f"시간대_{slot}_유동인구_수"] = time_flow[:, j].astype(np.int64)
+
+        return pa.table(franchise), pa.table(biz)
+
+
+# 이력 기반 파생 컬럼 (월별 원본 적재 후 윈도 함수로 계산, 모든 가맹점이 매월 존재 → LAG n = n개월 전)
+FRANCHISE_DERIVED_SQL = """
+    SELECT *,
+        (단골손님_비중 - LAG(단골손님_비중, 12) OVER hist) * 100 AS 단골비중_YoY_pp,
+        (신규손님_비중 - LAG(신규손님_비중, 12) OVER hist) * 100 AS 신규비중_YoY_pp,
+        (배달매출_비중 - LAG(배달매출_비중, 12) OVER hist) * 100 AS 배달비중_YoY_pp,
+        (단골손님_비중 - LAG(단골손님_비중, 2) OVER hist) * 100 AS 단골비중_3개월_순증감_pp,
+        (단골손님_비중 - LAG(단골손님_비중, 2) OVER hist) * 100 / 2 AS 단골비중_3개월_추세_pp_per_m,
+        (신규손님_비중 - LAG(신규손님_비중, 2) OVER hist) * 100 / 2 AS 신규비중_3개월_추세_pp_per_m
+    FROM _gen_franchise
+    WINDOW hist AS (PARTITION BY 가맹점_구분번호 ORDER BY 기준년월)
+"""
+
+BIZ_AREA_DERIVED_SQL = """
+    SELECT *,
+        (당월_매출_금액 / NULLIF(LAG(당월_매출_금액, 12) OVER hist, 0) - 1) * 100 AS 매출_YoY,
+        (총_유동인구_수 / NULLIF(LAG(총_유동인구_수, 12) OVER hist, 0) - 1) * 100 AS 유동인구_YoY
+    FROM _gen_biz_area
+    WINDOW hist AS (PARTITION BY 상권_지리, 업종 ORDER BY 기준년월)
+"""
+
+
+def generate_tables(con, n_stores: int, months: int = 24, n_areas: int = None,
+                    seed: int = 42, start: int = 202301):
+    """con에 franchise / biz_area 테이블 생성 (build_duckdb.py와 같은 스키마·정렬)"""
+    world = SyntheticWorld(n_stores, n_areas, seed)
+    print(f"✓ 가맹점 {n_stores:,}개 / 상권 {world.n_areas:,}개 / 업종 {len(world.industries)}개")
+
+    for t, yyyymm in enumerate(month_list(start, months)):
+        franchise, biz = world.month(t, yyyymm)
+        for raw, df in (("_gen_franchise", franchise), ("_gen_biz_area", biz)):
+            con.register("_gen_df", df)
+            if t == 0:
+                con.execute(f"CREATE TEMP TABLE {raw} AS SELECT * FROM _gen_df")
+            else:
+                con.execute(f"INSERT INTO {raw} SELECT * FROM _gen_df")
+            con.unregister("_gen_df")
+        print(f"   {yyyymm}: franchise {len(franchise):,} rows, biz_area {len(biz):,} rows")
+
+    con.execute(f"CREATE TEMP TABLE _raw_franchise AS {FRANCHISE_DERIVED_SQL}")
+    con.execute(f"CREATE TEMP TABLE _raw_biz_area AS {BIZ_AREA_DERIVED_SQL}")
+    con.execute("DROP TABLE _gen_franchise")
+    con.execute("DROP TABLE _gen_biz_area")
+    apply_schema(con, {"franchise": "_raw_franchise", "biz_area": "_raw_biz_area"})
+
+
+def write_synthetic(fmt: str, out: Path, n_stores: int, months: int = 24, n_areas: int = None,
+                    seed: int = 42, start: int = 202301) -> Dict[str, Path]:
+    """
+    합성 데이터 생성 후 지정 형식으로 저장
+
+    Returns:
+        duckdb → {"duckdb": 파일}, parquet → {테이블: 디렉터리}, csv → {테이블: 파일}
+    """
+    out = Path(out).expanduser()
+    kwargs = dict(n_stores=n_stores, months=months, n_areas=n_areas, seed=seed, start=start)
+
+    if fmt == "duckdb":
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with shadow_database(out, copy_existing=False) as con:
+            generate_tables(con, **kwargs)
+            create_indexes(con)
+            build_derived_tables(con)
+        return {"duckdb": out}
+
+    con = duckdb.connect()
+    try:
+        generate_tables(con, **kwargs)
+        if fmt == "parquet":
+            export_parquet(con, out)
+            return {table: out / table for table in SOURCE_TABLES}
+
+        out.mkdir(parents=True, exist_ok=True)
+        paths = {table: out / f"{table}.csv" for table in SOURCE_TABLES}
+        for table, path in paths.items():
+            con.execute(f"COPY {table} TO '{path}' (HEADER, DELIMITER ',')")
+            print(f"✓ {path.name}: {path.stat().st_size / 1024 / 1024:.1f} MB")
+        return paths
+    finally:
+        con.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 franchise / biz_area 데이터 생성")
+    parser.add_argument("--stores", type=int, default=10_000, help="가맹점 수")
+    parser.add_argument("--months", type=int, default=24, help="기준년월 개수 (YoY 컬럼은 13개월 이상부터 채워짐)")
+    parser.add_argument("--areas", type=int, default=None, help="상권 수 (기본: 가맹점 300개당 1개)")
+    parser.add_argument("--start", type=int, default=202301, help="첫 기준년월 (YYYYMM)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--format", choices=["duckdb", "parquet", "csv"], default="duckdb")
+    parser.add_argument("--out", type=Path, default=None,
+                        help="출력 경로 (기본: data/synthetic/data.duckdb | parquet/ | csv/)")
+    args = parser.parse_args()
+
+    default_out = {"duckdb": DEFAULT_OUT / "data.duckdb", "parquet": DEFAULT_OUT / "parquet", "csv": DEFAULT_OUT / "csv"}
+    out = args.out or default_out[args.format]
+
+    print("=" * 60)
+    print(f"합성 데이터 생성 ({args.format})")
+    print("=" * 60)
+    t0 = time.time()
+    paths = write_synthetic(args.format, out, args.stores, args.months, args.areas, args.seed, args.start)
+
+    print("\n" + "=" * 60)
+    print(f"✅ 생성 완료 ({time.time() - t0:.1f}s)")
+    print("=" * 60)
+    for name, path in paths.items():
+        print(f"{name}: {path}")
+    if args.format == "duckdb":
+        print(f"\n사용: DUCKDB_PATH={out} USE_DUCKDB=true")
+    elif args.format == "csv":
+        print(f"\n사용: FRANCHISE_CSV={paths['franchise']} BIZ_AREA_CSV={paths['biz_area']} "
+              f"python scripts/build_duckdb.py")
+
+
+if __name__ == "__main__":
+    main()
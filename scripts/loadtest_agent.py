@@ -0,0 +1,511 @@
+# scripts/loadtest_agent.py
+"""
+에이전트 end-to-end 부하 테스트 (Gemini / Serper / 기상청 없이)
+
+구성:
+1. FakeChatModel   : ChatGoogleGenerativeAI 대체 (결정적 응답, 지연시간·출력 토큰 수 설정)
+                     - 라우터 분류 / 가맹점 추출 / 검색어 재작성 / 답변 생성 프롬프트를 구분해 응답
+2. 로컬 HTTP 스텁  : google.serper.dev(POST /search), 기상청 단기예보(GET /kma) 대체
+                     (SERPER_URL / KMA_URL 환경변수로 연결)
+3. 드라이버        : 6개 intent 질의 믹스를 N개 동시 세션에서 run_one_turn으로 재생
+
+리포트 (동시 세션 수별):
+- turns/s, 턴 지연시간 p50/p95/p99, 상태(ok/error/need_clarify), intent 라우팅 일치율
+- 노드별 지연시간 (router, web_augment, general ... memory_updater)
+- 툴별 지연시간 + DuckDB 경합 (DuckDB 툴 p50/p95 / 가장 적은 세션 수 대비 배율)
+
+실행 방법:
+    python scripts/loadtest_agent.py --sessions 1 4 16 [--turns 5] [--stores 5000]
+        [--llm-latency-ms 800] [--llm-tokens 300] [--llm-tps 0]
+        [--search-latency-ms 300] [--weather-latency-ms 150]
+        [--mix SNS=1,REVISIT=1,ISSUE=1,GENERAL=1,COOPERATION=1,SEASON=1]
+        [--duckdb-path PATH] [--out loadtest.json]
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List
+from urllib.parse import urlparse
+
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+INTENTS = ("SNS", "REVISIT", "ISSUE", "GENERAL", "COOPERATION", "SEASON")
+
+# intent별 질의 (router.RULES 키워드와 겹치지 않게 작성 → 규칙 분류 결과가 의도한 intent)
+QUERY_MIX = {
+    "SNS": [
+        "{store} 인스타 홍보 어떻게 하면 좋을까?",
+        "{store} 릴스랑 해시태그 운영 전략 알려줘",
+    ],
+    "REVISIT": [
+        "{store} 단골 손님을 늘리는 방법이 궁금해",
+        "{store} 재방문율 높이려면 멤버십을 어떻게 설계할까?",
+    ],
+    "ISSUE": [
+        "{store} 요즘 매출 하락 원인 진단해줘",
+        "{store} 손님이 줄어든 이유가 뭔지 문제를 짚어줘",
+    ],
+    "GENERAL": [
+        "{store} 전반적인 마케팅 전략 추천해줘",
+        "{store} 매장 운영 방향을 정리해줘",
+    ],
+    "COOPERATION": [
+        "{store} 근처 가게랑 제휴할 만한 곳 추천해줘",
+        "{store} 상권 협업 아이디어 알려줘",
+    ],
+    "SEASON": [
+        "{store} 여름 시즌 프로모션 전략",
+        "{store} 날씨가 추워질 때 준비할 것",
+    ],
+}
+
+
+# 측정값 수집
+class Recorder:
+    """스레드 안전 지연시간 수집기 (kind → name → [ms])"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.samples: Dict[str, Dict[str, List[float]]] = {}
+            self.counts: Dict[str, int] = {}
+
+    def record(self, kind: str, name: str, ms: float):
+        with self._lock:
+            self.samples.setdefault(kind, {}).setdefault(name, []).append(ms)
+
+    def count(self, key: str, n: int = 1):
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + n
+
+
+RECORDER = Recorder()
+
+
+def _timed(kind: str, name: str, fn):
+    def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            RECORDER.record(kind, name, (time.perf_counter() - t0) * 1000)
+    wrapper.__wrapped__ = fn
+    return wrapper
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    arr = np.asarray(samples)
+    return {
+        "n": int(arr.size),
+        "p50_ms": round(float(np.percentile(arr, 50)), 1),
+        "p95_ms": round(float(np.percentile(arr, 95)), 1),
+        "p99_ms": round(float(np.percentile(arr, 99)), 1),
+        "mean_ms": round(float(arr.mean()), 1),
+    }
+
+
+# 1. 가짜 LLM
+class FakeChatModel:
+    """
+    ChatGoogleGenerativeAI 대체 — invoke(...).content만 사용하는 노드 코드와 호환
+
+    지연시간 = latency × (1 ± jitter/2, 프롬프트 해시로 결정) + 출력 토큰 / tps
+    """
+
+    latency_s = 0.8
+    jitter = 0.2
+    tokens = 300
+    tokens_per_s = 0.0
+
+    def __init__(self, model: str = None, google_api_key: str = None, temperature: float = None, **kwargs):
+        self.model = model
+        self.temperature = temperature
+
+    @classmethod
+    def configure(cls, latency_ms: float, jitter: float, tokens: int, tokens_per_s: float):
+        cls.latency_s = latency_ms / 1000
+        cls.jitter = jitter
+        cls.tokens = tokens
+        cls.tokens_per_s = tokens_per_s
+
+    @staticmethod
+    def _text(messages) -> str:
+        if isinstance(messages, str):
+            return messages
+        parts = []
+        for m in messages:
+            if isinstance(m, tuple):
+                parts.append(str(m[1]))
+            else:
+                parts.append(str(getattr(m, "content", m)))
+        return "\n".join(parts)
+
+    def _respond(self, prompt: str):
+        """(응답 종류, 응답 텍스트, 출력 토큰 수)"""
+        if "SNS, REVISIT, ISSUE, COOPERATION, SEASON, GENERAL" in prompt:
+            from my_agent.nodes.router import RULES
+            m = re.search(r"```(.*?)```", prompt, re.S)
+            q = (m.group(1) if m else prompt).lower()
+            intent = next((k for k, kws in RULES.items() if any(kw in q for kw in kws)), "GENERAL")
+            return "classify", intent, 1
+
+        if "가맹점 관련 텍스트" in prompt:
+            q = prompt.rsplit("질문:", 1)[-1]
+            m = re.search(r"\b[0-9A-F]{10,11}\b", q) or re.search(r"[^\s'\"]+\*+", q)
+            return "extract", (m.group(0) if m else "NONE"), 3
+
+        if "검색어 생성기" in prompt:
+            q = prompt.rsplit("입력:", 1)[-1].split("출력:")[0]
+            return "rewrite", " ".join(q.split()[:10]) + " 마케팅 전략", 12
+
+        sentences = [
+            "최근 매출과 고객 구성 데이터를 보면 단골 비중과 신규 고객 비율의 균형이 중요합니다.",
+            "배달 비중이 동일 업종 평균과 차이가 있어 채널별 순위와 방문 패턴을 함께 점검해야 합니다.",
+            "재방문을 늘리려면 리뷰 관리와 방문 주기에 맞춘 혜택을 데이터로 검증하며 운영하세요.",
+        ]
+        words: List[str] = []
+        i = zlib.crc32(prompt.encode("utf-8")) % len(sentences)
+        while len(words) < self.tokens:
+            words.extend(sentences[i % len(sentences)].split())
+            i += 1
+        return "generate", "## 분석 요약\n" + " ".join(words[: self.tokens]), self.tokens
+
+    def invoke(self, messages, config=None, **kwargs):
+        from langchain_core.messages import AIMessage
+
+        t0 = time.perf_counter()
+        prompt = self._text(messages)
+        kind, text, n_tokens = self._respond(prompt)
+
+        h = zlib.crc32(prompt.encode("utf-8")) / 0xFFFFFFFF
+        delay = self.latency_s * (1 + self.jitter * (h - 0.5))
+        if self.tokens_per_s > 0:
+            delay += n_tokens / self.tokens_per_s
+        time.sleep(max(0.0, delay - (time.perf_counter() - t0)))
+
+        RECORDER.record("llm", kind, (time.perf_counter() - t0) * 1000)
+        RECORDER.count("llm_output_tokens", n_tokens)
+        return AIMessage(content=text)
+
+
+# 모델을 직접 생성하는 모듈 (from langchain_google_genai import ChatGoogleGenerativeAI)
+LLM_MODULES = [
+    "my_agent.nodes.router", "my_agent.nodes.general", "my_agent.nodes.issue", "my_agent.nodes.sns",
+    "my_agent.nodes.revisit", "my_agent.nodes.cooperation", "my_agent.nodes.season",
+    "my_agent.nodes.regenerate", "my_agent.utils.tools", "mcp.tools_web",
+]
+
+
+def install_fake_llm():
+    import importlib
+    for name in LLM_MODULES:
+        module = importlib.import_module(name)
+        module.ChatGoogleGenerativeAI = FakeChatModel
+
+
+# 2. 로컬 HTTP 스텁 (Serper / 기상청)
+class _StubHandler(BaseHTTPRequestHandler):
+    search_latency_s = 0.3
+    weather_latency_s = 0.15
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload: Dict[str, Any]):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/search":
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        req = json.loads(self.rfile.read(length) or b"{}")
+        time.sleep(self.search_latency_s)
+        RECORDER.count("stub_search")
+
+        q = str(req.get("q", ""))
+        seed = zlib.crc32(q.encode("utf-8"))
+        organic = [
+            {
+                "title": f"{q[:30]} 사례 {i + 1}",
+                "link": f"https://example.com/{seed:x}/{i}",
+                "snippet": f"소상공인 매장의 {q[:40]} 관련 마케팅 사례와 고객 반응을 정리한 글입니다. ({i + 1})",
+                "date": "2025.01.01",
+            }
+            for i in range(min(int(req.get("num", 10)), 10))
+        ]
+        self._send_json({"searchParameters": {"q": q}, "organic": organic})
+
+    def do_GET(self):
+        if urlparse(self.path).path != "/kma":
+            self.send_error(404)
+            return
+        time.sleep(self.weather_latency_s)
+        RECORDER.count("stub_weather")
+
+        start = datetime.now().replace(minute=0, second=0, microsecond=0)
+        items = []
+        for h in range(72):
+            ts = start + timedelta(hours=h)
+            date, hhmm = ts.strftime("%Y%m%d"), ts.strftime("%H%M")
+            temp = 12 + 8 * np.sin((ts.hour - 9) / 24 * 2 * np.pi)
+            items.append({"fcstDate": date, "fcstTime": hhmm, "category": "TMP", "fcstValue": f"{temp:.0f}"})
+            items.append({"fcstDate": date, "fcstTime": hhmm, "category": "PTY",
+                          "fcstValue": "1" if h % 24 in (15, 16) else "0"})
+            if ts.hour == 6:
+                items.append({"fcstDate": date, "fcstTime": hhmm, "category": "TMN", "fcstValue": "5.0"})
+            if ts.hour == 15:
+                items.append({"fcstDate": date, "fcstTime": hhmm, "category": "TMX", "fcstValue": "20.0"})
+        self._send_json({"response": {"header": {"resultCode": "00"},
+                                      "body": {"items": {"item": items}, "totalCount": len(items)}}})
+
+
+def start_stub_server(search_latency_ms: float, weather_latency_ms: float):
+    """백그라운드 스레드에서 스텁 서버 시작 → (server, base_url)"""
+    _StubHandler.search_latency_s = search_latency_ms / 1000
+    _StubHandler.weather_latency_s = weather_latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+# 3. 드라이버
+NODE_NAMES = ["router", "web_augment", "general", "issue", "sns", "revisit", "cooperation", "season", "regenerate"]
+DUCKDB_TOOLS = ["search_merchant", "load_store_data", "load_bizarea_data", "load_store_profile",
+                "find_cooperation_candidates"]
+HTTP_TOOLS = ["web_search", "get_weather_forecast"]
+
+
+def instrument():
+    """노드 / 툴 호출에 타이머 설치 (그래프는 run_one_turn마다 새로 만들어지므로 클래스·모듈 속성을 교체)"""
+    from my_agent import agent
+    from mcp import adapter_client
+
+    node_classes = {
+        "router": agent.RouterNode, "web_augment": agent.WebAugmentNode, "general": agent.GeneralNode,
+        "issue": agent.IssueNode, "sns": agent.SNSNode, "revisit": agent.RevisitNode,
+        "cooperation": agent.CooperationNode, "season": agent.SeasonNode, "regenerate": agent.RegenerateNode,
+    }
+    for name, cls in node_classes.items():
+        call = getattr(cls.__call__, "__wrapped__", cls.__call__)
+        cls.__call__ = _timed("node", name, call)
+    agent.check_relevance = _timed("node", "relevance_checker",
+                                   getattr(agent.check_relevance, "__wrapped__", agent.check_relevance))
+    agent.update_conversation_memory = _timed(
+        "node", "memory_updater",
+        getattr(agent.update_conversation_memory, "__wrapped__", agent.update_conversation_memory),
+    )
+    # call_mcp_tool은 호출 시점에 모듈 전역에서 툴 함수를 찾음
+    for name in DUCKDB_TOOLS + HTTP_TOOLS:
+        fn = getattr(adapter_client, name)
+        setattr(adapter_client, name, _timed("tool", name, getattr(fn, "__wrapped__", fn)))
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        k, _, v = part.partition("=")
+        k = k.strip().upper()
+        if k not in INTENTS:
+            raise SystemExit(f"알 수 없는 intent: {k} (가능: {', '.join(INTENTS)})")
+        mix[k] = float(v or 1)
+    return mix or {k: 1.0 for k in INTENTS}
+
+
+def sample_store_ids(db_path: str, n: int, seed: int) -> List[str]:
+    import duckdb
+    con = duckdb.connect(db_path, read_only=True)
+    try:
+        ids = [r[0] for r in con.execute("SELECT DISTINCT 가맹점_구분번호 FROM franchise").fetchall()]
+    finally:
+        con.close()
+    rng = random.Random(seed)
+    return rng.sample(ids, min(n, len(ids)))
+
+
+def run_level(n_sessions: int, turns: int, mix: Dict[str, float], store_ids: List[str], seed: int) -> Dict[str, Any]:
+    """동시 세션 n개 × 세션당 turns턴 실행"""
+    from my_agent.utils.adapters import run_one_turn
+
+    RECORDER.reset()
+    intents = list(mix)
+    weights = [mix[k] for k in intents]
+    turn_ms: List[float] = []
+    statuses: Dict[str, int] = {}
+    routed = {"match": 0, "mismatch": 0}
+    lock = threading.Lock()
+
+    def session(idx: int):
+        rng = random.Random(seed * 1000 + idx)
+        for t in range(turns):
+            intent = rng.choices(intents, weights)[0]
+            query = rng.choice(QUERY_MIX[intent]).format(store=rng.choice(store_ids))
+            t0 = time.perf_counter()
+            try:
+                result = run_one_turn(query, thread_id=f"loadtest-{n_sessions}-{idx}")
+            except Exception as e:
+                result = {"status": "error", "error": str(e)}
+            ms = (time.perf_counter() - t0) * 1000
+            with lock:
+                turn_ms.append(ms)
+                status = result.get("status", "error")
+                statuses[status] = statuses.get(status, 0) + 1
+                routed["match" if (result.get("intent") or "").upper() == intent else "mismatch"] += 1
+
+    t_wall = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_sessions) as pool:
+        list(pool.map(session, range(n_sessions)))
+    wall_s = time.perf_counter() - t_wall
+
+    samples = RECORDER.samples
+    return {
+        "sessions": n_sessions,
+        "turns": len(turn_ms),
+        "wall_s": round(wall_s, 2),
+        "turns_per_s": round(len(turn_ms) / wall_s, 3) if wall_s > 0 else None,
+        "turn": _summarize(turn_ms),
+        "status": statuses,
+        "intent_routing": routed,
+        "nodes": {k: _summarize(v) for k, v in samples.get("node", {}).items()},
+        "tools": {k: _summarize(v) for k, v in samples.get("tool", {}).items()},
+        "duckdb": _summarize(sum((samples.get("tool", {}).get(k, []) for k in DUCKDB_TOOLS), [])
+                             or [0.0]),
+        "llm": {k: _summarize(v) for k, v in samples.get("llm", {}).items()},
+        "counts": dict(RECORDER.counts),
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    levels = report["levels"]
+    base = levels[0]["duckdb"]["p50_ms"] if levels else 0
+    print("\n" + "=" * 78)
+    print(f"에이전트 부하 테스트  (LLM {report['config']['llm_latency_ms']}ms / "
+          f"search {report['config']['search_latency_ms']}ms / stores {report['config']['stores']:,})")
+    print("=" * 78)
+    print(f"{'sessions':>8s} {'turns/s':>9s} {'turn p50':>10s} {'turn p95':>10s} "
+          f"{'duckdb p50':>11s} {'duckdb p95':>11s} {'contention':>11s}  status")
+    for lv in levels:
+        ratio = lv["duckdb"]["p50_ms"] / base if base else 0
+        print(f"{lv['sessions']:8d} {lv['turns_per_s']:9.2f} {lv['turn']['p50_ms']:9.0f}ms {lv['turn']['p95_ms']:9.0f}ms "
+              f"{lv['duckdb']['p50_ms']:10.1f}ms {lv['duckdb']['p95_ms']:10.1f}ms {ratio:10.2f}x  {lv['status']}")
+
+    for lv in levels:
+        print(f"\n── sessions={lv['sessions']} 노드/툴 지연시간 (p50 / p95) "
+              f"· intent 일치 {lv['intent_routing']['match']}/{lv['turns']}")
+        for kind in ("nodes", "tools"):
+            for name, s in lv[kind].items():
+                print(f"   {kind[:-1]:5s} {name:28s} {s['p50_ms']:9.1f}ms {s['p95_ms']:9.1f}ms  (n={s['n']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="에이전트 end-to-end 부하 테스트 (LLM/검색 스텁)")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 16], help="동시 세션 수 (여러 개 지정 가능)")
+    parser.add_argument("--turns", type=int, default=5, help="세션당 턴 수")
+    parser.add_argument("--mix", type=str, default="", help="intent 가중치 (예: SNS=2,ISSUE=1)")
+    parser.add_argument("--llm-latency-ms", type=float, default=800)
+    parser.add_argument("--llm-jitter", type=float, default=0.2, help="LLM 지연시간 변동 비율")
+    parser.add_argument("--llm-tokens", type=int, default=300, help="답변 생성 출력 토큰 수")
+    parser.add_argument("--llm-tps", type=float, default=0, help="출력 토큰/초 (0이면 토큰 수와 무관)")
+    parser.add_argument("--search-latency-ms", type=float, default=300)
+    parser.add_argument("--weather-latency-ms", type=float, default=150)
+    parser.add_argument("--stores", type=int, default=5000, help="합성 데이터 가맹점 수 (--duckdb-path 미지정 시)")
+    parser.add_argument("--months", type=int, default=13)
+    parser.add_argument("--duckdb-path", type=str, default=None, help="기존 DuckDB 사용")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", type=str, default=None, help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix="loadtest_"))
+    server, base_url = start_stub_server(args.search_latency_ms, args.weather_latency_ms)
+
+    # 설정 모듈이 import 시점에 읽으므로 my_agent / mcp import 전에 지정
+    db_path = args.duckdb_path or str(work_dir / "loadtest.duckdb")
+    os.environ.update({
+        "GOOGLE_API_KEY": "loadtest",
+        "SERPER_API_KEY": "loadtest",
+        "WEATHER_API_KEY": "loadtest",
+        "SERPER_URL": f"{base_url}/search",
+        "KMA_URL": f"{base_url}/kma",
+        "DUCKDB_PATH": db_path,
+        "USE_DUCKDB": "true",
+        "SEARCH_CACHE_PATH": str(work_dir / "search_cache.sqlite"),
+    })
+
+    real_stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:
+        if not args.duckdb_path:
+            print(f"▶ 합성 데이터 생성: stores={args.stores:,} months={args.months}")
+            with contextlib.redirect_stdout(devnull):
+                from scripts.gen_synthetic_data import write_synthetic
+                write_synthetic("duckdb", Path(db_path), args.stores, args.months)
+
+        # 채팅 히스토리(chat_history/)는 임시 디렉터리에 기록
+        os.chdir(work_dir)
+        install_fake_llm()
+        instrument()
+        FakeChatModel.configure(args.llm_latency_ms, args.llm_jitter, args.llm_tokens, args.llm_tps)
+
+        mix = parse_mix(args.mix)
+        store_ids = sample_store_ids(db_path, 200, args.seed)
+
+        report = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "config": {
+                "turns_per_session": args.turns, "mix": mix, "stores": args.stores if not args.duckdb_path else None,
+                "llm_latency_ms": args.llm_latency_ms, "llm_tokens": args.llm_tokens, "llm_tps": args.llm_tps,
+                "search_latency_ms": args.search_latency_ms, "weather_latency_ms": args.weather_latency_ms,
+                "duckdb_path": db_path,
+            },
+            "levels": [],
+        }
+
+        # 워밍업 (싱글톤·모듈 로딩) 후 측정
+        with contextlib.redirect_stdout(devnull):
+            run_level(1, len(mix), mix, store_ids, args.seed + 1)
+        for n in sorted(args.sessions):
+            print(f"▶ sessions={n} × turns={args.turns} 실행 중...", file=real_stdout)
+            with contextlib.redirect_stdout(devnull):
+                report["levels"].append(run_level(n, args.turns, mix, store_ids, args.seed))
+
+    server.shutdown()
+    if report["config"]["stores"] is None:
+        report["config"]["stores"] = len(store_ids)
+    print_report(report)
+
+    if args.out:
+        out = Path(args.out)
+        if not out.is_absolute():
+            out = PROJECT_ROOT / out
+        out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n💾 저장: {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,15 +19,14 @@ import os
 from pathlib import Path
 from PIL import Image
 import traceback
-import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 from langchain_core.messages import HumanMessage, AIMessage
 from streamlit_option_menu import option_menu
 import joblib
-from autogluon.tabular import TabularPredictor
 
 import dashboard as dash
+import forecast
 
 # 설정
 ASSETS = Path("assets")
@@ -39,6 +38,7 @@ CHAT_PLACEHOLDER = (
 from my_agent.utils.config import (
     FRANCHISE_CSV as _FRANCHISE,
     BIZ_AREA_CSV as _BIZAREA,
+    LABEL_ENCODER_PATH,
 )
 
 FRANCHISE_CSV = Path(_FRANCHISE).expanduser()
@@ -47,12 +47,18 @@ BIZ_AREA_CSV = Path(_BIZAREA).expanduser()
 # 챗봇 파이프라인
 from my_agent.utils.adapters import run_one_turn
 
-# 타임시리즈 모델 로드 (캐싱)
+# 타임시리즈 모델: 프로세스 시작 시 백그라운드 로드 + 워밍업
+forecast.start_warmup()
+
+# 날씨: 전체 매장 격자 예보 백그라운드 선조회 (SEASON 턴이 기상청 응답을 기다리지 않도록)
+from mcp.tools_weather import start_prefetcher as start_weather_prefetcher
+start_weather_prefetcher()
+
 @st.cache_resource
 def load_predictor():
-    """AutoGluon 예측 모델 로드"""
+    """AutoGluon 예측 모델 래퍼 (persist + warmup 완료된 싱글턴)"""
     try:
-        return TabularPredictor.load("AutogluonModels/ag-20251018_185635")
+        return forecast.get_predictor()
     except Exception as e:
         st.error(f"모델 로드 실패: {e}")
         return None
@@ -61,29 +67,13 @@ def load_predictor():
 def load_label_encoder():
     """가맹점 ID 인코더 로드"""
     try:
-        return joblib.load("data/label_encoder_store.pkl")
+        return joblib.load(LABEL_ENCODER_PATH)
     except Exception as e:
         st.error(f"인코더 로드 실패: {e}")
         return None
 
-@st.cache_data
-def load_preprocessed_data():
-    """전처리된 데이터 로드"""
-    try:
-        return pd.read_csv("data/preprocessed_df.csv")
-    except Exception as e:
-        st.error(f"데이터 로드 실패: {e}")
-        return None
-
 # 매출 구간 라벨 매핑
-LABEL_MAP = {
-    0: "6_90%초과(하위 10% 이하)",
-    1: "5_75-90%",
-    2: "4_50-75%",
-    3: "3_25-50%",
-    4: "2_10-25%",
-    5: "1_10%이하"
-}
+LABEL_MAP = forecast.LABEL_MAP
 
 # Page Config & 스타일
 st.set_page_config(
@@ -293,27 +283,14 @@ def reset_clarify_state():
     st.session_state.last_web_meta = None
     st.session_state.processing = False
 
-def predict_next_month_sales(store_id: str, predictor, label_encoder, df_preprocessed):
+def predict_next_month_sales(store_id: str, predictor, label_encoder):
     """다음 달 매출 구간 예측"""
-    if not all([predictor, label_encoder, df_preprocessed is not None]):
+    if not all([predictor, label_encoder]):
         return None
     
     try:
         # 가맹점 ID 전처리: '___' 이후 부분 제거
-        clean_store_id = store_id.split('___')[0] if '___' in store_id else store_id
-        
-        # 타임시리즈 데이터는 가맹점구분번호 사용
-        store_col = None
-        possible_names = ["가맹점구분번호", "가맹점_구분번호", "MCT_KEY", "store_id"]
-        
-        for col_name in possible_names:
-            if col_name in df_preprocessed.columns:
-                store_col = col_name
-                break
-        
-        if not store_col:
-            st.error(f"❌ 데이터 컬럼명 오류: 가맹점 ID 컬럼을 찾을 수 없습니다.")
-            return None
+        clean_store_id = forecast.clean_store_id(store_id)
         
         # label_encoder로 원본 ID를 숫자로 변환
         try:
@@ -322,31 +299,18 @@ def predict_next_month_sales(store_id: str, predictor, label_encoder, df_preproc
             st.warning(f"⚠️ 가맹점 ID `{clean_store_id}`가 학습 데이터에 없습니다.")
             return None
 
-        # 인코딩된 ID로 데이터 필터링
-        store_df = df_preprocessed[df_preprocessed[store_col] == encoded_store_id].sort_values("기준년월")
+        # 인코딩된 ID의 최신 행만 조회 (모델 피처 컬럼만)
+        store_df = forecast.load_latest_features(encoded_store_id, predictor.features())
         
-        if store_df.empty:
+        if store_df is None:
             st.warning(f"⚠️ 인코딩된 ID `{encoded_store_id}`에 해당하는 데이터가 없습니다.")
             return None
         
-        latest_row = store_df.iloc[-1:].copy()
-        
         # 예측에 불필요한 컬럼 제거
-        drop_cols = ['매출금액_구간', '매핑용_상권명', '매핑용_업종', '기준년월', 'dt']
-        latest_row = latest_row.drop(columns=drop_cols, errors='ignore')
-
-        # 예측 수행
-        pred_class = predictor.predict(latest_row).iloc[0]
-        pred_proba_df = predictor.predict_proba(latest_row).iloc[0]
+        latest_row = store_df.drop(columns=forecast.DROP_COLS, errors='ignore')
 
-        pred_label = LABEL_MAP.get(int(pred_class), "알 수 없음")
-        pred_prob = float(pred_proba_df[int(pred_class)])
-
-        return {
-            "predicted_class": int(pred_class),
-            "predicted_label": pred_label,
-            "predicted_probability": pred_prob
-        }
+        # 예측 수행 (predict_proba 1회 → argmax)
+        return predictor.predict_one(latest_row)
 
     except Exception as e:
         st.error(f"❌ 예측 중 오류 발생: {str(e)}")
@@ -517,30 +481,32 @@ if st.session_state.current_page == "Home":
         st.markdown("---")
         section("AI기반 모델 예측", "🔮")
         
-        predictor = load_predictor()
-        label_encoder = load_label_encoder()
-        df_preprocessed = load_preprocessed_data()
-        
-        if predictor and label_encoder and df_preprocessed is not None:
-            try:
-                with st.spinner("🔍 다음 달 매출을 예측하는 중..."):
-                    import time
-                    start_time = time.time()
-                    prediction = predict_next_month_sales(
-                        store_id=store_id,
-                        predictor=predictor,
-                        label_encoder=label_encoder,
-                        df_preprocessed=df_preprocessed
-                    )
-                    elapsed_time = time.time() - start_time
-                
-                if prediction:
-                    # GPS 스타일 시각화 렌더링
-                    render_gps_style_prediction(prediction)
-                else:
-                    st.warning("⚠️ 해당 가맹점의 AI 예측을 수행할 수 없습니다.")
-            except Exception as e:
-                st.error(f"❌ 예측 실패: {str(e)}")
+        # 배치 예측 결과(predictions 테이블) 우선 → 없을 때만 실시간 예측
+        prediction = forecast.load_prediction(store_id)
+
+        if prediction:
+            render_gps_style_prediction(prediction)
+        else:
+            predictor = load_predictor()
+            label_encoder = load_label_encoder()
+
+            if predictor and label_encoder:
+                try:
+                    with st.spinner("🔍 다음 달 매출을 예측하는 중..."):
+                        prediction = predict_next_month_sales(
+                            store_id=store_id,
+                            predictor=predictor,
+                            label_encoder=label_encoder
+                        )
+
+                    if prediction:
+                        # GPS 스타일 시각화 렌더링
+                        render_gps_style_prediction(prediction)
+                        st.caption(f"모델 추론 {prediction['latency_ms']:.0f}ms")
+                    else:
+                        st.warning("⚠️ 해당 가맹점의 AI 예측을 수행할 수 없습니다.")
+                except Exception as e:
+                    st.error(f"❌ 예측 실패: {str(e)}")
 
         st.markdown("---")
 
@@ -0,0 +1,66 @@
+# tests/test_duckdb_swap.py
+# -*- coding: utf-8 -*-
+"""
+duckdb_swap 동시성 테스트 — 다른 스레드가 결과를 읽는 도중 DB 파일을 교체해도
+진행 중인 쿼리는 끝까지 읽히고, 교체 후 조회는 새 파일을 봐야 함
+"""
+import threading
+
+import duckdb
+
+from my_agent.utils.duckdb_swap import readonly_cursor, shadow_database
+
+
+def _write_version(db_path, version: int, copy_existing: bool):
+    with shadow_database(db_path, copy_existing=copy_existing) as con:
+        con.execute("CREATE OR REPLACE TABLE meta AS SELECT ? AS version", [version])
+        con.execute("CREATE OR REPLACE TABLE big AS SELECT range AS i FROM range(2000000)")
+
+
+def test_swap_while_fetching(tmp_path):
+    db_path = tmp_path / "data.duckdb"
+    _write_version(db_path, 1, copy_existing=False)
+
+    started = threading.Event()
+    swapped = threading.Event()
+    result = {}
+
+    def reader():
+        try:
+            cur = readonly_cursor(db_path)
+            cur.execute("SELECT i FROM big")
+            n = len(cur.fetchmany(1000))
+            started.set()
+            assert swapped.wait(10)
+            while True:
+                chunk = cur.fetchmany(100000)
+                if not chunk:
+                    break
+                n += len(chunk)
+            result["rows"] = n
+            # 같은 스레드의 다음 조회는 새 세대 커서
+            result["version_after"] = readonly_cursor(db_path).execute("SELECT version FROM meta").fetchone()[0]
+        except Exception as e:  # 스레드 예외를 본 스레드에서 확인
+            result["error"] = e
+            started.set()
+
+    t = threading.Thread(target=reader)
+    t.start()
+    assert started.wait(10)
+
+    _write_version(db_path, 2, copy_existing=True)
+    version = readonly_cursor(db_path).execute("SELECT version FROM meta").fetchone()[0]
+    swapped.set()
+    t.join(30)
+
+    assert "error" not in result, result.get("error")
+    assert result["rows"] == 2000000
+    assert version == 2
+    assert result["version_after"] == 2
+
+
+def test_cursor_sees_attached_catalog(tmp_path):
+    db_path = tmp_path / "memory.duckdb"   # 예약 카탈로그 이름과 겹치는 파일명
+    with duckdb.connect(str(db_path)) as con:
+        con.execute("CREATE TABLE t AS SELECT 42 AS x")
+    assert readonly_cursor(db_path).execute("SELECT x FROM t").fetchone()[0] == 42
@@ -0,0 +1,43 @@
+# tests/test_tools_float32.py
+# -*- coding: utf-8 -*-
+"""
+build_duckdb 스키마의 FLOAT(float32) 비율 컬럼이 도구 결과에 저장 값 그대로 나와야 함
+(0.1164 → 0.11640000343322754 같은 float32 오차가 user_info / 지표로 새지 않도록)
+"""
+import duckdb
+
+from mcp import tools
+from scripts.build_duckdb import apply_schema
+
+
+def _build_db(db_path):
+    con = duckdb.connect(str(db_path))
+    con.execute("""
+        CREATE TABLE raw_franchise AS
+        SELECT * FROM (VALUES
+            ('001F3D5B79', '202401', '가게A', '성수동', '카페', 0.1164, 0.2243),
+            ('001F3D5B79', '202402', '가게A', '성수동', '카페', 0.0731, 12.34)
+        ) t(가맹점_구분번호, 기준년월, 가맹점명, 상권_지리, 업종, 배달매출_비중, 재방문율)
+    """)
+    apply_schema(con, {"franchise": "raw_franchise"})
+    types = dict(con.execute("SELECT column_name, data_type FROM duckdb_columns() "
+                             "WHERE table_name = 'franchise'").fetchall())
+    con.close()
+    return types
+
+
+def test_ratio_round_trips(tmp_path, monkeypatch):
+    db_path = tmp_path / "data.duckdb"
+    types = _build_db(db_path)
+    assert types["배달매출_비중"] == "FLOAT"
+
+    monkeypatch.setattr(tools, "DUCKDB_PATH", str(db_path))
+    monkeypatch.setattr(tools, "USE_DUCKDB", True)
+
+    latest = tools.load_store_data("001F3D5B79")["data"]
+    assert latest["배달매출_비중"] == 0.0731
+    assert latest["재방문율"] == 12.34
+
+    history = tools.load_store_data("001F3D5B79", latest_only=False)["data"]
+    assert [r["배달매출_비중"] for r in history] == [0.1164, 0.0731]
+    assert [r["재방문율"] for r in history] == [0.2243, 12.34]
@@ -2,28 +2,22 @@
 
 import streamlit as st
 import joblib
-import pandas as pd
-from autogluon.tabular import TabularPredictor
+
+import forecast
+from my_agent.utils.config import LABEL_ENCODER_PATH
 
 st.set_page_config(page_title="Next Month Sales Prediction", layout="centered")
 st.title("🛒 다음달 매출 예상")
 
-# 모델 및 데이터 로드
-@st.cache_data
+# 모델 로드 (persist + warmup 완료된 싱글턴, 피처는 forecast.load_latest_features 에서 지연 로드)
+# 사전 계산 결과가 없을 때만 predict_next_month에서 처음 로드
+@st.cache_resource
 def load_predictor():
-    return TabularPredictor.load("AutogluonModels/ag-20251018_185635")
+    return forecast.get_predictor()
 
-@st.cache_data
+@st.cache_resource
 def load_label_encoder():
-    return joblib.load("data/label_encoder_store.pkl")
-
-@st.cache_data
-def load_data():
-    return pd.read_csv("data/preprocessed_df.csv")
-
-predictor = load_predictor()
-label_encoder = load_label_encoder()
-df = load_data()
+    return joblib.load(LABEL_ENCODER_PATH)
 
 label_map = {
     0: "90%초과(하위 10% 이하)",
@@ -36,32 +30,33 @@ label_map = {
 
 # 예측 함수
 def predict_next_month(store_id):
+    # 배치 예측 결과(predictions 테이블) 우선
+    precomputed = forecast.load_prediction(store_id)
+    if precomputed:
+        return {
+            "predicted_class": precomputed["predicted_class"],
+            "predicted_label": label_map[precomputed["predicted_class"]],
+            "predicted_probability": precomputed["predicted_probability"]
+        }
+
+    predictor = load_predictor()
     try:
-        encoded_store_id = label_encoder.transform([store_id])[0]
+        encoded_store_id = load_label_encoder().transform([store_id])[0]
     except ValueError:
         st.error(f"[Error] store_id '{store_id}'는 학습 데이터에 존재하지 않습니다.")
         return None
 
-    store_df = df[df["가맹점_구분번호"] == encoded_store_id].sort_values("기준년월")
-    if store_df.empty:
+    store_df = forecast.load_latest_features(encoded_store_id, predictor.features())
+    if store_df is None:
         st.error(f"[Error] store_id {store_id} 데이터가 없습니다.")
         return None
 
-    latest_row = store_df.iloc[-1:].copy()
-    drop_cols = ['매출금액_구간', '매핑용_상권명', '매핑용_업종', '기준년월']
-    latest_row = latest_row.drop(columns=drop_cols, errors='ignore')
-
-    pred_class = predictor.predict(latest_row).iloc[0]
-    pred_proba_df = predictor.predict_proba(latest_row).iloc[0]
-
-    pred_label = label_map[int(pred_class)]
-    pred_prob = float(pred_proba_df[int(pred_class)])
+    latest_row = store_df.drop(columns=forecast.DROP_COLS, errors='ignore')
 
-    return {
-        "predicted_class": int(pred_class),
-        "predicted_label": pred_label,
-        "predicted_probability": pred_prob
-    }
+    # predict_proba 1회 → argmax
+    result = predictor.predict_one(latest_row)
+    result["predicted_label"] = label_map[result["predicted_class"]]
+    return result
 
 # Streamlit UI
 store_id_input = st.text_input("Store ID를 입력해주세요:", "")
@@ -74,3 +69,5 @@ if st.button("입력"):
             st.subheader(f"Store ID: {store_id_input}")
             st.metric(label="예상매출구간", value=result['predicted_label'],
                       delta=f"{result['predicted_probability']*100:.2f}% 확률")
+            if "latency_ms" in result:
+                st.caption(f"모델 추론 {result['latency_ms']:.0f}ms")